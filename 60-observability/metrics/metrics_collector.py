@@ -7,8 +7,9 @@ Collects and exposes metrics for Prometheus monitoring
 import asyncio
 import json
 import time
-from typing import Dict, Any
+from typing import Callable, Dict, Any, Optional
 from prometheus_client import Counter, Histogram, Gauge, start_http_server
+from prometheus_client.core import REGISTRY, CounterMetricFamily, GaugeMetricFamily, HistogramMetricFamily
 import logging
 
 logger = logging.getLogger(__name__)
@@ -134,6 +135,14 @@ class IZAOSMetrics:
             method=method
         ).inc()
         
+    def register_request_metrics(self, service: str, source):
+        """Export the pre-aggregated request metrics of a service
+        
+        `source.export()` yields per-route dicts with method, route, status, count,
+        sum, cumulative buckets and quantiles, read at every scrape.
+        """
+        REGISTRY.register(RequestMetricsCollector(service, source))
+        
     def update_system_metrics(self, active_agents: int, cache_metrics: Dict[str, float]):
         """Update system-wide metrics"""
         self.system_uptime.set(time.time() - self.start_time)
@@ -142,11 +151,50 @@ class IZAOSMetrics:
         for cache_name, hit_ratio in cache_metrics.items():
             self.cache_hit_ratio.labels(cache_name=cache_name).set(hit_ratio)
 
+class RequestMetricsCollector:
+    """Prometheus collector reading pre-aggregated request metrics at scrape time"""
+    
+    def __init__(self, service: str, source):
+        self.service = service
+        self.source = source
+        
+    def collect(self):
+        labels = ['service', 'method', 'route', 'status']
+        requests = CounterMetricFamily(
+            'iza_os_http_requests', 'Total HTTP requests', labels=labels
+        )
+        duration = HistogramMetricFamily(
+            'iza_os_http_request_duration_seconds', 'HTTP request duration', labels=labels
+        )
+        quantiles = GaugeMetricFamily(
+            'iza_os_http_request_duration_quantile_seconds', 'HTTP request duration quantiles',
+            labels=labels + ['quantile']
+        )
+        
+        for route in self.source.export():
+            values = [self.service, route['method'], route['route'], route['status']]
+            requests.add_metric(values, route['count'])
+            duration.add_metric(
+                values,
+                buckets=[(str(bound), count) for bound, count in route['buckets']] + [('+Inf', route['count'])],
+                sum_value=route['sum']
+            )
+            for quantile, value in route['quantiles'].items():
+                quantiles.add_metric(values + [str(quantile)], value)
+        
+        yield requests
+        yield duration
+        yield quantiles
+
 class MetricsCollector:
     """Collects metrics from various IZA OS components"""
     
-    def __init__(self, metrics: IZAOSMetrics):
+    def __init__(self, metrics: IZAOSMetrics,
+                 cache_metrics_source: Optional[Callable[[], Dict[str, float]]] = None):
         self.metrics = metrics
+        # Returns the hit ratio of each cache, e.g. DatabaseService.get_cache_metrics. The
+        # counters are per process, so only a process that reads through the cache may pass it.
+        self.cache_metrics_source = cache_metrics_source
         self.running = False
         
     async def start(self):
@@ -175,12 +223,15 @@ class MetricsCollector:
         # Simulate active agents
         active_agents = 5  # Would come from orchestrator
         
-        # Simulate cache metrics
-        cache_metrics = {
-            'llm_cache': 0.85,  # 85% hit ratio
-            'knowledge_cache': 0.92,
-            'agent_cache': 0.78
-        }
+        if self.cache_metrics_source is not None:
+            cache_metrics = self.cache_metrics_source()
+        else:
+            # Simulate cache metrics
+            cache_metrics = {
+                'llm_cache': 0.85,  # 85% hit ratio
+                'knowledge_cache': 0.92,
+                'agent_cache': 0.78
+            }
         
         self.metrics.update_system_metrics(active_agents, cache_metrics)
 
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+⚡ IZA OS Async Data Layer
+=========================
+One asyncpg pool and one redis.asyncio client per process, shared by the API
+managers and repositories, so that queries never block the event loop.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, Dict, List, Optional
+
+import asyncpg
+import redis.asyncio as aioredis
+
+logger = logging.getLogger(__name__)
+
+
+class PoolTimeoutError(Exception):
+    """Raised when no connection becomes available within the acquire timeout"""
+
+
+class AsyncDatabasePool:
+    """asyncpg connection pool and redis.asyncio client with saturation metrics"""
+
+    def __init__(self,
+                 dsn: Optional[str] = None,
+                 redis_url: Optional[str] = None,
+                 min_size: int = 2,
+                 max_size: int = 20,
+                 acquire_timeout: float = 5.0,
+                 command_timeout: float = 30.0,
+                 statement_cache_size: int = 1024,
+                 max_inactive_connection_lifetime: float = 300.0):
+        self.dsn = dsn or os.getenv('DATABASE_URL') or (
+            f"postgresql://{os.getenv('DB_USER', 'postgres')}:{os.getenv('DB_PASSWORD', 'password')}"
+            f"@{os.getenv('DB_HOST', 'localhost')}:{os.getenv('DB_PORT', '5432')}/{os.getenv('DB_NAME', 'iza_os')}"
+        )
+        self.redis_url = redis_url or os.getenv('REDIS_URL') or (
+            f"redis://{os.getenv('REDIS_HOST', 'localhost')}:{os.getenv('REDIS_PORT', '6379')}/0"
+        )
+        self.min_size = min_size
+        self.max_size = max_size
+        self.acquire_timeout = acquire_timeout
+        self.command_timeout = command_timeout
+        self.statement_cache_size = statement_cache_size
+        self.max_inactive_connection_lifetime = max_inactive_connection_lifetime
+
+        self.pool: Optional[asyncpg.Pool] = None
+        self.redis: Optional[aioredis.Redis] = None
+        self._init_lock = asyncio.Lock()
+
+        # Saturation metrics
+        self.in_use = 0
+        self.waiting = 0
+        self.acquired_total = 0
+        self.acquire_timeouts = 0
+        self._wait_times = deque(maxlen=1024)
+
+    @property
+    def is_initialized(self) -> bool:
+        return self.pool is not None
+
+    async def initialize(self):
+        """Create the pool and the Redis client, once per process"""
+        async with self._init_lock:
+            if self.pool is not None:
+                return
+            try:
+                self.pool = await asyncpg.create_pool(
+                    dsn=self.dsn,
+                    min_size=self.min_size,
+                    max_size=self.max_size,
+                    command_timeout=self.command_timeout,
+                    statement_cache_size=self.statement_cache_size,
+                    max_inactive_connection_lifetime=self.max_inactive_connection_lifetime,
+                )
+                logger.info(f"✅ PostgreSQL pool initialized ({self.min_size}-{self.max_size} connections)")
+
+                self.redis = aioredis.from_url(
+                    self.redis_url,
+                    decode_responses=True,
+                    max_connections=self.max_size * 2,
+                    socket_connect_timeout=5,
+                    socket_timeout=5,
+                )
+                await self.redis.ping()
+                logger.info("✅ Redis client connected")
+            except Exception as e:
+                logger.error(f"❌ Async data layer initialization failed: {e}")
+                await self.close()
+                raise
+
+    async def close(self):
+        """Close the pool and the Redis client"""
+        if self.redis is not None:
+            await self.redis.close()
+            self.redis = None
+            logger.info("✅ Redis client disconnected")
+        if self.pool is not None:
+            await self.pool.close()
+            self.pool = None
+            logger.info("✅ PostgreSQL pool closed")
+
+    @asynccontextmanager
+    async def acquire(self, timeout: Optional[float] = None):
+        """Acquire a connection, failing with PoolTimeoutError when the pool stays saturated"""
+        if self.pool is None:
+            await self.initialize()
+
+        timeout = self.acquire_timeout if timeout is None else timeout
+        start = time.perf_counter()
+        self.waiting += 1
+        try:
+            conn = await self.pool.acquire(timeout=timeout)
+        except asyncio.TimeoutError:
+            self.acquire_timeouts += 1
+            raise PoolTimeoutError(f"No database connection available within {timeout}s")
+        finally:
+            self.waiting -= 1
+        self._wait_times.append(time.perf_counter() - start)
+        self.acquired_total += 1
+        self.in_use += 1
+        try:
+            yield conn
+        finally:
+            self.in_use -= 1
+            await self.pool.release(conn)
+
+    @asynccontextmanager
+    async def transaction(self, timeout: Optional[float] = None):
+        """Acquire a connection inside a transaction"""
+        async with self.acquire(timeout) as conn:
+            async with conn.transaction():
+                yield conn
+
+    async def fetch(self, query: str, *args) -> List[asyncpg.Record]:
+        async with self.acquire() as conn:
+            return await conn.fetch(query, *args)
+
+    async def fetchrow(self, query: str, *args) -> Optional[asyncpg.Record]:
+        async with self.acquire() as conn:
+            return await conn.fetchrow(query, *args)
+
+    async def fetchval(self, query: str, *args) -> Any:
+        async with self.acquire() as conn:
+            return await conn.fetchval(query, *args)
+
+    async def execute(self, query: str, *args) -> str:
+        async with self.acquire() as conn:
+            return await conn.execute(query, *args)
+
+    async def executemany(self, query: str, args: List[tuple]):
+        async with self.acquire() as conn:
+            return await conn.executemany(query, args)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Pool saturation metrics"""
+        wait_times = sorted(self._wait_times)
+        size = self.pool.get_size() if self.pool is not None else 0
+        idle = self.pool.get_idle_size() if self.pool is not None else 0
+        return {
+            'pool_size': size,
+            'pool_idle': idle,
+            'pool_in_use': self.in_use,
+            'pool_max_size': self.max_size,
+            'pool_saturation': self.in_use / self.max_size if self.max_size else 0.0,
+            'pool_waiting': self.waiting,
+            'acquired_total': self.acquired_total,
+            'acquire_timeouts': self.acquire_timeouts,
+            'acquire_wait_avg': sum(wait_times) / len(wait_times) if wait_times else 0.0,
+            'acquire_wait_p99': wait_times[int(len(wait_times) * 0.99)] if wait_times else 0.0,
+        }
+
+
+# One pool per process, recreated in forked workers
+_pools: Dict[int, AsyncDatabasePool] = {}
+
+
+def get_db_pool() -> AsyncDatabasePool:
+    """Get the data layer of the current process"""
+    pid = os.getpid()
+    if pid not in _pools:
+        _pools[pid] = AsyncDatabasePool(
+            min_size=int(os.getenv('DB_POOL_MIN_SIZE', '2')),
+            max_size=int(os.getenv('DB_POOL_MAX_SIZE', '20')),
+            acquire_timeout=float(os.getenv('DB_POOL_ACQUIRE_TIMEOUT', '5')),
+        )
+    return _pools[pid]
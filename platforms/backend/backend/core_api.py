@@ -10,6 +10,7 @@ Production-ready FastAPI backend with comprehensive features:
 """
 
 import asyncio
+import functools
 import logging
 import os
 import sys
@@ -23,11 +24,8 @@ from fastapi import FastAPI, HTTPException, Depends, BackgroundTasks, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from pydantic import BaseModel, Field, validator
-import redis
-import psycopg2
-from psycopg2.extras import RealDictCursor
 import jwt
 from passlib.context import CryptContext
 import httpx
@@ -35,6 +33,13 @@ from shared.core.base_manager import BaseManager, DatabaseManager
 from shared.core.security import SecurityManager, get_current_user
 from shared.core.config import get_config, get_service_config
 
+from async_db import get_db_pool
+from database_manager import AgentExecutionRepository
+from task_queue import TaskQueue, TERMINAL_STATUSES
+from health_cache import HealthProbeCache
+from request_metrics import RequestMetricsMiddleware, request_metrics, start_metrics_server
+from write_buffer import WriteBehindBuffer
+
 
 # Configure logging
 logging.basicConfig(
@@ -51,59 +56,36 @@ logger = logging.getLogger(__name__)
 security = HTTPBearer()
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
-# Database and Redis connections
-redis_client = None
-db_connection = None
-
 class DatabaseManager(DatabaseManager):
-    """Production-ready database manager with connection pooling"""
+    """Production-ready database manager on the process-wide async pool"""
     
     def __init__(self):
-        self.connection_pool = None
-        self.redis_pool = None
+        self.pool = get_db_pool()
     
     async def initialize(self):
         """Initialize database connections"""
         try:
-            # PostgreSQL connection
-            self.connection_pool = psycopg2.pool.SimpleConnectionPool(
-                minconn=1,
-                maxconn=20,
-                host=get_config().get('DB_HOST', 'localhost'),
-                port=get_config().get('DB_PORT', '5432'),
-                database=get_config().get('DB_NAME', 'iza_os'),
-                user=get_config().get('DB_USER', 'postgres'),
-                password=get_config().get('DB_PASSWORD', 'password')
-            )
-            
-            # Redis connection
-            self.redis_pool = redis.ConnectionPool(
-                host=get_config().get('REDIS_HOST', 'localhost'),
-                port=int(get_config().get('REDIS_PORT', '6379')),
-                db=0,
-                decode_responses=True
-            )
-            
+            await self.pool.initialize()
             logger.info("✅ Database connections initialized")
             
         except Exception as e:
             logger.error(f"❌ Database initialization failed: {e}")
             raise
     
-    async def get_db_connection(self):
-        """Get database connection from pool"""
-        return self.connection_pool.getconn()
-    
-    async def return_db_connection(self, conn):
-        """Return database connection to pool"""
-        self.connection_pool.putconn(conn)
+    async def close(self):
+        """Close database connections"""
+        await self.pool.close()
     
     async def get_redis_client(self):
         """Get Redis client"""
-        return redis.Redis(connection_pool=self.redis_pool)
+        if not self.pool.is_initialized:
+            await self.pool.initialize()
+        return self.pool.redis
 
 # Global database manager
 db_manager = DatabaseManager()
+# Raw list reads of the Prisma AgentExecution table, through the same pool
+execution_repo = AgentExecutionRepository(db_manager)
 
 # Pydantic models
 class AgentRequest(BaseModel):
@@ -114,6 +96,13 @@ class AgentRequest(BaseModel):
     priority: int = Field(default=1, ge=1, le=10)
     timeout: int = Field(default=300, ge=30, le=3600)
 
+class AgentJobAccepted(BaseModel):
+    """Queued agent execution"""
+    agent_id: str
+    status: str
+    status_url: str
+    events_url: str
+
 class AgentResponse(BaseModel):
     """Agent execution response model"""
     agent_id: str
@@ -161,63 +150,51 @@ async def get_current_user(token_data: dict = Depends(verify_token)):
     return token_data
 
 # Agent orchestration system
+# Jobs of each agent type run at most this many at a time per worker process
+AGENT_CONCURRENCY = {
+    'research': int(os.getenv('AGENT_CONCURRENCY_RESEARCH', '8')),
+    'analysis': int(os.getenv('AGENT_CONCURRENCY_ANALYSIS', '8')),
+    'automation': int(os.getenv('AGENT_CONCURRENCY_AUTOMATION', '4')),
+    'integration': int(os.getenv('AGENT_CONCURRENCY_INTEGRATION', '4')),
+}
+
 class AgentOrchestrator:
-    """Production-ready agent orchestration system"""
+    """Production-ready agent orchestration system
     
-    def __init__(self):
-        self.active_agents = {}
-        self.agent_queue = asyncio.Queue()
-        self.agent_results = {}
+    Executions are queued as jobs of the `agents` task queue and run by the workers
+    of every API process started with TASK_QUEUE_WORKERS enabled.
+    """
+    
+    def __init__(self, queue: TaskQueue):
+        self.queue = queue
+        for agent_type, concurrency in AGENT_CONCURRENCY.items():
+            self.queue.register(agent_type, self._run_job, concurrency)
+    
+    async def execute_agent(self, request: AgentRequest, user_id: str) -> str:
+        """Queue an agent execution, returns its id"""
+        agent_type = request.agent_type.lower()
+        if agent_type not in AGENT_CONCURRENCY:
+            raise HTTPException(status_code=400, detail=f"Unknown agent type: {request.agent_type}")
+        
+        agent_id = await self.queue.enqueue(
+            agent_type, request.model_dump(), user_id=user_id, timeout=request.timeout
+        )
+        logger.info(f"🤖 Queued agent {agent_id} of type {agent_type}")
+        return agent_id
     
-    async def execute_agent(self, request: AgentRequest, user_id: str) -> AgentResponse:
-        """Execute agent with comprehensive error handling"""
-        agent_id = str(uuid4())
-        start_time = datetime.now()
+    async def _run_job(self, job: Dict[str, Any]) -> Dict[str, Any]:
+        """Execute a queued agent with comprehensive error handling"""
+        request = AgentRequest(**job['payload'])
+        logger.info(f"🤖 Executing agent {job['id']} of type {request.agent_type}")
         
         try:
-            # Log agent execution
-            logger.info(f"🤖 Executing agent {agent_id} of type {request.agent_type}")
-            
-            # Add to active agents
-            self.active_agents[agent_id] = {
-                'type': request.agent_type,
-                'task': request.task,
-                'user_id': user_id,
-                'start_time': start_time,
-                'status': 'running'
-            }
-            
-            # Execute agent based on type
-            result = await self._execute_agent_by_type(request, agent_id)
-            
-            execution_time = (datetime.now() - start_time).total_seconds()
-            
-            # Store result
-            self.agent_results[agent_id] = {
-                'result': result,
-                'execution_time': execution_time,
-                'status': 'completed'
-            }
-            
-            return AgentResponse(
-                agent_id=agent_id,
-                status='completed',
-                result=result,
-                execution_time=execution_time,
-                created_at=start_time
-            )
-            
-        except Exception as e:
-            execution_time = (datetime.now() - start_time).total_seconds()
-            logger.error(f"❌ Agent {agent_id} failed: {e}")
-            
-            return AgentResponse(
-                agent_id=agent_id,
-                status='failed',
-                error=str(e),
-                execution_time=execution_time,
-                created_at=start_time
-            )
+            result = await self._execute_agent_by_type(request, job['id'])
+        except Exception:
+            log_agent_execution(request.agent_type, request.task, 'failed', job['user_id'])
+            raise
+        
+        log_agent_execution(request.agent_type, request.task, 'completed', job['user_id'])
+        return result
     
     async def _execute_agent_by_type(self, request: AgentRequest, agent_id: str) -> Dict[str, Any]:
         """Execute agent based on type"""
@@ -307,31 +284,49 @@ class AgentOrchestrator:
             ]
         }
 
-# Global agent orchestrator
-agent_orchestrator = AgentOrchestrator()
+# Global agent queue and orchestrator
+agent_queue = TaskQueue("agents")
+agent_orchestrator = AgentOrchestrator(agent_queue)
 
 # System monitoring
 class SystemMonitor:
     """Production-ready system monitoring"""
     
+    # External services probed by the health check
+    EXTERNAL_SERVICES = {
+        'ollama': 'http://localhost:11434/api/tags',
+        'anythingllm': 'http://localhost:3001/api/health',
+        'omnara': 'https://omnara.com/api/health',
+        'unified_dashboard': 'http://localhost:3002/health'
+    }
+    
     def __init__(self):
-        self.metrics = {}
-        self.health_checks = {}
+        self.http_client: Optional[httpx.AsyncClient] = None
+        probes = {
+            'database': self._check_database_health,
+            'redis': self._check_redis_health,
+        }
+        for service_name, url in self.EXTERNAL_SERVICES.items():
+            probes[service_name] = functools.partial(self._check_external_service, url)
+        self.health_checks = HealthProbeCache(probes, ttl=10.0, timeout=5.0)
+    
+    async def start(self):
+        """Start refreshing the health checks in the background"""
+        self.http_client = httpx.AsyncClient(timeout=5.0)
+        self.health_checks.start()
+    
+    async def stop(self):
+        await self.health_checks.stop()
+        if self.http_client is not None:
+            await self.http_client.aclose()
+            self.http_client = None
     
     async def get_system_health(self) -> SystemHealth:
-        """Get comprehensive system health status"""
+        """Get comprehensive system health status, from the cached health checks"""
         try:
-            # Check database health
-            db_health = await self._check_database_health()
-            
-            # Check Redis health
-            redis_health = await self._check_redis_health()
-            
-            # Check external services
-            external_health = await self._check_external_services()
+            all_services = await self.health_checks.get_statuses()
             
             # Calculate overall status
-            all_services = {**db_health, **redis_health, **external_health}
             overall_status = 'healthy' if all(status == 'healthy' for status in all_services.values()) else 'degraded'
             
             return SystemHealth(
@@ -339,10 +334,10 @@ class SystemMonitor:
                 timestamp=datetime.now(),
                 services=all_services,
                 metrics={
-                    'active_agents': len(agent_orchestrator.active_agents),
-                    'total_requests': self.metrics.get('total_requests', 0),
-                    'error_rate': self.metrics.get('error_rate', 0.0),
-                    'response_time_avg': self.metrics.get('response_time_avg', 0.0)
+                    'active_agents': agent_queue.running_count(),
+                    **request_metrics.summary(),
+                    'health_check_latency': self.health_checks.get_latency_histograms(),
+                    **db_manager.pool.get_metrics()
                 }
             )
             
@@ -355,48 +350,23 @@ class SystemMonitor:
                 metrics={}
             )
     
-    async def _check_database_health(self) -> Dict[str, str]:
+    async def _check_database_health(self) -> str:
         """Check database health"""
-        try:
-            conn = await db_manager.get_db_connection()
-            cursor = conn.cursor()
-            cursor.execute("SELECT 1")
-            cursor.close()
-            await db_manager.return_db_connection(conn)
-            return {'database': 'healthy'}
-        except Exception as e:
-            logger.error(f"❌ Database health check failed: {e}")
-            return {'database': 'unhealthy'}
+        await db_manager.pool.fetchval("SELECT 1")
+        return 'healthy'
     
-    async def _check_redis_health(self) -> Dict[str, str]:
+    async def _check_redis_health(self) -> str:
         """Check Redis health"""
-        try:
-            redis_client = await db_manager.get_redis_client()
-            redis_client.ping()
-            return {'redis': 'healthy'}
-        except Exception as e:
-            logger.error(f"❌ Redis health check failed: {e}")
-            return {'redis': 'unhealthy'}
+        redis_client = await db_manager.get_redis_client()
+        await redis_client.ping()
+        return 'healthy'
     
-    async def _check_external_services(self) -> Dict[str, str]:
-        """Check external services health"""
-        services = {
-            'ollama': 'http://localhost:11434/api/tags',
-            'anythingllm': 'http://localhost:3001/api/health',
-            'omnara': 'https://omnara.com/api/health',
-            'unified_dashboard': 'http://localhost:3002/health'
-        }
-        
-        health_status = {}
-        async with httpx.AsyncClient(timeout=5.0) as client:
-            for service_name, url in services.items():
-                try:
-                    response = await client.get(url)
-                    health_status[service_name] = 'healthy' if response.status_code == 200 else 'unhealthy'
-                except Exception:
-                    health_status[service_name] = 'unhealthy'
-        
-        return health_status
+    async def _check_external_service(self, url: str) -> str:
+        """Check an external service health"""
+        if self.http_client is None:
+            self.http_client = httpx.AsyncClient(timeout=5.0)
+        response = await self.http_client.get(url)
+        return 'healthy' if response.status_code == 200 else 'unhealthy'
 
 # Global system monitor
 system_monitor = SystemMonitor()
@@ -408,14 +378,20 @@ async def lifespan(app: FastAPI):
     # Startup
     logger.info("🚀 Starting IZA OS Backend API")
     await db_manager.initialize()
+    if os.getenv('TASK_QUEUE_WORKERS', '1') == '1':
+        await agent_queue.start()
+    await system_monitor.start()
+    start_metrics_server("core_api")
     logger.info("✅ Backend API startup complete")
     
     yield
     
     # Shutdown
     logger.info("🛑 Shutting down IZA OS Backend API")
-    if db_manager.connection_pool:
-        db_manager.connection_pool.closeall()
+    await system_monitor.stop()
+    await agent_queue.close()
+    await execution_log.close()
+    await db_manager.close()
     logger.info("✅ Backend API shutdown complete")
 
 # Create FastAPI application
@@ -440,6 +416,9 @@ app.add_middleware(
     allowed_hosts=["*"]  # Configure appropriately for production
 )
 
+# Per-route request counts and latency histograms
+app.add_middleware(RequestMetricsMiddleware, metrics=request_metrics)
+
 # Request logging middleware
 @app.middleware("http")
 async def log_requests(request: Request, call_next):
@@ -501,81 +480,109 @@ async def login(user_auth: UserAuth):
     else:
         raise HTTPException(status_code=401, detail="Invalid credentials")
 
-@app.post("/agents/execute", response_model=AgentResponse)
+@app.post("/agents/execute", response_model=AgentJobAccepted, status_code=202)
 async def execute_agent(
     request: AgentRequest,
-    background_tasks: BackgroundTasks,
     current_user: dict = Depends(get_current_user)
 ):
-    """Execute agent endpoint"""
+    """Queue an agent execution, poll its status or follow its events"""
     try:
-        result = await agent_orchestrator.execute_agent(request, current_user['sub'])
+        agent_id = await agent_orchestrator.execute_agent(request, current_user['sub'])
         
-        # Log agent execution
-        background_tasks.add_task(
-            log_agent_execution,
-            request.agent_type,
-            request.task,
-            result.status,
-            current_user['sub']
+        return AgentJobAccepted(
+            agent_id=agent_id,
+            status='queued',
+            status_url=f"/agents/status/{agent_id}",
+            events_url=f"/agents/events/{agent_id}"
         )
         
-        return result
-        
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"❌ Agent execution failed: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+async def get_user_job(agent_id: str, user_id: str) -> Dict[str, Any]:
+    """Agent job of a user, 404 for unknown, expired and other users' jobs"""
+    job = await agent_queue.get(agent_id)
+    if job is None or job['user_id'] != user_id:
+        raise HTTPException(status_code=404, detail="Agent not found")
+    return job
+
 @app.get("/agents/status/{agent_id}")
 async def get_agent_status(agent_id: str, current_user: dict = Depends(get_current_user)):
     """Get agent execution status"""
-    if agent_id in agent_orchestrator.active_agents:
-        return agent_orchestrator.active_agents[agent_id]
-    elif agent_id in agent_orchestrator.agent_results:
-        return agent_orchestrator.agent_results[agent_id]
-    else:
-        raise HTTPException(status_code=404, detail="Agent not found")
+    return await get_user_job(agent_id, current_user['sub'])
+
+@app.get("/agents/events/{agent_id}")
+async def get_agent_events(agent_id: str, current_user: dict = Depends(get_current_user)):
+    """Stream agent execution updates as server-sent events, until it finishes"""
+    await get_user_job(agent_id, current_user['sub'])
+    return StreamingResponse(
+        agent_queue.sse_events(agent_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache"}
+    )
 
 @app.get("/agents/list")
 async def list_agents(current_user: dict = Depends(get_current_user)):
     """List all agents"""
+    jobs = await agent_queue.list_jobs(user_id=current_user['sub'])
     return {
-        "active_agents": agent_orchestrator.active_agents,
-        "completed_agents": agent_orchestrator.agent_results
+        "active_agents": [job for job in jobs if job['status'] not in TERMINAL_STATUSES],
+        "completed_agents": [job for job in jobs if job['status'] in TERMINAL_STATUSES]
     }
 
+@app.get("/executions")
+async def list_executions(status: Optional[str] = None, limit: int = 100, offset: int = 0,
+                          fields: Optional[str] = None,
+                          current_user: dict = Depends(get_current_user)):
+    """List the user's agent executions, newest first
+    
+    `fields` is a comma-separated list of columns to return, all by default.
+    """
+    if not 1 <= limit <= 1000 or offset < 0:
+        raise HTTPException(status_code=400, detail="limit must be between 1 and 1000 and offset at least 0")
+    try:
+        body = await execution_repo.list_executions_json(
+            user_id=current_user['sub'], status=status, limit=limit, offset=offset,
+            fields=[field for field in fields.split(",") if field] if fields is not None else None
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return Response(content=body, media_type="application/json")
+
 @app.get("/metrics")
 async def get_metrics(current_user: dict = Depends(get_current_user)):
     """Get system metrics"""
     return {
-        "active_agents": len(agent_orchestrator.active_agents),
-        "total_requests": system_monitor.metrics.get('total_requests', 0),
-        "error_rate": system_monitor.metrics.get('error_rate', 0.0),
-        "response_time_avg": system_monitor.metrics.get('response_time_avg', 0.0),
+        "active_agents": agent_queue.running_count(),
+        "agent_workers": agent_queue.get_metrics(),
+        **request_metrics.summary(),
+        "database_pool": db_manager.pool.get_metrics(),
+        "execution_log": execution_log.get_metrics(),
         "timestamp": datetime.now().isoformat()
     }
 
 # Background tasks
-async def log_agent_execution(agent_type: str, task: str, status: str, user_id: str):
+EXECUTION_LOG_COLUMNS = ('agent_type', 'task', 'status', 'user_id', 'created_at')
+
+async def write_execution_logs(rows: List[tuple]):
+    """Write a batch of execution logs with a single COPY"""
+    async with db_manager.pool.acquire() as conn:
+        await conn.copy_records_to_table('agent_executions', records=rows, columns=EXECUTION_LOG_COLUMNS)
+
+# Execution logs are written behind, one COPY per batch
+execution_log = WriteBehindBuffer(
+    'agent_executions',
+    write_execution_logs,
+    max_size=int(os.getenv('EXECUTION_LOG_BATCH_SIZE', '500')),
+    max_delay=float(os.getenv('EXECUTION_LOG_MAX_DELAY', '1.0'))
+)
+
+def log_agent_execution(agent_type: str, task: str, status: str, user_id: str):
     """Log agent execution to database"""
-    try:
-        conn = await db_manager.get_db_connection()
-        cursor = conn.cursor()
-        
-        cursor.execute(
-            """
-            INSERT INTO agent_executions (agent_type, task, status, user_id, created_at)
-            VALUES (%s, %s, %s, %s, %s)
-            """,
-            (agent_type, task, status, user_id, datetime.now())
-        )
-        
-        conn.commit()
-        cursor.close()
-        await db_manager.return_db_connection(conn)
-        
-    except Exception as e:
-        logger.error(f"❌ Failed to log agent execution: {e}")
+    execution_log.add((agent_type, task, status, user_id, datetime.now()))
 
 # Error handlers
 @app.exception_handler(HTTPException)
@@ -607,37 +614,31 @@ async def general_exception_handler(request: Request, exc: Exception):
 async def initialize_database():
     """Initialize database tables"""
     try:
-        conn = await db_manager.get_db_connection()
-        cursor = conn.cursor()
-        
-        # Create agent_executions table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS agent_executions (
-                id SERIAL PRIMARY KEY,
-                agent_type VARCHAR(100) NOT NULL,
-                task TEXT NOT NULL,
-                status VARCHAR(50) NOT NULL,
-                user_id VARCHAR(100) NOT NULL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
-        
-        # Create users table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS users (
-                id SERIAL PRIMARY KEY,
-                username VARCHAR(100) UNIQUE NOT NULL,
-                password_hash VARCHAR(255) NOT NULL,
-                email VARCHAR(255),
-                role VARCHAR(50) DEFAULT 'user',
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-        """)
+        async with db_manager.pool.transaction() as conn:
+            # Create agent_executions table
+            await conn.execute("""
+                CREATE TABLE IF NOT EXISTS agent_executions (
+                    id SERIAL PRIMARY KEY,
+                    agent_type VARCHAR(100) NOT NULL,
+                    task TEXT NOT NULL,
+                    status VARCHAR(50) NOT NULL,
+                    user_id VARCHAR(100) NOT NULL,
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
         
-        conn.commit()
-        cursor.close()
-        await db_manager.return_db_connection(conn)
+            # Create users table
+            await conn.execute("""
+                CREATE TABLE IF NOT EXISTS users (
+                    id SERIAL PRIMARY KEY,
+                    username VARCHAR(100) UNIQUE NOT NULL,
+                    password_hash VARCHAR(255) NOT NULL,
+                    email VARCHAR(255),
+                    role VARCHAR(50) DEFAULT 'user',
+                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                )
+            """)
         
         logger.info("✅ Database tables initialized")
         
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+🩺 IZA OS Health Probe Cache
+===========================
+Runs dependency health probes concurrently and serves their last results,
+refreshing them in the background (stale-while-revalidate), so that health
+endpoints answer without waiting on slow or unreachable dependencies.
+"""
+
+import asyncio
+import bisect
+import logging
+import time
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds of the probe latency buckets, in seconds
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+HealthProbe = Callable[[], Awaitable[str]]
+
+class LatencyHistogram:
+    """Cumulative latency histogram with fixed buckets"""
+
+    def __init__(self, buckets: tuple = LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, seconds: float):
+        self.counts[bisect.bisect_left(self.buckets, seconds)] += 1
+        self.count += 1
+        self.sum += seconds
+
+    def snapshot(self) -> Dict[str, Any]:
+        cumulative = 0
+        buckets = {}
+        for bound, count in zip(self.buckets + (float('inf'),), self.counts):
+            cumulative += count
+            buckets['+Inf' if bound == float('inf') else str(bound)] = cumulative
+        return {'buckets': buckets, 'count': self.count, 'sum': self.sum}
+
+class ProbeResult:
+    __slots__ = ('status', 'latency', 'checked_at', 'checked_monotonic')
+
+    def __init__(self, status: str, latency: float):
+        self.status = status
+        self.latency = latency
+        self.checked_at = datetime.now()
+        self.checked_monotonic = time.monotonic()
+
+class HealthProbeCache:
+    """Concurrent health probes with cached, background-refreshed results
+
+    `get` returns the last results right away and, when they are older than
+    `ttl`, starts a refresh without waiting for it. Only the very first call
+    waits, at most `timeout`, for the probes. `start` keeps the results warm
+    with a refresh every `ttl` seconds.
+    """
+
+    def __init__(self, probes: Dict[str, HealthProbe], ttl: float = 10.0, timeout: float = 5.0,
+                 on_result: Optional[Callable[[str, 'ProbeResult'], None]] = None):
+        self.probes = probes
+        self.ttl = ttl
+        self.timeout = timeout
+        # Called with every new probe result
+        self.on_result = on_result
+        self.results: Dict[str, ProbeResult] = {}
+        self.histograms = {name: LatencyHistogram() for name in probes}
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._loop_task: Optional[asyncio.Task] = None
+
+    async def _run_probe(self, name: str):
+        start = time.perf_counter()
+        try:
+            status = await asyncio.wait_for(self.probes[name](), timeout=self.timeout)
+        except asyncio.TimeoutError:
+            status = 'unhealthy'
+            logger.error(f"❌ Health probe {name} timed out after {self.timeout}s")
+        except Exception as e:
+            status = 'unhealthy'
+            logger.error(f"❌ Health probe {name} failed: {e}")
+        latency = time.perf_counter() - start
+        self.histograms[name].observe(latency)
+        self.results[name] = ProbeResult(status, latency)
+        if self.on_result is not None:
+            self.on_result(name, self.results[name])
+
+    async def refresh(self):
+        """Run every probe concurrently"""
+        await asyncio.gather(*(self._run_probe(name) for name in self.probes))
+
+    def _refresh_in_background(self) -> asyncio.Task:
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.create_task(self.refresh())
+        return self._refresh_task
+
+    def is_stale(self) -> bool:
+        if len(self.results) < len(self.probes):
+            return True
+        oldest = min(result.checked_monotonic for result in self.results.values())
+        return time.monotonic() - oldest > self.ttl
+
+    async def get(self) -> Dict[str, ProbeResult]:
+        """Last probe results, refreshed in the background once stale"""
+        if not self.results:
+            await asyncio.shield(self._refresh_in_background())
+        elif self.is_stale():
+            self._refresh_in_background()
+        return {name: self.results[name] for name in self.probes if name in self.results}
+
+    async def get_statuses(self) -> Dict[str, str]:
+        return {name: result.status for name, result in (await self.get()).items()}
+
+    def get_latency_histograms(self) -> Dict[str, Dict[str, Any]]:
+        return {name: histogram.snapshot() for name, histogram in self.histograms.items()}
+
+    async def _refresh_loop(self):
+        while True:
+            try:
+                await self._refresh_in_background()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"❌ Health probe refresh failed: {e}")
+            await asyncio.sleep(self.ttl)
+
+    def start(self):
+        """Keep the results warm in the background"""
+        if self._loop_task is None:
+            self._loop_task = asyncio.create_task(self._refresh_loop())
+
+    async def stop(self):
+        tasks = [task for task in (self._loop_task, self._refresh_task) if task is not None]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._loop_task = None
+        self._refresh_task = None
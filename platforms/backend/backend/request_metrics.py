@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+📈 IZA OS Request Metrics
+========================
+Pre-aggregated per-route request counters and latency histograms, recorded by
+a plain ASGI middleware. Recording is a few dict and list updates on the event
+loop thread, so it needs no lock; percentiles and Prometheus buckets are only
+computed when the metrics are read.
+"""
+
+import logging
+import os
+import time
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+try:
+    # Prometheus export through the observability metrics server, when it is deployed alongside
+    from observability.metrics.metrics_collector import IZAOSMetrics
+except ImportError:
+    IZAOSMetrics = None
+
+logger = logging.getLogger(__name__)
+
+# Log-linear (HDR-style) buckets over microseconds: values below 2**SUB_BUCKET_BITS
+# get a bucket each, larger ones 2**(SUB_BUCKET_BITS - 1) buckets per power of two,
+# which bounds the relative error of the percentiles to about 6%
+SUB_BUCKET_BITS = 5
+SUB_BUCKET_COUNT = 1 << SUB_BUCKET_BITS
+SUB_BUCKET_HALF = SUB_BUCKET_COUNT >> 1
+MAX_VALUE_BITS = 30  # ~18 minutes in microseconds
+BUCKET_COUNT = SUB_BUCKET_COUNT + (MAX_VALUE_BITS - SUB_BUCKET_BITS) * SUB_BUCKET_HALF
+
+# Bucket upper bounds exported to Prometheus, in seconds
+EXPORT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+def _bucket_index(value: int) -> int:
+    if value < SUB_BUCKET_COUNT:
+        return value
+    shift = value.bit_length() - SUB_BUCKET_BITS
+    return min(
+        SUB_BUCKET_COUNT + (shift - 1) * SUB_BUCKET_HALF + ((value >> shift) - SUB_BUCKET_HALF),
+        BUCKET_COUNT - 1
+    )
+
+def _bucket_upper_bound(index: int) -> int:
+    """Smallest value, in microseconds, above every value of the bucket"""
+    if index < SUB_BUCKET_COUNT:
+        return index + 1
+    shift = (index - SUB_BUCKET_COUNT) // SUB_BUCKET_HALF + 1
+    sub_bucket = (index - SUB_BUCKET_COUNT) % SUB_BUCKET_HALF + SUB_BUCKET_HALF
+    return (sub_bucket + 1) << shift
+
+class LatencyRecorder:
+    """Log-linear latency histogram of one route"""
+
+    __slots__ = ('counts', 'count', 'sum_us')
+
+    def __init__(self):
+        self.counts = [0] * BUCKET_COUNT
+        self.count = 0
+        self.sum_us = 0
+
+    def record(self, duration_us: int):
+        self.counts[_bucket_index(duration_us)] += 1
+        self.count += 1
+        self.sum_us += duration_us
+
+    def percentiles(self, quantiles: Tuple[float, ...]) -> List[float]:
+        """Upper bounds of the buckets holding each quantile, in seconds"""
+        results = []
+        targets = iter(sorted(quantiles))
+        target = next(targets, None)
+        cumulative = 0
+        for index, count in enumerate(self.counts):
+            if target is None:
+                break
+            cumulative += count
+            while target is not None and cumulative >= target * self.count and self.count:
+                results.append(_bucket_upper_bound(index) / 1e6)
+                target = next(targets, None)
+        return results + [0.0] * (len(quantiles) - len(results))
+
+    def export_buckets(self, bounds: Tuple[float, ...] = EXPORT_BUCKETS) -> List[Tuple[float, int]]:
+        """Cumulative counts at each bound, in seconds
+
+        A bucket is counted under the first bound above all of its values.
+        """
+        bounds_us = [bound * 1e6 for bound in bounds]
+        cumulative = [0] * len(bounds)
+        position = 0
+        for index, count in enumerate(self.counts):
+            if not count:
+                continue
+            upper = _bucket_upper_bound(index)
+            while position < len(bounds_us) and bounds_us[position] < upper:
+                position += 1
+            if position == len(bounds_us):
+                break
+            cumulative[position] += count
+        total = 0
+        result = []
+        for bound, count in zip(bounds, cumulative):
+            total += count
+            result.append((bound, total))
+        return result
+
+class RequestMetrics:
+    """Per (method, route, status) request counts and latencies of one process"""
+
+    def __init__(self):
+        self.routes: Dict[Tuple[str, str, int], LatencyRecorder] = {}
+        self.started_at = time.time()
+
+    def record(self, method: str, route: str, status: int, duration_us: int):
+        key = (method, route, status)
+        recorder = self.routes.get(key)
+        if recorder is None:
+            recorder = self.routes[key] = LatencyRecorder()
+        recorder.record(duration_us)
+
+    def summary(self) -> Dict[str, Any]:
+        """Totals over all routes"""
+        total = LatencyRecorder()
+        errors = 0
+        for (_, _, status), recorder in list(self.routes.items()):
+            total.count += recorder.count
+            total.sum_us += recorder.sum_us
+            total.counts = [a + b for a, b in zip(total.counts, recorder.counts)]
+            if status >= 500:
+                errors += recorder.count
+        p50, p99 = total.percentiles((0.5, 0.99))
+        return {
+            'total_requests': total.count,
+            'error_rate': errors / total.count if total.count else 0.0,
+            'response_time_avg': total.sum_us / total.count / 1e6 if total.count else 0.0,
+            'response_time_p50': p50,
+            'response_time_p99': p99,
+        }
+
+    def export(self, quantiles: Tuple[float, ...] = (0.5, 0.9, 0.99)) -> Iterator[Dict[str, Any]]:
+        """Per-route metrics, for the Prometheus collector"""
+        for (method, route, status), recorder in list(self.routes.items()):
+            yield {
+                'method': method,
+                'route': route,
+                'status': str(status),
+                'count': recorder.count,
+                'sum': recorder.sum_us / 1e6,
+                'buckets': recorder.export_buckets(),
+                'quantiles': dict(zip(quantiles, recorder.percentiles(quantiles))),
+            }
+
+class RequestMetricsMiddleware:
+    """ASGI middleware recording the latency of every HTTP request by route template"""
+
+    def __init__(self, app, metrics: RequestMetrics):
+        self.app = app
+        self.metrics = metrics
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter_ns()
+        status = 500
+
+        async def send_with_status(message):
+            nonlocal status
+            if message['type'] == 'http.response.start':
+                status = message['status']
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            # The router stores the matched route in the scope, its template keeps label cardinality bounded
+            route = scope.get('route')
+            self.metrics.record(
+                scope['method'],
+                route.path if route is not None else 'unmatched',
+                status,
+                (time.perf_counter_ns() - start) // 1000
+            )
+
+# Metrics of this process
+request_metrics = RequestMetrics()
+
+def start_metrics_server(service: str):
+    """Export the request metrics on METRICS_PORT, if set"""
+    port = os.getenv('METRICS_PORT')
+    if not port:
+        return
+    if IZAOSMetrics is None:
+        logger.error("❌ METRICS_PORT is set but the observability metrics package is not installed")
+        return
+    metrics = IZAOSMetrics(port=int(port))
+    metrics.register_request_metrics(service, request_metrics)
+    metrics.start_server()
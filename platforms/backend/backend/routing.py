@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+🧭 IZA OS Latency-Aware Router
+=============================
+Picks the target system of a task among the systems able to run it, by
+power-of-two-choices on a load and latency cost, skipping systems whose
+circuit breaker is open.
+
+Router state is per process. Tasks are routed where they are queued (the API
+process) and run where a task queue worker picks them up, so latencies, error
+rates and breaker trials are recorded in the worker process. When the workers
+run in separate processes, the API process routes on the shared queue backlog
+and on its health probes, which open and close its breakers.
+"""
+
+import random
+import time
+from typing import Any, Dict, Iterable, List, Optional
+
+def capable_systems(systems: Dict[str, Dict[str, Any]], task_type: str) -> List[str]:
+    """Systems with a capability for `task_type`, in order of preference
+
+    A capability matches a task type equal to it or to its first word, e.g.
+    `file_operations` matches `file`. Systems listing the capability earlier
+    come first.
+    """
+    task_type = task_type.lower()
+    ranked = []
+    for order, (system, config) in enumerate(systems.items()):
+        for rank, capability in enumerate(config.get('capabilities', [])):
+            if capability == task_type or capability.startswith(f"{task_type}_"):
+                ranked.append((rank, order, system))
+                break
+    return [system for _, _, system in sorted(ranked)]
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker
+
+    Opens after `failure_threshold` consecutive failures, then lets a single
+    trial through once `reset_timeout` seconds have passed (half-open): its
+    success closes the breaker, its failure opens it again. A trial whose
+    outcome is never reported is given up after another `reset_timeout`.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.trial_at: Optional[float] = None
+
+    def available(self) -> bool:
+        """Whether a request may be sent now"""
+        now = time.monotonic()
+        if self.state == self.CLOSED:
+            return True
+        if self.state == self.OPEN:
+            return now - self.opened_at >= self.reset_timeout
+        return self.trial_at is None or now - self.trial_at >= self.reset_timeout
+
+    def acquire(self):
+        """Take a request slot, the trial of a half-open breaker"""
+        if self.state == self.OPEN and self.available():
+            self.state = self.HALF_OPEN
+        if self.state == self.HALF_OPEN:
+            self.trial_at = time.monotonic()
+
+    def record_success(self):
+        self.state = self.CLOSED
+        self.failures = 0
+        self.trial_at = None
+
+    def record_failure(self):
+        self.failures += 1
+        if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+            self.trip()
+
+    def trip(self):
+        self.state = self.OPEN
+        self.opened_at = time.monotonic()
+        self.trial_at = None
+
+class SystemStats:
+    """Moving averages of one target system"""
+
+    __slots__ = ('latency', 'error_rate', 'in_flight', 'requests', 'breaker')
+
+    def __init__(self, initial_latency: float, breaker: CircuitBreaker):
+        self.latency = initial_latency
+        self.error_rate = 0.0
+        self.in_flight = 0
+        self.requests = 0
+        self.breaker = breaker
+
+class SystemRouter:
+    """Least-loaded, power-of-two-choices routing with circuit breaking
+
+    Each system keeps an exponentially weighted moving average of its task
+    latency and error rate. The cost of a system is its expected wait,
+    (load + 1) * latency, inflated by its error rate; `choose` compares two
+    random available candidates and picks the cheaper one, which spreads load
+    while steering it away from slow or failing systems.
+    """
+
+    def __init__(self,
+                 systems: Iterable[str],
+                 alpha: float = 0.2,
+                 initial_latency: float = 1.0,
+                 error_penalty: float = 4.0,
+                 failure_threshold: int = 5,
+                 reset_timeout: float = 30.0):
+        self.alpha = alpha
+        self.error_penalty = error_penalty
+        self.stats: Dict[str, SystemStats] = {
+            system: SystemStats(initial_latency, CircuitBreaker(failure_threshold, reset_timeout))
+            for system in systems
+        }
+
+    def cost(self, system: str, load: Optional[int] = None) -> float:
+        stats = self.stats[system]
+        load = stats.in_flight if load is None else load
+        return (load + 1) * stats.latency * (1 + self.error_penalty * stats.error_rate)
+
+    def choose(self, candidates: List[str], loads: Optional[Dict[str, int]] = None) -> str:
+        """Pick a system among `candidates`, in order of preference
+
+        `loads` are the tasks queued or running per system, the local in-flight
+        counts are used without it. When every candidate's breaker is open, the
+        preferred candidate is returned anyway.
+        """
+        loads = loads or {}
+        available = [system for system in candidates if self.stats[system].breaker.available()]
+        if not available:
+            return candidates[0]
+        if len(available) > 2:
+            available = random.sample(available, 2)
+
+        return min(available, key=lambda system: self.cost(system, loads.get(system)))
+
+    def start(self, system: str):
+        """A task started running on `system`
+
+        Takes the trial of a half-open breaker here rather than in `choose`, in
+        the process that will report its outcome to `finish`.
+        """
+        stats = self.stats[system]
+        stats.in_flight += 1
+        stats.requests += 1
+        stats.breaker.acquire()
+
+    def finish(self, system: str, latency: float, ok: bool):
+        """A task of `system` finished after `latency` seconds"""
+        stats = self.stats[system]
+        stats.in_flight = max(stats.in_flight - 1, 0)
+        stats.latency += self.alpha * (latency - stats.latency)
+        stats.error_rate += self.alpha * ((0.0 if ok else 1.0) - stats.error_rate)
+        if ok:
+            stats.breaker.record_success()
+        else:
+            stats.breaker.record_failure()
+
+    def record_health(self, system: str, healthy: bool):
+        """Health probe result
+
+        An unhealthy system is cut off until its breaker half-opens, a healthy
+        probe closes a breaker that may half-open without waiting for a trial,
+        which is how the breakers of a process running no tasks recover.
+        """
+        breaker = self.stats[system].breaker
+        if not healthy and breaker.state != CircuitBreaker.OPEN:
+            breaker.trip()
+        elif healthy and breaker.state != CircuitBreaker.CLOSED and breaker.available():
+            breaker.record_success()
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        return {
+            system: {
+                'latency_ewma': stats.latency,
+                'error_rate_ewma': stats.error_rate,
+                'in_flight': stats.in_flight,
+                'requests': stats.requests,
+                'circuit': stats.breaker.state,
+            }
+            for system, stats in self.stats.items()
+        }
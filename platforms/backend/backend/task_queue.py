@@ -0,0 +1,386 @@
+#!/usr/bin/env python3
+"""
+📬 IZA OS Task Queue
+===================
+Durable job queue on Redis streams. API requests enqueue a job and return its
+id right away; worker loops, in any number of processes, run the jobs with a
+concurrency limit per job type. Job records expire a while after they finish
+and clients can poll them or follow their updates as server-sent events.
+
+Use `memory://` as the Redis URL to run on an in-process fakeredis (local runs
+and tests, requires the fakeredis package).
+"""
+
+import asyncio
+import json
+import logging
+import os
+import socket
+import time
+from datetime import datetime
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional
+from uuid import uuid4
+
+import redis.asyncio as aioredis
+from redis.exceptions import ResponseError
+
+logger = logging.getLogger(__name__)
+
+TERMINAL_STATUSES = ('completed', 'failed')
+
+# Job fields stored as JSON in the job hash
+_JSON_FIELDS = ('payload', 'result')
+_INT_FIELDS = ('attempts',)
+_FLOAT_FIELDS = ('timeout', 'execution_time')
+
+JobHandler = Callable[[Dict[str, Any]], Awaitable[Any]]
+
+def create_redis_client(url: str):
+    """redis.asyncio client for `url`, or an in-process fakeredis for `memory://`"""
+    if url.startswith('memory://'):
+        try:
+            from fakeredis import aioredis as fakeredis
+        except ImportError:
+            raise ImportError("memory:// task queues require fakeredis: pip install fakeredis")
+        return fakeredis.FakeRedis(decode_responses=True)
+    return aioredis.from_url(url, decode_responses=True)
+
+class TaskQueue:
+    """Redis-streams job queue with per-type worker pools
+
+    Every job type has its own stream and consumer group, so a saturated type
+    never holds back the others. A job stays pending in its stream until a
+    worker finishes it; jobs of a worker that died are claimed by another one
+    after `visibility_timeout` seconds, up to `max_attempts` runs.
+    """
+
+    def __init__(self,
+                 name: str,
+                 redis_url: Optional[str] = None,
+                 redis=None,
+                 default_concurrency: int = 4,
+                 result_ttl: int = 3600,
+                 max_jobs: int = 10000,
+                 visibility_timeout: float = 3900.0,
+                 max_attempts: int = 3,
+                 claim_interval: float = 30.0):
+        self.name = name
+        self.prefix = f"taskqueue:{name}"
+        self.redis_url = redis_url or os.getenv('TASK_QUEUE_REDIS_URL') or os.getenv('REDIS_URL') or (
+            f"redis://{os.getenv('REDIS_HOST', 'localhost')}:{os.getenv('REDIS_PORT', '6379')}/0"
+        )
+        self.redis = redis if redis is not None else create_redis_client(self.redis_url)
+        # fakeredis blocks the event loop on blocking reads, so it is polled instead
+        self._block_ms = None if type(self.redis).__module__.startswith('fakeredis') else 5000
+        self.default_concurrency = default_concurrency
+        self.result_ttl = result_ttl
+        self.max_jobs = max_jobs
+        self.visibility_timeout = visibility_timeout
+        self.max_attempts = max_attempts
+        self.claim_interval = claim_interval
+
+        self.group = f"{self.prefix}:workers"
+        self.consumer = f"{socket.gethostname()}-{os.getpid()}"
+        self.handlers: Dict[str, JobHandler] = {}
+        self.concurrency: Dict[str, int] = {}
+
+        self._consumers: List[asyncio.Task] = []
+        self._running: Dict[str, set] = {}
+        self.processed = 0
+        self.failed = 0
+
+    # Keys
+    def _stream(self, job_type: str) -> str:
+        return f"{self.prefix}:stream:{job_type}"
+
+    def _job_key(self, job_id: str) -> str:
+        return f"{self.prefix}:job:{job_id}"
+
+    def _channel(self, job_id: str) -> str:
+        return f"{self.prefix}:events:{job_id}"
+
+    @property
+    def _index(self) -> str:
+        return f"{self.prefix}:jobs"
+
+    def register(self, job_type: str, handler: JobHandler, concurrency: Optional[int] = None):
+        """Register the handler of a job type, run at most `concurrency` at a time per process"""
+        self.handlers[job_type] = handler
+        self.concurrency[job_type] = concurrency or self.default_concurrency
+
+    # Producer side
+    async def enqueue(self, job_type: str, payload: Dict[str, Any], user_id: Optional[str] = None,
+                      timeout: Optional[float] = None) -> str:
+        """Store a job and queue it for the workers, returns its id"""
+        if job_type not in self.handlers:
+            raise ValueError(f"Unknown job type: {job_type}")
+
+        job_id = str(uuid4())
+        now = datetime.now().isoformat()
+        job = {
+            'id': job_id,
+            'type': job_type,
+            'status': 'queued',
+            'user_id': user_id or '',
+            'payload': json.dumps(payload, default=str),
+            'attempts': 0,
+            'created_at': now,
+            'updated_at': now,
+        }
+        if timeout is not None:
+            job['timeout'] = timeout
+
+        # Unfinished jobs are still bounded, by their longest possible lifetime
+        max_lifetime = int(self.visibility_timeout * self.max_attempts) + self.result_ttl
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.hset(self._job_key(job_id), mapping=job)
+            pipe.expire(self._job_key(job_id), max_lifetime)
+            pipe.zadd(self._index, {job_id: time.time()})
+            pipe.xadd(self._stream(job_type), {'job_id': job_id})
+            await pipe.execute()
+
+        await self._trim_index()
+        return job_id
+
+    async def _trim_index(self):
+        """Keep at most `max_jobs` jobs, dropping the records of the oldest finished ones"""
+        excess = await self.redis.zcard(self._index) - self.max_jobs
+        if excess <= 0:
+            return
+        evicted = await self.redis.zrange(self._index, 0, excess - 1)
+        statuses = [await self.redis.hget(self._job_key(job_id), 'status') for job_id in evicted]
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.zrem(self._index, *evicted)
+            for job_id, status in zip(evicted, statuses):
+                if status in TERMINAL_STATUSES:
+                    pipe.delete(self._job_key(job_id))
+            await pipe.execute()
+
+    @staticmethod
+    def _decode_job(fields: Dict[str, str]) -> Dict[str, Any]:
+        job: Dict[str, Any] = dict(fields)
+        for key in _JSON_FIELDS:
+            if key in job:
+                job[key] = json.loads(job[key])
+        for key in _INT_FIELDS:
+            if key in job:
+                job[key] = int(job[key])
+        for key in _FLOAT_FIELDS:
+            if key in job:
+                job[key] = float(job[key])
+        return job
+
+    async def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Job record, None once it expired or for an unknown id"""
+        fields = await self.redis.hgetall(self._job_key(job_id))
+        return self._decode_job(fields) if fields else None
+
+    async def list_jobs(self, user_id: Optional[str] = None, limit: int = 100) -> List[Dict[str, Any]]:
+        """Most recent jobs, optionally of one user"""
+        job_ids = await self.redis.zrevrange(self._index, 0, self.max_jobs - 1 if user_id else limit - 1)
+        jobs = []
+        # Fetched in batches, stopping as soon as enough jobs of the user are found
+        for start in range(0, len(job_ids), limit):
+            async with self.redis.pipeline(transaction=False) as pipe:
+                for job_id in job_ids[start:start + limit]:
+                    pipe.hgetall(self._job_key(job_id))
+                records = await pipe.execute()
+            for fields in records:
+                if fields and (user_id is None or fields.get('user_id') == user_id):
+                    jobs.append(self._decode_job(fields))
+                    if len(jobs) == limit:
+                        return jobs
+        return jobs
+
+    async def events(self, job_id: str, heartbeat: float = 15.0) -> AsyncIterator[Optional[Dict[str, Any]]]:
+        """Current state of a job, then every update until it finishes
+
+        Yields None every `heartbeat` seconds without an update.
+        """
+        pubsub = self.redis.pubsub()
+        await pubsub.subscribe(self._channel(job_id))
+        try:
+            # Subscribed before reading, so no update can fall in between
+            job = await self.get(job_id)
+            if job is None:
+                return
+            yield job
+            while job['status'] not in TERMINAL_STATUSES:
+                message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=heartbeat)
+                if message is None:
+                    yield None
+                    continue
+                job = json.loads(message['data'])
+                yield job
+        finally:
+            await pubsub.unsubscribe(self._channel(job_id))
+            await pubsub.close()
+
+    async def sse_events(self, job_id: str) -> AsyncIterator[str]:
+        """`events` formatted as a text/event-stream body"""
+        async for job in self.events(job_id):
+            if job is None:
+                yield ": keepalive\n\n"
+            else:
+                yield f"event: {job['status']}\ndata: {json.dumps(job, default=str)}\n\n"
+
+    # Worker side
+    async def start(self):
+        """Start one consumer loop per registered job type in this process"""
+        for job_type in self.handlers:
+            try:
+                await self.redis.xgroup_create(self._stream(job_type), self.group, id='0', mkstream=True)
+            except ResponseError as e:
+                if 'BUSYGROUP' not in str(e):
+                    raise
+            self._running[job_type] = set()
+            self._consumers.append(asyncio.create_task(self._consume(job_type)))
+        logger.info(f"✅ Task queue {self.name} workers started ({self.consumer})")
+
+    async def stop(self, grace_period: float = 30.0):
+        """Stop taking jobs and wait up to `grace_period` for the running ones
+
+        Jobs still running afterwards are cancelled and stay pending, another
+        worker picks them up after the visibility timeout.
+        """
+        for task in self._consumers:
+            task.cancel()
+        await asyncio.gather(*self._consumers, return_exceptions=True)
+        self._consumers = []
+
+        running = set().union(*self._running.values()) if self._running else set()
+        if running:
+            _, pending = await asyncio.wait(running, timeout=grace_period)
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+        logger.info(f"✅ Task queue {self.name} workers stopped")
+
+    async def close(self):
+        await self.stop()
+        await self.redis.close()
+
+    async def _consume(self, job_type: str):
+        stream = self._stream(job_type)
+        running = self._running[job_type]
+        concurrency = self.concurrency[job_type]
+        next_claim = 0.0
+
+        while True:
+            try:
+                free = concurrency - len(running)
+                if free <= 0:
+                    await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                    continue
+
+                messages = []
+                if time.monotonic() >= next_claim:
+                    # Jobs left pending by workers that died
+                    claimed = await self.redis.xautoclaim(
+                        stream, self.group, self.consumer,
+                        min_idle_time=int(self.visibility_timeout * 1000), start_id='0-0', count=free
+                    )
+                    messages = claimed[1]
+                    next_claim = time.monotonic() + self.claim_interval
+                if not messages:
+                    response = await self.redis.xreadgroup(
+                        self.group, self.consumer, {stream: '>'}, count=free, block=self._block_ms
+                    )
+                    messages = response[0][1] if response else []
+                    if not messages and self._block_ms is None:
+                        await asyncio.sleep(0.1)
+
+                for message_id, fields in messages:
+                    task = asyncio.create_task(self._run(job_type, message_id, fields['job_id']))
+                    running.add(task)
+                    task.add_done_callback(running.discard)
+
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"❌ Task queue {self.name} consumer for {job_type} failed: {e}")
+                await asyncio.sleep(1)
+
+    async def _update(self, job_id: str, **fields) -> Optional[Dict[str, Any]]:
+        """Update a job record and publish its new state"""
+        fields['updated_at'] = datetime.now().isoformat()
+        if 'result' in fields:
+            fields['result'] = json.dumps(fields['result'], default=str)
+        key = self._job_key(job_id)
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.hset(key, mapping=fields)
+            if fields.get('status') in TERMINAL_STATUSES:
+                pipe.expire(key, self.result_ttl)
+            pipe.hgetall(key)
+            *_, record = await pipe.execute()
+
+        job = self._decode_job(record)
+        await self.redis.publish(self._channel(job_id), json.dumps(job, default=str))
+        return job
+
+    async def _run(self, job_type: str, message_id: str, job_id: str):
+        job = await self.get(job_id)
+
+        if job is not None and job['status'] not in TERMINAL_STATUSES:
+            attempts = job['attempts'] + 1
+            if attempts > self.max_attempts:
+                self.failed += 1
+                await self._update(job_id, status='failed', error=f"Gave up after {self.max_attempts} attempts")
+            else:
+                job = await self._update(
+                    job_id, status='running', attempts=attempts, worker=self.consumer,
+                    started_at=datetime.now().isoformat()
+                )
+                await self._execute(job)
+
+        # Cancellation skips the ack, leaving the job pending for another worker
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.xack(self._stream(job_type), self.group, message_id)
+            pipe.xdel(self._stream(job_type), message_id)
+            await pipe.execute()
+
+    async def _execute(self, job: Dict[str, Any]):
+        start_time = time.monotonic()
+        try:
+            result = await asyncio.wait_for(self.handlers[job['type']](job), timeout=job.get('timeout'))
+            self.processed += 1
+            await self._update(
+                job['id'], status='completed', result=result,
+                execution_time=time.monotonic() - start_time, finished_at=datetime.now().isoformat()
+            )
+        except asyncio.TimeoutError:
+            self.failed += 1
+            await self._update(
+                job['id'], status='failed', error=f"Timed out after {job['timeout']}s",
+                execution_time=time.monotonic() - start_time, finished_at=datetime.now().isoformat()
+            )
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.failed += 1
+            logger.error(f"❌ Job {job['id']} of type {job['type']} failed: {e}")
+            await self._update(
+                job['id'], status='failed', error=str(e),
+                execution_time=time.monotonic() - start_time, finished_at=datetime.now().isoformat()
+            )
+
+    async def backlog(self, job_types: List[str]) -> Dict[str, int]:
+        """Jobs queued or running per job type, across all workers"""
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for job_type in job_types:
+                pipe.xlen(self._stream(job_type))
+            lengths = await pipe.execute()
+        return dict(zip(job_types, lengths))
+
+    def running_count(self) -> int:
+        """Jobs running in this process"""
+        return sum(len(running) for running in self._running.values())
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Worker metrics of this process"""
+        return {
+            'running': {job_type: len(running) for job_type, running in self._running.items()},
+            'concurrency': dict(self.concurrency),
+            'processed': self.processed,
+            'failed': self.failed,
+        }
@@ -0,0 +1,115 @@
+import warnings
+warnings.simplefilter("ignore", DeprecationWarning)
+
+import sys
+import asyncio
+import time
+from pathlib import Path
+
+root = str(Path(__file__).resolve().parents[1])
+sys.path.append(root)
+
+from async_db import AsyncDatabasePool, PoolTimeoutError
+
+class FakeConnection():
+    def __init__(self, latency: float):
+        self.latency = latency
+
+    async def fetchval(self, query: str, *args):
+        await asyncio.sleep(self.latency)
+        return 1
+
+class FakePool():
+    """A stand-in for an asyncpg pool of max_size connections, each query taking latency seconds."""
+    def __init__(self, max_size: int, latency: float):
+        self.idle = [FakeConnection(latency) for _ in range(max_size)]
+        self.max_size = max_size
+        self.available = asyncio.Semaphore(max_size)
+
+    async def acquire(self, timeout: float = None):
+        await asyncio.wait_for(self.available.acquire(), timeout=timeout)
+        return self.idle.pop()
+
+    async def release(self, conn: FakeConnection):
+        self.idle.append(conn)
+        self.available.release()
+
+    def get_size(self) -> int:
+        return self.max_size
+
+    def get_idle_size(self) -> int:
+        return len(self.idle)
+
+    async def close(self):
+        pass
+
+def make_pool(max_size: int, latency: float, acquire_timeout: float = 5.0) -> AsyncDatabasePool:
+    pool = AsyncDatabasePool(dsn="postgresql://test", max_size=max_size, acquire_timeout=acquire_timeout)
+    pool.pool = FakePool(max_size, latency)
+    return pool
+
+async def check_saturation():
+    pool = make_pool(max_size=2, latency=0.05)
+    start = time.perf_counter()
+    queries = [asyncio.create_task(pool.fetchval("SELECT 1")) for _ in range(8)]
+
+    # Two queries run, the six others wait for a connection
+    await asyncio.sleep(0.01)
+    metrics = pool.get_metrics()
+    assert metrics["pool_in_use"] == 2 and metrics["pool_idle"] == 0
+    assert metrics["pool_saturation"] == 1.0 and metrics["pool_waiting"] == 6
+
+    assert await asyncio.gather(*queries) == [1] * 8
+    elapsed = time.perf_counter() - start
+    # Four rounds of two queries
+    assert 0.2 <= elapsed < 0.4, elapsed
+
+    metrics = pool.get_metrics()
+    assert metrics["pool_in_use"] == 0 and metrics["pool_waiting"] == 0
+    assert metrics["pool_saturation"] == 0.0 and metrics["pool_idle"] == 2
+    assert metrics["acquired_total"] == 8 and metrics["acquire_timeouts"] == 0
+    # The last queries waited for three rounds
+    assert 0.14 <= metrics["acquire_wait_p99"] < 0.3
+    assert 0.05 <= metrics["acquire_wait_avg"] < metrics["acquire_wait_p99"]
+    await pool.close()
+
+async def check_acquire_timeout():
+    pool = make_pool(max_size=2, latency=0.5, acquire_timeout=0.05)
+    holders = [asyncio.create_task(pool.fetchval("SELECT pg_sleep(0.5)")) for _ in range(2)]
+    await asyncio.sleep(0.01)
+
+    start = time.perf_counter()
+    try:
+        await pool.fetchval("SELECT 1")
+        raise AssertionError("a saturated pool should time out")
+    except PoolTimeoutError as e:
+        assert "0.05s" in str(e)
+    assert time.perf_counter() - start < 0.2
+
+    # A per-call timeout overrides the pool default
+    try:
+        async with pool.acquire(timeout=0.01):
+            raise AssertionError("a saturated pool should time out")
+    except PoolTimeoutError:
+        pass
+
+    metrics = pool.get_metrics()
+    assert metrics["acquire_timeouts"] == 2 and metrics["pool_waiting"] == 0
+    assert metrics["pool_in_use"] == 2 and metrics["acquired_total"] == 2
+
+    # Connections come back once the slow queries are over
+    await asyncio.gather(*holders)
+    assert await pool.fetchval("SELECT 1") == 1
+    assert pool.get_metrics()["acquired_total"] == 3
+    await pool.close()
+
+def test_saturation():
+    asyncio.run(check_saturation())
+
+def test_acquire_timeout():
+    asyncio.run(check_acquire_timeout())
+
+if __name__ == "__main__":
+    test_saturation()
+    test_acquire_timeout()
+    print("All tests passed.")
@@ -0,0 +1,95 @@
+import warnings
+warnings.simplefilter("ignore", DeprecationWarning)
+
+import sys
+import asyncio
+import json
+from datetime import datetime
+from pathlib import Path
+
+root = str(Path(__file__).resolve().parents[1])
+sys.path.append(root)
+
+from database_manager import (
+    AgentExecutionRepository, EXECUTION_COLUMNS, EXECUTION_RELATIONS, PROJECT_COLUMNS,
+    _list_query, _sparse_fieldset,
+)
+
+def expect_error(func, *args) -> str:
+    try:
+        func(*args)
+    except ValueError as e:
+        return str(e)
+    raise AssertionError(f"{func.__name__} should reject {args}")
+
+def test_sparse_fieldset():
+    # Every column and relation by default
+    assert _sparse_fieldset(None, EXECUTION_COLUMNS, EXECUTION_RELATIONS) == \
+        (None, {"agent": True, "user": True})
+
+    # Only the requested relations are joined
+    assert _sparse_fieldset(["id", "status", "agent"], EXECUTION_COLUMNS, EXECUTION_RELATIONS) == \
+        ({"id", "status", "agent"}, {"agent": True})
+    assert _sparse_fieldset(["id"], EXECUTION_COLUMNS, EXECUTION_RELATIONS) == ({"id"}, {})
+
+    assert expect_error(_sparse_fieldset, ["id", "password", "agnet"], EXECUTION_COLUMNS,
+                        EXECUTION_RELATIONS) == "Unknown fields: agnet, password"
+    assert expect_error(_sparse_fieldset, [], EXECUTION_COLUMNS, EXECUTION_RELATIONS) == "No fields requested"
+
+def test_list_query():
+    query, args = _list_query("Project", None, PROJECT_COLUMNS, {"userId": None, "status": None}, 100, 0)
+    assert query == ('SELECT "id", "name", "description", "userId", "status", "budget", "createdAt" '
+                     'FROM "Project" ORDER BY "createdAt" DESC LIMIT $1 OFFSET $2')
+    assert args == [100, 0]
+
+    # Filters without a value are left out, the others are bound in order
+    query, args = _list_query("AgentExecution", ["id", "status"], EXECUTION_COLUMNS,
+                              {"userId": "user-1", "agentId": None, "status": "completed"}, 20, 40)
+    assert query == ('SELECT "id", "status" FROM "AgentExecution" WHERE "userId" = $1 AND "status" = $2 '
+                     'ORDER BY "createdAt" DESC LIMIT $3 OFFSET $4')
+    assert args == ["user-1", "completed", 20, 40]
+
+    # Field names end up in the SQL, so only known columns are accepted
+    assert expect_error(_list_query, "AgentExecution", ['id" FROM "User" --'], EXECUTION_COLUMNS,
+                        {}, 20, 0) == 'Unknown or relation fields: id" FROM "User" --'
+    assert expect_error(_list_query, "AgentExecution", ["agent"], EXECUTION_COLUMNS,
+                        {}, 20, 0) == "Unknown or relation fields: agent"
+    assert expect_error(_list_query, "AgentExecution", [], EXECUTION_COLUMNS,
+                        {}, 20, 0) == "No fields requested"
+
+class FakePool():
+    def __init__(self, rows):
+        self.rows = rows
+        self.queries = []
+
+    async def fetch(self, query: str, *args):
+        self.queries.append((query, args))
+        return self.rows
+
+class FakeDatabaseManager():
+    def __init__(self, rows):
+        self.pool = FakePool(rows)
+
+def test_list_executions_json():
+    created_at = datetime(2026, 1, 2, 3, 4, 5)
+    db = FakeDatabaseManager([
+        # JSON columns come back from asyncpg as text
+        {"id": "exec-1", "result": '{"answer": 42}', "createdAt": created_at},
+        {"id": "exec-2", "result": None, "createdAt": created_at},
+    ])
+    repo = AgentExecutionRepository(db)
+    body = asyncio.run(repo.list_executions_json(user_id="user-1", fields=["id", "result", "createdAt"]))
+
+    assert json.loads(body) == [
+        {"id": "exec-1", "result": {"answer": 42}, "createdAt": "2026-01-02T03:04:05"},
+        {"id": "exec-2", "result": None, "createdAt": "2026-01-02T03:04:05"},
+    ]
+    [(query, args)] = db.pool.queries
+    assert query.startswith('SELECT "id", "result", "createdAt" FROM "AgentExecution" WHERE "userId" = $1')
+    assert args == ("user-1", 100, 0)
+
+if __name__ == "__main__":
+    test_sparse_fieldset()
+    test_list_query()
+    test_list_executions_json()
+    print("All tests passed.")
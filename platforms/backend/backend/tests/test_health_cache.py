@@ -0,0 +1,111 @@
+import warnings
+warnings.simplefilter("ignore", DeprecationWarning)
+
+import sys
+import asyncio
+import time
+from pathlib import Path
+
+root = str(Path(__file__).resolve().parents[1])
+sys.path.append(root)
+
+from health_cache import HealthProbeCache, LatencyHistogram
+
+class Probe():
+    """A dependency answering `status` after `delay` seconds, counting its calls"""
+    def __init__(self, status: str = 'healthy', delay: float = 0.0):
+        self.status = status
+        self.delay = delay
+        self.calls = 0
+
+    async def __call__(self) -> str:
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return self.status
+
+async def check_stale_while_revalidate():
+    database = Probe()
+    cache = HealthProbeCache({'database': database}, ttl=0.05, timeout=1.0)
+
+    # The first call waits for the probes
+    assert await cache.get_statuses() == {'database': 'healthy'}
+    assert database.calls == 1 and not cache.is_stale()
+
+    # Once stale, the last results are served while a slow refresh runs
+    await asyncio.sleep(0.06)
+    database.status, database.delay = 'degraded', 0.2
+    start = time.perf_counter()
+    assert await cache.get_statuses() == {'database': 'healthy'}
+    await asyncio.sleep(0.01)
+    assert await cache.get_statuses() == {'database': 'healthy'}
+    assert time.perf_counter() - start < 0.1
+    # Stale reads during the refresh share it
+    assert database.calls == 2
+
+    await cache._refresh_task
+    assert await cache.get_statuses() == {'database': 'degraded'}
+    await cache.stop()
+
+async def check_timeout_and_errors():
+    results = []
+    async def broken() -> str:
+        raise ConnectionError("connection refused")
+
+    cache = HealthProbeCache({'redis': Probe(delay=1.0), 'database': Probe(), 'queue': broken},
+                             ttl=10.0, timeout=0.05,
+                             on_result=lambda name, result: results.append((name, result.status)))
+    start = time.perf_counter()
+    statuses = await cache.get_statuses()
+    # Probes run concurrently, and a hung dependency costs at most the timeout
+    assert time.perf_counter() - start < 0.5
+    assert statuses == {'redis': 'unhealthy', 'database': 'healthy', 'queue': 'unhealthy'}
+    assert sorted(results) == [('database', 'healthy'), ('queue', 'unhealthy'), ('redis', 'unhealthy')]
+    assert cache.results['redis'].latency >= 0.05
+    await cache.stop()
+
+async def check_start_stop():
+    database = Probe()
+    cache = HealthProbeCache({'database': database}, ttl=0.05)
+    cache.start()
+    cache.start()
+    await asyncio.sleep(0.18)
+    # One refresh right away, then one every ttl
+    assert 3 <= database.calls <= 5
+    assert cache.get_latency_histograms()['database']['count'] == database.calls
+
+    await cache.stop()
+    assert cache._loop_task is None and cache._refresh_task is None
+    calls = database.calls
+    await asyncio.sleep(0.1)
+    assert database.calls == calls
+
+    # A stopped cache can be started again
+    cache.start()
+    await asyncio.sleep(0.01)
+    assert database.calls == calls + 1
+    await cache.stop()
+
+def test_stale_while_revalidate():
+    asyncio.run(check_stale_while_revalidate())
+
+def test_timeout_and_errors():
+    asyncio.run(check_timeout_and_errors())
+
+def test_start_stop():
+    asyncio.run(check_start_stop())
+
+def test_latency_histogram():
+    histogram = LatencyHistogram(buckets=(0.01, 0.1, 1.0))
+    for seconds in (0.005, 0.01, 0.05, 0.5, 3.0):
+        histogram.observe(seconds)
+    snapshot = histogram.snapshot()
+    # Buckets are cumulative and their bounds inclusive
+    assert snapshot['buckets'] == {'0.01': 2, '0.1': 3, '1.0': 4, '+Inf': 5}
+    assert snapshot['count'] == 5 and abs(snapshot['sum'] - 3.565) < 1e-9
+
+if __name__ == "__main__":
+    test_stale_while_revalidate()
+    test_timeout_and_errors()
+    test_start_stop()
+    test_latency_histogram()
+    print("All tests passed.")
@@ -0,0 +1,136 @@
+import warnings
+warnings.simplefilter("ignore", DeprecationWarning)
+
+import sys
+import asyncio
+import random
+from pathlib import Path
+
+root = str(Path(__file__).resolve().parents[1])
+sys.path.append(root)
+
+from request_metrics import (
+    BUCKET_COUNT, SUB_BUCKET_COUNT, LatencyRecorder, RequestMetrics, RequestMetricsMiddleware,
+    _bucket_index, _bucket_upper_bound,
+)
+
+def test_bucket_index():
+    # One bucket per microsecond below SUB_BUCKET_COUNT, then 16 per power of two
+    assert [_bucket_index(value) for value in (0, 1, 31)] == [0, 1, 31]
+    assert [_bucket_index(value) for value in (32, 33, 34, 63, 64, 67, 68)] == [32, 32, 33, 47, 48, 48, 49]
+
+    # Buckets are contiguous: each value is below the upper bound of its bucket and
+    # at or above the upper bound of the previous one
+    for value in list(range(0, 5000)) + [2 ** 20 - 1, 2 ** 20, 10 ** 8]:
+        index = _bucket_index(value)
+        assert _bucket_upper_bound(index) > value
+        assert index == 0 or _bucket_upper_bound(index - 1) <= value
+
+    # Values past the range land in the last bucket
+    assert _bucket_index(2 ** 40) == BUCKET_COUNT - 1
+
+def test_percentile_error_bound():
+    rng = random.Random(0)
+    # Log-uniform latencies from 100us to 10s
+    values = sorted(int(10 ** rng.uniform(2, 7)) for _ in range(20000))
+    recorder = LatencyRecorder()
+    for value in values:
+        recorder.record(value)
+
+    p50, p99 = recorder.percentiles((0.5, 0.99))
+    for quantile, estimate in ((0.5, p50), (0.99, p99)):
+        exact = values[int(quantile * len(values)) - 1] / 1e6
+        # Bucket upper bounds never underestimate, and overestimate by at most 1/16
+        assert exact <= estimate <= exact * (1 + 1 / 16), (quantile, exact, estimate)
+
+    # Small values are exact to the microsecond: the median 16us is reported as the
+    # upper bound of its one-microsecond bucket
+    recorder = LatencyRecorder()
+    for value in range(1, SUB_BUCKET_COUNT):
+        recorder.record(value)
+    assert recorder.percentiles((0.5,)) == [17 / 1e6]
+
+    assert LatencyRecorder().percentiles((0.5, 0.99)) == [0.0, 0.0]
+
+def test_export_buckets():
+    recorder = LatencyRecorder()
+    # 0.5ms, 2ms, 2ms, 40ms, 3s and 20s
+    for value in (500, 2000, 2000, 40000, 3000000, 20000000):
+        recorder.record(value)
+    buckets = recorder.export_buckets((0.001, 0.0025, 0.05, 5.0))
+    assert buckets == [(0.001, 1), (0.0025, 3), (0.05, 4), (5.0, 5)]
+    # The last one is only counted by +Inf, i.e. recorder.count
+    assert recorder.count == 6 and recorder.sum_us == 23044500
+
+class Route():
+    def __init__(self, path: str):
+        self.path = path
+
+ITEM_ROUTE = Route("/items/{item_id}")
+
+async def app(scope, receive, send):
+    """A tiny router storing the matched route in the scope, like Starlette's"""
+    if scope['path'].startswith("/items/"):
+        scope['route'] = ITEM_ROUTE
+        if scope['path'] == "/items/broken":
+            raise RuntimeError("handler failed")
+        status = 200
+    else:
+        status = 404
+    await send({'type': 'http.response.start', 'status': status, 'headers': []})
+    await send({'type': 'http.response.body', 'body': b""})
+
+async def request(middleware, method: str, path: str):
+    sent = []
+    async def receive():
+        return {'type': 'http.request', 'body': b""}
+    async def send(message):
+        sent.append(message)
+    await middleware({'type': 'http', 'method': method, 'path': path}, receive, send)
+    return sent
+
+async def check_middleware():
+    metrics = RequestMetrics()
+    middleware = RequestMetricsMiddleware(app, metrics)
+
+    for item_id in range(3):
+        sent = await request(middleware, "GET", f"/items/{item_id}")
+        assert sent[0]['status'] == 200
+    await request(middleware, "DELETE", "/items/1")
+    await request(middleware, "GET", "/nope")
+    await request(middleware, "GET", "/also/nope")
+    try:
+        await request(middleware, "GET", "/items/broken")
+        raise AssertionError("the error should propagate")
+    except RuntimeError:
+        pass
+
+    # Requests are grouped by route template, not by path
+    counts = {key: recorder.count for key, recorder in metrics.routes.items()}
+    assert counts == {
+        ("GET", "/items/{item_id}", 200): 3,
+        ("DELETE", "/items/{item_id}", 200): 1,
+        ("GET", "unmatched", 404): 2,
+        # A handler that raised before responding counts as a 500
+        ("GET", "/items/{item_id}", 500): 1,
+    }
+    summary = metrics.summary()
+    assert summary['total_requests'] == 7 and abs(summary['error_rate'] - 1 / 7) < 1e-9
+    assert {entry['route'] for entry in metrics.export()} == {"/items/{item_id}", "unmatched"}
+
+    # Other scopes are passed through without being recorded
+    seen = []
+    async def lifespan_app(scope, receive, send):
+        seen.append(scope['type'])
+    await RequestMetricsMiddleware(lifespan_app, metrics)({'type': 'lifespan'}, None, None)
+    assert seen == ['lifespan'] and metrics.summary()['total_requests'] == 7
+
+def test_middleware():
+    asyncio.run(check_middleware())
+
+if __name__ == "__main__":
+    test_bucket_index()
+    test_percentile_error_bound()
+    test_export_buckets()
+    test_middleware()
+    print("All tests passed.")
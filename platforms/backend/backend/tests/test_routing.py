@@ -0,0 +1,90 @@
+import warnings
+warnings.simplefilter("ignore", DeprecationWarning)
+
+import sys
+import time
+from pathlib import Path
+
+root = str(Path(__file__).resolve().parents[1])
+sys.path.append(root)
+
+from routing import CircuitBreaker, SystemRouter, capable_systems
+
+SYSTEMS = {
+    "orchestra": {"capabilities": ["planning", "research", "quick_execution"]},
+    "fast": {"capabilities": ["quick_execution", "research"]},
+    "files": {"capabilities": ["file_operations"]},
+}
+
+def test_circuit_breaker():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0.05)
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED and breaker.available()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN and not breaker.available()
+
+    # One trial once the reset timeout is over, its failure opens the breaker again
+    time.sleep(0.06)
+    assert breaker.available()
+    breaker.acquire()
+    assert breaker.state == CircuitBreaker.HALF_OPEN and not breaker.available()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+
+    # A successful trial closes it
+    time.sleep(0.06)
+    breaker.acquire()
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED and breaker.failures == 0
+
+    # A trial whose outcome never comes is given up after another reset timeout
+    breaker.trip()
+    time.sleep(0.06)
+    breaker.acquire()
+    assert not breaker.available()
+    time.sleep(0.06)
+    assert breaker.available()
+
+def test_capable_systems():
+    assert capable_systems(SYSTEMS, "research") == ["orchestra", "fast"]
+    assert capable_systems(SYSTEMS, "quick") == ["fast", "orchestra"]
+    assert capable_systems(SYSTEMS, "File") == ["files"]
+    assert capable_systems(SYSTEMS, "unknown") == []
+
+def test_router_choose():
+    router = SystemRouter(SYSTEMS, failure_threshold=1, reset_timeout=0.05)
+
+    # The cheaper of the candidates, by load and latency
+    assert router.choose(["orchestra", "fast"], {"orchestra": 5, "fast": 0}) == "fast"
+    router.stats["fast"].latency = 100.0
+    assert router.choose(["orchestra", "fast"], {"orchestra": 5, "fast": 0}) == "orchestra"
+
+    # Failed systems are skipped while their breaker is open
+    router.start("orchestra")
+    router.finish("orchestra", 1.0, ok=False)
+    assert router.snapshot()["orchestra"]["circuit"] == CircuitBreaker.OPEN
+    assert router.choose(["orchestra", "fast"]) == "fast"
+
+    # With every breaker open, the preferred candidate is returned anyway
+    router.record_health("fast", healthy=False)
+    assert router.choose(["orchestra", "fast"]) == "orchestra"
+
+    # Choosing takes no trial, the worker running the task does
+    time.sleep(0.06)
+    assert router.choose(["orchestra"]) == "orchestra"
+    assert router.stats["orchestra"].breaker.state == CircuitBreaker.OPEN
+    router.start("orchestra")
+    assert router.stats["orchestra"].breaker.state == CircuitBreaker.HALF_OPEN
+    router.finish("orchestra", 1.0, ok=True)
+    assert router.stats["orchestra"].breaker.state == CircuitBreaker.CLOSED
+    assert router.stats["orchestra"].in_flight == 0
+
+    # A healthy probe closes a breaker past its reset timeout
+    router.record_health("fast", healthy=True)
+    assert router.stats["fast"].breaker.state == CircuitBreaker.CLOSED
+
+if __name__ == "__main__":
+    test_circuit_breaker()
+    test_capable_systems()
+    test_router_choose()
+    print("All tests passed.")
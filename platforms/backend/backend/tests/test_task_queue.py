@@ -0,0 +1,120 @@
+import warnings
+warnings.simplefilter("ignore", DeprecationWarning)
+
+import sys
+import asyncio
+import time
+from pathlib import Path
+
+root = str(Path(__file__).resolve().parents[1])
+sys.path.append(root)
+
+from task_queue import TaskQueue, TERMINAL_STATUSES
+
+async def echo(job):
+    return {"echo": job["payload"]["text"]}
+
+async def sleep(job):
+    await asyncio.sleep(job["payload"]["seconds"])
+    return "woke up"
+
+def make_queue(name: str, **kwargs) -> TaskQueue:
+    queue = TaskQueue(name, redis_url="memory://", **kwargs)
+    queue.register("echo", echo)
+    queue.register("sleep", sleep)
+    return queue
+
+async def wait_for_job(queue: TaskQueue, job_id: str, timeout: float = 5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        job = await queue.get(job_id)
+        if job is not None and job["status"] in TERMINAL_STATUSES:
+            return job
+        await asyncio.sleep(0.05)
+    raise AssertionError(f"job {job_id} did not finish")
+
+async def check_job_completes():
+    queue = make_queue("completes", result_ttl=60)
+    job_id = await queue.enqueue("echo", {"text": "hello"}, user_id="user-1")
+    assert (await queue.get(job_id))["status"] == "queued"
+
+    await queue.start()
+    job = await wait_for_job(queue, job_id)
+    assert job["status"] == "completed" and job["result"] == {"echo": "hello"}
+    assert job["attempts"] == 1 and job["user_id"] == "user-1"
+    assert [job["id"] for job in await queue.list_jobs(user_id="user-1")] == [job_id]
+
+    # Finished jobs leave the stream and their records expire after result_ttl
+    assert await queue.backlog(["echo"]) == {"echo": 0}
+    assert 0 < await queue.redis.ttl(queue._job_key(job_id)) <= 60
+    await queue.close()
+
+async def check_job_timeout():
+    queue = make_queue("timeout")
+    await queue.start()
+    job_id = await queue.enqueue("sleep", {"seconds": 10}, timeout=0.1)
+    job = await wait_for_job(queue, job_id)
+    assert job["status"] == "failed" and job["error"] == "Timed out after 0.1s"
+    assert queue.failed == 1
+    await queue.close()
+
+async def check_reclaim(max_attempts: int, attempts: int):
+    queue = make_queue(f"reclaim-{attempts}", visibility_timeout=0.1, claim_interval=0.05,
+                       max_attempts=max_attempts)
+    job_id = await queue.enqueue("echo", {"text": "retried"})
+
+    # A worker that died after reading the job, leaving it pending
+    stream = queue._stream("echo")
+    await queue.redis.xgroup_create(stream, queue.group, id="0", mkstream=True)
+    await queue.redis.xreadgroup(queue.group, "dead-worker", {stream: ">"}, count=1)
+    await queue.redis.hset(queue._job_key(job_id), "attempts", attempts)
+
+    await asyncio.sleep(0.15)
+    await queue.start()
+    job = await wait_for_job(queue, job_id)
+    await queue.close()
+    return job
+
+def test_job_completes():
+    asyncio.run(check_job_completes())
+
+def test_job_timeout():
+    asyncio.run(check_job_timeout())
+
+def test_reclaim_dead_worker():
+    # Claimed by a live worker once the visibility timeout is over
+    job = asyncio.run(check_reclaim(max_attempts=3, attempts=1))
+    assert job["status"] == "completed" and job["attempts"] == 2
+
+    # Given up once the job already ran max_attempts times
+    job = asyncio.run(check_reclaim(max_attempts=3, attempts=3))
+    assert job["status"] == "failed" and job["error"] == "Gave up after 3 attempts"
+    assert "result" not in job
+
+async def check_events():
+    queue = make_queue("events")
+    job_id = await queue.enqueue("sleep", {"seconds": 0.2})
+
+    async def follow():
+        return [chunk async for chunk in queue.sse_events(job_id)]
+
+    follower = asyncio.create_task(follow())
+    await asyncio.sleep(0.05)
+    await queue.start()
+    chunks = await asyncio.wait_for(follower, timeout=5)
+    events = [chunk.split("\n")[0] for chunk in chunks if not chunk.startswith(":")]
+    assert events == ["event: queued", "event: running", "event: completed"], events
+
+    # Unknown or expired jobs end the stream right away
+    assert [chunk async for chunk in queue.sse_events("unknown")] == []
+    await queue.close()
+
+def test_events():
+    asyncio.run(check_events())
+
+if __name__ == "__main__":
+    test_job_completes()
+    test_job_timeout()
+    test_reclaim_dead_worker()
+    test_events()
+    print("All tests passed.")
@@ -0,0 +1,113 @@
+import warnings
+warnings.simplefilter("ignore", DeprecationWarning)
+
+import sys
+import asyncio
+from pathlib import Path
+
+root = str(Path(__file__).resolve().parents[1])
+sys.path.append(root)
+
+from write_buffer import WriteBehindBuffer
+
+class FakeTable():
+    """A stand-in for a COPY target, rejecting whole batches holding a poison row."""
+    def __init__(self, poison=(), down: bool = False):
+        self.poison = set(poison)
+        self.down = down
+        self.rows = []
+        self.batches = []
+
+    async def write(self, batch):
+        self.batches.append(len(batch))
+        if self.down:
+            raise ConnectionError("database unreachable")
+        if self.poison.intersection(batch):
+            raise ValueError("value too long for type character varying(100)")
+        self.rows.extend(batch)
+
+async def check_flush():
+    table = FakeTable()
+    buffer = WriteBehindBuffer("test", table.write, max_size=4, max_delay=0.05)
+    buffer.add_many(range(10))
+    # A full batch wakes the flusher, the rest goes after max_delay
+    await asyncio.sleep(0.2)
+    assert table.rows == list(range(10))
+    assert table.batches == [4, 4, 2]
+    assert buffer.get_metrics()["pending"] == 0 and buffer.written == 10
+    await buffer.close()
+
+async def check_poison_row():
+    table = FakeTable(poison=[3])
+    dead = []
+    buffer = WriteBehindBuffer("test", table.write, max_size=8, retry_delay=0.01, max_attempts=3,
+                               dead_letter=lambda row, error: dead.append((row, type(error))))
+    buffer.add_many(range(8))
+
+    # The batch is split until the poison row is alone, the others are written
+    await buffer.flush()
+    assert sorted(table.rows) == [0, 1, 2, 4, 5, 6, 7]
+    assert [entry[0] for entry in buffer.pending] == [3]
+
+    # Rows queued behind it are not held back, the poison row goes to the dead letter sink
+    buffer.add_many(range(10, 14))
+    await buffer.flush()
+    await buffer.flush()
+    assert dead == [(3, ValueError)]
+    assert sorted(table.rows) == [0, 1, 2, 4, 5, 6, 7, 10, 11, 12, 13]
+    assert buffer.get_metrics()["dead_lettered"] == 1 and buffer.get_metrics()["pending"] == 0
+    await buffer.close()
+
+async def check_outage_and_overflow():
+    table = FakeTable(down=True)
+    buffer = WriteBehindBuffer("test", table.write, max_size=4, max_pending=6, max_attempts=1000)
+    buffer.add_many(range(10))
+    assert buffer.dropped == 4
+    assert [entry[0] for entry in buffer.pending] == list(range(4, 10))
+
+    # While the database is down, rows stay buffered in order
+    await buffer.flush()
+    assert table.rows == [] and len(buffer.pending) == 6
+
+    table.down = False
+    await buffer.flush()
+    assert table.rows == list(range(4, 10))
+    await buffer.close()
+
+async def check_close():
+    table = FakeTable()
+    buffer = WriteBehindBuffer("test", table.write, max_size=100, max_delay=60)
+    buffer.add_many(["a", "b"])
+    await buffer.close()
+    assert table.rows == ["a", "b"]
+    try:
+        buffer.add("c")
+        raise AssertionError("a closed buffer should reject rows")
+    except RuntimeError:
+        pass
+
+    # Rows that cannot be written are reported, not waited for forever
+    table = FakeTable(down=True)
+    buffer = WriteBehindBuffer("test", table.write, retry_delay=0.01, max_attempts=1000)
+    buffer.add("d")
+    await buffer.close(attempts=2)
+    assert buffer.get_metrics()["pending"] == 1
+
+def test_flush():
+    asyncio.run(check_flush())
+
+def test_poison_row():
+    asyncio.run(check_poison_row())
+
+def test_outage_and_overflow():
+    asyncio.run(check_outage_and_overflow())
+
+def test_close():
+    asyncio.run(check_close())
+
+if __name__ == "__main__":
+    test_flush()
+    test_poison_row()
+    test_outage_and_overflow()
+    test_close()
+    print("All tests passed.")
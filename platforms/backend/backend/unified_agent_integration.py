@@ -10,9 +10,11 @@ Connects to existing agent systems instead of creating duplicates:
 """
 
 import asyncio
+import functools
 import logging
 import os
 import sys
+import time
 from contextlib import asynccontextmanager
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any
@@ -24,12 +26,17 @@ from fastapi import FastAPI, HTTPException, Depends, BackgroundTasks, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel, Field, validator
 import redis
 import jwt
 from passlib.context import CryptContext
 
+from task_queue import TaskQueue, TERMINAL_STATUSES
+from health_cache import HealthProbeCache
+from request_metrics import RequestMetricsMiddleware, request_metrics, start_metrics_server
+from routing import SystemRouter, capable_systems
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -45,35 +52,46 @@ logger = logging.getLogger(__name__)
 security = HTTPBearer()
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
-# Existing agent system endpoints
+# Existing agent system endpoints. Tasks are routed to the systems with a capability
+# for their type, earlier capabilities first (see routing.capable_systems)
 EXISTING_AGENT_SYSTEMS = {
     "agentorchestra": {
         "url": "http://localhost:8087",
         "description": "Hierarchical Multi-Agent Framework",
-        "capabilities": ["planning", "research", "browser", "analysis", "automation"]
+        "capabilities": ["planning", "research", "browser", "analysis", "automation",
+                         "quick_execution", "fast_execution", "real_time"],
+        "concurrency": 8
     },
     "fast_agent": {
         "url": "http://localhost:8002", 
         "description": "Fast Agent Execution Server",
-        "capabilities": ["quick_execution", "task_processing", "real_time"]
+        "capabilities": ["quick_execution", "fast_execution", "task_processing", "real_time",
+                         "research", "analysis", "automation"],
+        "concurrency": 16
     },
     "mcp_filesystem": {
         "url": "http://localhost:3000",
         "description": "MCP Filesystem Server",
-        "capabilities": ["file_operations", "directory_management"]
+        "capabilities": ["file_operations", "directory_management", "filesystem"],
+        "concurrency": 4
     },
     "mcp_github": {
         "url": "http://localhost:3001",
         "description": "MCP GitHub Server", 
-        "capabilities": ["repository_management", "code_operations"]
+        "capabilities": ["repository_management", "code_operations", "github_integration"],
+        "concurrency": 4
     },
     "mcp_azure": {
         "url": "http://localhost:3002",
         "description": "MCP Azure Server",
-        "capabilities": ["cloud_operations", "azure_integration"]
+        "capabilities": ["cloud_operations", "azure_integration"],
+        "concurrency": 4
     }
 }
 
+# Complex tasks default to AgentOrchestra
+DEFAULT_ROUTE = ['agentorchestra', 'fast_agent']
+
 # Pydantic models
 class AgentTaskRequest(BaseModel):
     """Unified agent task request"""
@@ -94,6 +112,14 @@ class AgentTaskResponse(BaseModel):
     execution_time: float
     created_at: datetime
 
+class AgentTaskAccepted(BaseModel):
+    """Queued unified agent task"""
+    task_id: str
+    status: str
+    target_system: str
+    status_url: str
+    events_url: str
+
 class SystemStatus(BaseModel):
     """System status for all agent systems"""
     system_name: str
@@ -104,82 +130,92 @@ class SystemStatus(BaseModel):
     response_time: float
 
 class UnifiedAgentOrchestrator:
-    """Unified orchestrator for existing agent systems"""
+    """Unified orchestrator for existing agent systems
     
-    def __init__(self):
-        self.active_tasks = {}
+    Tasks are queued as jobs of the `unified_tasks` task queue, one job type per
+    target system, limited to the system's `concurrency` per worker process.
+    """
+    
+    def __init__(self, queue: TaskQueue):
+        self.queue = queue
         self.system_status = {}
         self.http_client = httpx.AsyncClient(timeout=30.0)
+        self.router = SystemRouter(EXISTING_AGENT_SYSTEMS)
+        for system_name, config in EXISTING_AGENT_SYSTEMS.items():
+            self.queue.register(system_name, self._run_job, config['concurrency'])
+        self.health_checks = HealthProbeCache(
+            {
+                system_name: functools.partial(self._probe_system, config['url'])
+                for system_name, config in EXISTING_AGENT_SYSTEMS.items()
+            },
+            ttl=10.0,
+            timeout=5.0,
+            on_result=lambda system_name, result: self.router.record_health(system_name, result.status == 'healthy')
+        )
+    
+    async def execute_task(self, request: AgentTaskRequest, user_id: str) -> AgentTaskAccepted:
+        """Queue a task for the appropriate existing agent system"""
+        # Determine best agent system for the task
+        target_system = await self._select_best_system(request)
+        
+        task_id = await self.queue.enqueue(
+            target_system, request.model_dump(), user_id=user_id, timeout=request.timeout
+        )
+        logger.info(f"🎯 Queued task {task_id} for {target_system}")
+        
+        return AgentTaskAccepted(
+            task_id=task_id,
+            status='queued',
+            target_system=target_system,
+            status_url=f"/tasks/{task_id}",
+            events_url=f"/tasks/{task_id}/events"
+        )
     
-    async def execute_task(self, request: AgentTaskRequest, user_id: str) -> AgentTaskResponse:
-        """Execute task using appropriate existing agent system"""
-        task_id = str(uuid4())
-        start_time = datetime.now()
+    async def _run_job(self, job: Dict[str, Any]) -> Dict[str, Any]:
+        """Execute a queued task on its target system"""
+        request = AgentTaskRequest(**job['payload'])
+        target_system = job['type']
+        logger.info(f"🎯 Executing task {job['id']} using {target_system}")
         
+        self.router.start(target_system)
+        start_time = time.monotonic()
+        ok = False
         try:
-            # Determine best agent system for the task
-            target_system = await self._select_best_system(request)
-            
-            logger.info(f"🎯 Executing task {task_id} using {target_system}")
-            
-            # Add to active tasks
-            self.active_tasks[task_id] = {
-                'request': request,
-                'user_id': user_id,
-                'target_system': target_system,
-                'start_time': start_time,
-                'status': 'running'
-            }
-            
-            # Execute task on selected system
-            result = await self._execute_on_system(target_system, request, task_id)
-            
-            execution_time = (datetime.now() - start_time).total_seconds()
-            
-            return AgentTaskResponse(
-                task_id=task_id,
-                status='completed',
-                target_system=target_system,
-                result=result,
-                execution_time=execution_time,
-                created_at=start_time
-            )
-            
-        except Exception as e:
-            execution_time = (datetime.now() - start_time).total_seconds()
-            logger.error(f"❌ Task {task_id} failed: {e}")
-            
-            return AgentTaskResponse(
-                task_id=task_id,
-                status='failed',
-                target_system=target_system or 'unknown',
-                error=str(e),
-                execution_time=execution_time,
-                created_at=start_time
-            )
+            result = await self._execute_on_system(target_system, request, job['id'])
+            # The system adapters fall back to a mock result when the system fails
+            ok = not result.get('execution_details', {}).get('mock', False)
+        except Exception:
+            await log_task_execution(request.task_type, request.task_description, target_system,
+                                     'failed', job['user_id'])
+            raise
+        finally:
+            self.router.finish(target_system, time.monotonic() - start_time, ok)
+        
+        await log_task_execution(request.task_type, request.task_description, target_system,
+                                 'completed', job['user_id'])
+        return result
     
     async def _select_best_system(self, request: AgentTaskRequest) -> str:
-        """Select the best existing agent system for the task"""
-        task_type = request.task_type.lower()
+        """Select the best existing agent system for the task
         
+        Among the systems able to run the task type, the router picks the least
+        loaded one relative to its observed latency and error rate, skipping
+        systems whose circuit breaker is open.
+        """
         # Check if specific system is requested
         if request.target_system and request.target_system in EXISTING_AGENT_SYSTEMS:
             return request.target_system
         
-        # Route based on task type
-        if task_type in ['planning', 'research', 'analysis', 'automation']:
-            return 'agentorchestra'
-        elif task_type in ['quick', 'fast', 'real_time']:
-            return 'fast_agent'
-        elif task_type in ['file', 'directory', 'filesystem']:
-            return 'mcp_filesystem'
-        elif task_type in ['github', 'repository', 'code']:
-            return 'mcp_github'
-        elif task_type in ['azure', 'cloud']:
-            return 'mcp_azure'
-        else:
-            # Default to AgentOrchestra for complex tasks
-            return 'agentorchestra'
+        candidates = capable_systems(EXISTING_AGENT_SYSTEMS, request.task_type) or DEFAULT_ROUTE
+        if len(candidates) == 1:
+            return candidates[0]
+        
+        try:
+            loads = await self.queue.backlog(candidates)
+        except Exception as e:
+            logger.error(f"❌ Task backlog lookup failed: {e}")
+            loads = None
+        return self.router.choose(candidates, loads)
     
     async def _execute_on_system(self, system_name: str, request: AgentTaskRequest, task_id: str) -> Dict[str, Any]:
         """Execute task on specific existing system"""
@@ -320,53 +356,36 @@ class UnifiedAgentOrchestrator:
             }
         }
     
+    async def _probe_system(self, url: str) -> str:
+        """Probe the health endpoint of an agent system"""
+        try:
+            response = await self.http_client.get(f"{url}/health", timeout=5.0)
+            return "healthy" if response.status_code == 200 else "unhealthy"
+        except Exception as e:
+            return f"error: {str(e)[:50]}"
+    
     async def check_system_health(self) -> List[SystemStatus]:
-        """Check health of all existing agent systems"""
-        health_status = []
+        """Health of all existing agent systems, probed concurrently and cached"""
+        results = await self.health_checks.get()
         
-        for system_name, config in EXISTING_AGENT_SYSTEMS.items():
-            start_time = datetime.now()
-            
-            try:
-                # Try to reach the system
-                response = await self.http_client.get(f"{config['url']}/health", timeout=5.0)
-                response_time = (datetime.now() - start_time).total_seconds()
-                
-                if response.status_code == 200:
-                    health_status.append(SystemStatus(
-                        system_name=system_name,
-                        status="healthy",
-                        url=config['url'],
-                        capabilities=config['capabilities'],
-                        last_checked=datetime.now(),
-                        response_time=response_time
-                    ))
-                else:
-                    health_status.append(SystemStatus(
-                        system_name=system_name,
-                        status="unhealthy",
-                        url=config['url'],
-                        capabilities=config['capabilities'],
-                        last_checked=datetime.now(),
-                        response_time=response_time
-                    ))
-                    
-            except Exception as e:
-                response_time = (datetime.now() - start_time).total_seconds()
-                health_status.append(SystemStatus(
-                    system_name=system_name,
-                    status=f"error: {str(e)[:50]}",
-                    url=config['url'],
-                    capabilities=config['capabilities'],
-                    last_checked=datetime.now(),
-                    response_time=response_time
-                ))
+        health_status = [
+            SystemStatus(
+                system_name=system_name,
+                status=result.status,
+                url=EXISTING_AGENT_SYSTEMS[system_name]['url'],
+                capabilities=EXISTING_AGENT_SYSTEMS[system_name]['capabilities'],
+                last_checked=result.checked_at,
+                response_time=result.latency
+            )
+            for system_name, result in results.items()
+        ]
         
         self.system_status = {status.system_name: status for status in health_status}
         return health_status
 
-# Global orchestrator
-orchestrator = UnifiedAgentOrchestrator()
+# Global task queue and orchestrator
+task_queue = TaskQueue("unified_tasks")
+orchestrator = UnifiedAgentOrchestrator(task_queue)
 
 # FastAPI application setup
 @asynccontextmanager
@@ -376,14 +395,21 @@ async def lifespan(app: FastAPI):
     logger.info("🚀 Starting IZA OS Unified Agent Integration")
     logger.info("🔗 Connecting to existing agent systems...")
     
-    # Check system health on startup
+    # Check system health on startup, then keep it fresh in the background
     health_status = await orchestrator.check_system_health()
     logger.info(f"✅ System health check complete: {len(health_status)} systems checked")
+    orchestrator.health_checks.start()
+    start_metrics_server("unified_agent_integration")
+    
+    if os.getenv('TASK_QUEUE_WORKERS', '1') == '1':
+        await task_queue.start()
     
     yield
     
     # Shutdown
     logger.info("🛑 Shutting down IZA OS Unified Agent Integration")
+    await orchestrator.health_checks.stop()
+    await task_queue.close()
     await orchestrator.http_client.aclose()
 
 # Create FastAPI application
@@ -408,6 +434,9 @@ app.add_middleware(
     allowed_hosts=["*"]
 )
 
+# Per-route request counts and latency histograms
+app.add_middleware(RequestMetricsMiddleware, metrics=request_metrics)
+
 # Request logging middleware
 @app.middleware("http")
 async def log_requests(request: Request, call_next):
@@ -449,27 +478,14 @@ async def list_systems():
     """List all available agent systems"""
     return EXISTING_AGENT_SYSTEMS
 
-@app.post("/execute", response_model=AgentTaskResponse)
+@app.post("/execute", response_model=AgentTaskAccepted, status_code=202)
 async def execute_task(
     request: AgentTaskRequest,
-    background_tasks: BackgroundTasks,
     current_user: dict = Depends(lambda: {"sub": "unified_user"})  # Simplified auth for now
 ):
-    """Execute task using appropriate existing agent system"""
+    """Queue a task for the appropriate existing agent system"""
     try:
-        result = await orchestrator.execute_task(request, current_user['sub'])
-        
-        # Log task execution
-        background_tasks.add_task(
-            log_task_execution,
-            request.task_type,
-            request.task_description,
-            result.target_system,
-            result.status,
-            current_user['sub']
-        )
-        
-        return result
+        return await orchestrator.execute_task(request, current_user['sub'])
         
     except Exception as e:
         logger.error(f"❌ Task execution failed: {e}")
@@ -478,25 +494,42 @@ async def execute_task(
 @app.get("/tasks/{task_id}")
 async def get_task_status(task_id: str):
     """Get task execution status"""
-    if task_id in orchestrator.active_tasks:
-        return orchestrator.active_tasks[task_id]
-    else:
+    task = await task_queue.get(task_id)
+    if task is None:
         raise HTTPException(status_code=404, detail="Task not found")
+    return task
+
+@app.get("/tasks/{task_id}/events")
+async def get_task_events(task_id: str):
+    """Stream task execution updates as server-sent events, until it finishes"""
+    if await task_queue.get(task_id) is None:
+        raise HTTPException(status_code=404, detail="Task not found")
+    return StreamingResponse(
+        task_queue.sse_events(task_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache"}
+    )
 
 @app.get("/tasks")
 async def list_tasks():
     """List all active tasks"""
+    tasks = await task_queue.list_jobs()
+    active_tasks = [task for task in tasks if task['status'] not in TERMINAL_STATUSES]
     return {
-        "active_tasks": orchestrator.active_tasks,
-        "total_active": len(orchestrator.active_tasks)
+        "active_tasks": active_tasks,
+        "total_active": len(active_tasks)
     }
 
 @app.get("/metrics")
 async def get_metrics():
     """Get system metrics"""
     return {
-        "active_tasks": len(orchestrator.active_tasks),
+        "active_tasks": task_queue.running_count(),
+        "task_workers": task_queue.get_metrics(),
         "system_status": orchestrator.system_status,
+        "health_check_latency": orchestrator.health_checks.get_latency_histograms(),
+        "routing": orchestrator.router.snapshot(),
+        "requests": request_metrics.summary(),
         "available_systems": len(EXISTING_AGENT_SYSTEMS),
         "timestamp": datetime.now().isoformat()
     }
@@ -7,22 +7,27 @@ Implements the complete user flow: Backend API → MCP wrapper → Frontend UI
 """
 
 import asyncio
+import base64
+import json
 import logging
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta
+from decimal import Decimal
 from typing import Dict, List, Optional, Any
 from uuid import uuid4
 
 from fastapi import FastAPI, HTTPException, Depends, BackgroundTasks, Request
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, Field, validator
-from sqlalchemy import create_engine, text
-from sqlalchemy.orm import sessionmaker
 
 # Import shared library components
-from shared.core.base_manager import BaseManager, DatabaseManager
+from shared.core.base_manager import BaseManager
 from shared.core.security import SecurityManager, get_current_user, User
 from shared.core.config import get_config, get_service_config
 
+from async_db import get_db_pool
+
 logger = logging.getLogger(__name__)
 
 # Pydantic models for API
@@ -77,6 +82,8 @@ class VentureListResponse(BaseModel):
     limit: int
     has_next: bool
     has_prev: bool
+    next_cursor: Optional[str] = None
+    total_estimated: bool = False
 
 class VentureAnalyticsResponse(BaseModel):
     """Venture analytics response"""
@@ -88,18 +95,40 @@ class VentureAnalyticsResponse(BaseModel):
     growth_metrics: Dict[str, Any]
     top_performers: List[Dict[str, Any]]
 
+VENTURE_COLUMNS = """id, name, description, industry, stage, status,
+                       valuation, funding, team_size, founders, metrics,
+                       created_at, updated_at"""
+
+# Cached per-filter venture counts are considered fresh for this long
+VENTURE_COUNT_TTL = 60.0
+# Upper bound of the cached counts, filters are free-form so the keys are unbounded
+VENTURE_COUNT_CACHE_SIZE = 10_000
+
+# Redis key of a user's analytics overview, versioned by a counter bumped whenever
+# their ventures change. A read that started before a write caches its result under
+# the old version, which is never read again, instead of overwriting the fresh entry.
+# The TTL only bounds how long a missed invalidation can be served.
+ANALYTICS_VERSION_KEY = "venture_analytics_version:{user_id}"
+ANALYTICS_CACHE_KEY = "venture_analytics:{user_id}:{version}"
+ANALYTICS_CACHE_TTL = 300
+
+def _load_json(value) -> Any:
+    return json.loads(value) if isinstance(value, str) else value
+
 class VentureManager(BaseManager):
     """Venture portfolio management"""
     
     def __init__(self):
         super().__init__("venture_manager", get_config().to_dict())
-        self.db_manager = DatabaseManager()
+        self.db = get_db_pool()
+        # (user_id, stage, industry) -> (count, expires_at), in expiry order
+        self._count_cache: OrderedDict = OrderedDict()
     
     async def initialize(self) -> bool:
         """Initialize venture manager"""
         try:
             await super().initialize()
-            await self.db_manager.initialize()
+            await self.db.initialize()
             
             # Initialize database tables
             await self._init_database_tables()
@@ -112,9 +141,12 @@ class VentureManager(BaseManager):
             return False
     
     async def shutdown(self) -> bool:
-        """Shutdown venture manager"""
+        """Shutdown venture manager
+
+        The pool is process-wide and shared with the other managers, it is closed by the
+        app's shutdown handler rather than here.
+        """
         try:
-            await self.db_manager.shutdown()
             await super().shutdown()
             
             self.logger.info("✅ Venture manager shutdown")
@@ -127,37 +159,56 @@ class VentureManager(BaseManager):
     async def _init_database_tables(self):
         """Initialize venture-related database tables"""
         try:
-            conn = await self.db_manager.get_db_connection()
-            cursor = conn.cursor()
-            
-            # Create ventures table if not exists
-            cursor.execute("""
-                CREATE TABLE IF NOT EXISTS ventures (
-                    id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
-                    name VARCHAR(255) NOT NULL,
-                    description TEXT,
-                    industry VARCHAR(100),
-                    stage VARCHAR(20) DEFAULT 'IDEA',
-                    status VARCHAR(20) DEFAULT 'ACTIVE',
-                    valuation DECIMAL(15,2),
-                    funding DECIMAL(15,2),
-                    team_size INTEGER,
-                    founders TEXT[], -- PostgreSQL array
-                    metrics JSONB DEFAULT '{}',
-                    user_id UUID NOT NULL,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+            async with self.db.transaction() as conn:
+                # Create ventures table if not exists
+                await conn.execute("""
+                    CREATE TABLE IF NOT EXISTS ventures (
+                        id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+                        name VARCHAR(255) NOT NULL,
+                        description TEXT,
+                        industry VARCHAR(100),
+                        stage VARCHAR(20) DEFAULT 'IDEA',
+                        status VARCHAR(20) DEFAULT 'ACTIVE',
+                        valuation DECIMAL(15,2),
+                        funding DECIMAL(15,2),
+                        team_size INTEGER,
+                        founders TEXT[], -- PostgreSQL array
+                        metrics JSONB DEFAULT '{}',
+                        user_id UUID NOT NULL,
+                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                    )
+                """)
+                
+                # Create indexes
+                await conn.execute("CREATE INDEX IF NOT EXISTS idx_ventures_user_id ON ventures(user_id)")
+                await conn.execute("CREATE INDEX IF NOT EXISTS idx_ventures_stage ON ventures(stage)")
+                await conn.execute("CREATE INDEX IF NOT EXISTS idx_ventures_industry ON ventures(industry)")
+                await conn.execute(
+                    "CREATE INDEX IF NOT EXISTS idx_ventures_user_created "
+                    "ON ventures(user_id, created_at DESC, id DESC)"
                 )
-            """)
-            
-            # Create indexes
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_ventures_user_id ON ventures(user_id)")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_ventures_stage ON ventures(stage)")
-            cursor.execute("CREATE INDEX IF NOT EXISTS idx_ventures_industry ON ventures(industry)")
-            
-            conn.commit()
-            cursor.close()
-            await self.db_manager.return_db_connection(conn)
+                await conn.execute(
+                    "CREATE INDEX IF NOT EXISTS idx_ventures_user_top "
+                    "ON ventures(user_id, valuation DESC NULLS LAST, funding DESC NULLS LAST) "
+                    "WHERE status = 'ACTIVE'"
+                )
+                
+                # Per-user analytics, maintained incrementally by every venture write
+                await conn.execute("""
+                    CREATE TABLE IF NOT EXISTS venture_analytics (
+                        user_id UUID PRIMARY KEY,
+                        total_ventures INTEGER NOT NULL DEFAULT 0,
+                        total_valuation DECIMAL(18,2) NOT NULL DEFAULT 0,
+                        valuation_count INTEGER NOT NULL DEFAULT 0,
+                        total_funding DECIMAL(18,2) NOT NULL DEFAULT 0,
+                        funding_count INTEGER NOT NULL DEFAULT 0,
+                        stage_distribution JSONB NOT NULL DEFAULT '{}',
+                        industry_distribution JSONB NOT NULL DEFAULT '{}',
+                        top_performers JSONB NOT NULL DEFAULT '[]',
+                        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                    )
+                """)
             
             self.logger.info("✅ Venture database tables initialized")
             
@@ -165,41 +216,112 @@ class VentureManager(BaseManager):
             self.logger.error(f"❌ Database initialization failed: {e}")
             raise
     
+    @staticmethod
+    def _venture_fields(row) -> Dict[str, Any]:
+        """Response fields of a ventures row"""
+        metrics = row['metrics'] or {}
+        if isinstance(metrics, str):
+            metrics = json.loads(metrics)
+        return {
+            'id': str(row['id']),
+            'name': row['name'],
+            'description': row['description'],
+            'industry': row['industry'],
+            'stage': row['stage'],
+            'status': row['status'],
+            'valuation': float(row['valuation']) if row['valuation'] else None,
+            'funding': float(row['funding']) if row['funding'] else None,
+            'team_size': row['team_size'],
+            'founders': row['founders'] or [],
+            'metrics': metrics,
+            'created_at': row['created_at'],
+            'updated_at': row['updated_at']
+        }
+    
+    def _row_to_venture(self, row) -> VentureResponse:
+        """Convert a ventures row to a response"""
+        return VentureResponse(**self._venture_fields(row))
+    
+    def _rows_to_ventures(self, rows) -> List[VentureResponse]:
+        """Convert a page of ventures rows to responses.
+        
+        Rows come straight from the ventures table, whose constraints already match
+        the response model, so validation is skipped.
+        """
+        fields = self._venture_fields
+        return [VentureResponse.model_construct(**fields(row)) for row in rows]
+    
+    @staticmethod
+    def _encode_cursor(row) -> str:
+        """Opaque cursor pointing after a row, in (created_at, id) order"""
+        key = json.dumps([row['created_at'].isoformat(), str(row['id'])])
+        return base64.urlsafe_b64encode(key.encode()).decode().rstrip('=')
+    
+    @staticmethod
+    def _decode_cursor(cursor: str) -> tuple:
+        try:
+            padded = cursor + '=' * (-len(cursor) % 4)
+            created_at, venture_id = json.loads(base64.urlsafe_b64decode(padded))
+            return datetime.fromisoformat(created_at), venture_id
+        except (ValueError, TypeError):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+    
+    def _invalidate_counts(self, user_id: str):
+        """Drop the cached venture counts of a user"""
+        for key in [key for key in self._count_cache if key[0] == user_id]:
+            del self._count_cache[key]
+    
+    async def _estimated_count(self, conn, user_id: str, stage: Optional[str], industry: Optional[str],
+                               where_clause: str, params: List[Any]) -> int:
+        """Venture count of a filter, cached for VENTURE_COUNT_TTL seconds"""
+        key = (user_id, stage, industry)
+        cached = self._count_cache.get(key)
+        if cached is not None and cached[1] > time.monotonic():
+            return cached[0]
+        
+        total = await conn.fetchval(f"SELECT COUNT(*) FROM ventures WHERE {where_clause}", *params)
+        now = time.monotonic()
+        self._count_cache.pop(key, None)
+        self._count_cache[key] = (total, now + VENTURE_COUNT_TTL)
+        # Every entry has the same TTL, so the oldest entries are the first to expire
+        while self._count_cache and (
+            len(self._count_cache) > VENTURE_COUNT_CACHE_SIZE
+            or next(iter(self._count_cache.values()))[1] <= now
+        ):
+            self._count_cache.popitem(last=False)
+        return total
+    
     async def create_venture(self, venture_data: VentureCreateRequest, user_id: str) -> VentureResponse:
         """Create a new venture"""
         try:
             venture_id = str(uuid4())
             
-            conn = await self.db_manager.get_db_connection()
-            cursor = conn.cursor()
-            
-            cursor.execute("""
-                INSERT INTO ventures (
-                    id, name, description, industry, stage, status,
-                    valuation, funding, team_size, founders, user_id
-                ) VALUES (
-                    %s, %s, %s, %s, %s, 'ACTIVE',
-                    %s, %s, %s, %s, %s
+            async with self.db.transaction() as conn:
+                row = await conn.fetchrow(f"""
+                    INSERT INTO ventures (
+                        id, name, description, industry, stage, status,
+                        valuation, funding, team_size, founders, user_id
+                    ) VALUES (
+                        $1, $2, $3, $4, $5, 'ACTIVE',
+                        $6, $6, $7, $8, $9
+                    )
+                    RETURNING {VENTURE_COLUMNS}
+                """,
+                    venture_id,
+                    venture_data.name,
+                    venture_data.description,
+                    venture_data.industry,
+                    venture_data.stage,
+                    venture_data.initial_funding,
+                    venture_data.team_size,
+                    venture_data.founders,
+                    user_id
                 )
-            """, (
-                venture_id,
-                venture_data.name,
-                venture_data.description,
-                venture_data.industry,
-                venture_data.stage,
-                venture_data.initial_funding,
-                venture_data.initial_funding,
-                venture_data.team_size,
-                venture_data.founders,
-                user_id
-            ))
-            
-            conn.commit()
-            cursor.close()
-            await self.db_manager.return_db_connection(conn)
-            
-            # Get created venture
-            venture = await self.get_venture_by_id(venture_id, user_id)
+                await self._apply_analytics_delta(conn, user_id, None, row)
+            
+            venture = self._row_to_venture(row)
+            self._invalidate_counts(user_id)
+            await self._invalidate_analytics(user_id)
             
             # Log metric
             await self.log_metric("ventures_created", 1)
@@ -214,39 +336,16 @@ class VentureManager(BaseManager):
     async def get_venture_by_id(self, venture_id: str, user_id: str) -> VentureResponse:
         """Get venture by ID"""
         try:
-            conn = await self.db_manager.get_db_connection()
-            cursor = conn.cursor()
-            
-            cursor.execute("""
-                SELECT id, name, description, industry, stage, status,
-                       valuation, funding, team_size, founders, metrics,
-                       created_at, updated_at
+            row = await self.db.fetchrow(f"""
+                SELECT {VENTURE_COLUMNS}
                 FROM ventures
-                WHERE id = %s AND user_id = %s
-            """, (venture_id, user_id))
-            
-            row = cursor.fetchone()
-            cursor.close()
-            await self.db_manager.return_db_connection(conn)
+                WHERE id = $1 AND user_id = $2
+            """, venture_id, user_id)
             
             if not row:
                 raise HTTPException(status_code=404, detail="Venture not found")
             
-            return VentureResponse(
-                id=str(row[0]),
-                name=row[1],
-                description=row[2],
-                industry=row[3],
-                stage=row[4],
-                status=row[5],
-                valuation=float(row[6]) if row[6] else None,
-                funding=float(row[7]) if row[7] else None,
-                team_size=row[8],
-                founders=row[9] or [],
-                metrics=row[10] or {},
-                created_at=row[11],
-                updated_at=row[12]
-            )
+            return self._row_to_venture(row)
             
         except HTTPException:
             raise
@@ -255,74 +354,94 @@ class VentureManager(BaseManager):
             raise HTTPException(status_code=500, detail=str(e))
     
     async def list_ventures(self, user_id: str, page: int = 1, limit: int = 20, 
-                          stage: Optional[str] = None, industry: Optional[str] = None) -> VentureListResponse:
-        """List ventures with pagination and filters"""
+                          stage: Optional[str] = None, industry: Optional[str] = None,
+                          cursor: Optional[str] = None, count: str = "estimated") -> VentureListResponse:
+        """List ventures with pagination and filters
+        
+        Pages are ordered by (created_at, id), newest first. Passing the `next_cursor`
+        of the previous page seeks straight to the next one through the
+        (user_id, created_at, id) index, so deep pages cost the same as the first;
+        `page` is only used without a cursor.
+        
+        `count` selects how `total` is computed: "estimated" reuses a count cached
+        per filter for VENTURE_COUNT_TTL seconds, "exact" counts the whole filter
+        with a window function in the same query as the page.
+        """
+        if count not in ("estimated", "exact"):
+            raise HTTPException(status_code=400, detail="count must be 'estimated' or 'exact'")
+        if limit < 1 or page < 1:
+            raise HTTPException(status_code=400, detail="page and limit must be at least 1")
+        
         try:
-            offset = (page - 1) * limit
-            
             # Build query
-            where_conditions = ["user_id = %s"]
+            where_conditions = ["user_id = $1"]
             params = [user_id]
             
             if stage:
-                where_conditions.append("stage = %s")
                 params.append(stage)
+                where_conditions.append(f"stage = ${len(params)}")
             
             if industry:
-                where_conditions.append("industry = %s")
                 params.append(industry)
+                where_conditions.append(f"industry = ${len(params)}")
             
             where_clause = " AND ".join(where_conditions)
             
-            conn = await self.db_manager.get_db_connection()
-            cursor = conn.cursor()
-            
-            # Get total count
-            cursor.execute(f"SELECT COUNT(*) FROM ventures WHERE {where_clause}", params)
-            total = cursor.fetchone()[0]
-            
-            # Get ventures
-            cursor.execute(f"""
-                SELECT id, name, description, industry, stage, status,
-                       valuation, funding, team_size, founders, metrics,
-                       created_at, updated_at
-                FROM ventures
-                WHERE {where_clause}
-                ORDER BY created_at DESC
-                LIMIT %s OFFSET %s
-            """, params + [limit, offset])
-            
-            rows = cursor.fetchall()
-            cursor.close()
-            await self.db_manager.return_db_connection(conn)
-            
-            ventures = []
-            for row in rows:
-                ventures.append(VentureResponse(
-                    id=str(row[0]),
-                    name=row[1],
-                    description=row[2],
-                    industry=row[3],
-                    stage=row[4],
-                    status=row[5],
-                    valuation=float(row[6]) if row[6] else None,
-                    funding=float(row[7]) if row[7] else None,
-                    team_size=row[8],
-                    founders=row[9] or [],
-                    metrics=row[10] or {},
-                    created_at=row[11],
-                    updated_at=row[12]
-                ))
+            page_params = list(params)
+            if cursor:
+                page_params.extend(self._decode_cursor(cursor))
+                seek_condition = f"(created_at, id) < (${len(page_params) - 1}, ${len(page_params)})"
+                offset = 0
+            else:
+                seek_condition = "TRUE"
+                offset = (page - 1) * limit
+            # One extra row tells whether there is a next page
+            page_params.extend([limit + 1, offset])
+            limit_clause = f"LIMIT ${len(page_params) - 1} OFFSET ${len(page_params)}"
+            
+            async with self.db.acquire() as conn:
+                if count == "exact":
+                    # The window runs before the seek and the limit, over the whole filter
+                    rows = await conn.fetch(f"""
+                        SELECT * FROM (
+                            SELECT {VENTURE_COLUMNS}, COUNT(*) OVER () AS total_count
+                            FROM ventures
+                            WHERE {where_clause}
+                        ) filtered
+                        WHERE {seek_condition}
+                        ORDER BY created_at DESC, id DESC
+                        {limit_clause}
+                    """, *page_params)
+                    if rows:
+                        total = rows[0]['total_count']
+                    else:
+                        total = await conn.fetchval(f"SELECT COUNT(*) FROM ventures WHERE {where_clause}", *params)
+                else:
+                    rows = await conn.fetch(f"""
+                        SELECT {VENTURE_COLUMNS}
+                        FROM ventures
+                        WHERE {where_clause} AND {seek_condition}
+                        ORDER BY created_at DESC, id DESC
+                        {limit_clause}
+                    """, *page_params)
+                    total = await self._estimated_count(conn, user_id, stage, industry, where_clause, params)
+            
+            has_next = len(rows) > limit
+            rows = rows[:limit]
             
             return VentureListResponse(
-                ventures=ventures,
+                ventures=self._rows_to_ventures(rows),
                 total=total,
                 page=page,
                 limit=limit,
-                has_next=offset + limit < total,
-                has_prev=page > 1
+                has_next=has_next,
+                has_prev=bool(cursor) or page > 1,
+                next_cursor=self._encode_cursor(rows[-1]) if has_next else None,
+                total_estimated=count == "estimated"
             )
             
+        except HTTPException:
+            raise
         except Exception as e:
             self.logger.error(f"❌ Failed to list ventures: {e}")
             raise HTTPException(status_code=500, detail=str(e))
@@ -334,37 +453,12 @@ class VentureManager(BaseManager):
             update_fields = []
             params = []
             
-            if venture_data.name is not None:
-                update_fields.append("name = %s")
-                params.append(venture_data.name)
-            
-            if venture_data.description is not None:
-                update_fields.append("description = %s")
-                params.append(venture_data.description)
-            
-            if venture_data.industry is not None:
-                update_fields.append("industry = %s")
-                params.append(venture_data.industry)
-            
-            if venture_data.stage is not None:
-                update_fields.append("stage = %s")
-                params.append(venture_data.stage)
-            
-            if venture_data.valuation is not None:
-                update_fields.append("valuation = %s")
-                params.append(venture_data.valuation)
-            
-            if venture_data.funding is not None:
-                update_fields.append("funding = %s")
-                params.append(venture_data.funding)
-            
-            if venture_data.team_size is not None:
-                update_fields.append("team_size = %s")
-                params.append(venture_data.team_size)
-            
-            if venture_data.founders is not None:
-                update_fields.append("founders = %s")
-                params.append(venture_data.founders)
+            for column in ('name', 'description', 'industry', 'stage', 'valuation',
+                           'funding', 'team_size', 'founders'):
+                value = getattr(venture_data, column)
+                if value is not None:
+                    params.append(value)
+                    update_fields.append(f"{column} = ${len(params)}")
             
             if not update_fields:
                 raise HTTPException(status_code=400, detail="No fields to update")
@@ -372,26 +466,28 @@ class VentureManager(BaseManager):
             update_fields.append("updated_at = CURRENT_TIMESTAMP")
             params.extend([venture_id, user_id])
             
-            conn = await self.db_manager.get_db_connection()
-            cursor = conn.cursor()
-            
-            cursor.execute(f"""
-                UPDATE ventures
-                SET {', '.join(update_fields)}
-                WHERE id = %s AND user_id = %s
-            """, params)
-            
-            if cursor.rowcount == 0:
-                cursor.close()
-                await self.db_manager.return_db_connection(conn)
-                raise HTTPException(status_code=404, detail="Venture not found")
-            
-            conn.commit()
-            cursor.close()
-            await self.db_manager.return_db_connection(conn)
-            
-            # Get updated venture
-            venture = await self.get_venture_by_id(venture_id, user_id)
+            async with self.db.transaction() as conn:
+                old_row = await conn.fetchrow(f"""
+                    SELECT {VENTURE_COLUMNS}
+                    FROM ventures
+                    WHERE id = $1 AND user_id = $2
+                    FOR UPDATE
+                """, venture_id, user_id)
+                
+                if old_row is None:
+                    raise HTTPException(status_code=404, detail="Venture not found")
+                
+                row = await conn.fetchrow(f"""
+                    UPDATE ventures
+                    SET {', '.join(update_fields)}
+                    WHERE id = ${len(params) - 1} AND user_id = ${len(params)}
+                    RETURNING {VENTURE_COLUMNS}
+                """, *params)
+                await self._apply_analytics_delta(conn, user_id, old_row, row)
+            
+            venture = self._row_to_venture(row)
+            self._invalidate_counts(user_id)
+            await self._invalidate_analytics(user_id)
             
             # Log metric
             await self.log_metric("ventures_updated", 1)
@@ -408,22 +504,20 @@ class VentureManager(BaseManager):
     async def delete_venture(self, venture_id: str, user_id: str) -> bool:
         """Delete venture"""
         try:
-            conn = await self.db_manager.get_db_connection()
-            cursor = conn.cursor()
-            
-            cursor.execute("""
-                DELETE FROM ventures
-                WHERE id = %s AND user_id = %s
-            """, (venture_id, user_id))
-            
-            if cursor.rowcount == 0:
-                cursor.close()
-                await self.db_manager.return_db_connection(conn)
-                raise HTTPException(status_code=404, detail="Venture not found")
-            
-            conn.commit()
-            cursor.close()
-            await self.db_manager.return_db_connection(conn)
+            async with self.db.transaction() as conn:
+                row = await conn.fetchrow(f"""
+                    DELETE FROM ventures
+                    WHERE id = $1 AND user_id = $2
+                    RETURNING {VENTURE_COLUMNS}
+                """, venture_id, user_id)
+                
+                if row is None:
+                    raise HTTPException(status_code=404, detail="Venture not found")
+                
+                await self._apply_analytics_delta(conn, user_id, row, None)
+            
+            self._invalidate_counts(user_id)
+            await self._invalidate_analytics(user_id)
             
             # Log metric
             await self.log_metric("ventures_deleted", 1)
@@ -437,85 +531,214 @@ class VentureManager(BaseManager):
             self.logger.error(f"❌ Failed to delete venture: {e}")
             raise HTTPException(status_code=500, detail=str(e))
     
+    async def _top_performers(self, conn, user_id: str) -> List[Dict[str, Any]]:
+        """Top 5 active ventures by valuation, read from the idx_ventures_user_top index"""
+        rows = await conn.fetch("""
+            SELECT name, valuation, funding, stage
+            FROM ventures
+            WHERE user_id = $1 AND status = 'ACTIVE'
+            ORDER BY valuation DESC NULLS LAST, funding DESC NULLS LAST
+            LIMIT 5
+        """, user_id)
+        
+        return [{
+            'name': row[0],
+            'valuation': float(row[1]) if row[1] else 0,
+            'funding': float(row[2]) if row[2] else 0,
+            'stage': row[3]
+        } for row in rows]
+    
+    async def _rebuild_analytics(self, conn, user_id: str):
+        """Recompute the analytics row of a user from the ventures table"""
+        stats = await conn.fetchrow("""
+            SELECT 
+                COUNT(*) as total_ventures,
+                COALESCE(SUM(valuation), 0) as total_valuation,
+                COUNT(valuation) as valuation_count,
+                COALESCE(SUM(funding), 0) as total_funding,
+                COUNT(funding) as funding_count
+            FROM ventures
+            WHERE user_id = $1 AND status = 'ACTIVE'
+        """, user_id)
+        
+        rows = await conn.fetch("""
+            SELECT stage, industry, COUNT(*) as count
+            FROM ventures
+            WHERE user_id = $1 AND status = 'ACTIVE'
+            GROUP BY stage, industry
+        """, user_id)
+        stage_dist: Dict[str, int] = {}
+        industry_dist: Dict[str, int] = {}
+        for row in rows:
+            stage_dist[row['stage']] = stage_dist.get(row['stage'], 0) + row['count']
+            industry = row['industry'] or 'UNSPECIFIED'
+            industry_dist[industry] = industry_dist.get(industry, 0) + row['count']
+        
+        await conn.execute("""
+            INSERT INTO venture_analytics (
+                user_id, total_ventures, total_valuation, valuation_count,
+                total_funding, funding_count, stage_distribution,
+                industry_distribution, top_performers, updated_at
+            ) VALUES ($1, $2, $3, $4, $5, $6, $7::jsonb, $8::jsonb, $9::jsonb, CURRENT_TIMESTAMP)
+            ON CONFLICT (user_id) DO UPDATE SET
+                total_ventures = EXCLUDED.total_ventures,
+                total_valuation = EXCLUDED.total_valuation,
+                valuation_count = EXCLUDED.valuation_count,
+                total_funding = EXCLUDED.total_funding,
+                funding_count = EXCLUDED.funding_count,
+                stage_distribution = EXCLUDED.stage_distribution,
+                industry_distribution = EXCLUDED.industry_distribution,
+                top_performers = EXCLUDED.top_performers,
+                updated_at = EXCLUDED.updated_at
+        """,
+            user_id,
+            stats['total_ventures'],
+            stats['total_valuation'],
+            stats['valuation_count'],
+            stats['total_funding'],
+            stats['funding_count'],
+            json.dumps(stage_dist),
+            json.dumps(industry_dist),
+            json.dumps(await self._top_performers(conn, user_id))
+        )
+    
+    async def _apply_analytics_delta(self, conn, user_id: str, old_row, new_row):
+        """Update the analytics row of a user for one venture write, inside its transaction
+        
+        `old_row` and `new_row` are the venture before and after the write, None for
+        an insert or a delete. Only active ventures count towards the analytics.
+        """
+        # Serializes the writes of one user, so that deltas are applied in commit order
+        await conn.execute("SELECT pg_advisory_xact_lock(hashtext($1))", user_id)
+        
+        summary = await conn.fetchrow("""
+            SELECT * FROM venture_analytics WHERE user_id = $1 FOR UPDATE
+        """, user_id)
+        if summary is None:
+            # First write since the table exists, the ventures may predate it
+            await self._rebuild_analytics(conn, user_id)
+            return
+        
+        total_ventures = summary['total_ventures']
+        total_valuation = summary['total_valuation']
+        valuation_count = summary['valuation_count']
+        total_funding = summary['total_funding']
+        funding_count = summary['funding_count']
+        stage_dist = _load_json(summary['stage_distribution'])
+        industry_dist = _load_json(summary['industry_distribution'])
+        
+        changed = False
+        for sign, row in ((-1, old_row), (1, new_row)):
+            if row is None or row['status'] != 'ACTIVE':
+                continue
+            changed = True
+            total_ventures += sign
+            if row['valuation'] is not None:
+                total_valuation += sign * Decimal(row['valuation'])
+                valuation_count += sign
+            if row['funding'] is not None:
+                total_funding += sign * Decimal(row['funding'])
+                funding_count += sign
+            for dist, key in ((stage_dist, row['stage']), (industry_dist, row['industry'] or 'UNSPECIFIED')):
+                dist[key] = dist.get(key, 0) + sign
+                if dist[key] <= 0:
+                    del dist[key]
+        
+        if not changed:
+            return
+        
+        await conn.execute("""
+            UPDATE venture_analytics SET
+                total_ventures = $2,
+                total_valuation = $3,
+                valuation_count = $4,
+                total_funding = $5,
+                funding_count = $6,
+                stage_distribution = $7::jsonb,
+                industry_distribution = $8::jsonb,
+                top_performers = $9::jsonb,
+                updated_at = CURRENT_TIMESTAMP
+            WHERE user_id = $1
+        """,
+            user_id,
+            total_ventures,
+            total_valuation,
+            valuation_count,
+            total_funding,
+            funding_count,
+            json.dumps(stage_dist),
+            json.dumps(industry_dist),
+            json.dumps(await self._top_performers(conn, user_id))
+        )
+    
+    async def _invalidate_analytics(self, user_id: str):
+        """Retire the cached analytics overview of a user after their ventures changed"""
+        try:
+            await self.db.redis.incr(ANALYTICS_VERSION_KEY.format(user_id=user_id))
+        except Exception as e:
+            self.logger.warning(f"⚠️ Failed to invalidate analytics cache: {e}")
+    
+    def _analytics_from_summary(self, summary) -> VentureAnalyticsResponse:
+        """Build the analytics response from a venture_analytics row"""
+        stage_dist = _load_json(summary['stage_distribution'])
+        industry_dist = _load_json(summary['industry_distribution'])
+        valuation_count = summary['valuation_count']
+        funding_count = summary['funding_count']
+        
+        return VentureAnalyticsResponse(
+            total_ventures=summary['total_ventures'],
+            total_valuation=float(summary['total_valuation']),
+            total_funding=float(summary['total_funding']),
+            stage_distribution=stage_dist,
+            industry_distribution=industry_dist,
+            growth_metrics={
+                'avg_valuation': float(summary['total_valuation'] / valuation_count) if valuation_count else 0,
+                'avg_funding': float(summary['total_funding'] / funding_count) if funding_count else 0,
+                'portfolio_diversity': len(industry_dist),
+                'stage_progression': self._calculate_stage_progression(stage_dist)
+            },
+            top_performers=_load_json(summary['top_performers'])
+        )
+    
     async def get_venture_analytics(self, user_id: str) -> VentureAnalyticsResponse:
-        """Get venture portfolio analytics"""
+        """Get venture portfolio analytics
+        
+        Served from Redis, falling back to the user's venture_analytics row, which
+        is only rebuilt from the ventures table when it does not exist yet.
+        """
+        # The version is read before the database, see ANALYTICS_CACHE_KEY
+        cache_key = None
         try:
-            conn = await self.db_manager.get_db_connection()
-            cursor = conn.cursor()
-            
-            # Get basic stats
-            cursor.execute("""
-                SELECT 
-                    COUNT(*) as total_ventures,
-                    COALESCE(SUM(valuation), 0) as total_valuation,
-                    COALESCE(SUM(funding), 0) as total_funding,
-                    AVG(valuation) as avg_valuation,
-                    AVG(funding) as avg_funding
-                FROM ventures
-                WHERE user_id = %s AND status = 'ACTIVE'
-            """, (user_id,))
-            
-            basic_stats = cursor.fetchone()
-            
-            # Get stage distribution
-            cursor.execute("""
-                SELECT stage, COUNT(*) as count
-                FROM ventures
-                WHERE user_id = %s AND status = 'ACTIVE'
-                GROUP BY stage
-            """, (user_id,))
-            
-            stage_dist = {row[0]: row[1] for row in cursor.fetchall()}
-            
-            # Get industry distribution
-            cursor.execute("""
-                SELECT industry, COUNT(*) as count
-                FROM ventures
-                WHERE user_id = %s AND status = 'ACTIVE'
-                GROUP BY industry
-            """, (user_id,))
-            
-            industry_dist = {row[0]: row[1] for row in cursor.fetchall()}
+            version = await self.db.redis.get(ANALYTICS_VERSION_KEY.format(user_id=user_id))
+            cache_key = ANALYTICS_CACHE_KEY.format(user_id=user_id, version=int(version or 0))
+            cached = await self.db.redis.get(cache_key)
+            if cached is not None:
+                return VentureAnalyticsResponse.model_validate_json(cached)
+        except Exception as e:
+            self.logger.warning(f"⚠️ Analytics cache read failed: {e}")
+        
+        try:
+            async with self.db.acquire() as conn:
+                summary = await conn.fetchrow("SELECT * FROM venture_analytics WHERE user_id = $1", user_id)
+                if summary is None:
+                    async with conn.transaction():
+                        await conn.execute("SELECT pg_advisory_xact_lock(hashtext($1))", user_id)
+                        await self._rebuild_analytics(conn, user_id)
+                    summary = await conn.fetchrow("SELECT * FROM venture_analytics WHERE user_id = $1", user_id)
             
-            # Get top performers
-            cursor.execute("""
-                SELECT name, valuation, funding, stage
-                FROM ventures
-                WHERE user_id = %s AND status = 'ACTIVE'
-                ORDER BY valuation DESC NULLS LAST, funding DESC NULLS LAST
-                LIMIT 5
-            """, (user_id,))
-            
-            top_performers = []
-            for row in cursor.fetchall():
-                top_performers.append({
-                    'name': row[0],
-                    'valuation': float(row[1]) if row[1] else 0,
-                    'funding': float(row[2]) if row[2] else 0,
-                    'stage': row[3]
-                })
-            
-            cursor.close()
-            await self.db_manager.return_db_connection(conn)
-            
-            return VentureAnalyticsResponse(
-                total_ventures=basic_stats[0],
-                total_valuation=float(basic_stats[1]),
-                total_funding=float(basic_stats[2]),
-                stage_distribution=stage_dist,
-                industry_distribution=industry_dist,
-                growth_metrics={
-                    'avg_valuation': float(basic_stats[3]) if basic_stats[3] else 0,
-                    'avg_funding': float(basic_stats[4]) if basic_stats[4] else 0,
-                    'portfolio_diversity': len(industry_dist),
-                    'stage_progression': self._calculate_stage_progression(stage_dist)
-                },
-                top_performers=top_performers
-            )
+            analytics = self._analytics_from_summary(summary)
             
         except Exception as e:
             self.logger.error(f"❌ Failed to get analytics: {e}")
             raise HTTPException(status_code=500, detail=str(e))
+        
+        if cache_key is not None:
+            try:
+                await self.db.redis.set(cache_key, analytics.model_dump_json(), ex=ANALYTICS_CACHE_TTL)
+            except Exception as e:
+                self.logger.warning(f"⚠️ Analytics cache write failed: {e}")
+        
+        return analytics
     
     def _calculate_stage_progression(self, stage_dist: Dict[str, int]) -> Dict[str, float]:
         """Calculate stage progression metrics"""
@@ -533,13 +756,13 @@ class VentureManager(BaseManager):
         """Check venture service health"""
         try:
             # Test database connection
-            conn = await self.db_manager.get_db_connection()
-            cursor = conn.cursor()
-            cursor.execute("SELECT COUNT(*) FROM ventures")
-            cursor.close()
-            await self.db_manager.return_db_connection(conn)
+            await self.db.fetchval("SELECT COUNT(*) FROM ventures")
             
-            return {'status': 'healthy', 'message': 'Venture service operational'}
+            return {
+                'status': 'healthy',
+                'message': 'Venture service operational',
+                'pool': self.db.get_metrics()
+            }
             
         except Exception as e:
             return {'status': 'unhealthy', 'message': f'Database error: {e}'}
@@ -572,6 +795,8 @@ async def startup_event():
 async def shutdown_event():
     """Shutdown event"""
     await venture_manager.shutdown()
+    # The app owns the process-wide pool, closed once every manager is done with it
+    await get_db_pool().close()
 
 # API Routes
 @app.get("/health")
@@ -594,11 +819,13 @@ async def list_ventures(
     limit: int = 20,
     stage: Optional[str] = None,
     industry: Optional[str] = None,
+    cursor: Optional[str] = None,
+    count: str = "estimated",
     current_user: User = Depends(get_current_user)
 ):
     """List ventures with pagination and filters"""
     return await venture_manager.list_ventures(
-        current_user.id, page, limit, stage, industry
+        current_user.id, page, limit, stage, industry, cursor, count
     )
 
 @app.get("/ventures/{venture_id}", response_model=VentureResponse)
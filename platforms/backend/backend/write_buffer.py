@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+📥 IZA OS Write-Behind Buffer
+============================
+Collects rows in memory and writes them in batches, once `max_size` rows are
+pending or `max_delay` seconds after the first one, so that high-volume writes
+cost one database round trip per batch instead of one per row.
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Dict, Generic, List, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+
+class WriteBehindBuffer(Generic[T]):
+    """In-process write-behind buffer with at-least-once flushing
+
+    `flush_batch` receives up to `max_size` rows and must write them atomically.
+    A batch whose write fails is retried in halves right away, so that a row the
+    database rejects does not hold back the rows queued behind it. A row that
+    still fails on its own is retried on the next flush, and after
+    `max_attempts` failures it is handed to `dead_letter` (or logged) and
+    dropped. Rows are otherwise written at least
+    once, unless more than `max_pending` pile up while the database is
+    unreachable, in which case the oldest are dropped. `close` flushes
+    everything left before returning.
+    """
+
+    def __init__(self,
+                 name: str,
+                 flush_batch: Callable[[List[T]], Awaitable[Any]],
+                 max_size: int = 500,
+                 max_delay: float = 1.0,
+                 max_pending: int = 100_000,
+                 retry_delay: float = 1.0,
+                 max_attempts: int = 3,
+                 dead_letter: Optional[Callable[[T, Exception], Any]] = None):
+        self.name = name
+        self.flush_batch = flush_batch
+        self.max_size = max_size
+        self.max_delay = max_delay
+        self.max_pending = max_pending
+        self.retry_delay = retry_delay
+        self.max_attempts = max_attempts
+        self.dead_letter = dead_letter
+
+        # [row, failed attempts on its own] entries
+        self.pending: deque = deque()
+        self._batch_size = max_size
+        self._stalled = False
+        self._first_pending_at: Optional[float] = None
+        self._flush_lock = asyncio.Lock()
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._closed = False
+
+        # Metrics
+        self.written = 0
+        self.batches = 0
+        self.failures = 0
+        self.dropped = 0
+        self.dead_lettered = 0
+
+    def add(self, row: T):
+        """Buffer a row, waking the flusher once a batch is full"""
+        if self._closed:
+            raise RuntimeError(f"Write buffer {self.name} is closed")
+        if not self.pending:
+            self._first_pending_at = time.monotonic()
+        self.pending.append([row, 0])
+        if len(self.pending) > self.max_pending:
+            self.pending.popleft()
+            self.dropped += 1
+        if len(self.pending) >= self.max_size:
+            self._wakeup.set()
+        self._ensure_started()
+
+    def add_many(self, rows: List[T]):
+        for row in rows:
+            self.add(row)
+
+    def _ensure_started(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._flush_loop())
+
+    async def flush(self) -> int:
+        """Write every pending row, returns the number written
+
+        Failed batches are split until the failing rows are isolated. Those are
+        set aside and the flush goes on with the rows behind them, unless two
+        rows in a row fail on their own, which looks like the database being
+        down rather than bad rows. Set-aside rows are charged an attempt when a
+        later write succeeded (the head row always is) and go back to the head
+        of the buffer, or to the dead letter sink once out of attempts.
+        """
+        written = 0
+        async with self._flush_lock:
+            self._stalled = False
+            set_aside = []
+            confirmed = 0
+            consecutive = 0
+            while self.pending:
+                size = min(self._batch_size, len(self.pending))
+                entries = [self.pending.popleft() for _ in range(size)]
+                try:
+                    await self.flush_batch([entry[0] for entry in entries])
+                except asyncio.CancelledError:
+                    self.pending.extendleft(reversed(entries))
+                    self.pending.extendleft(reversed([entry for entry, _ in set_aside]))
+                    raise
+                except Exception as e:
+                    self.failures += 1
+                    logger.error(f"❌ Write buffer {self.name} failed to flush {size} rows: {e}")
+                    if size > 1:
+                        self.pending.extendleft(reversed(entries))
+                        self._batch_size = max(size // 2, 1)
+                        continue
+                    set_aside.append((entries[0], e))
+                    consecutive += 1
+                    if consecutive >= 2:
+                        break
+                    continue
+                written += size
+                self.written += size
+                self.batches += 1
+                self._batch_size = min(self._batch_size * 2, self.max_size)
+                consecutive = 0
+                confirmed = len(set_aside)
+
+            kept = []
+            for i, (entry, error) in enumerate(set_aside):
+                if i == 0 or i < confirmed:
+                    entry[1] += 1
+                if entry[1] >= self.max_attempts:
+                    self._dead_letter(entry[0], error)
+                else:
+                    kept.append(entry)
+            self.pending.extendleft(reversed(kept))
+            self._stalled = bool(set_aside) and bool(self.pending)
+            if not self.pending:
+                self._first_pending_at = None
+        return written
+
+    def _dead_letter(self, row: T, error: Exception):
+        self.dead_lettered += 1
+        if self.dead_letter is None:
+            logger.error(f"❌ Write buffer {self.name} dropped a row after {self.max_attempts} attempts: {row!r}")
+            return
+        try:
+            self.dead_letter(row, error)
+        except Exception as e:
+            logger.error(f"❌ Write buffer {self.name} dead letter sink failed: {e}")
+
+    async def _flush_loop(self):
+        while not self._closed:
+            if self._first_pending_at is None:
+                timeout = self.max_delay
+            else:
+                timeout = max(self._first_pending_at + self.max_delay - time.monotonic(), 0)
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+            if self.pending and (
+                len(self.pending) >= self.max_size
+                or time.monotonic() - self._first_pending_at >= self.max_delay
+            ):
+                await self.flush()
+                if self._stalled:
+                    await asyncio.sleep(self.retry_delay)
+
+    async def close(self, attempts: int = 3):
+        """Stop the flusher and write the remaining rows"""
+        self._closed = True
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+        for attempt in range(attempts):
+            await self.flush()
+            if not self.pending:
+                break
+            await asyncio.sleep(self.retry_delay)
+        if self.pending:
+            logger.error(f"❌ Write buffer {self.name} closed with {len(self.pending)} unwritten rows")
+        else:
+            logger.info(f"✅ Write buffer {self.name} flushed")
+
+    def get_metrics(self) -> Dict[str, int]:
+        return {
+            'pending': len(self.pending),
+            'written': self.written,
+            'batches': self.batches,
+            'failures': self.failures,
+            'dropped': self.dropped,
+            'dead_lettered': self.dead_lettered,
+        }
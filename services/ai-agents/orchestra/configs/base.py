@@ -32,6 +32,7 @@ deep_analyzer_tool_config  = dict(
     type="deep_analyzer_tool",
     analyzer_model_ids = ["gemini-2.5-pro"],
     summarizer_model_id = "gemini-2.5-pro",
+    pdf_page_workers = None, # None for one worker per CPU core, 1 to convert PDFs serially
 )
 
 mcp_tools_config = {
@@ -63,6 +64,14 @@ video_generator_tool_config = dict(
     fetch_model_id = "veo3-fetch",
 )
 
+planning_tool_config = dict(
+    type="planning_tool",
+    # Plans are kept in memory per tool instance, so concurrent tasks do not share plan
+    # ids or the active plan. Set plans_path (relative to the experiment directory) to
+    # persist them, every tool built on that file then shares the same plans.
+    plans_path=None,
+)
+
 file_reader_tool_config = dict(
     type="file_reader_tool"
 )
@@ -3,6 +3,7 @@ _base_ = './base.py'
 # General Config
 tag = "hle"
 concurrency = 1
+task_timeout = None # Seconds before a task is cancelled and recorded as failed, None for no limit
 workdir = "workdir"
 log_path = "log.txt"
 save_path = "dra.jsonl"
@@ -15,6 +16,9 @@ dataset = dict(
     name="hle",
     path="data/hle",
     split="test",
+    # Split the tasks across runner processes, each one running a contiguous shard
+    num_shards=1,
+    shard_index=0,
 )
 
 deep_researcher_agent_config = dict(
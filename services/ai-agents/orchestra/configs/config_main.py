@@ -6,6 +6,8 @@ concurrency = 1
 workdir = "workdir"
 log_path = "log.txt"
 save_path = "dra.jsonl"
+trace_path = None # e.g. "trace.json" to record spans, open it in chrome://tracing or Perfetto
+trace_format = "chrome" # "chrome" or "otlp"
 use_local_proxy = False # True for local proxy, False for public proxy
 
 use_hierarchical_agent = True
@@ -4,12 +4,9 @@ warnings.simplefilter("ignore", DeprecationWarning)
 import os
 import sys
 from pathlib import Path
-import pandas as pd
-from typing import List
-import json
 from datetime import datetime
+from functools import partial
 import asyncio
-import threading
 import argparse
 from mmengine import DictAction
 
@@ -22,72 +19,22 @@ from src.models import model_manager
 from src.metric import question_scorer
 from src.agent import create_agent, prepare_response
 from src.registry import DATASET
+from src.runner import AnswersLog, BenchmarkRunner, make_error_entry
 
-append_answer_lock = threading.Lock()
+def is_answer_done(entry: dict) -> bool:
+    """Previous answers that are kept on resume, the other tasks are run again."""
+    prediction = entry.get("prediction")
+    truth = entry.get("true_answer")
 
-def append_answer(entry: dict, jsonl_file: str) -> None:
-    jsonl_file = Path(jsonl_file)
-    jsonl_file.parent.mkdir(parents=True, exist_ok=True)
-    with append_answer_lock, open(jsonl_file, "a", encoding="utf-8") as fp:
-        fp.write(json.dumps(entry) + "\n")
-    assert os.path.exists(jsonl_file), "File not found!"
-    print("Answer exported to file:", jsonl_file.resolve())
+    # If the prediction is "Unable to determine", we set it to None
+    if prediction is None or str(prediction) == "Unable to determine":
+        return False
 
-def filter_answers(answers_file):
-    answer_df = pd.read_json(answers_file, lines=True)
-
-    filttered_df = []
-    for row in answer_df.iterrows():
-        row = row[1]
-
-        prediction = row['prediction']
-        truth = row['true_answer']
-
-        # If the prediction is "Unable to determine", we set it to None
-        if str(prediction) == "Unable to determine":
-            prediction = None
-
-        # Processing the test dataset that not contains the true answer
-        if truth == "?":
-            if prediction is not None:
-                filttered_df.append(row)
-        # Processing the validation dataset that contains the true answer
-        else:
-            if prediction is not None:
-                prediction = str(prediction)
-                score = question_scorer(prediction, truth)
-                if score:
-                    filttered_df.append(row)
-
-    filttered_df = pd.DataFrame(filttered_df)
-    filttered_df.to_json(answers_file, lines=True, orient='records')
-
-    logger.info(f"Previous answers filtered! {len(answer_df)} -> {len(filttered_df)}")
-
-def get_tasks_to_run(answers_file, dataset) -> List[dict]:
-    
-    data = dataset.data
-
-    logger.info(f"Loading answers from {answers_file}...")
-    try:
-        if os.path.exists(answers_file):
-            logger.info("Filtering answers starting.")
-            filter_answers(answers_file)
-            logger.info("Filtering answers ending.")
-
-            df = pd.read_json(answers_file, lines=True)
-            if "task_id" not in df.columns:
-                logger.warning(f"Answers file {answers_file} does not contain 'task_id' column. Please check the file format.")
-                return []
-            done_questions = df["task_id"].tolist()
-            logger.info(f"Found {len(done_questions)} previous results!")
-        else:
-            done_questions = []
-    except Exception as e:
-        logger.warning("Error when loading records: ", e)
-        logger.warning("No usable records! ▶️ Starting new.")
-        done_questions = []
-    return [line for line in data.to_dict(orient="records") if line["task_id"] not in done_questions]
+    # Processing the test dataset that not contains the true answer
+    if truth == "?":
+        return True
+    # Processing the validation dataset that contains the true answer
+    return bool(question_scorer(str(prediction), truth))
 
 async def answer_single_question(config, example):
 
@@ -153,7 +100,7 @@ async def answer_single_question(config, example):
         "task_id": example["task_id"],
         "true_answer": example["true_answer"],
     }
-    append_answer(annotated_example, config.save_path)
+    return annotated_example
 
 def parse_args():
     parser = argparse.ArgumentParser(description='main')
@@ -192,17 +139,21 @@ async def main():
     dataset = DATASET.build(config.dataset)
     logger.info(f"| Loaded dataset: {len(dataset)} examples.")
 
-    # Load answers
-    tasks_to_run = get_tasks_to_run(config.save_path, dataset)
+    # Load answers, tasks without a correct previous answer are run again
+    answers_log = AnswersLog(config.save_path, is_done=is_answer_done)
+    runner = BenchmarkRunner(
+        answer_fn=partial(answer_single_question, config),
+        answers_log=answers_log,
+        error_entry_fn=partial(make_error_entry, config),
+        concurrency=getattr(config, "concurrency", 4),
+        task_timeout=getattr(config, "task_timeout", None),
+    )
+    tasks_to_run = runner.tasks_to_run(dataset, task_ids=dataset.task_ids)
     tasks_to_run = [task for task in tasks_to_run[:1]]
     logger.info(f"| Loaded {len(tasks_to_run)} tasks to run.")
 
-    # Run tasks
-    batch_size = getattr(config, "concurrency", 4)
-    for i in range(0, len(tasks_to_run), batch_size):
-        batch = tasks_to_run[i:min(i + batch_size, len(tasks_to_run))]
-        await asyncio.gather(*[answer_single_question(config, task) for task in batch])
-        logger.info(f"| Batch {i // batch_size + 1} done.")
+    # Run tasks, each worker pulls the next task as soon as it is free
+    await runner.run(tasks_to_run)
 
 if __name__ == '__main__':
     asyncio.run(main())
\ No newline at end of file
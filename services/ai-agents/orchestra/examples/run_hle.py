@@ -4,12 +4,9 @@ warnings.simplefilter("ignore", DeprecationWarning)
 import os
 import sys
 from pathlib import Path
-import pandas as pd
-from typing import List
-import json
 from datetime import datetime
+from functools import partial
 import asyncio
-import threading
 import argparse
 from mmengine import DictAction
 
@@ -20,42 +17,13 @@ from src.logger import logger
 from src.config import config
 from src.models import model_manager
 from src.agent import create_agent, prepare_response
-from src.dataset import HLEDataset
-from src.utils import assemble_project_path
-
-append_answer_lock = threading.Lock()
-
-def append_answer(entry: dict, jsonl_file: str) -> None:
-    jsonl_file = Path(jsonl_file)
-    jsonl_file.parent.mkdir(parents=True, exist_ok=True)
-    with append_answer_lock, open(jsonl_file, "a", encoding="utf-8") as fp:
-        fp.write(json.dumps(entry) + "\n")
-    assert os.path.exists(jsonl_file), "File not found!"
-    print("Answer exported to file:", jsonl_file.resolve())
-
-def get_tasks_to_run(answers_file, dataset) -> List[dict]:
-
-    data = dataset.data
-
-    logger.info(f"Loading answers from {answers_file}...")
-    try:
-        if os.path.exists(answers_file):
-            
-            done_questions = pd.read_json(answers_file, lines=True)["task_id"].tolist()
-            logger.info(f"Found {len(done_questions)} previous results!")
-            
-        else:
-            done_questions = []
-    except Exception as e:
-        logger.warning("Error when loading records: ", e)
-        logger.warning("No usable records! ▶️ Starting new.")
-        done_questions = []
-    return [line for line in data.to_dict(orient="records") if line["task_id"] not in done_questions]
+from src.registry import DATASET
+from src.runner import AnswersLog, BenchmarkRunner, make_error_entry
 
 async def answer_single_question(config, example):
 
     agent = await create_agent(config)
-    logger.visualize_agent_tree()
+    logger.visualize_agent_tree(agent)
 
     logger.info(f"Task Id: {example['task_id']}, Final Answer: {example['true_answer']}")
 
@@ -114,7 +82,7 @@ async def answer_single_question(config, example):
         "task_id": example["task_id"],
         "true_answer": example["true_answer"],
     }
-    append_answer(annotated_example, config.save_path)
+    return annotated_example
 
 
 def parse_args():
@@ -155,17 +123,20 @@ async def main():
     dataset = DATASET.build(config.dataset)
     logger.info(f"| Loaded dataset: {len(dataset)} examples.")
 
-    # Load answers
-    tasks_to_run = get_tasks_to_run(config.save_path, dataset)
-    tasks_to_run = [task for task in tasks_to_run]
+    # Load answers, every task with a previous answer is skipped
+    answers_log = AnswersLog(config.save_path)
+    runner = BenchmarkRunner(
+        answer_fn=partial(answer_single_question, config),
+        answers_log=answers_log,
+        error_entry_fn=partial(make_error_entry, config),
+        concurrency=getattr(config, "concurrency", 4),
+        task_timeout=getattr(config, "task_timeout", None),
+    )
+    tasks_to_run = runner.tasks_to_run(dataset, task_ids=dataset.task_ids)
     logger.info(f"| Loaded {len(tasks_to_run)} tasks to run.")
 
-    # Run tasks
-    batch_size = getattr(config, "concurrency", 4)
-    for i in range(0, len(tasks_to_run), batch_size):
-        batch = tasks_to_run[i:min(i + batch_size, len(tasks_to_run))]
-        await asyncio.gather(*[answer_single_question(config, task) for task in batch])
-        logger.info(f"| Batch {i // batch_size + 1} done.")
+    # Run tasks, each worker pulls the next task as soon as it is free
+    await runner.run(tasks_to_run)
 
 if __name__ == '__main__':
     asyncio.run(main())
\ No newline at end of file
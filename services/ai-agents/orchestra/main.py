@@ -8,7 +8,7 @@ from mmengine import DictAction
 root = str(Path(__file__).resolve().parents[0])
 sys.path.append(root)
 
-from src.logger import logger
+from src.logger import logger, tracer
 from src.config import config
 from src.models import model_manager
 from src.agent import create_agent
@@ -43,6 +43,10 @@ async def main():
     logger.info(f"| Logger initialized at: {config.log_path}")
     logger.info(f"| Config:\n{config.pretty_text}")
 
+    # Span tracing costs nothing measurable when off, enable it with `trace_path`
+    if config.get("trace_path", None):
+        tracer.enable()
+
     # Registed models
     model_manager.init_models(use_local_proxy=True)
     logger.info("| Registed models: %s", ", ".join(model_manager.registed_models.keys()))
@@ -56,5 +60,9 @@ async def main():
     res = await agent.run(task)
     logger.info(f"| Result: {res}")
 
+    if tracer.enabled:
+        tracer.export(config.trace_path, format=config.get("trace_format", "chrome"))
+        logger.info(f"| Trace saved at: {config.trace_path}")
+
 if __name__ == '__main__':
     asyncio.run(main())
\ No newline at end of file
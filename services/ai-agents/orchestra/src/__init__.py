@@ -2,10 +2,19 @@ from .tools import (
     Tool,
     ToolResult,
     AsyncTool,
-    DeepAnalyzerTool,
-    DeepResearcherTool,
-    PythonInterpreterTool,
-    AutoBrowserUseTool,
-    PlanningTool,
     make_tool_instance,
-)
\ No newline at end of file
+)
+
+_LAZY_TOOLS = [
+    "DeepAnalyzerTool",
+    "DeepResearcherTool",
+    "PythonInterpreterTool",
+    "AutoBrowserUseTool",
+    "PlanningTool",
+]
+
+def __getattr__(name):
+    if name in _LAZY_TOOLS:
+        from . import tools
+        return getattr(tools, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
\ No newline at end of file
@@ -1,10 +1,23 @@
-from src.agent.planning_agent import PlanningAgent
-from src.agent.browser_use_agent import BrowserUseAgent
-from src.agent.deep_analyzer_agent import DeepAnalyzerAgent
-from src.agent.deep_researcher_agent import DeepResearcherAgent
-from src.agent.general_agent import GeneralAgent
-from src.agent.agent import create_agent
-from src.agent.reformulator import prepare_response
+import importlib
+
+# Agents are imported on first access, each one pulls in the tools and models it uses
+_LAZY_IMPORTS = {
+    "PlanningAgent": "src.agent.planning_agent",
+    "BrowserUseAgent": "src.agent.browser_use_agent",
+    "DeepAnalyzerAgent": "src.agent.deep_analyzer_agent",
+    "DeepResearcherAgent": "src.agent.deep_researcher_agent",
+    "GeneralAgent": "src.agent.general_agent",
+    "create_agent": "src.agent.agent",
+    "prepare_response": "src.agent.reformulator",
+}
+
+def __getattr__(name):
+    if name in _LAZY_IMPORTS:
+        value = getattr(importlib.import_module(_LAZY_IMPORTS[name]), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 __all__ = [
     "PlanningAgent",
@@ -1,3 +1,4 @@
+import os
 from typing import List, Dict, Any
 
 from src.registry import AGENT, TOOL
@@ -5,6 +6,7 @@ from src.models import model_manager
 from src.tools import make_tool_instance
 from src.mcp.mcpadapt import MCPAdapt, AsyncToolAdapter
 from src.logger import logger
+from src.utils import assemble_project_path
 
 AUTHORIZED_IMPORTS = [
     "pandas",
@@ -99,7 +101,9 @@ async def build_agent(config,
 async def create_agent(config):
 
     # Load MCP tools
-    mcpadapt = MCPAdapt(config.mcp_tools_config, AsyncToolAdapter())
+    mcpadapt = MCPAdapt(config.mcp_tools_config,
+                        AsyncToolAdapter(),
+                        cache_dir=assemble_project_path(os.path.join(config.workdir, "mcp_cache")))
     mcpadapt_tools = await mcpadapt.tools()
     
     if config.use_hierarchical_agent:
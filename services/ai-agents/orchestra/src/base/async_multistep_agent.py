@@ -67,6 +67,7 @@ from src.logger import (
     Monitor,
     Timing,
     TokenUsage,
+    tracer,
 )
 
 from src.tools import AsyncTool
@@ -392,7 +393,8 @@ You have been provided with these additional arguments, that you can access usin
         run_start_time = time.time()
         # Outputs are returned only at the end. We only look at the last step.
 
-        steps = [step async for step in self._run_stream(task=self.task, max_steps=max_steps, images=images)]
+        with tracer.span(f"{self.name}.run", category="agent", agent=self.name, max_steps=max_steps):
+            steps = [step async for step in self._run_stream(task=self.task, max_steps=max_steps, images=images)]
         assert isinstance(steps[-1], FinalAnswerStep)
         output = steps[-1].output
 
@@ -444,12 +446,14 @@ You have been provided with these additional arguments, that you can access usin
                 self.step_number == 1 or (self.step_number - 1) % self.planning_interval == 0
             ):
                 planning_start_time = time.time()
-                planning_step = None
-                async for element in self._generate_planning_step(
-                    task, is_first_step=len(self.memory.steps) == 1, step=self.step_number
-                ):  # Don't use the attribute step_number here, because there can be steps from previous runs
-                    yield element
-                    planning_step = element
+                with tracer.span("planning", category="planning", agent=self.name, step=self.step_number) as span:
+                    planning_step = None
+                    async for element in self._generate_planning_step(
+                        task, is_first_step=len(self.memory.steps) == 1, step=self.step_number
+                    ):  # Don't use the attribute step_number here, because there can be steps from previous runs
+                        with span.suspended():
+                            yield element
+                        planning_step = element
                 assert isinstance(planning_step, PlanningStep)  # Last yielded element should be a PlanningStep
                 self.memory.steps.append(planning_step)
                 planning_end_time = time.time()
@@ -466,29 +470,32 @@ You have been provided with these additional arguments, that you can access usin
                 observations_images=images,
             )
             self.logger.log_rule(f"Step {self.step_number}", level=LogLevel.INFO)
-            try:
-                async for output in self._step_stream(action_step):
-                    # Yield streaming deltas
-                    if not isinstance(output, (ActionOutput, ToolOutput)):
-                        yield output
-
-                    if isinstance(output, (ActionOutput, ToolOutput)) and output.is_final_answer:
-                        if self.final_answer_checks:
-                            self._validate_final_answer(output.output)
-                        returned_final_answer = True
-                        action_step.is_final_answer = True
-                        final_answer = output.output
-            except AgentGenerationError as e:
-                # Agent generation errors are not caused by a Model error but an implementation error: so we should raise them and exit.
-                raise e
-            except AgentError as e:
-                # Other AgentError types are caused by the Model, so we should log them and iterate.
-                action_step.error = e
-            finally:
-                self._finalize_step(action_step)
-                self.memory.steps.append(action_step)
-                yield action_step
-                self.step_number += 1
+            with tracer.span(f"step {self.step_number}", category="step", agent=self.name, step=self.step_number) as span:
+                try:
+                    async for output in self._step_stream(action_step):
+                        # Yield streaming deltas
+                        if not isinstance(output, (ActionOutput, ToolOutput)):
+                            with span.suspended():
+                                yield output
+
+                        if isinstance(output, (ActionOutput, ToolOutput)) and output.is_final_answer:
+                            if self.final_answer_checks:
+                                self._validate_final_answer(output.output)
+                            returned_final_answer = True
+                            action_step.is_final_answer = True
+                            final_answer = output.output
+                except AgentGenerationError as e:
+                    # Agent generation errors are not caused by a Model error but an implementation error: so we should raise them and exit.
+                    raise e
+                except AgentError as e:
+                    # Other AgentError types are caused by the Model, so we should log them and iterate.
+                    action_step.error = e
+                finally:
+                    self._finalize_step(action_step)
+                    self.memory.steps.append(action_step)
+                    with span.suspended():
+                        yield action_step
+                    self.step_number += 1
 
         if not returned_final_answer and self.step_number == max_steps + 1:
             final_answer = await self._handle_max_steps_reached(task, images)
@@ -33,6 +33,7 @@ from src.models import (
 )
 from src.logger import (
     LogLevel,
+    tracer,
 )
 
 from src.tools import Tool
@@ -170,7 +171,8 @@ class CodeAgent(MultiStepAgent):
         Yields ChatMessageStreamDelta during the run if streaming is enabled.
         At the end, yields either None if the step is not final, or the final answer.
         """
-        memory_messages = self.write_memory_to_messages()
+        with tracer.span("write_memory_to_messages", category="prompt"):
+            memory_messages = self.write_memory_to_messages()
 
         input_messages = memory_messages.copy()
         ### Generate model output ###
@@ -187,23 +189,26 @@ class CodeAgent(MultiStepAgent):
                     stop_sequences=["<end_code>", "Observation:", "Calling tools:"],
                     **additional_args,
                 )
-                chat_message_stream_deltas: list[ChatMessageStreamDelta] = []
-                with Live("", console=self.logger.console, vertical_overflow="visible") as live:
-                    for event in output_stream:
-                        chat_message_stream_deltas.append(event)
-                        live.update(
-                            Markdown(agglomerate_stream_deltas(chat_message_stream_deltas).render_as_markdown())
-                        )
-                        yield event
+                with tracer.span("model.generate_stream", category="stream", model_id=self.model.model_id) as span:
+                    chat_message_stream_deltas: list[ChatMessageStreamDelta] = []
+                    with Live("", console=self.logger.console, vertical_overflow="visible") as live:
+                        for event in output_stream:
+                            chat_message_stream_deltas.append(event)
+                            live.update(
+                                Markdown(agglomerate_stream_deltas(chat_message_stream_deltas).render_as_markdown())
+                            )
+                            with span.suspended():
+                                yield event
                 chat_message = agglomerate_stream_deltas(chat_message_stream_deltas)
                 memory_step.model_output_message = chat_message
                 output_text = chat_message.content
             else:
-                chat_message: ChatMessage = self.model.generate(
-                    input_messages,
-                    stop_sequences=["<end_code>", "Observation:", "Calling tools:"],
-                    **additional_args,
-                )
+                with tracer.span("model.generate", category="model", model_id=self.model.model_id):
+                    chat_message: ChatMessage = self.model.generate(
+                        input_messages,
+                        stop_sequences=["<end_code>", "Observation:", "Calling tools:"],
+                        **additional_args,
+                    )
                 memory_step.model_output_message = chat_message
                 output_text = chat_message.content
                 self.logger.log_markdown(
@@ -247,7 +252,8 @@ class CodeAgent(MultiStepAgent):
         self.logger.log_code(title="Executing parsed code:", content=code_action, level=LogLevel.INFO)
         is_final_answer = False
         try:
-            output, execution_logs, is_final_answer = self.python_executor(code_action)
+            with tracer.span("python_executor", category="tool", agent=self.name):
+                output, execution_logs, is_final_answer = self.python_executor(code_action)
             execution_outputs_console = []
             if len(execution_logs) > 0:
                 execution_outputs_console += [
@@ -36,6 +36,7 @@ from src.models import (
 )
 from src.logger import (
     LogLevel,
+    tracer,
 )
 
 from src.tools import Tool
@@ -129,7 +130,8 @@ class ToolCallingAgent(MultiStepAgent):
         Yields ChatMessageStreamDelta during the run if streaming is enabled.
         At the end, yields either None if the step is not final, or the final answer.
         """
-        memory_messages = self.write_memory_to_messages()
+        with tracer.span("write_memory_to_messages", category="prompt"):
+            memory_messages = self.write_memory_to_messages()
 
         input_messages = memory_messages.copy()
 
@@ -144,21 +146,24 @@ class ToolCallingAgent(MultiStepAgent):
                     tools_to_call_from=self.tools_and_managed_agents,
                 )
 
-                chat_message_stream_deltas: list[ChatMessageStreamDelta] = []
-                with Live("", console=self.logger.console, vertical_overflow="visible") as live:
-                    for event in output_stream:
-                        chat_message_stream_deltas.append(event)
-                        live.update(
-                            Markdown(agglomerate_stream_deltas(chat_message_stream_deltas).render_as_markdown())
-                        )
-                        yield event
+                with tracer.span("model.generate_stream", category="stream", model_id=self.model.model_id) as span:
+                    chat_message_stream_deltas: list[ChatMessageStreamDelta] = []
+                    with Live("", console=self.logger.console, vertical_overflow="visible") as live:
+                        for event in output_stream:
+                            chat_message_stream_deltas.append(event)
+                            live.update(
+                                Markdown(agglomerate_stream_deltas(chat_message_stream_deltas).render_as_markdown())
+                            )
+                            with span.suspended():
+                                yield event
                 chat_message = agglomerate_stream_deltas(chat_message_stream_deltas)
             else:
-                chat_message: ChatMessage = self.model.generate(
-                    input_messages,
-                    stop_sequences=["Observation:", "Calling tools:"],
-                    tools_to_call_from=self.tools_and_managed_agents,
-                )
+                with tracer.span("model.generate", category="model", model_id=self.model.model_id):
+                    chat_message: ChatMessage = self.model.generate(
+                        input_messages,
+                        stop_sequences=["Observation:", "Calling tools:"],
+                        tools_to_call_from=self.tools_and_managed_agents,
+                    )
 
                 self.logger.log_markdown(
                     content=chat_message.content if chat_message.content else str(chat_message.raw),
@@ -324,13 +329,16 @@ class ToolCallingAgent(MultiStepAgent):
         is_managed_agent = tool_name in self.managed_agents
 
         try:
-            # Call tool with appropriate arguments
-            if isinstance(arguments, dict):
-                return tool(**arguments) if is_managed_agent else tool(**arguments, sanitize_inputs_outputs=True)
-            elif isinstance(arguments, str):
-                return tool(arguments) if is_managed_agent else tool(arguments, sanitize_inputs_outputs=True)
-            else:
-                raise TypeError(f"Unsupported arguments type: {type(arguments)}")
+            # Call tool with appropriate arguments, managed agents nest their own spans under this one
+            with tracer.span(tool_name,
+                             category="managed_agent" if is_managed_agent else "tool",
+                             agent=self.name):
+                if isinstance(arguments, dict):
+                    return tool(**arguments) if is_managed_agent else tool(**arguments, sanitize_inputs_outputs=True)
+                elif isinstance(arguments, str):
+                    return tool(arguments) if is_managed_agent else tool(arguments, sanitize_inputs_outputs=True)
+                else:
+                    raise TypeError(f"Unsupported arguments type: {type(arguments)}")
 
         except TypeError as e:
             # Handle invalid arguments
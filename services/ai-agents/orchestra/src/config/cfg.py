@@ -19,6 +19,9 @@ def process_general(config: MMConfig) -> MMConfig:
     if "save_path" in config:
         config.save_path = os.path.join(config.exp_path, getattr(config, 'save_path', 'dra.json'))
 
+    if config.get("trace_path", None):
+        config.trace_path = os.path.join(config.exp_path, config.trace_path)
+
     return config
 
 def process_mcp(config: MMConfig) -> MMConfig:
@@ -1,80 +1,127 @@
 import os
+import hashlib
 import pandas as pd
 import datasets
 import base64
+import threading
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Iterator, List, Optional
 
 from src.utils import assemble_project_path
 from src.logger import logger
 from src.registry import DATASET
 
-@DATASET.register_module(name="gaia_dataset", force=True)
-class GAIADataset():
-    def __init__(self, path, name, split):
+
+class HuggingFaceDataset(ABC):
+    """A dataset backed by the memory-mapped Arrow table of `datasets`.
+
+    Columns are renamed with a fingerprint derived from the source table, so the Arrow
+    cache is reused across runs. Rows are only materialized, and their file paths
+    resolved, when they are accessed. `num_shards` and `shard_index` select a contiguous
+    slice of the rows, so several runner processes can split a dataset.
+    """
+    # Bump when `resolve_row` changes, to invalidate cached tables
+    version = "1"
+    rename_map: Dict[str, str] = {}
+
+    def __init__(self, path, name, split, num_shards: int = 1, shard_index: int = 0):
         self.path = path
         self.name = name
         self.split = split
+        self.num_shards = num_shards
+        self.shard_index = shard_index
 
-        path = assemble_project_path(path)
-        ds = datasets.load_dataset(path, name, trust_remote_code=True)[split]
-        ds = ds.rename_columns({"Question": "question", "Final answer": "true_answer", "Level": "task"})
-        ds = ds.map(self.preprocess_file_paths, load_from_cache_file=False, fn_kwargs={"split": split, "path": path})
-        
-        data = pd.DataFrame(ds)
-        
-        self.data = data
-        
-    def preprocess_file_paths(self, row, path, split):
-        save_path = assemble_project_path(os.path.join(path, "2023", split))
-        os.makedirs(save_path, exist_ok=True)
-        if len(row["file_name"]) > 0:
-            row["file_name"] = os.path.join(save_path, row["file_name"])
+        self.root = assemble_project_path(path)
+        ds = self.load(self.root, name, split)
+        ds = ds.rename_columns(self.rename_map, new_fingerprint=self.get_fingerprint(ds))
+        if num_shards > 1:
+            ds = ds.shard(num_shards=num_shards, index=shard_index, contiguous=True)
+        self.ds = ds
+        self._data: Optional[pd.DataFrame] = None
+
+    @abstractmethod
+    def load(self, path: str, name: str, split: str) -> datasets.Dataset:
+        """Load the split of the source dataset."""
+
+    def resolve_row(self, row: Dict[str, Any]) -> Dict[str, Any]:
         return row
-    
+
+    def get_fingerprint(self, ds: datasets.Dataset) -> str:
+        key = f"{ds._fingerprint}-{self.__class__.__name__}-{sorted(self.rename_map.items())}-{self.version}"
+        return hashlib.sha256(key.encode("utf-8")).hexdigest()[:16]
+
+    @property
+    def task_ids(self) -> List[Any]:
+        """Task ids read from their column, without materializing the rows."""
+        return self.ds["task_id"]
+
+    @property
+    def data(self) -> pd.DataFrame:
+        """All the rows as a DataFrame, materialized on first access."""
+        if self._data is None:
+            self._data = pd.DataFrame(list(self))
+        return self._data
+
     def __len__(self):
-        return len(self.data)
-    
+        return len(self.ds)
+
     def __getitem__(self, index):
-        return self.data.iloc[index]
+        return self.resolve_row(self.ds[int(index)])
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for row in self.ds:
+            yield self.resolve_row(row)
+
+
+@DATASET.register_module(name="gaia_dataset", force=True)
+class GAIADataset(HuggingFaceDataset):
+    rename_map = {"Question": "question", "Final answer": "true_answer", "Level": "task"}
+
+    def __init__(self, path, name, split, **kwargs):
+        super(GAIADataset, self).__init__(path, name, split, **kwargs)
+        self.save_path = assemble_project_path(os.path.join(self.root, "2023", split))
+        os.makedirs(self.save_path, exist_ok=True)
+
+    def load(self, path: str, name: str, split: str) -> datasets.Dataset:
+        return datasets.load_dataset(path, name, trust_remote_code=True)[split]
+
+    def resolve_row(self, row: Dict[str, Any]) -> Dict[str, Any]:
+        if len(row["file_name"]) > 0:
+            row["file_name"] = os.path.join(self.save_path, row["file_name"])
+        return row
+
 
 @DATASET.register_module(name="hle_dataset", force=True)
-class HLEDataset():
-    def __init__(self, path, name, split):
-        self.path = path
-        self.name = name
-        self.split = split
+class HLEDataset(HuggingFaceDataset):
+    rename_map = {"answer": "true_answer", "id": "task_id"}
 
-        path = assemble_project_path(path)
-        ds = datasets.load_dataset(path, trust_remote_code=True)[split]
-        ds = ds.rename_columns({"answer": "true_answer", "id": "task_id"})
-        ds = ds.map(self.preprocess_file_paths, load_from_cache_file=False, fn_kwargs={"split": split, "path": path})
+    def __init__(self, path, name, split, **kwargs):
+        super(HLEDataset, self).__init__(path, name, split, **kwargs)
+        self.save_path = assemble_project_path(os.path.join(self.root, "images", split))
+        os.makedirs(self.save_path, exist_ok=True)
 
-        data = pd.DataFrame(ds)
-        self.data = data
-        
-    def preprocess_file_paths(self, row, path, split):
-        save_path = assemble_project_path(os.path.join(path, "images", split))
-        os.makedirs(save_path, exist_ok=True)
+    def load(self, path: str, name: str, split: str) -> datasets.Dataset:
+        return datasets.load_dataset(path, trust_remote_code=True)[split]
 
+    def resolve_row(self, row: Dict[str, Any]) -> Dict[str, Any]:
         image_path = ""
         if len(row["image"]) > 0:
             image_string = row["image"]
             task_id = row["task_id"]
             if image_string.startswith('data:image'):
                 image_type = image_string.split(';')[0].split('/')[1]
-                image_base64 = image_string.split(',')[1]
+                image_path = os.path.join(self.save_path, f"{task_id}.{image_type}")
 
-                image_path = os.path.join(save_path, f"{task_id}.{image_type}")
-                with open(image_path, "wb") as f:
-                    f.write(base64.b64decode(image_base64))
-                logger.info(f"Save image {task_id} to {image_path}")
-            else:
-                image_path = ""
+                # Images are decoded once, on the first access to their row. They are
+                # written under a temp name, so that a crashed or concurrent writer
+                # never leaves a truncated image behind the final path.
+                if not os.path.exists(image_path):
+                    image_base64 = image_string.split(',')[1]
+                    tmp_path = f"{image_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+                    with open(tmp_path, "wb") as f:
+                        f.write(base64.b64decode(image_base64))
+                    os.replace(tmp_path, image_path)
+                    logger.info(f"Save image {task_id} to {image_path}")
 
         row["file_name"] = image_path
         return row
-        
-    def __len__(self):
-        return len(self.data)
-    
-    def __getitem__(self, index):
-        return self.data.iloc[index]
\ No newline at end of file
@@ -1,5 +1,7 @@
 from .logger import logger, LogLevel, AgentLogger, YELLOW_HEX
 from .monitor import Monitor, Timing, TokenUsage
+from .pipeline import LogPipeline, ConsoleSink, JsonlFileSink
+from .tracing import Tracer, Span, tracer
 
 __all__ = ["logger",
            "LogLevel",
@@ -7,4 +9,10 @@ __all__ = ["logger",
            "Monitor",
            "YELLOW_HEX",
            "Timing",
-           "TokenUsage"]
\ No newline at end of file
+           "TokenUsage",
+           "LogPipeline",
+           "ConsoleSink",
+           "JsonlFileSink",
+           "Tracer",
+           "Span",
+           "tracer"]
\ No newline at end of file
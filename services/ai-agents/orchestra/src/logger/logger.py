@@ -1,7 +1,8 @@
+import atexit
 import logging
 import json
 from enum import IntEnum
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 
 from rich import box
 from rich.console import Console, Group
@@ -15,6 +16,14 @@ from src.utils import (
     escape_code_brackets,
     Singleton
 )
+from src.logger.pipeline import (
+    LogPipeline,
+    ConsoleSink,
+    JsonlFileSink,
+    PipelineHandler,
+    make_record,
+)
+from src.logger.tracing import tracer
 
 YELLOW_HEX = "#d4b702"
 
@@ -24,6 +33,13 @@ class LogLevel(IntEnum):
     INFO = 1  # Normal output (default)
     DEBUG = 2  # Detailed output
 
+_LOGGING_LEVELS = {
+    LogLevel.OFF: logging.CRITICAL,
+    LogLevel.ERROR: logging.ERROR,
+    LogLevel.INFO: logging.INFO,
+    LogLevel.DEBUG: logging.DEBUG,
+}
+
 class AgentLogger(logging.Logger, metaclass=Singleton):
     def __init__(self, name="logger", level=logging.INFO):
         # Initialize the parent class
@@ -35,35 +51,137 @@ class AgentLogger(logging.Logger, metaclass=Singleton):
             datefmt="%H:%M:%S",
         )
 
-    def init_logger(self, log_path: str, level=logging.INFO):
+        # Rich records are printed directly until `init_logger` starts the pipeline
+        self.console = Console(width=100)
+        self.pipeline: Optional[LogPipeline] = None
+        self.handler: Optional[PipelineHandler] = None
+        # Registered once, closes whichever pipeline is running at exit
+        atexit.register(self.close)
+
+    def init_logger(self,
+                    log_path: str,
+                    level=logging.INFO,
+                    max_queue_size: int = 10000,
+                    overflow_policy: str = "block",
+                    sample_every: int = 10):
         """
-        Initialize the logger with a file path and optional main process check.
+        Initialize the logger with a file path.
+
+        Records are enqueued by the caller and written by a background thread: rich output
+        is rendered for the console only, the log file receives one JSON object per line.
 
         Args:
             log_path (str): The log file path.
             level (int, optional): The logging level. Defaults to logging.INFO.
-            accelerator (Accelerator, optional): Accelerator instance to determine the main process.
+            max_queue_size (int, optional): Maximum number of records waiting to be written.
+            overflow_policy (str, optional): What to do with INFO and DEBUG records when the
+                queue is full: "block", "drop" or "sample". Defaults to "block".
+            sample_every (int, optional): Keep one in this many records when sampling.
         """
+        if self.pipeline is not None:
+            self.close()
+
+        self.pipeline = LogPipeline(
+            sinks=[
+                ConsoleSink(self.console, self._render, self.formatter),
+                JsonlFileSink(log_path, width=self.console.width),
+            ],
+            max_queue_size=max_queue_size,
+            overflow_policy=overflow_policy,
+            sample_every=sample_every,
+        )
+        self.handler = PipelineHandler(self.pipeline, level=level)
+        self.addHandler(self.handler)
 
-        # Add a console handler for logging to the console
-        console_handler = logging.StreamHandler()
-        console_handler.setLevel(level)
-        console_handler.setFormatter(self.formatter)
-        self.addHandler(console_handler)
+        # Prevent duplicate logs from propagating to the root logger
+        self.propagate = False
 
-        # Add a file handler for logging to the file
-        file_handler = logging.FileHandler(
-            log_path, mode="a"
-        )  # 'a' mode appends to the file
-        file_handler.setLevel(level)
-        file_handler.setFormatter(self.formatter)
-        self.addHandler(file_handler)
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until everything logged so far is written."""
+        if self.pipeline is None:
+            return True
+        return self.pipeline.flush(timeout)
+
+    def close(self):
+        if self.pipeline is None:
+            return
+        self.removeHandler(self.handler)
+        self.pipeline.close()
+        self.pipeline = None
+        self.handler = None
+
+    def _submit(self, kind: str, level: int | LogLevel = LogLevel.INFO, **fields) -> None:
+        with tracer.span(f"log.{kind}", category="log"):
+            record = make_record(kind, _LOGGING_LEVELS.get(level, logging.INFO), **fields)
+            if self.pipeline is None:
+                self.console.print(self._render(record))
+            else:
+                self.pipeline.submit(record)
+
+    def _render(self, record: Dict[str, Any]) -> Any:
+        """Build the rich renderable of a record, on the pipeline thread."""
+        kind = record["kind"]
+        if kind == "renderable":
+            return record["_renderable"]
+
+        if kind == "markdown":
+            markdown_content = Syntax(
+                record["content"],
+                lexer="markdown",
+                theme="github-dark",
+                word_wrap=True,
+            )
+            if not record["title"]:
+                return markdown_content
+            return Group(
+                Rule(
+                    "[bold italic]" + record["title"],
+                    align="left",
+                    style=record["style"],
+                ),
+                markdown_content,
+            )
 
-        self.console = Console(width=100)
-        self.file_console = Console(file=open(log_path, "a"), width=100)
+        if kind == "code":
+            return Panel(
+                Syntax(
+                    record["content"],
+                    lexer="python",
+                    theme="monokai",
+                    word_wrap=True,
+                ),
+                title="[bold]" + record["title"],
+                title_align="left",
+                box=box.HORIZONTALS,
+            )
 
-        # Prevent duplicate logs from propagating to the root logger
-        self.propagate = False
+        if kind == "rule":
+            return Rule(
+                "[bold]" + record["title"],
+                characters="━",
+                style=YELLOW_HEX,
+            )
+
+        if kind == "task":
+            return Panel(
+                f"\n[bold]{escape_code_brackets(record['content'])}\n",
+                title="[bold]New run" + (f" - {record['title']}" if record["title"] else ""),
+                subtitle=record["subtitle"],
+                border_style=YELLOW_HEX,
+                subtitle_align="left",
+            )
+
+        if kind == "messages":
+            messages_as_string = "\n".join(
+                [json.dumps(message, indent=4, ensure_ascii=False, default=str) for message in record["messages"]])
+            return Syntax(
+                messages_as_string,
+                lexer="markdown",
+                theme="github-dark",
+                word_wrap=True,
+            )
+
+        raise ValueError(f"Unknown log record kind: {kind}")
 
     def log(self, *args, level: int | str | LogLevel = LogLevel.INFO, **kwargs) -> None:
         """Logs a message to the console.
@@ -81,8 +199,7 @@ class AgentLogger(logging.Logger, metaclass=Singleton):
         Overridden info method with stacklevel adjustment for correct log location.
         """
         if isinstance(msg, (Rule, Panel, Group, Tree, Table, Syntax)):
-            self.console.print(msg)
-            self.file_console.print(msg)
+            self._submit("renderable", kwargs.get("level", LogLevel.INFO), _renderable=msg)
         else:
             kwargs.setdefault(
                 "stacklevel", 2
@@ -113,76 +230,20 @@ class AgentLogger(logging.Logger, metaclass=Singleton):
         self.info(escape_code_brackets(error_message), style="bold red", level=LogLevel.ERROR)
 
     def log_markdown(self, content: str, title: str | None = None, level=LogLevel.INFO, style=YELLOW_HEX) -> None:
-        markdown_content = Syntax(
-            content,
-            lexer="markdown",
-            theme="github-dark",
-            word_wrap=True,
-        )
-        if title:
-            self.info(
-                Group(
-                    Rule(
-                        "[bold italic]" + title,
-                        align="left",
-                        style=style,
-                    ),
-                    markdown_content,
-                ),
-                level=level,
-            )
-        else:
-            self.info(markdown_content, level=level)
+        self._submit("markdown", level, content=content, title=title, style=style)
 
     def log_code(self, title: str, content: str, level: int = LogLevel.INFO) -> None:
-        self.info(
-            Panel(
-                Syntax(
-                    content,
-                    lexer="python",
-                    theme="monokai",
-                    word_wrap=True,
-                ),
-                title="[bold]" + title,
-                title_align="left",
-                box=box.HORIZONTALS,
-            ),
-            level=level,
-        )
+        self._submit("code", level, title=title, content=content)
 
     def log_rule(self, title: str, level: int = LogLevel.INFO) -> None:
-        self.info(
-            Rule(
-                "[bold]" + title,
-                characters="━",
-                style=YELLOW_HEX,
-            ),
-            level=LogLevel.INFO,
-        )
+        self._submit("rule", LogLevel.INFO, title=title)
 
     def log_task(self, content: str, subtitle: str, title: str | None = None, level: LogLevel = LogLevel.INFO) -> None:
-        self.info(
-            Panel(
-                f"\n[bold]{escape_code_brackets(content)}\n",
-                title="[bold]New run" + (f" - {title}" if title else ""),
-                subtitle=subtitle,
-                border_style=YELLOW_HEX,
-                subtitle_align="left",
-            ),
-            level=level,
-        )
+        self._submit("task", level, content=content, subtitle=subtitle, title=title)
 
     def log_messages(self, messages: list[dict], level: LogLevel = LogLevel.DEBUG) -> None:
-        messages_as_string = "\n".join([json.dumps(dict(message), indent=4, ensure_ascii=False) for message in messages])
-        self.info(
-            Syntax(
-                messages_as_string,
-                lexer="markdown",
-                theme="github-dark",
-                word_wrap=True,
-            ),
-            level=level,
-        )
+        # Copied now, the agent keeps appending to its messages while the record is queued
+        self._submit("messages", level, messages=[dict(message) for message in messages])
 
     def visualize_agent_tree(self, agent):
         def create_tools_section(tools_dict):
@@ -225,6 +286,6 @@ class AgentLogger(logging.Logger, metaclass=Singleton):
                 f"✅ [italic #1E90FF]Authorized imports:[/italic #1E90FF] {agent.additional_authorized_imports}"
             )
         build_agent_tree(main_tree, agent)
-        self.console.print(main_tree)
+        self._submit("renderable", _renderable=main_tree)
 
 logger = AgentLogger()
\ No newline at end of file
@@ -1,6 +1,8 @@
 from rich.text import Text
 from dataclasses import dataclass, field
 
+from src.logger.tracing import tracer
+
 @dataclass
 class TokenUsage:
     """
@@ -48,6 +50,7 @@ class Timing:
 class Monitor:
     def __init__(self, tracked_model, logger):
         self.step_durations = []
+        self.step_breakdowns = []
         self.tracked_model = tracked_model
         self.logger = logger
         self.total_input_token_count = 0
@@ -61,6 +64,7 @@ class Monitor:
 
     def reset(self):
         self.step_durations = []
+        self.step_breakdowns = []
         self.total_input_token_count = 0
         self.total_output_token_count = 0
 
@@ -80,5 +84,15 @@ class Monitor:
             console_outputs += (
                 f"| Input tokens: {self.total_input_token_count:,} | Output tokens: {self.total_output_token_count:,}"
             )
+
+        # Called from inside the step span when tracing is on
+        span = tracer.current_span()
+        if span is not None and span.category == "step":
+            breakdown = dict(span.breakdown)
+            breakdown["other"] = max(0.0, step_duration - sum(breakdown.values()))
+            self.step_breakdowns.append(breakdown)
+            console_outputs += "| " + " | ".join(
+                f"{category}: {seconds:.2f}s" for category, seconds in sorted(breakdown.items(), key=lambda item: -item[1])
+            )
         console_outputs += "]"
         self.logger.log(Text(console_outputs, style="dim"), level=1)
\ No newline at end of file
@@ -0,0 +1,267 @@
+"""Queue-backed logging pipeline.
+
+Callers enqueue structured records and return immediately; a background thread drains
+the queue in batches and hands each batch to the sinks. Rich rendering only happens in
+the console sink, the file sink writes one compact JSON object per line.
+"""
+import io
+import json
+import logging
+import queue
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, TextIO
+
+from rich.console import Console
+
+# Records at or above this level are never dropped, whatever the overflow policy
+_MIN_KEPT_LEVEL = logging.WARNING
+
+OVERFLOW_POLICIES = ("block", "drop", "sample")
+
+
+class _FlushMarker():
+    def __init__(self):
+        self.event = threading.Event()
+
+
+class ConsoleSink():
+    """Print plain messages to a stream and rich records to a console.
+
+    Args:
+        console (Console): Console for rich records.
+        render (Callable): Builds the rich renderable of a structured record.
+        formatter (logging.Formatter): Formatter of plain logging messages.
+        stream (TextIO, optional): Stream for plain messages, stderr by default.
+    """
+    def __init__(self,
+                 console: Console,
+                 render: Callable[[Dict[str, Any]], Any],
+                 formatter: logging.Formatter,
+                 stream: Optional[TextIO] = None):
+        self.console = console
+        self.render = render
+        self.formatter = formatter
+        self.stream = stream if stream is not None else sys.stderr
+
+    def write(self, records: List[Dict[str, Any]]):
+        lines = []
+        for record in records:
+            if record["kind"] == "message":
+                lines.append(self.formatter.format(record["_record"]))
+                continue
+            # Keep the order of plain and rich output
+            if lines:
+                self.stream.write("\n".join(lines) + "\n")
+                lines = []
+            self.console.print(self.render(record))
+        if lines:
+            self.stream.write("\n".join(lines) + "\n")
+        self.stream.flush()
+
+    def close(self):
+        pass
+
+
+class JsonlFileSink():
+    """Append records to a file as compact JSON lines.
+
+    Pre-built renderables are flattened to plain text, the other fields of a record are
+    written as they are. Keys starting with an underscore are not written.
+    """
+    def __init__(self, path: str, width: int = 100):
+        self.path = path
+        self.file = open(path, "a", encoding="utf-8")
+        self._text_console = Console(file=io.StringIO(), width=width, color_system=None)
+
+    def _to_text(self, renderable: Any) -> str:
+        with self._text_console.capture() as capture:
+            self._text_console.print(renderable)
+        return capture.get().rstrip()
+
+    def write(self, records: List[Dict[str, Any]]):
+        lines = []
+        for record in records:
+            entry = {key: value for key, value in record.items() if not key.startswith("_")}
+            if "_renderable" in record:
+                entry["text"] = self._to_text(record["_renderable"])
+            lines.append(json.dumps(entry, ensure_ascii=False, default=str))
+        self.file.write("\n".join(lines) + "\n")
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+
+class LogPipeline():
+    """A bounded queue of log records drained by a background thread.
+
+    When the queue is full, `overflow_policy` decides what happens to a new record below
+    WARNING level: "block" waits for room, "drop" discards it and "sample" keeps one in
+    `sample_every` records once the queue is `sample_watermark` full, then drops when it
+    is full. Warnings and errors always wait for room.
+
+    Args:
+        sinks (list): Objects with `write(records)` and `close()` methods.
+        max_queue_size (int): Maximum number of pending records.
+        batch_size (int): Maximum number of records handed to the sinks at once.
+        overflow_policy (str): One of "block", "drop" or "sample".
+        sample_every (int): Keep one in this many records when sampling.
+        sample_watermark (float): Queue fill ratio at which sampling starts.
+    """
+    def __init__(self,
+                 sinks: List[Any],
+                 max_queue_size: int = 10000,
+                 batch_size: int = 256,
+                 overflow_policy: str = "block",
+                 sample_every: int = 10,
+                 sample_watermark: float = 0.8):
+        if overflow_policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy {overflow_policy}, expected one of {OVERFLOW_POLICIES}")
+
+        self.sinks = sinks
+        self.max_queue_size = max_queue_size
+        self.batch_size = batch_size
+        self.overflow_policy = overflow_policy
+        self.sample_every = max(1, sample_every)
+        self.sample_watermark = sample_watermark
+
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue_size)
+        self._sample_count = 0
+        self._closed = False
+        # Updated by the submitting threads and the pipeline thread
+        self.stats = dict(submitted=0, written=0, dropped=0, sampled_out=0, sink_errors=0)
+        self._stats_lock = threading.Lock()
+
+        self._thread = threading.Thread(target=self._run, name="log-pipeline", daemon=True)
+        self._thread.start()
+
+    def _count(self, key: str, n: int = 1):
+        with self._stats_lock:
+            self.stats[key] += n
+
+    def _sampled_out(self) -> bool:
+        if self._queue.qsize() < self.sample_watermark * self.max_queue_size:
+            return False
+        with self._stats_lock:
+            self._sample_count += 1
+            return self._sample_count % self.sample_every != 0
+
+    def submit(self, record: Dict[str, Any]) -> bool:
+        """Enqueue a record, return False if it was dropped."""
+        if self._closed:
+            return False
+
+        if record.get("levelno", logging.INFO) >= _MIN_KEPT_LEVEL or self.overflow_policy == "block":
+            self._queue.put(record)
+        elif self.overflow_policy == "sample" and self._sampled_out():
+            self._count("sampled_out")
+            return False
+        else:
+            try:
+                self._queue.put_nowait(record)
+            except queue.Full:
+                self._count("dropped")
+                return False
+        self._count("submitted")
+        return True
+
+    def _next_batch(self) -> List[Any]:
+        batch = [self._queue.get()]
+        while len(batch) < self.batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _write(self, records: List[Dict[str, Any]]):
+        for sink in self.sinks:
+            try:
+                sink.write(records)
+            except Exception as e:
+                self._count("sink_errors")
+                print(f"| Log sink {sink.__class__.__name__} failed: {e}", file=sys.stderr)
+        self._count("written", len(records))
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            records = []
+            for item in batch:
+                if isinstance(item, _FlushMarker):
+                    # Everything enqueued before the marker is written before it is set
+                    if records:
+                        self._write(records)
+                        records = []
+                    item.event.set()
+                elif item is None:
+                    if records:
+                        self._write(records)
+                    return
+                else:
+                    records.append(item)
+            if records:
+                self._write(records)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until the records submitted so far are written."""
+        if self._closed:
+            return True
+        marker = _FlushMarker()
+        self._queue.put(marker)
+        return marker.event.wait(timeout)
+
+    def close(self, timeout: Optional[float] = 10.0):
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        self._thread.join(timeout)
+        for sink in self.sinks:
+            try:
+                sink.close()
+            except Exception:
+                pass
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._stats_lock:
+            stats = dict(self.stats)
+        return dict(**stats, queued=self._queue.qsize())
+
+
+class PipelineHandler(logging.Handler):
+    """Forward standard logging records to a `LogPipeline`.
+
+    The message is formatted on the calling thread, as `logging.handlers.QueueHandler`
+    does, so arguments mutated after the call are logged as they were.
+    """
+    def __init__(self, pipeline: LogPipeline, level: int = logging.NOTSET):
+        super(PipelineHandler, self).__init__(level)
+        self.pipeline = pipeline
+
+    def emit(self, record: logging.LogRecord):
+        try:
+            record.msg = record.getMessage()
+            record.args = None
+            if record.exc_info:
+                record.exc_text = logging.Formatter().formatException(record.exc_info)
+                record.exc_info = None
+            self.pipeline.submit(dict(
+                kind="message",
+                time=record.created,
+                level=record.levelname,
+                levelno=record.levelno,
+                file=record.filename,
+                line=record.lineno,
+                message=record.msg,
+                exc_text=record.exc_text,
+                _record=record,
+            ))
+        except Exception:
+            self.handleError(record)
+
+
+def make_record(kind: str, levelno: int = logging.INFO, **fields) -> Dict[str, Any]:
+    return dict(kind=kind, time=time.time(), level=logging.getLevelName(levelno), levelno=levelno, **fields)
@@ -0,0 +1,251 @@
+"""Span tracing for agent runs.
+
+Spans nest through a context variable, so they follow asyncio tasks: a tool call run
+with `asyncio.gather` is a child of the step that started it. Each span adds its
+duration to its parent's `breakdown` under its category, which is how a step knows how
+much of its time went to the model, the tools, prompt building or logging.
+
+A span opened in a generator is suspended around its `yield`s with `span.suspended()`:
+the consumer's code then runs under the parent span, and the time it takes is not
+counted in the span's duration.
+
+Tracing is off by default. While it is off `tracer.span` returns a shared no-op context
+manager, so instrumented code pays one attribute check per span.
+"""
+import asyncio
+import contextvars
+import json
+import os
+import random
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+_current_span: contextvars.ContextVar[Optional["Span"]] = contextvars.ContextVar("current_span", default=None)
+
+
+class Span():
+    __slots__ = ("name", "category", "attributes", "trace_id", "span_id", "parent",
+                 "start_ns", "end_ns", "suspended_ns", "lane", "breakdown", "error")
+
+    def __init__(self, name: str, category: str, attributes: Dict[str, Any], parent: Optional["Span"]):
+        self.name = name
+        self.category = category
+        self.attributes = attributes
+        self.parent = parent
+        self.trace_id = parent.trace_id if parent is not None else random.getrandbits(128)
+        self.span_id = random.getrandbits(64)
+        self.lane = _get_lane()
+        self.breakdown: Dict[str, float] = {}
+        self.error: Optional[str] = None
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+        self.suspended_ns = 0
+
+    @property
+    def duration(self) -> Optional[float]:
+        """Time spent in the span, excluding the time it was suspended."""
+        return None if self.end_ns is None else (self.end_ns - self.start_ns - self.suspended_ns) / 1e9
+
+    def set(self, **attributes):
+        self.attributes.update(attributes)
+
+    def suspended(self) -> "_Suspension":
+        """Context manager to wrap a `yield` with, handing control back to the parent span."""
+        return _Suspension(self)
+
+
+class _Suspension():
+    __slots__ = ("span", "start_ns")
+
+    def __init__(self, span: Span):
+        self.span = span
+
+    def __enter__(self):
+        self.start_ns = time.time_ns()
+        _current_span.set(self.span.parent)
+
+    def __exit__(self, exc_type, exc, tb):
+        # Set rather than reset a token: the generator may resume in another context
+        _current_span.set(self.span)
+        self.span.suspended_ns += time.time_ns() - self.start_ns
+        return False
+
+
+class _NoopSpan():
+    """Returned by `tracer.span` while tracing is off."""
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def set(self, **attributes):
+        pass
+
+    def suspended(self):
+        return self
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class _SpanContext():
+    __slots__ = ("tracer", "name", "category", "attributes", "span")
+
+    def __init__(self, tracer: "Tracer", name: str, category: str, attributes: Dict[str, Any]):
+        self.tracer = tracer
+        self.name = name
+        self.category = category
+        self.attributes = attributes
+        self.span: Optional[Span] = None
+
+    def __enter__(self) -> Span:
+        self.span = Span(self.name, self.category, self.attributes, _current_span.get())
+        _current_span.set(self.span)
+        return self.span
+
+    def __exit__(self, exc_type, exc, tb):
+        span = self.span
+        span.end_ns = time.time_ns()
+        if exc is not None:
+            span.error = f"{exc_type.__name__}: {exc}"
+        # Set rather than reset a token: an async generator may resume in another context
+        _current_span.set(span.parent)
+        if span.parent is not None:
+            span.parent.breakdown[span.category] = span.parent.breakdown.get(span.category, 0.0) + span.duration
+        self.tracer._finish(span)
+        return False
+
+
+def _get_lane() -> int:
+    """Lane of a span in the Chrome trace viewer: its asyncio task, else its thread."""
+    try:
+        task = asyncio.current_task()
+    except RuntimeError:
+        task = None
+    return id(task) if task is not None else threading.get_ident()
+
+
+class Tracer():
+    """Collect spans and export them as Chrome trace or OTLP JSON files.
+
+    Args:
+        service_name (str): Service name written in the exported traces.
+        max_spans (int): Spans kept in memory, the oldest are dropped past this.
+    """
+    def __init__(self, service_name: str = "orchestra", max_spans: int = 1_000_000):
+        self.service_name = service_name
+        self.max_spans = max_spans
+        self.enabled = False
+        self._spans: List[Span] = []
+        self._lock = threading.Lock()
+
+    def enable(self):
+        self.enabled = True
+
+    def disable(self):
+        self.enabled = False
+
+    def reset(self):
+        with self._lock:
+            self._spans = []
+
+    def span(self, name: str, category: str = "other", **attributes):
+        """Context manager timing a block as a child of the current span."""
+        if not self.enabled:
+            return _NOOP_SPAN
+        return _SpanContext(self, name, category, attributes)
+
+    def current_span(self) -> Optional[Span]:
+        return _current_span.get() if self.enabled else None
+
+    def _finish(self, span: Span):
+        with self._lock:
+            self._spans.append(span)
+            if len(self._spans) > self.max_spans:
+                del self._spans[:len(self._spans) - self.max_spans]
+
+    @property
+    def spans(self) -> List[Span]:
+        with self._lock:
+            return list(self._spans)
+
+    def to_chrome_trace(self) -> Dict[str, Any]:
+        """Complete events ("ph": "X") for chrome://tracing and Perfetto."""
+        pid = os.getpid()
+        lanes: Dict[int, int] = {}
+        events = []
+        for span in self.spans:
+            tid = lanes.setdefault(span.lane, len(lanes) + 1)
+            args = {key: _to_json_value(value) for key, value in span.attributes.items()}
+            if span.error is not None:
+                args["error"] = span.error
+            if span.suspended_ns:
+                args["suspended_ms"] = span.suspended_ns / 1e6
+            events.append(dict(
+                name=span.name,
+                cat=span.category,
+                ph="X",
+                ts=span.start_ns / 1000,
+                dur=(span.end_ns - span.start_ns) / 1000,
+                pid=pid,
+                tid=tid,
+                args=args,
+            ))
+        return dict(traceEvents=events, displayTimeUnit="ms")
+
+    def to_otlp(self) -> Dict[str, Any]:
+        """Spans in the OTLP/JSON encoding, as accepted by OpenTelemetry collectors."""
+        spans = []
+        for span in self.spans:
+            attributes = dict(span.attributes, category=span.category)
+            otlp_span = dict(
+                traceId=f"{span.trace_id:032x}",
+                spanId=f"{span.span_id:016x}",
+                name=span.name,
+                kind=1,  # SPAN_KIND_INTERNAL
+                startTimeUnixNano=str(span.start_ns),
+                endTimeUnixNano=str(span.end_ns),
+                attributes=[_to_otlp_attribute(key, value) for key, value in attributes.items()],
+                status=dict(code=2, message=span.error) if span.error is not None else dict(code=1),
+            )
+            if span.parent is not None:
+                otlp_span["parentSpanId"] = f"{span.parent.span_id:016x}"
+            spans.append(otlp_span)
+        return dict(resourceSpans=[dict(
+            resource=dict(attributes=[_to_otlp_attribute("service.name", self.service_name)]),
+            scopeSpans=[dict(scope=dict(name="src.logger.tracing"), spans=spans)],
+        )])
+
+    def export(self, path: str, format: str = "chrome") -> str:
+        """Write the collected spans to `path`, format is "chrome" or "otlp"."""
+        if format == "chrome":
+            trace = self.to_chrome_trace()
+        elif format == "otlp":
+            trace = self.to_otlp()
+        else:
+            raise ValueError(f"Unknown trace format {format}, expected 'chrome' or 'otlp'")
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(trace, f)
+        return path
+
+
+def _to_json_value(value: Any) -> Any:
+    if isinstance(value, (str, int, float, bool)) or value is None:
+        return value
+    return str(value)
+
+
+def _to_otlp_attribute(key: str, value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return dict(key=key, value=dict(boolValue=value))
+    if isinstance(value, int):
+        return dict(key=key, value=dict(intValue=str(value)))
+    if isinstance(value, float):
+        return dict(key=key, value=dict(doubleValue=value))
+    return dict(key=key, value=dict(stringValue=str(value)))
+
+
+tracer = Tracer()
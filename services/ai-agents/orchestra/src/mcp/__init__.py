@@ -1,8 +1,16 @@
 from .mcpadapt import MCPAdapt
 from .adapter import AsyncToolAdapter, ToolAdapter
+from .session_pool import MCPSession, MCPSessionPool, MCPSessionClosedError, mcp_session_pool
+from .tool_cache import MCPToolCache, LazyMCPTools
 
 __all__ = [
     "MCPAdapt",
     "AsyncToolAdapter",
-    "ToolAdapter"
+    "ToolAdapter",
+    "MCPSession",
+    "MCPSessionPool",
+    "MCPSessionClosedError",
+    "mcp_session_pool",
+    "MCPToolCache",
+    "LazyMCPTools",
 ]
\ No newline at end of file
@@ -5,7 +5,7 @@ basic interfaces and classes for adapting tools from MCP to the desired Agent fr
 """
 
 from abc import ABC, abstractmethod
-from typing import Any, Callable, Coroutine
+from typing import Any, Callable, Coroutine, Optional
 from fastmcp.tools import Tool
 import json5
 import keyword
@@ -13,6 +13,7 @@ import re
 import inflection
 
 from src.tools import AsyncTool
+from src.mcp.session_pool import MCPSessionPool, mcp_session_pool
 
 def _sanitize_function_name(name):
     """
@@ -35,6 +36,10 @@ def _sanitize_function_name(name):
 
     return name
 
+def adapted_tool_name(name: str) -> str:
+    """The name an MCP tool is exposed under once adapted."""
+    return _sanitize_function_name(inflection.underscore(name))
+
 class ToolAdapter(ABC):
     def adapt(
         self,
@@ -52,12 +57,35 @@ class AsyncToolAdapter(ToolAdapter):
     Warning: if the mcp tool name is a python keyword, starts with digits or contains
     dashes, the tool name will be sanitized to become a valid python function name.
 
+    When the server config is given, tool calls go through a persistent session from
+    the session pool instead of opening the client for every call.
+
     """
+    def __init__(self, session_pool: Optional[MCPSessionPool] = None):
+        self.session_pool = session_pool if session_pool is not None else mcp_session_pool
+
     async def adapt(
         self,
         client,
         tool: Tool,
+        server_config: Optional[Any] = None,
     ) -> AsyncTool:
+        return self.adapt_tool(client, tool, server_config=server_config)
+
+    def adapt_tool(
+        self,
+        client,
+        tool: Tool,
+        server_config: Optional[Any] = None,
+    ) -> AsyncTool:
+        """Synchronous version of :meth:`adapt`, used to adapt tools lazily on first access."""
+        session_pool = self.session_pool
+
+        async def call_tool(name: str, arguments: dict):
+            if server_config is not None:
+                return await session_pool.call_tool(server_config, name, arguments)
+            async with client:
+                return await client.call_tool(name=name, arguments=arguments)
 
         class MCPAdaptTool(AsyncTool):
             def __init__(
@@ -79,15 +107,13 @@ class AsyncToolAdapter(ToolAdapter):
             async def forward(self, *args, **kwargs) -> str:
                 if len(args) > 0:
                     if len(args) == 1 and isinstance(args[0], dict) and not kwargs:
-                        async with client:
-                            mcp_output = await client.call_tool(self.name, arguments=args[0])
+                        mcp_output = await call_tool(self.name, arguments=args[0])
                     else:
                         raise ValueError(
                             f"tool {self.name} does not support multiple positional arguments or combined positional and keyword arguments"
                         )
                 else:
-                    async with client:
-                        mcp_output = await client.call_tool(name = self.name, arguments=kwargs)
+                    mcp_output = await call_tool(self.name, arguments=kwargs)
 
                 return json5.loads(mcp_output[0].text)
 
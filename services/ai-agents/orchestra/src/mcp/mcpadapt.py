@@ -8,12 +8,15 @@ from typing import Any, Dict, Optional
 from fastmcp import Client
 
 from src.mcp.adapter import AsyncToolAdapter, ToolAdapter
+from src.mcp.tool_cache import MCPToolCache, LazyMCPTools, tool_to_spec, fingerprint_tools
+from src.logger import logger
 
 class MCPAdapt():
     def __init__(
         self,
         config: Dict[str, Any],
         adapter: Optional[ToolAdapter] = None,
+        cache_dir: Optional[str] = None,
     ):
         """
         Manage the MCP server / client lifecycle and expose tools adapted with the adapter.
@@ -22,6 +25,8 @@ class MCPAdapt():
             serverparams (StdioServerParameters | dict[str, Any] | list[StdioServerParameters | dict[str, Any]]):
                 MCP server parameters (stdio or sse). Can be a list if you want to connect multiple MCPs at once.
             adapter (ToolAdapter): Adapter to use to convert MCP tools call into agentic framework tools.
+            cache_dir (str, optional): Directory of the tool listing cache. When set, tools are loaded
+                from the cache and revalidated against the server in the background.
             connect_timeout (int): Connection timeout in seconds to the mcp server (default is 30s).
             client_session_timeout_seconds: Timeout for MCP ClientSession calls
 
@@ -37,6 +42,26 @@ class MCPAdapt():
 
         self.client = Client(config)
 
+        self.cache = MCPToolCache(cache_dir) if cache_dir is not None else None
+        self.revalidate_task: Optional[asyncio.Task] = None
+
+    async def _list_tool_specs(self):
+        session = await self.adapter.session_pool.acquire(self.config)
+        mcp_tools = await session.client.list_tools()
+        return [tool_to_spec(tool) for tool in mcp_tools]
+
+    async def _revalidate(self, tools: LazyMCPTools, fingerprint: str):
+        try:
+            specs = await self._list_tool_specs()
+        except Exception as e:
+            logger.warning(f"| Failed to revalidate cached MCP tools: {e}")
+            return
+
+        if fingerprint_tools(specs) != fingerprint:
+            logger.info("| MCP tool listing changed, updating the cache.")
+            self.cache.save(self.config, specs)
+            tools.update_specs(specs)
+
     async def tools(self):
         """Returns the tools from the MCP server adapted to the desired Agent framework.
 
@@ -49,6 +74,19 @@ class MCPAdapt():
         see :meth:`atools`.
 
         """
+        if isinstance(self.adapter, AsyncToolAdapter):
+            cached = self.cache.load(self.config) if self.cache is not None else None
+            if cached is not None:
+                tools = LazyMCPTools(self.adapter, self.client, self.config, cached["tools"])
+                self.revalidate_task = asyncio.create_task(self._revalidate(tools, cached["fingerprint"]))
+                return tools
+
+            # Discover over the pooled session, so the first tool call reuses it
+            specs = await self._list_tool_specs()
+            if self.cache is not None:
+                self.cache.save(self.config, specs)
+            return LazyMCPTools(self.adapter, self.client, self.config, specs)
+
         async with self.client as client:
             mcp_tools = await client.list_tools()
 
@@ -0,0 +1,204 @@
+"""Persistent MCP client sessions.
+
+Opening a `fastmcp.Client` performs the full connect/initialize handshake of the MCP
+server (and spawns a subprocess for stdio servers). The pool below keeps one live
+session per server config, so a tool call only costs the `call_tool` round trip.
+"""
+import asyncio
+import json
+import time
+import weakref
+from typing import Any, Dict, Optional
+
+from fastmcp import Client
+from fastmcp.exceptions import ToolError
+from mcp.shared.exceptions import McpError
+
+from src.logger import logger
+
+
+class MCPSessionClosedError(ConnectionError):
+    """The session was closed before the request was sent, so the call can be retried safely."""
+
+
+class MCPSession():
+    """A connected MCP client kept open by a background task.
+
+    The client context is entered and exited by the same task (`_run`), which is what
+    the anyio-based transports require, while any task on the same event loop can issue
+    requests over it. Requests are multiplexed over the session by their JSON-RPC ids;
+    `max_concurrent_calls` bounds them for servers that cannot handle concurrent calls.
+    """
+    def __init__(self,
+                 config: Any,
+                 max_concurrent_calls: Optional[int] = None):
+        self.config = config
+        self.client = Client(config)
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.last_used = time.monotonic()
+        self.num_calls = 0
+
+        self._runner: Optional[asyncio.Task] = None
+        self._stop: Optional[asyncio.Event] = None
+        self._semaphore = asyncio.Semaphore(max_concurrent_calls) if max_concurrent_calls else None
+
+    async def start(self, timeout: float):
+        self.loop = asyncio.get_running_loop()
+        self._stop = asyncio.Event()
+        ready = self.loop.create_future()
+        self._runner = asyncio.create_task(self._run(ready))
+        try:
+            await asyncio.wait_for(asyncio.shield(ready), timeout=timeout)
+        except BaseException:
+            self._stop.set()
+            self._runner.cancel()
+            raise
+
+    async def _run(self, ready: asyncio.Future):
+        try:
+            async with self.client:
+                ready.set_result(None)
+                await self._stop.wait()
+        except Exception as e:
+            if not ready.done():
+                ready.set_exception(e)
+            else:
+                logger.warning(f"| MCP session closed with error: {e}")
+
+    @property
+    def is_connected(self) -> bool:
+        return (self._runner is not None
+                and not self._runner.done()
+                and self.client.is_connected())
+
+    async def ping(self, timeout: float) -> bool:
+        try:
+            await asyncio.wait_for(self.client.ping(), timeout=timeout)
+            return True
+        except Exception:
+            return False
+
+    async def call_tool(self, name: str, arguments: Dict[str, Any]) -> Any:
+        if not self.is_connected:
+            raise MCPSessionClosedError("MCP session is closed")
+        self.last_used = time.monotonic()
+        self.num_calls += 1
+        if self._semaphore is None:
+            return await self.client.call_tool(name=name, arguments=arguments)
+        async with self._semaphore:
+            return await self.client.call_tool(name=name, arguments=arguments)
+
+    async def close(self):
+        if self._runner is None:
+            return
+        if self.loop is asyncio.get_running_loop():
+            self._stop.set()
+            try:
+                await asyncio.wait_for(self._runner, timeout=5)
+            except Exception:
+                self._runner.cancel()
+        self._runner = None
+
+
+class MCPSessionPool():
+    """Keep MCP sessions alive across tool calls, keyed by server config.
+
+    Args:
+        connect_timeout (float): Timeout in seconds for the connect/initialize handshake.
+        health_check_interval (float): Sessions idle for longer than this are pinged before reuse.
+        ping_timeout (float): Timeout in seconds for the health-check ping.
+        max_concurrent_calls (int, optional): Limit of in-flight calls per session, None for no limit.
+    """
+    def __init__(self,
+                 connect_timeout: float = 30.0,
+                 health_check_interval: float = 60.0,
+                 ping_timeout: float = 5.0,
+                 max_concurrent_calls: Optional[int] = None):
+        self.connect_timeout = connect_timeout
+        self.health_check_interval = health_check_interval
+        self.ping_timeout = ping_timeout
+        self.max_concurrent_calls = max_concurrent_calls
+
+        self._sessions: Dict[str, MCPSession] = {}
+        # Per event loop, dropped with the loop
+        self._locks: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Lock]]" = \
+            weakref.WeakKeyDictionary()
+
+    @staticmethod
+    def make_key(config: Any) -> str:
+        return json.dumps(config, sort_keys=True, default=str)
+
+    def _get_lock(self, key: str) -> asyncio.Lock:
+        # asyncio locks are bound to the loop they are first used on
+        locks = self._locks.setdefault(asyncio.get_running_loop(), {})
+        if key not in locks:
+            locks[key] = asyncio.Lock()
+        return locks[key]
+
+    async def _is_healthy(self, session: MCPSession) -> bool:
+        if session.loop is not asyncio.get_running_loop() or not session.is_connected:
+            return False
+        if time.monotonic() - session.last_used < self.health_check_interval:
+            return True
+        return await session.ping(self.ping_timeout)
+
+    async def acquire(self, config: Any) -> MCPSession:
+        """Return a live session for the config, connecting or reconnecting if needed."""
+        key = self.make_key(config)
+        async with self._get_lock(key):
+            session = self._sessions.get(key, None)
+            if session is not None and not await self._is_healthy(session):
+                logger.info("| MCP session is unhealthy, reconnecting.")
+                self._sessions.pop(key, None)
+                await session.close()
+                session = None
+
+            if session is None:
+                start = time.monotonic()
+                session = MCPSession(config, max_concurrent_calls=self.max_concurrent_calls)
+                await session.start(timeout=self.connect_timeout)
+                self._sessions[key] = session
+                logger.info(f"| MCP session connected in {time.monotonic() - start:.2f}s")
+
+            session.last_used = time.monotonic()
+            return session
+
+    async def invalidate(self, config: Any):
+        """Drop and close the session of the config, the next call reconnects."""
+        session = self._sessions.pop(self.make_key(config), None)
+        if session is not None:
+            await session.close()
+
+    async def call_tool(self, config: Any, name: str, arguments: Dict[str, Any]) -> Any:
+        """Call a tool over the pooled session.
+
+        Only a call that failed before its request was sent is retried, once, on a new
+        session: a transport error after sending may come after the tool ran, and tools
+        are not assumed to be idempotent. The session is dropped either way, so the next
+        call reconnects.
+        """
+        for attempt in range(2):
+            session = await self.acquire(config)
+            try:
+                return await session.call_tool(name, arguments)
+            except (ToolError, McpError):
+                # The server answered, the session itself is fine
+                raise
+            except MCPSessionClosedError:
+                await self.invalidate(config)
+                if attempt > 0:
+                    raise
+                logger.warning(f"| MCP session closed before calling '{name}', reconnecting.")
+            except Exception as e:
+                logger.warning(f"| MCP call to '{name}' failed ({e}), dropping the session.")
+                await self.invalidate(config)
+                raise
+
+    async def close(self):
+        sessions = list(self._sessions.values())
+        self._sessions.clear()
+        self._locks.clear()
+        await asyncio.gather(*[session.close() for session in sessions], return_exceptions=True)
+
+
+mcp_session_pool = MCPSessionPool()
@@ -0,0 +1,115 @@
+"""On-disk cache of MCP tool listings.
+
+Listings are stored per server identity (a hash of the server config) together with a
+fingerprint of the tool schemas, so an agent can be built from the cache while the
+listing is revalidated against the live server in the background.
+"""
+import copy
+import hashlib
+import json
+import os
+import time
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator, List, Optional
+
+from mcp.types import Tool as MCPTool
+
+from src.mcp.adapter import AsyncToolAdapter, adapted_tool_name
+from src.mcp.session_pool import MCPSessionPool
+from src.tools import AsyncTool
+from src.logger import logger
+
+
+def tool_to_spec(tool: MCPTool) -> Dict[str, Any]:
+    return dict(
+        name=tool.name,
+        description=tool.description,
+        inputSchema=tool.inputSchema,
+    )
+
+def fingerprint_tools(specs: List[Dict[str, Any]]) -> str:
+    """A stable hash of the tool names, descriptions and input schemas."""
+    specs = sorted(specs, key=lambda spec: spec["name"])
+    payload = json.dumps(specs, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class MCPToolCache():
+    def __init__(self, cache_dir: str):
+        self.cache_dir = cache_dir
+
+    def _get_path(self, config: Any) -> str:
+        server_id = hashlib.sha256(MCPSessionPool.make_key(config).encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, f"{server_id[:16]}.json")
+
+    def load(self, config: Any) -> Optional[Dict[str, Any]]:
+        path = self._get_path(config)
+        try:
+            with open(path, "r") as f:
+                cached = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (json.JSONDecodeError, OSError) as e:
+            logger.warning(f"| Ignoring unreadable MCP tool cache {path}: {e}")
+            return None
+
+        if cached.get("fingerprint") != fingerprint_tools(cached.get("tools", [])):
+            logger.warning(f"| Ignoring corrupted MCP tool cache {path}")
+            return None
+        return cached
+
+    def save(self, config: Any, specs: List[Dict[str, Any]]) -> str:
+        os.makedirs(self.cache_dir, exist_ok=True)
+        fingerprint = fingerprint_tools(specs)
+        path = self._get_path(config)
+
+        # Write then rename, so concurrent readers never see a partial file
+        temp_path = f"{path}.{os.getpid()}.tmp"
+        with open(temp_path, "w") as f:
+            json.dump(dict(fingerprint=fingerprint, saved_at=time.time(), tools=specs), f)
+        os.replace(temp_path, path)
+        return fingerprint
+
+
+class LazyMCPTools(Mapping):
+    """Mapping of adapted tool name to `AsyncTool`, adapting each tool on first access."""
+    def __init__(self,
+                 adapter: AsyncToolAdapter,
+                 client: Any,
+                 server_config: Any,
+                 specs: List[Dict[str, Any]]):
+        self.adapter = adapter
+        self.client = client
+        self.server_config = server_config
+
+        self._specs: Dict[str, Dict[str, Any]] = {}
+        self._tools: Dict[str, AsyncTool] = {}
+        self.update_specs(specs)
+
+    def update_specs(self, specs: List[Dict[str, Any]]):
+        """Replace the listing, dropping the adapted tools whose schema changed."""
+        new_specs = {adapted_tool_name(spec["name"]): spec for spec in specs}
+        for name in list(self._tools):
+            if self._specs.get(name) != new_specs.get(name):
+                del self._tools[name]
+        self._specs = new_specs
+
+    def __getitem__(self, name: str) -> AsyncTool:
+        if name not in self._tools:
+            # The adapter edits the schema in place, keep the listing intact
+            spec = copy.deepcopy(self._specs[name])
+            self._tools[name] = self.adapter.adapt_tool(
+                self.client,
+                MCPTool(**spec),
+                server_config=self.server_config,
+            )
+        return self._tools[name]
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._specs
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._specs)
+
+    def __len__(self) -> int:
+        return len(self._specs)
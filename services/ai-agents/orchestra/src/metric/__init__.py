@@ -1,5 +1,16 @@
-from src.metric.gaia_scorer import question_scorer
+from src.metric.gaia_scorer import question_scorer, normalize_ground_truth
+from src.metric.batch_scorer import (
+    score_batch,
+    score_entries,
+    score_answer_files,
+    ScoreReport,
+)
 
 __all__ = [
     "question_scorer",
+    "normalize_ground_truth",
+    "score_batch",
+    "score_entries",
+    "score_answer_files",
+    "ScoreReport",
 ]
\ No newline at end of file
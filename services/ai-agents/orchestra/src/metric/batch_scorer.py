@@ -0,0 +1,160 @@
+import json
+import os
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from src.metric.gaia_scorer import question_scorer
+
+# Ground truth of the GAIA test split, answers to it cannot be scored
+UNKNOWN_TRUTH = "?"
+
+
+def _score_pair(prediction: Optional[str], truth: Optional[str]) -> bool:
+    if prediction is None or truth is None or prediction == "Unable to determine":
+        return False
+    # One message per unparsable number or mismatched list is noise when scoring whole files
+    return bool(question_scorer(prediction, truth, verbose=False))
+
+
+def score_pairs(pairs: Sequence[Tuple[Optional[str], Optional[str]]]) -> List[bool]:
+    """Score (prediction, ground truth) pairs in the calling process."""
+    return [_score_pair(prediction, truth) for prediction, truth in pairs]
+
+
+def score_batch(predictions: Sequence[Any],
+                truths: Sequence[Any],
+                num_workers: Optional[int] = None,
+                min_parallel_size: int = 20000,
+                chunk_size: int = 5000) -> List[bool]:
+    """Score predictions against ground truths, across processes for large batches.
+
+    Args:
+        predictions (Sequence): Model answers, None counts as wrong.
+        truths (Sequence): Ground truths, in the same order.
+        num_workers (int, optional): Worker processes, one per CPU core if None.
+        min_parallel_size (int): Batches with fewer distinct pairs are scored in-process,
+            where the ground truth cache is warm and no pickling is needed.
+        chunk_size (int): Pairs sent to a worker at once.
+    """
+    pairs = [(None if prediction is None else str(prediction), None if truth is None else str(truth))
+             for prediction, truth in zip(predictions, truths)]
+
+    # Re-scored runs repeat the same answers, each distinct pair is scored once
+    unique_pairs = list(dict.fromkeys(pairs))
+    num_workers = num_workers or os.cpu_count() or 1
+    if num_workers <= 1 or len(unique_pairs) < min_parallel_size:
+        unique_scores = score_pairs(unique_pairs)
+    else:
+        chunks = [unique_pairs[i:i + chunk_size] for i in range(0, len(unique_pairs), chunk_size)]
+        with ProcessPoolExecutor(max_workers=min(num_workers, len(chunks))) as executor:
+            unique_scores = [score for scores in executor.map(score_pairs, chunks) for score in scores]
+
+    scores = dict(zip(unique_pairs, unique_scores))
+    return [scores[pair] for pair in pairs]
+
+
+@dataclass
+class ScoreGroup:
+    total: int = 0
+    correct: int = 0
+    unscored: int = 0
+
+    @property
+    def accuracy(self) -> Optional[float]:
+        scored = self.total - self.unscored
+        return self.correct / scored if scored else None
+
+    def dict(self):
+        return {
+            "total": self.total,
+            "correct": self.correct,
+            "unscored": self.unscored,
+            "accuracy": self.accuracy,
+        }
+
+
+@dataclass
+class ScoreReport:
+    """Scores of answer entries, overall and grouped by file and by each group key."""
+    overall: ScoreGroup = field(default_factory=ScoreGroup)
+    by_file: Dict[str, ScoreGroup] = field(default_factory=lambda: defaultdict(ScoreGroup))
+    by_key: Dict[str, Dict[Any, ScoreGroup]] = field(default_factory=dict)
+    scores: List[Optional[bool]] = field(default_factory=list)
+
+    def dict(self):
+        return {
+            "overall": self.overall.dict(),
+            "by_file": {name: group.dict() for name, group in self.by_file.items()},
+            "by_key": {
+                key: {str(value): group.dict() for value, group in groups.items()}
+                for key, groups in self.by_key.items()
+            },
+        }
+
+
+def read_answer_files(paths: Iterable[str],
+                      dedupe_key: Optional[str] = "task_id") -> List[Tuple[str, Dict[str, Any]]]:
+    """Read (path, entry) pairs from JSONL answer files, skipping unreadable lines.
+
+    Answers logs are append-only, so a resumed or retried task has several entries in
+    its file: only the last entry of each `dedupe_key` value is kept per file. Entries
+    without the key, or all entries when `dedupe_key` is None, are kept.
+    """
+    entries = []
+    for path in paths:
+        file_entries: Dict[Any, Dict[str, Any]] = {}
+        with open(path, "r", encoding="utf-8") as f:
+            for i, line in enumerate(f):
+                if not line.strip():
+                    continue
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                key = entry.get(dedupe_key) if dedupe_key is not None else None
+                # Keyed by position when there is nothing to dedupe on
+                file_entries[(0, key) if key is not None else (1, i)] = entry
+        entries.extend((path, entry) for entry in file_entries.values())
+    return entries
+
+
+def score_entries(entries: Sequence[Tuple[str, Dict[str, Any]]],
+                  group_keys: Sequence[str] = ("task",),
+                  prediction_key: str = "prediction",
+                  truth_key: str = "true_answer",
+                  **kwargs) -> ScoreReport:
+    """Score answer entries and aggregate them in one pass.
+
+    Entries whose ground truth is "?" are counted but not scored. Extra keyword
+    arguments are passed to `score_batch`.
+    """
+    scorable = [i for i, (_, entry) in enumerate(entries) if entry.get(truth_key) != UNKNOWN_TRUTH]
+    scores = score_batch(
+        [entries[i][1].get(prediction_key) for i in scorable],
+        [entries[i][1].get(truth_key) for i in scorable],
+        **kwargs,
+    )
+
+    report = ScoreReport(by_key={key: defaultdict(ScoreGroup) for key in group_keys})
+    report.scores = [None] * len(entries)
+    for i, score in zip(scorable, scores):
+        report.scores[i] = score
+
+    for (path, entry), score in zip(entries, report.scores):
+        groups = [report.overall, report.by_file[path]]
+        groups += [report.by_key[key][entry.get(key)] for key in group_keys]
+        for group in groups:
+            group.total += 1
+            if score is None:
+                group.unscored += 1
+            elif score:
+                group.correct += 1
+    return report
+
+
+def score_answer_files(paths: Iterable[str], dedupe_key: Optional[str] = "task_id", **kwargs) -> ScoreReport:
+    """Score the latest entries of JSONL answer files, see `read_answer_files` and
+    `score_entries` for the arguments."""
+    return score_entries(read_answer_files(paths, dedupe_key=dedupe_key), **kwargs)
@@ -1,26 +1,36 @@
 import re
 import string
 import warnings
+from functools import lru_cache
 
+# Compiled once, scoring a result file calls these for every answer
+_WHITESPACE_PATTERN = re.compile(r"\s")
+_NUMBER_UNITS_TABLE = str.maketrans("", "", "$%,")
+_PUNCTUATION_TABLE = str.maketrans("", "", string.punctuation)
 
-def normalize_number_str(number_str: str) -> float:
+
+def normalize_number_str(number_str: str, verbose: bool = True) -> float:
     # we replace these common units and commas to allow
     # conversion to float
-    for char in ["$", "%", ","]:
-        number_str = number_str.replace(char, "")
+    number_str = number_str.translate(_NUMBER_UNITS_TABLE)
     try:
         return float(number_str)
     except ValueError:
-        print(f"String {number_str} cannot be normalized to number str.")
+        if verbose:
+            print(f"String {number_str} cannot be normalized to number str.")
         return float("inf")
 
 
+@lru_cache(maxsize=None)
+def _get_split_pattern(chars: str) -> re.Pattern:
+    return re.compile(f"[{chars}]")
+
+
 def split_string(
     s: str,
     char_list: list[str] = [",", ";"],
 ) -> list[str]:
-    pattern = f"[{''.join(char_list)}]"
-    return re.split(pattern, s)
+    return _get_split_pattern("".join(char_list)).split(s)
 
 
 def is_float(element: any) -> bool:
@@ -31,43 +41,64 @@ def is_float(element: any) -> bool:
         return False
 
 
-def question_scorer(
-    model_answer: str,
-    ground_truth: str,
-) -> bool:
+@lru_cache(maxsize=65536)
+def normalize_ground_truth(ground_truth: str) -> tuple:
+    """Normalize a ground truth once, as ("number", value), ("list", elements) or ("str", value).
+
+    Ground truths repeat across runs of the same benchmark, so the result is cached.
+    """
     # if gt is a number
     if is_float(ground_truth):
-        normalized_answer = normalize_number_str(str(model_answer))
-        return normalized_answer == float(ground_truth)
+        return ("number", float(ground_truth))
 
     # if gt is a list
     elif any(char in ground_truth for char in [",", ";"]):
         # question with the fish: normalization removes punct
+        elements = []
+        for gt_elem in split_string(ground_truth):
+            if is_float(gt_elem):
+                elements.append(("number", float(gt_elem)))
+            else:
+                # we do not remove punct since comparisons can include punct
+                elements.append(("str", normalize_str(gt_elem, remove_punct=False)))
+        return ("list", tuple(elements))
+
+    # if gt is a str
+    else:
+        return ("str", normalize_str(ground_truth))
+
+
+def question_scorer(
+    model_answer: str,
+    ground_truth: str,
+    verbose: bool = True,
+) -> bool:
+    kind, normalized_truth = normalize_ground_truth(ground_truth)
 
-        gt_elems = split_string(ground_truth)
+    if kind == "number":
+        normalized_answer = normalize_number_str(str(model_answer), verbose=verbose)
+        return normalized_answer == normalized_truth
+
+    elif kind == "list":
         ma_elems = split_string(model_answer)
 
         # check length is the same
-        if len(gt_elems) != len(ma_elems):
-            warnings.warn("Answer lists have different lengths, returning False.", UserWarning)
+        if len(normalized_truth) != len(ma_elems):
+            if verbose:
+                warnings.warn("Answer lists have different lengths, returning False.", UserWarning)
             return False
 
         # compare each element as float or str
-        comparisons = []
-        for ma_elem, gt_elem in zip(ma_elems, gt_elems):
-            if is_float(gt_elem):
-                normalized_ma_elem = normalize_number_str(ma_elem)
-                comparisons.append(normalized_ma_elem == float(gt_elem))
-            else:
-                # we do not remove punct since comparisons can include punct
-                comparisons.append(
-                    normalize_str(ma_elem, remove_punct=False) == normalize_str(gt_elem, remove_punct=False)
-                )
-        return all(comparisons)
+        for ma_elem, (gt_kind, gt_elem) in zip(ma_elems, normalized_truth):
+            if gt_kind == "number":
+                if normalize_number_str(ma_elem, verbose=verbose) != gt_elem:
+                    return False
+            elif normalize_str(ma_elem, remove_punct=False) != gt_elem:
+                return False
+        return True
 
-    # if gt is a str
     else:
-        return normalize_str(model_answer) == normalize_str(ground_truth)
+        return normalize_str(model_answer) == normalized_truth
 
 
 def check_prediction_contains_answer_letters_in_order(prediction, true_answer):
@@ -114,11 +145,10 @@ def normalize_str(input_str, remove_punct=True) -> str:
     - str, the normalized string
     """
     # Remove all white spaces. Required e.g for seagull vs. sea gull
-    no_spaces = re.sub(r"\s", "", input_str)
+    no_spaces = _WHITESPACE_PATTERN.sub("", input_str)
 
     # Remove punctuation, if specified.
     if remove_punct:
-        translator = str.maketrans("", "", string.punctuation)
-        return no_spaces.lower().translate(translator)
+        return no_spaces.lower().translate(_PUNCTUATION_TABLE)
     else:
         return no_spaces.lower()
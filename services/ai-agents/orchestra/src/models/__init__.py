@@ -10,10 +10,16 @@ from .base import (
                   )
 from .litellm import LiteLLMModel
 from .openaillm import OpenAIServerModel
-from .models import ModelManager
 from .message_manager import MessageManager
 
-model_manager = ModelManager()
+def __getattr__(name):
+    # The model manager imports every provider client, so it is only loaded on first use
+    if name in ("ModelManager", "model_manager"):
+        from .models import ModelManager
+        globals()["ModelManager"] = ModelManager
+        globals()["model_manager"] = ModelManager()
+        return globals()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 __all__ = [
     "Model",
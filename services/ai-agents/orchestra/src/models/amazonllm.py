@@ -11,6 +11,7 @@ from src.models.base import (ApiModel,
 from src.models.message_manager import (
     MessageManager
 )
+from src.logger import tracer
 
 
 class AmazonBedrockServerModel(ApiModel):
@@ -195,4 +196,5 @@ class AmazonBedrockServerModel(ApiModel):
         Call the model with the given arguments.
         This is a convenience method that calls `generate` with the same arguments.
         """
-        return await self.generate(*args, **kwargs)
\ No newline at end of file
+        with tracer.span("model.generate", category="model", model_id=self.model_id):
+            return await self.generate(*args, **kwargs)
\ No newline at end of file
@@ -25,7 +25,7 @@ from enum import Enum
 from threading import Thread
 from typing import TYPE_CHECKING, Any
 
-from src.logger import TokenUsage
+from src.logger import TokenUsage, tracer
 from src.utils import (_is_package_available,
                        encode_image_base64, 
                        make_image_url, 
@@ -492,7 +492,8 @@ class Model:
         raise NotImplementedError("This method must be implemented in child classes")
 
     def __call__(self, *args, **kwargs):
-        return self.generate(*args, **kwargs)
+        with tracer.span("model.generate", category="model", model_id=self.model_id):
+            return self.generate(*args, **kwargs)
 
     def parse_tool_calls(self, message: ChatMessage) -> ChatMessage:
         """Sometimes APIs do not return the tool call as a specific object, so we need to parse it."""
@@ -0,0 +1,286 @@
+"""Background polling of long-running generation jobs.
+
+Veo generations are submitted to the API and then polled until the operation holds the
+video, which takes minutes. Polling from inside a tool call keeps the agent step open
+for the whole generation. The manager below submits jobs, polls all outstanding jobs
+from a single timer task with a per-job adaptive interval, and resolves an
+`asyncio.Future` per job, which the caller can await whenever it needs the result, or
+look up later by job id with `wait` and `status`. Finished jobs are kept for
+`keep_finished` seconds for those lookups, then pruned.
+"""
+import asyncio
+import itertools
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from src.logger import logger
+
+
+class JobPending(Exception):
+    """Raised by a fetch function when the job has not finished yet."""
+
+
+class GenerationJob():
+    """A submitted job and its polling state.
+
+    Args:
+        job_id (str): Id of the job in the manager.
+        name (Any): Handle returned by the submit function, passed to the fetch function.
+        fetch_fn (Callable): Blocking function returning the result of a finished job, and
+            returning None or raising `JobPending` while it runs.
+        future (asyncio.Future): Resolved with the result of the fetch function.
+        interval (float): Seconds until the next poll.
+        deadline (float, optional): Monotonic time after which the job fails.
+    """
+    def __init__(self,
+                 job_id: str,
+                 name: Any,
+                 fetch_fn: Callable[[Any], Any],
+                 future: asyncio.Future,
+                 interval: float,
+                 deadline: Optional[float] = None):
+        self.job_id = job_id
+        self.name = name
+        self.fetch_fn = fetch_fn
+        self.future = future
+        self.interval = interval
+        self.deadline = deadline
+
+        self.submitted_at = time.monotonic()
+        self.next_poll_at = self.submitted_at + interval
+        self.finished_at: Optional[float] = None
+        self.num_polls = 0
+        self.num_errors = 0
+
+        future.add_done_callback(self._on_done)
+
+    def _on_done(self, future: asyncio.Future):
+        self.finished_at = time.monotonic()
+
+    @property
+    def status(self) -> str:
+        if not self.future.done():
+            return "pending"
+        if self.future.cancelled():
+            return "cancelled"
+        return "failed" if self.future.exception() is not None else "done"
+
+
+class GenerationJobManager():
+    """Submit generation jobs and poll them in the background.
+
+    The submit and fetch functions are the blocking model calls (`RestfulVeoPridictModel`
+    and `RestfulVeoFetchModel`), they run in worker threads. A job is first polled after
+    `initial_interval` seconds, and every pending poll multiplies its interval by
+    `backoff`, up to `max_interval`. The timer wakes up at the earliest due job, or when a
+    job is submitted, and polls all the due jobs concurrently.
+
+    Args:
+        initial_interval (float): Seconds before the first poll of a job.
+        max_interval (float): Upper bound of the interval between two polls of a job.
+        backoff (float): Factor applied to the interval after each pending poll.
+        timeout (float, optional): Seconds after which a job fails with `TimeoutError`.
+        max_errors (int): Consecutive fetch errors after which a job fails, errors before
+            that are retried like pending polls.
+        keep_finished (float): Seconds a finished job stays available to `get`, `wait`
+            and `status` before it is pruned.
+    """
+    def __init__(self,
+                 initial_interval: float = 10.0,
+                 max_interval: float = 60.0,
+                 backoff: float = 1.5,
+                 timeout: Optional[float] = 1800.0,
+                 max_errors: int = 5,
+                 keep_finished: float = 3600.0):
+        self.initial_interval = initial_interval
+        self.max_interval = max_interval
+        self.backoff = backoff
+        self.timeout = timeout
+        self.max_errors = max_errors
+        self.keep_finished = keep_finished
+
+        self.jobs: Dict[str, GenerationJob] = {}
+        self.num_polls = 0
+        self._ids = itertools.count(1)
+        self._poller: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+
+    @property
+    def num_pending(self) -> int:
+        return sum(not job.future.done() for job in self.jobs.values())
+
+    async def submit(self,
+                     submit_fn: Callable[[], Any],
+                     fetch_fn: Optional[Callable[[Any], Any]] = None,
+                     job_id: Optional[str] = None,
+                     initial_interval: Optional[float] = None,
+                     timeout: Optional[float] = None) -> asyncio.Future:
+        """Submit a job and return the future of its result.
+
+        Args:
+            submit_fn (Callable): Blocking function starting the job, returns the handle
+                passed to `fetch_fn`.
+            fetch_fn (Callable, optional): Blocking function fetching the result, see
+                `GenerationJob`. Without it the job is the `submit_fn` call itself, which
+                suits one-shot generations such as Imagen.
+            job_id (str, optional): Id to look the job up with `get` and `wait`.
+            initial_interval (float, optional): Overrides the manager's first poll delay.
+            timeout (float, optional): Overrides the manager's job timeout.
+        """
+        loop = asyncio.get_running_loop()
+        job_id = job_id or f"job-{next(self._ids)}"
+        future = loop.create_future()
+        self.prune()
+
+        if fetch_fn is None:
+            task = asyncio.ensure_future(asyncio.to_thread(submit_fn))
+            task.add_done_callback(lambda t: self._resolve_from_task(future, t))
+            self.jobs[job_id] = GenerationJob(job_id, None, None, future, 0.0)
+            return future
+
+        name = await asyncio.to_thread(submit_fn)
+        timeout = self.timeout if timeout is None else timeout
+        interval = self.initial_interval if initial_interval is None else initial_interval
+        job = GenerationJob(job_id=job_id,
+                            name=name,
+                            fetch_fn=fetch_fn,
+                            future=future,
+                            interval=interval,
+                            deadline=time.monotonic() + timeout if timeout else None)
+        self.jobs[job_id] = job
+        logger.info(f"| Submitted generation job {job_id}: {name}")
+
+        self._ensure_poller(loop)
+        self._wakeup.set()
+        return future
+
+    def get(self, job_id: str) -> Optional[asyncio.Future]:
+        job = self.jobs.get(job_id)
+        return job.future if job is not None else None
+
+    def status(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Poll a job by id without waiting, returns None for unknown or pruned jobs."""
+        job = self.jobs.get(job_id)
+        if job is None:
+            return None
+        end = job.finished_at if job.finished_at is not None else time.monotonic()
+        status = dict(job_id=job_id,
+                      status=job.status,
+                      elapsed=round(end - job.submitted_at, 1),
+                      num_polls=job.num_polls)
+        if job.status == "failed":
+            status["error"] = repr(job.future.exception())
+        return status
+
+    def prune(self):
+        """Drop the jobs that finished more than `keep_finished` seconds ago."""
+        expired = time.monotonic() - self.keep_finished
+        self.jobs = {job_id: job for job_id, job in self.jobs.items()
+                     if job.finished_at is None or job.finished_at > expired}
+
+    async def wait(self, job_id: str, timeout: Optional[float] = None) -> Any:
+        """Await the result of a job by id."""
+        future = self.get(job_id)
+        if future is None:
+            raise KeyError(f"Unknown generation job: {job_id}")
+        return await asyncio.wait_for(asyncio.shield(future), timeout=timeout)
+
+    @staticmethod
+    def _resolve_from_task(future: asyncio.Future, task: asyncio.Future):
+        if future.done():
+            return
+        if task.cancelled():
+            future.cancel()
+        elif task.exception() is not None:
+            future.set_exception(task.exception())
+        else:
+            future.set_result(task.result())
+
+    def _ensure_poller(self, loop: asyncio.AbstractEventLoop):
+        # The poller and its event belong to the loop the jobs were submitted on
+        if self._poller is None or self._poller.done() or self._poller.get_loop() is not loop:
+            self.jobs = {job_id: job for job_id, job in self.jobs.items() if job.future.get_loop() is loop}
+            self._wakeup = asyncio.Event()
+            self._poller = loop.create_task(self._poll_loop())
+
+    def _due_jobs(self, now: float) -> List[GenerationJob]:
+        return [job for job in self.jobs.values()
+                if job.fetch_fn is not None and not job.future.done() and job.next_poll_at <= now]
+
+    async def _poll_loop(self):
+        while True:
+            pending = [job for job in self.jobs.values() if job.fetch_fn is not None and not job.future.done()]
+            if not pending:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+                continue
+
+            delay = min(job.next_poll_at for job in pending) - time.monotonic()
+            if delay > 0:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            due = self._due_jobs(time.monotonic())
+            await asyncio.gather(*[self._poll(job) for job in due])
+            self.prune()
+
+    async def _poll(self, job: GenerationJob):
+        job.num_polls += 1
+        self.num_polls += 1
+        try:
+            result = await asyncio.to_thread(job.fetch_fn, job.name)
+        except JobPending:
+            result = None
+        except Exception as e:
+            job.num_errors += 1
+            if job.num_errors >= self.max_errors:
+                logger.error(f"| Generation job {job.job_id} failed: {e}")
+                self._finish(job, error=e)
+                return
+            logger.warning(f"| Generation job {job.job_id} fetch error ({job.num_errors}/{self.max_errors}): {e}")
+            result = None
+        else:
+            job.num_errors = 0
+
+        if result is not None:
+            logger.info(f"| Generation job {job.job_id} finished after {job.num_polls} polls, "
+                        f"{time.monotonic() - job.submitted_at:.1f}s")
+            self._finish(job, result=result)
+            return
+
+        now = time.monotonic()
+        if job.deadline is not None and now >= job.deadline:
+            self._finish(job, error=TimeoutError(f"Generation job {job.job_id} did not finish in time"))
+            return
+        job.interval = min(job.interval * self.backoff, self.max_interval)
+        job.next_poll_at = now + job.interval
+        if job.deadline is not None:
+            job.next_poll_at = min(job.next_poll_at, job.deadline)
+
+    def _finish(self, job: GenerationJob, result: Any = None, error: Optional[BaseException] = None):
+        if job.future.done():
+            return
+        if error is not None:
+            job.future.set_exception(error)
+        else:
+            job.future.set_result(result)
+
+    async def close(self):
+        """Stop polling and cancel the jobs that are still running."""
+        for job in self.jobs.values():
+            if not job.future.done():
+                job.future.cancel()
+        if self._poller is not None and not self._poller.done():
+            self._poller.cancel()
+            try:
+                await self._poller
+            except (asyncio.CancelledError, RuntimeError):
+                pass
+        self._poller = None
+
+
+job_manager = GenerationJobManager()
@@ -12,6 +12,7 @@ from src.models.base import (ApiModel,
 from src.models.message_manager import (
     MessageManager
 )
+from src.logger import tracer
 
 STRUCTURED_GENERATION_PROVIDERS = ["cerebras", "fireworks-ai"]
 
@@ -272,5 +273,6 @@ class InferenceClientModel(ApiModel):
         Call the model with the given arguments.
         This is a convenience method that calls `generate` with the same arguments.
         """
-        return await self.generate(*args, **kwargs)
+        with tracer.span("model.generate", category="model", model_id=self.model_id):
+            return await self.generate(*args, **kwargs)
 
@@ -5,8 +5,6 @@ from typing import Dict, Any, Tuple
 from dotenv import load_dotenv
 load_dotenv(verbose=True)
 
-from langchain_openai import ChatOpenAI
-
 from src.logger import logger
 from src.models.litellm import LiteLLMModel
 from src.models.openaillm import OpenAIServerModel
@@ -424,6 +422,9 @@ class ModelManager(metaclass=Singleton):
             self.registed_models[model_name] = model
 
     def _register_langchain_models(self, use_local_proxy: bool = False):
+        # imported here, langchain is only needed by the browser-use tools
+        from langchain_openai import ChatOpenAI
+
         # langchain models
         models = [
             {
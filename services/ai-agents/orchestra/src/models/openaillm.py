@@ -9,6 +9,7 @@ from src.models.base import (ApiModel,
                              ChatMessageStreamDelta,
                              ChatMessageToolCallStreamDelta)
 from src.models.message_manager import MessageManager
+from src.logger import tracer
 
 class OpenAIServerModel(ApiModel):
     """This model connects to an OpenAI-compatible API server.
@@ -238,4 +239,5 @@ class OpenAIServerModel(ApiModel):
         Call the model with the given arguments.
         This is a convenience method that calls `generate` with the same arguments.
         """
-        return await self.generate(*args, **kwargs)
\ No newline at end of file
+        with tracer.span("model.generate", category="model", model_id=self.model_id):
+            return await self.generate(*args, **kwargs)
\ No newline at end of file
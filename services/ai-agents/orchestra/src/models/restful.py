@@ -13,7 +13,7 @@ from src.models.base import (ApiModel,
                              ChatMessageStreamDelta,
                              ChatMessageToolCallStreamDelta)
 from src.models.message_manager import MessageManager
-from src.logger import TokenUsage, logger
+from src.logger import TokenUsage, logger, tracer
 from src.utils import encode_image_base64
 
 
@@ -498,7 +498,8 @@ class RestfulModel(ApiModel):
         Call the model with the given arguments.
         This is a convenience method that calls `generate` with the same arguments.
         """
-        return await self.generate(*args, **kwargs)
+        with tracer.span("model.generate", category="model", model_id=self.model_id):
+            return await self.generate(*args, **kwargs)
 
 
 class RestfulTranscribeModel(ApiModel):
@@ -1009,4 +1010,5 @@ class RestfulResponseModel(ApiModel):
         Call the model with the given arguments.
         This is a convenience method that calls `generate` with the same arguments.
         """
-        return await self.generate(*args, **kwargs)
\ No newline at end of file
+        with tracer.span("model.generate", category="model", model_id=self.model_id):
+            return await self.generate(*args, **kwargs)
\ No newline at end of file
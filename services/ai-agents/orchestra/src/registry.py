@@ -1,5 +1,50 @@
+import importlib
+
 from mmengine.registry import Registry
 
-DATASET = Registry('dataset', locations=['src.dataset'])
-TOOL = Registry('tool', locations=['src.tools'])
-AGENT = Registry('agent', locations=['src.agent'])
\ No newline at end of file
+
+class LazyRegistry(Registry):
+    """A registry that imports the module of an entry on its first lookup.
+
+    mmengine imports every module under `locations` before the first lookup, which pulls
+    in the dependencies of every tool and agent. Here each registered name maps to the
+    module defining it, so building one entry only imports that entry's module. Entries
+    added to the code base must also be added to the map below.
+    """
+    def __init__(self, *args, lazy_modules: dict = None, **kwargs):
+        super(LazyRegistry, self).__init__(*args, **kwargs)
+        self._lazy_modules = dict(lazy_modules or {})
+
+    def get(self, key):
+        if isinstance(key, str) and key not in self._module_dict and key in self._lazy_modules:
+            importlib.import_module(self._lazy_modules[key])
+        return super(LazyRegistry, self).get(key)
+
+
+DATASET = LazyRegistry('dataset', locations=['src.dataset'], lazy_modules={
+    "gaia_dataset": "src.dataset.huggingface",
+    "hle_dataset": "src.dataset.huggingface",
+})
+TOOL = LazyRegistry('tool', locations=['src.tools'], lazy_modules={
+    "archive_searcher_tool": "src.tools.archive_searcher",
+    "auto_browser_use_tool": "src.tools.auto_browser",
+    "deep_analyzer_tool": "src.tools.deep_analyzer",
+    "deep_researcher_tool": "src.tools.deep_researcher",
+    "file_reader_tool": "src.tools.file_reader",
+    "final_answer_tool": "src.tools.final_answer",
+    "generation_job_tool": "src.tools.generation_job",
+    "image_generator_tool": "src.tools.image_generator",
+    "oai_deep_research_tool": "src.tools.oai_deep_research",
+    "planning_tool": "src.tools.planning",
+    "python_interpreter_tool": "src.tools.python_interpreter",
+    "video_generator_tool": "src.tools.video_generator",
+    "web_fetcher_tool": "src.tools.web_fetcher",
+    "web_searcher_tool": "src.tools.web_searcher",
+})
+AGENT = LazyRegistry('agent', locations=['src.agent'], lazy_modules={
+    "browser_use_agent": "src.agent.browser_use_agent.browser_use_agent",
+    "deep_analyzer_agent": "src.agent.deep_analyzer_agent.deep_analyzer_agent",
+    "deep_researcher_agent": "src.agent.deep_researcher_agent.deep_researcher_agent",
+    "general_agent": "src.agent.general_agent.general_agent",
+    "planning_agent": "src.agent.planning_agent.planning_agent",
+})
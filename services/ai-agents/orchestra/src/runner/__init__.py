@@ -0,0 +1,8 @@
+from src.runner.answers_log import AnswersLog
+from src.runner.runner import BenchmarkRunner, make_error_entry
+
+__all__ = [
+    "AnswersLog",
+    "BenchmarkRunner",
+    "make_error_entry",
+]
\ No newline at end of file
@@ -0,0 +1,99 @@
+import json
+import os
+import threading
+from typing import Any, Callable, Dict, Iterator, Optional
+
+from src.logger import logger
+
+
+class AnswersLog():
+    """Append-only JSONL file of benchmark answers, indexed by task id.
+
+    The file is scanned once when opened, keeping the byte offset of the latest entry of
+    each task and whether that entry counts as done. A task that is run again appends a
+    new entry, which supersedes the previous one, so resuming never rewrites the file.
+    A truncated last line, left by an interrupted run, is ignored.
+
+    Args:
+        path (str): Path of the JSONL file.
+        is_done (Callable, optional): Decides whether an entry completes its task, every
+            entry does by default. Tasks whose latest entry is not done are run again.
+        key (str): Field holding the task id.
+    """
+    def __init__(self,
+                 path: str,
+                 is_done: Optional[Callable[[Dict[str, Any]], bool]] = None,
+                 key: str = "task_id"):
+        self.path = path
+        self.is_done = is_done if is_done is not None else (lambda entry: True)
+        self.key = key
+
+        self._offsets: Dict[Any, int] = {}
+        self._done: Dict[Any, bool] = {}
+        self._lock = threading.Lock()
+        self._needs_newline = False
+        self._load()
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+
+        num_invalid = 0
+        with open(self.path, "rb") as f:
+            offset = 0
+            for line in f:
+                line_offset, offset = offset, offset + len(line)
+                # A previous run may have stopped in the middle of the last line
+                self._needs_newline = not line.endswith(b"\n")
+                if not line.strip():
+                    continue
+                try:
+                    entry = json.loads(line)
+                    task_id = entry[self.key]
+                except (json.JSONDecodeError, KeyError, TypeError):
+                    num_invalid += 1
+                    continue
+                self._offsets[task_id] = line_offset
+                self._done[task_id] = bool(self.is_done(entry))
+
+        if num_invalid:
+            logger.warning(f"| Skipped {num_invalid} unreadable lines in {self.path}")
+
+    def __contains__(self, task_id: Any) -> bool:
+        return task_id in self._offsets
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self._offsets)
+
+    def done(self, task_id: Any) -> bool:
+        return self._done.get(task_id, False)
+
+    @property
+    def num_done(self) -> int:
+        return sum(self._done.values())
+
+    def get(self, task_id: Any) -> Optional[Dict[str, Any]]:
+        """Read the latest entry of a task."""
+        offset = self._offsets.get(task_id)
+        if offset is None:
+            return None
+        with open(self.path, "rb") as f:
+            f.seek(offset)
+            return json.loads(f.readline())
+
+    def append(self, entry: Dict[str, Any]):
+        line = (json.dumps(entry, default=str) + "\n").encode("utf-8")
+        with self._lock:
+            directory = os.path.dirname(os.path.abspath(self.path))
+            os.makedirs(directory, exist_ok=True)
+            with open(self.path, "ab") as f:
+                if self._needs_newline:
+                    f.write(b"\n")
+                    self._needs_newline = False
+                offset = f.tell()
+                f.write(line)
+            self._offsets[entry[self.key]] = offset
+            self._done[entry[self.key]] = bool(self.is_done(entry))
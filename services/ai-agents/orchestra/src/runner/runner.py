@@ -0,0 +1,141 @@
+import asyncio
+import time
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence
+
+from src.logger import logger
+from src.runner.answers_log import AnswersLog
+
+
+def format_duration(seconds: float) -> str:
+    seconds = int(seconds)
+    hours, seconds = divmod(seconds, 3600)
+    minutes, seconds = divmod(seconds, 60)
+    return f"{hours}h{minutes:02d}m{seconds:02d}s" if hours else f"{minutes}m{seconds:02d}s"
+
+
+def make_error_entry(config, example: Dict[str, Any], error: BaseException) -> Dict[str, Any]:
+    """Answers log entry of a GAIA/HLE task that timed out or raised."""
+    now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    return {
+        "agent_name": config.agent_config.name,
+        "question": example["question"],
+        "augmented_question": example["question"],
+        "prediction": None,
+        "intermediate_steps": [],
+        "parsing_error": False,
+        "iteration_limit_exceeded": False,
+        "agent_error": f"{type(error).__name__}: {error}",
+        "start_time": now,
+        "end_time": now,
+        "task": example["task"],
+        "task_id": example["task_id"],
+        "true_answer": example["true_answer"],
+    }
+
+
+class BenchmarkRunner():
+    """Run benchmark tasks from a work queue with a fixed number of worker slots.
+
+    Each slot pulls the next task as soon as its previous one finishes, so a slow task
+    only holds its own slot. Every result is appended to the answers log as it arrives,
+    which is what makes an interrupted run resumable.
+
+    Args:
+        answer_fn (Callable): Coroutine function answering one task, returns the entry
+            to append to the answers log.
+        answers_log (AnswersLog): Log receiving the entries.
+        error_entry_fn (Callable): Builds the entry of a task that timed out or raised,
+            from the task and the error.
+        concurrency (int): Number of worker slots.
+        task_timeout (float, optional): Seconds after which a task is cancelled.
+        report_interval (float): Minimum seconds between two progress reports.
+    """
+    def __init__(self,
+                 answer_fn: Callable[[Dict[str, Any]], Awaitable[Dict[str, Any]]],
+                 answers_log: AnswersLog,
+                 error_entry_fn: Callable[[Dict[str, Any], BaseException], Dict[str, Any]],
+                 concurrency: int = 4,
+                 task_timeout: Optional[float] = None,
+                 report_interval: float = 30.0):
+        self.answer_fn = answer_fn
+        self.answers_log = answers_log
+        self.error_entry_fn = error_entry_fn
+        self.concurrency = max(1, concurrency)
+        self.task_timeout = task_timeout
+        self.report_interval = report_interval
+
+        self.stats = dict(total=0, finished=0, failed=0, timed_out=0)
+        self._start_time = 0.0
+        self._last_report = 0.0
+
+    def tasks_to_run(self,
+                     tasks: Sequence[Dict[str, Any]],
+                     key: str = "task_id",
+                     task_ids: Optional[Sequence[Any]] = None) -> List[Dict[str, Any]]:
+        """Keep the tasks without a done entry in the answers log.
+
+        When `tasks` is a lazily materialized dataset, pass its `task_ids` so that only
+        the rows still to run are read.
+        """
+        if task_ids is None:
+            task_ids = [task[key] for task in tasks]
+        remaining = [tasks[i] for i, task_id in enumerate(task_ids) if not self.answers_log.done(task_id)]
+        logger.info(f"| Found {self.answers_log.num_done} previous results, {len(remaining)} tasks to run.")
+        return remaining
+
+    async def _run_task(self, task: Dict[str, Any]) -> Dict[str, Any]:
+        try:
+            return await asyncio.wait_for(self.answer_fn(task), timeout=self.task_timeout)
+        except asyncio.TimeoutError:
+            self.stats["timed_out"] += 1
+            error = TimeoutError(f"Task exceeded the {self.task_timeout}s timeout")
+            logger.warning(f"| Task {task.get('task_id')} timed out after {self.task_timeout}s")
+        except Exception as e:
+            self.stats["failed"] += 1
+            error = e
+            logger.warning(f"| Task {task.get('task_id')} failed: {type(e).__name__}: {e}")
+        return self.error_entry_fn(task, error)
+
+    async def _worker(self, queue: asyncio.Queue):
+        while True:
+            try:
+                task = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            entry = await self._run_task(task)
+            self.answers_log.append(entry)
+            self.stats["finished"] += 1
+            self._report()
+
+    def _report(self, force: bool = False):
+        now = time.monotonic()
+        finished, total = self.stats["finished"], self.stats["total"]
+        if not force and now - self._last_report < self.report_interval:
+            return
+        self._last_report = now
+
+        elapsed = now - self._start_time
+        throughput = finished / elapsed if elapsed > 0 else 0.0
+        eta = (total - finished) / throughput if throughput > 0 else float("inf")
+        logger.info(
+            f"| Progress: {finished}/{total} tasks "
+            f"({self.stats['failed']} failed, {self.stats['timed_out']} timed out) | "
+            f"{throughput * 60:.2f} tasks/min | elapsed {format_duration(elapsed)} | "
+            f"ETA {format_duration(eta) if eta != float('inf') else 'unknown'}"
+        )
+
+    async def run(self, tasks: List[Dict[str, Any]]) -> Dict[str, int]:
+        queue: asyncio.Queue = asyncio.Queue()
+        for task in tasks:
+            queue.put_nowait(task)
+
+        self.stats = dict(total=len(tasks), finished=0, failed=0, timed_out=0)
+        self._start_time = self._last_report = time.monotonic()
+        num_workers = min(self.concurrency, len(tasks))
+        logger.info(f"| Running {len(tasks)} tasks on {num_workers} workers.")
+
+        await asyncio.gather(*[self._worker(queue) for _ in range(num_workers)])
+        if tasks:
+            self._report(force=True)
+        return self.stats
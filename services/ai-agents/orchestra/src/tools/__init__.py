@@ -1,13 +1,28 @@
+import importlib
+
 from src.tools.tools import Tool, ToolResult, AsyncTool, make_tool_instance
-from src.tools.deep_analyzer import DeepAnalyzerTool
-from src.tools.deep_researcher import DeepResearcherTool
-from src.tools.python_interpreter import PythonInterpreterTool
-from src.tools.auto_browser import AutoBrowserUseTool
-from src.tools.planning import PlanningTool
-from src.tools.image_generator import ImageGeneratorTool
-from src.tools.video_generator import VideoGeneratorTool
-from src.tools.file_reader import FileReaderTool
-from src.tools.oai_deep_research import OAIDeepResearchTool
+
+# Tools are imported on first access, so that importing `src.tools` does not pull in
+# browser-use, playwright, markitdown and the model providers of every tool.
+_LAZY_IMPORTS = {
+    "DeepAnalyzerTool": "src.tools.deep_analyzer",
+    "DeepResearcherTool": "src.tools.deep_researcher",
+    "PythonInterpreterTool": "src.tools.python_interpreter",
+    "AutoBrowserUseTool": "src.tools.auto_browser",
+    "PlanningTool": "src.tools.planning",
+    "ImageGeneratorTool": "src.tools.image_generator",
+    "VideoGeneratorTool": "src.tools.video_generator",
+    "GenerationJobTool": "src.tools.generation_job",
+    "FileReaderTool": "src.tools.file_reader",
+    "OAIDeepResearchTool": "src.tools.oai_deep_research",
+}
+
+def __getattr__(name):
+    if name in _LAZY_IMPORTS:
+        value = getattr(importlib.import_module(_LAZY_IMPORTS[name]), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 __all__ = [
@@ -21,6 +36,7 @@ __all__ = [
     "PlanningTool",
     "ImageGeneratorTool",
     "VideoGeneratorTool",
+    "GenerationJobTool",
     "make_tool_instance",
     "FileReaderTool",
     "OAIDeepResearchTool"
@@ -2,6 +2,7 @@ import os
 import subprocess
 import atexit
 import signal
+import uuid
 from dotenv import load_dotenv
 load_dotenv(verbose=True)
 
@@ -9,6 +10,7 @@ from browser_use import Agent
 
 from src.tools import AsyncTool, ToolResult
 from src.tools.browser import Controller
+from src.tools.browser.context_pool import get_context_pool
 from src.utils import assemble_project_path
 from src.registry import TOOL
 from src.models import model_manager
@@ -31,11 +33,15 @@ class AutoBrowserUseTool(AsyncTool):
 
     def __init__(self,
                  model_id: str = "gpt-4.1",
+                 use_context_pool: bool = True,
                  ):
 
         super(AutoBrowserUseTool, self).__init__()
 
         self.model_id = model_id
+        self.use_context_pool = use_context_pool
+        # Owner token of the pooled contexts, unlike id() it is never reused by another instance
+        self.context_owner = uuid.uuid4().hex
         self.http_server_path = assemble_project_path("src/tools/browser/http_server")
         self.http_save_path = assemble_project_path("src/tools/browser/http_server/local")
         os.makedirs(self.http_save_path, exist_ok=True)
@@ -74,17 +80,31 @@ class AutoBrowserUseTool(AsyncTool):
 
         model = model_manager.registed_models[model_id]
 
-        browser_agent = Agent(
-            task=task,
-            llm=model,
-            enable_memory=False,
-            controller=controller,
-            page_extraction_llm=model,
-        )
-
-        history = await browser_agent.run(max_steps=50)
-        contents = history.extracted_content()
-        return "\n".join(contents)
+        if not self.use_context_pool:
+            browser_agent = Agent(
+                task=task,
+                llm=model,
+                enable_memory=False,
+                controller=controller,
+                page_extraction_llm=model,
+            )
+            history = await browser_agent.run(max_steps=50)
+            return "\n".join(history.extracted_content())
+
+        # Each tool instance belongs to one agent, so it owns its contexts (cookies, storage)
+        pool = get_context_pool()
+        async with pool.context(owner=self.context_owner) as browser_context:
+            browser_agent = Agent(
+                task=task,
+                llm=model,
+                enable_memory=False,
+                controller=controller,
+                page_extraction_llm=model,
+                browser=pool.browser,
+                browser_context=browser_context,
+            )
+            history = await browser_agent.run(max_steps=50)
+        return "\n".join(history.extracted_content())
 
     async def forward(self, task: str) -> ToolResult:
         """
@@ -1,7 +1,14 @@
 from .controller import Controller
 from .cdp import CDP
+from .snapshot import PageFingerprint, DOMSnapshotDiffer
+from .context_pool import BrowserContextPool, get_context_pool, close_context_pools
 
 __all__ = [
     'Controller',
     'CDP',
+    'PageFingerprint',
+    'DOMSnapshotDiffer',
+    'BrowserContextPool',
+    'get_context_pool',
+    'close_context_pools',
 ]
\ No newline at end of file
@@ -0,0 +1,265 @@
+import asyncio
+import atexit
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any, Dict, Hashable, List, Optional
+
+from browser_use import Browser, BrowserConfig
+from browser_use.browser.context import BrowserContext, BrowserContextConfig
+
+from src.logger import logger
+
+_JS_HEAP_SIZE_JS = "() => (performance.memory ? performance.memory.usedJSHeapSize : 0)"
+
+
+@dataclass
+class PooledContext:
+    context: BrowserContext
+    owner: Optional[Hashable] = None
+    uses: int = 0
+    created_at: float = field(default_factory=time.monotonic)
+    released_at: float = field(default_factory=time.monotonic)
+
+
+class BrowserContextPool():
+    """A pool of pre-launched browser contexts on one shared browser.
+
+    Chromium is started once and contexts are warmed up (session and first page created)
+    ahead of use. A context is bound to the first owner that acquires it, so agents never
+    share cookies or storage, and is handed back to the same owner on its next task. A
+    context is closed instead of being reused after `max_uses` tasks or when the JS heap
+    of its pages grows past `memory_threshold_mb`. Once `max_idle_contexts` are idle, the
+    least recently released context of any owner is closed to make room.
+
+    Args:
+        browser_config (BrowserConfig, optional): Config of the shared browser.
+        context_config (BrowserContextConfig, optional): Config of every context.
+        max_idle_contexts (int): Maximum of idle contexts kept open, warm ones included.
+        num_warm_contexts (int): Number of fresh contexts kept warmed up for new owners.
+        max_uses (int): Number of tasks after which a context is recycled.
+        memory_threshold_mb (float): JS heap size after which a context is recycled.
+    """
+    def __init__(self,
+                 browser_config: Optional[BrowserConfig] = None,
+                 context_config: Optional[BrowserContextConfig] = None,
+                 max_idle_contexts: int = 8,
+                 num_warm_contexts: int = 1,
+                 max_uses: int = 20,
+                 memory_threshold_mb: float = 512):
+        self.browser_config = browser_config if browser_config is not None else BrowserConfig()
+        self.context_config = context_config if context_config is not None else BrowserContextConfig()
+        self.max_idle_contexts = max_idle_contexts
+        self.num_warm_contexts = num_warm_contexts
+        self.max_uses = max_uses
+        self.memory_threshold_mb = memory_threshold_mb
+
+        self.browser: Optional[Browser] = None
+        self._warm: List[PooledContext] = []
+        self._idle: Dict[Hashable, List[PooledContext]] = {}
+        self._in_use: Dict[int, PooledContext] = {}
+        self._lock: Optional[asyncio.Lock] = None
+        self._browser_lock: Optional[asyncio.Lock] = None
+        self._warm_task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+        self.stats = dict(
+            browser_launches=0,
+            context_launches=0,
+            warm_hits=0,
+            reuses=0,
+            recycles=0,
+            evictions=0,
+            launch_time=0.0,
+        )
+
+    def _get_lock(self) -> asyncio.Lock:
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        return self._lock
+
+    async def ensure_browser(self) -> Browser:
+        if self._browser_lock is None:
+            self._browser_lock = asyncio.Lock()
+        async with self._browser_lock:
+            if self.browser is None:
+                self._loop = asyncio.get_running_loop()
+                start = time.monotonic()
+                browser = Browser(config=self.browser_config)
+                await browser.get_playwright_browser()
+                self.browser = browser
+                self.stats["browser_launches"] += 1
+                self.stats["launch_time"] += time.monotonic() - start
+        return self.browser
+
+    async def _launch_context(self) -> PooledContext:
+        browser = await self.ensure_browser()
+        start = time.monotonic()
+        context = BrowserContext(browser=browser, config=self.context_config)
+        # Creating the first page starts the session, which is the expensive part
+        await context.get_current_page()
+        self.stats["context_launches"] += 1
+        self.stats["launch_time"] += time.monotonic() - start
+        return PooledContext(context=context)
+
+    async def _fill_warm(self):
+        try:
+            while len(self._warm) < self.num_warm_contexts and self._num_idle() < self.max_idle_contexts:
+                self._warm.append(await self._launch_context())
+        except Exception as e:
+            logger.warning(f"| Failed to warm up a browser context: {e}")
+
+    def _schedule_warm(self):
+        if self.num_warm_contexts > 0 and (self._warm_task is None or self._warm_task.done()):
+            self._warm_task = asyncio.create_task(self._fill_warm())
+
+    def _num_idle(self) -> int:
+        return len(self._warm) + sum(len(contexts) for contexts in self._idle.values())
+
+    def _pop_lru_idle(self) -> Optional[PooledContext]:
+        """Remove and return the least recently released idle context, if any."""
+        owners = [owner for owner, contexts in self._idle.items() if contexts]
+        if not owners:
+            return None
+        owner = min(owners, key=lambda owner: self._idle[owner][0].released_at)
+        pooled = self._idle[owner].pop(0)
+        if not self._idle[owner]:
+            del self._idle[owner]
+        return pooled
+
+    async def start(self):
+        """Launch the browser and warm up contexts ahead of the first task."""
+        await self.ensure_browser()
+        await self._fill_warm()
+
+    async def acquire(self, owner: Hashable) -> BrowserContext:
+        pooled = None
+        async with self._get_lock():
+            idle = self._idle.get(owner, [])
+            if idle:
+                pooled = idle.pop()
+                if not idle:
+                    del self._idle[owner]
+                self.stats["reuses"] += 1
+            elif self._warm:
+                pooled = self._warm.pop()
+                self.stats["warm_hits"] += 1
+        if pooled is None:
+            pooled = await self._launch_context()
+
+        pooled.owner = owner
+        pooled.uses += 1
+        self._in_use[id(pooled.context)] = pooled
+        self._schedule_warm()
+        return pooled.context
+
+    async def _memory_mb(self, context: BrowserContext) -> float:
+        total = 0
+        session = getattr(context, "session", None)
+        if session is None:
+            return 0.0
+        for page in session.context.pages:
+            try:
+                total += await page.evaluate(_JS_HEAP_SIZE_JS)
+            except Exception:
+                pass
+        return total / (1024 * 1024)
+
+    async def _reset(self, context: BrowserContext):
+        """Leave a single blank tab, keeping the cookies and storage of the owner."""
+        pages = context.session.context.pages
+        for page in pages[1:]:
+            await page.close()
+        if pages:
+            await pages[0].goto("about:blank")
+
+    async def release(self, context: BrowserContext):
+        pooled = self._in_use.pop(id(context), None)
+        if pooled is None:
+            await context.close()
+            return
+
+        recycle = pooled.uses >= self.max_uses
+        if not recycle:
+            memory_mb = await self._memory_mb(context)
+            recycle = memory_mb >= self.memory_threshold_mb
+        if not recycle:
+            try:
+                await self._reset(context)
+            except Exception as e:
+                logger.warning(f"| Failed to reset browser context, recycling it: {e}")
+                recycle = True
+
+        kept, evicted = False, None
+        async with self._get_lock():
+            if not recycle and self._num_idle() >= self.max_idle_contexts:
+                evicted = self._pop_lru_idle()
+            if not recycle and self._num_idle() < self.max_idle_contexts:
+                pooled.released_at = time.monotonic()
+                self._idle.setdefault(pooled.owner, []).append(pooled)
+                kept = True
+        if evicted is not None:
+            self.stats["evictions"] += 1
+            await evicted.context.close()
+        if not kept:
+            self.stats["recycles"] += 1
+            await context.close()
+
+    @asynccontextmanager
+    async def context(self, owner: Hashable):
+        context = await self.acquire(owner)
+        try:
+            yield context
+        finally:
+            await self.release(context)
+
+    def metrics(self) -> Dict[str, Any]:
+        return dict(
+            **self.stats,
+            warm=len(self._warm),
+            idle=sum(len(contexts) for contexts in self._idle.values()),
+            in_use=len(self._in_use),
+        )
+
+    async def close(self):
+        if self._warm_task is not None:
+            self._warm_task.cancel()
+        pooled = self._warm + [p for contexts in self._idle.values() for p in contexts] + list(self._in_use.values())
+        self._warm, self._idle, self._in_use = [], {}, {}
+        await asyncio.gather(*[p.context.close() for p in pooled], return_exceptions=True)
+        if self.browser is not None:
+            await self.browser.close()
+            self.browser = None
+
+
+_pools: Dict[str, BrowserContextPool] = {}
+
+def get_context_pool(browser_config: Optional[BrowserConfig] = None,
+                     context_config: Optional[BrowserContextConfig] = None,
+                     **kwargs) -> BrowserContextPool:
+    """Return the shared pool for the browser and context configs, creating it if needed."""
+    key = repr((browser_config, context_config))
+    if key not in _pools:
+        _pools[key] = BrowserContextPool(browser_config, context_config, **kwargs)
+    return _pools[key]
+
+async def close_context_pools():
+    """Close every shared pool and its browser."""
+    pools = list(_pools.values())
+    _pools.clear()
+    await asyncio.gather(*[pool.close() for pool in pools], return_exceptions=True)
+
+@atexit.register
+def _close_context_pools_at_exit():
+    # Playwright objects belong to the loop that launched them, so reuse it when possible
+    for key, pool in list(_pools.items()):
+        del _pools[key]
+        if pool.browser is None:
+            continue
+        try:
+            if pool._loop is not None and not pool._loop.is_closed() and not pool._loop.is_running():
+                pool._loop.run_until_complete(pool.close())
+            else:
+                asyncio.run(pool.close())
+        except Exception as e:
+            logger.warning(f"| Failed to close browser context pool at exit: {e}")
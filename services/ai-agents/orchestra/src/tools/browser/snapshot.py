@@ -0,0 +1,96 @@
+import difflib
+import re
+from dataclasses import dataclass
+from typing import Optional
+
+from patchright.async_api import Page
+
+# Counts the interactive elements and hashes their tag/text, in one round trip.
+# Cheap enough to run between batched actions, unlike a full DOM tree build.
+# Input values are left out, so typing into a form does not count as a change.
+_PAGE_FINGERPRINT_JS = """() => {
+    const elements = document.querySelectorAll(
+        'a, button, input, select, textarea, [role], [onclick], [contenteditable="true"]');
+    let hash = 0;
+    for (const el of elements) {
+        const key = el.tagName + (el.innerText || '').slice(0, 32);
+        for (let i = 0; i < key.length; i++) {
+            hash = ((hash << 5) - hash + key.charCodeAt(i)) | 0;
+        }
+    }
+    return {count: elements.length, hash: hash};
+}"""
+
+_INDEX_PATTERN = re.compile(r"^\s*\[\d+\]")
+
+
+@dataclass(frozen=True)
+class PageFingerprint:
+    url: str
+    num_elements: int
+    elements_hash: int
+
+    @classmethod
+    async def capture(cls, page: Page) -> "PageFingerprint":
+        result = await page.evaluate(_PAGE_FINGERPRINT_JS)
+        return cls(url=page.url, num_elements=result["count"], elements_hash=result["hash"])
+
+    def describe_change(self, other: "PageFingerprint") -> Optional[str]:
+        """Describe how the page changed since this fingerprint, None if it did not."""
+        if self.url != other.url:
+            return f"navigated from {self.url} to {other.url}"
+        if self.num_elements != other.num_elements:
+            return f"interactive elements changed from {self.num_elements} to {other.num_elements}"
+        if self.elements_hash != other.elements_hash:
+            return "interactive elements changed"
+        return None
+
+
+class DOMSnapshotDiffer():
+    """Turn successive interactive-element dumps of a page into diffs.
+
+    The first snapshot of a page, and any snapshot after a navigation, is returned in
+    full. After that only the changed lines are returned, unless the diff would be
+    longer than the snapshot itself. Lines are matched without their [N] indices, so
+    an element that kept its text but was renumbered, e.g. by an insertion above it,
+    is listed again with its current index. Every index in a diff is current.
+    """
+    def __init__(self):
+        self._url: Optional[str] = None
+        self._lines: list[str] = []
+
+    def reset(self):
+        self._url = None
+        self._lines = []
+
+    def diff(self, url: str, elements_text: str) -> tuple[bool, str]:
+        """Return (is_full_snapshot, observation) and remember the snapshot."""
+        lines = elements_text.splitlines()
+        previous_url, previous_lines = self._url, self._lines
+        self._url, self._lines = url, lines
+
+        if previous_url != url:
+            return True, elements_text
+
+        matcher = difflib.SequenceMatcher(
+            a=[_INDEX_PATTERN.sub("", line) for line in previous_lines],
+            b=[_INDEX_PATTERN.sub("", line) for line in lines],
+            autojunk=False,
+        )
+        changes = []
+        for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+            if tag == "equal":
+                changes.extend(f"~ {new}" for old, new in zip(previous_lines[i1:i2], lines[j1:j2])
+                               if old != new)
+                continue
+            changes.extend(f"- {line}" for line in previous_lines[i1:i2])
+            changes.extend(f"+ {line}" for line in lines[j1:j2])
+
+        if not changes:
+            return False, f"No changes to the {len(lines)} interactive elements since the last state."
+
+        observation = (f"{len(changes)} changed lines since the last state (- removed, + added, "
+                       f"~ new index), other elements keep their index:\n" + "\n".join(changes))
+        if len(observation) >= len(elements_text):
+            return True, elements_text
+        return False, observation
@@ -4,8 +4,8 @@ load_dotenv(verbose=True)
 import asyncio
 import base64
 import json
+import uuid
 from typing import Generic, Optional, TypeVar, Any
-from browser_use import Browser as BrowserUseBrowser
 from browser_use import BrowserConfig
 from browser_use.browser.context import BrowserContext, BrowserContextConfig
 from browser_use.dom.service import DomService
@@ -16,6 +16,8 @@ from src.tools.web_searcher import WebSearcherTool
 from src.tools.web_fetcher import fetch_url
 from src.config import config
 from src.tools.markdown.mdconvert import MarkitdownConverter
+from src.tools.browser.snapshot import PageFingerprint, DOMSnapshotDiffer
+from src.tools.browser.context_pool import get_context_pool
 from src.logger import logger
 
 _BROWSER_DESCRIPTION = """\
@@ -31,6 +33,7 @@ Key capabilities include:
 * Scrolling: Scroll up/down by pixel amount or scroll to specific text
 * Content extraction: Extract and analyze content from web pages based on specific goals
 * Tab management: Switch between tabs, open new tabs, or close tabs
+* Batching: Run several actions in one call with `batch`, e.g. to fill a form. The batch stops early if the page changes unexpectedly
 
 Note: When using element indices, refer to the numbered elements shown in the current browser state.
 """
@@ -107,6 +110,7 @@ class BrowserUseTool(AsyncTool, Generic[Context]):
                     "switch_tab",
                     "open_tab",
                     "close_tab",
+                    "batch",
                 ],
                 "description": "The browser action to perform",
             },
@@ -155,6 +159,12 @@ class BrowserUseTool(AsyncTool, Generic[Context]):
                 "description": "Seconds to wait for 'wait' action",
                 "nullable": True,
             },
+            "actions": {
+                "type": "array",
+                "description": "Actions for 'batch' action, each an object with an 'action' key and the parameters of that action",
+                "items": {"type": "object"},
+                "nullable": True,
+            },
         },
         "required": ["action"],
         "dependencies": {
@@ -173,6 +183,7 @@ class BrowserUseTool(AsyncTool, Generic[Context]):
             "web_search": ["query"],
             "wait": ["seconds"],
             "extract_content": ["goal"],
+            "batch": ["actions"],
         },
     }
     output_type = 'any'
@@ -183,6 +194,9 @@ class BrowserUseTool(AsyncTool, Generic[Context]):
 
         self.browser = None
         self.context = None
+        self.context_pool = None
+        # Owner token of the pooled context, unlike id() it is never reused by another instance
+        self.context_owner = uuid.uuid4().hex
         self.dom_service = None
         self.tool_context = None
 
@@ -197,6 +211,7 @@ class BrowserUseTool(AsyncTool, Generic[Context]):
         self.converter = converter
 
         self.lock = asyncio.Lock()
+        self.dom_differ = DOMSnapshotDiffer()
 
         super().__init__()
 
@@ -237,9 +252,6 @@ class BrowserUseTool(AsyncTool, Generic[Context]):
                         if not isinstance(value, list) or value:
                             browser_config_kwargs[attr] = value
 
-            self.browser = BrowserUseBrowser(BrowserConfig(**browser_config_kwargs))
-
-        if self.context is None:
             context_config = BrowserContextConfig()
 
             # if there is context config in the config, use it.
@@ -250,7 +262,12 @@ class BrowserUseTool(AsyncTool, Generic[Context]):
             ):
                 context_config = self.browser_config.new_context_config
 
-            self.context = await self.browser.new_context(context_config)
+            # Tools with the same configs share one browser and its pre-launched contexts
+            self.context_pool = get_context_pool(BrowserConfig(**browser_config_kwargs), context_config)
+            self.browser = await self.context_pool.ensure_browser()
+
+        if self.context is None:
+            self.context = await self.context_pool.acquire(owner=self.context_owner)
             self.dom_service = DomService(await self.context.get_current_page())
 
         return self.context
@@ -267,6 +284,7 @@ class BrowserUseTool(AsyncTool, Generic[Context]):
             goal: Optional[str] = None,
             keys: Optional[str] = None,
             seconds: Optional[int] = None,
+            actions: Optional[list[dict]] = None,
             **kwargs,
     ) -> ToolResult:
         """
@@ -283,6 +301,7 @@ class BrowserUseTool(AsyncTool, Generic[Context]):
             goal: Extraction goal for content extraction
             keys: Keys to send for keyboard actions
             seconds: Seconds to wait
+            actions: Actions to run for batch action
             **kwargs: Additional arguments
 
         Returns:
@@ -292,237 +311,310 @@ class BrowserUseTool(AsyncTool, Generic[Context]):
             try:
                 context = await self._ensure_browser_initialized()
 
-                # Get max content length from config
-                max_content_length = getattr(
-                    self.browser_config, "max_content_length", 5000
+                if action == "batch":
+                    return await self._execute_batch(context, actions or [])
+
+                return await self._execute_action(
+                    context,
+                    action,
+                    url=url,
+                    index=index,
+                    text=text,
+                    scroll_amount=scroll_amount,
+                    tab_id=tab_id,
+                    query=query,
+                    goal=goal,
+                    keys=keys,
+                    seconds=seconds,
                 )
 
-                # Navigation actions
-                if action == "go_to_url":
-                    if not url:
-                        return ToolResult(
-                            error="URL is required for 'go_to_url' action"
-                        )
-                    page = await context.get_current_page()
-                    await page.goto(url)
-                    await page.wait_for_load_state()
-                    return ToolResult(output=f"Navigated to {url}")
-
-                elif action == "go_back":
-                    await context.go_back()
-                    return ToolResult(output="Navigated back")
-
-                elif action == "refresh":
-                    await context.refresh_page()
-                    return ToolResult(output="Refreshed current page")
-
-                elif action == "web_search":
-                    if not query:
-                        return ToolResult(
-                            error="Query is required for 'web_search' action"
-                        )
-                    # Execute the web search and return results directly without browser navigation
-                    search_response = self.web_searcher.forward(
-                        query=query
-                    )
-                    # Navigate to the first search result
-                    first_search_result = search_response.results[0]
-                    url_to_navigate = first_search_result.url
-
-                    page = await context.get_current_page()
-                    await page.goto(url_to_navigate)
-                    await page.wait_for_load_state()
-
-                    return search_response
-
-                # Element interaction actions
-                elif action == "click_element":
-                    if index is None:
-                        return ToolResult(
-                            error="Index is required for 'click_element' action"
-                        )
-                    element = await context.get_dom_element_by_index(index)
-                    if not element:
-                        return ToolResult(error=f"Element with index {index} not found")
-                    download_path = await context._click_element_node(element)
-                    output = f"Clicked element at index {index}"
-                    if download_path:
-                        output += f" - Downloaded file to {download_path}"
-                    return ToolResult(output=output)
-
-                elif action == "input_text":
-                    if index is None or not text:
-                        return ToolResult(
-                            error="Index and text are required for 'input_text' action"
-                        )
-                    element = await context.get_dom_element_by_index(index)
-                    if not element:
-                        return ToolResult(error=f"Element with index {index} not found")
-                    await context._input_text_element_node(element, text)
-                    return ToolResult(
-                        output=f"Input '{text}' into element at index {index}"
-                    )
+            except Exception as e:
+                return ToolResult(error=f"Browser action '{action}' failed: {str(e)}")
 
-                elif action == "scroll_down" or action == "scroll_up":
-                    direction = 1 if action == "scroll_down" else -1
-                    amount = (
-                        scroll_amount
-                        if scroll_amount is not None
-                        else context.config.browser_window_size["height"]
-                    )
-                    await context.execute_javascript(
-                        f"window.scrollBy(0, {direction * amount});"
-                    )
-                    return ToolResult(
-                        output=f"Scrolled {'down' if direction > 0 else 'up'} by {amount} pixels"
-                    )
+    async def _execute_action(
+            self,
+            context: BrowserContext,
+            action: str,
+            url: Optional[str] = None,
+            index: Optional[int] = None,
+            text: Optional[str] = None,
+            scroll_amount: Optional[int] = None,
+            tab_id: Optional[int] = None,
+            query: Optional[str] = None,
+            goal: Optional[str] = None,
+            keys: Optional[str] = None,
+            seconds: Optional[int] = None,
+            **kwargs,
+    ) -> ToolResult:
+        """Execute a single browser action, the caller holds the lock."""
+        # Get max content length from config
+        max_content_length = getattr(
+            self.browser_config, "max_content_length", 5000
+        )
 
-                elif action == "scroll_to_text":
-                    if not text:
-                        return ToolResult(
-                            error="Text is required for 'scroll_to_text' action"
-                        )
-                    page = await context.get_current_page()
-                    try:
-                        locator = page.get_by_text(text, exact=False)
-                        await locator.scroll_into_view_if_needed()
-                        return ToolResult(output=f"Scrolled to text: '{text}'")
-                    except Exception as e:
-                        return ToolResult(error=f"Failed to scroll to text: {str(e)}")
-
-                elif action == "send_keys":
-                    if not keys:
-                        return ToolResult(
-                            error="Keys are required for 'send_keys' action"
-                        )
-                    page = await context.get_current_page()
-                    await page.keyboard.press(keys)
-                    return ToolResult(output=f"Sent keys: {keys}")
-
-                elif action == "get_dropdown_options":
-                    if index is None:
-                        return ToolResult(
-                            error="Index is required for 'get_dropdown_options' action"
-                        )
-                    element = await context.get_dom_element_by_index(index)
-                    if not element:
-                        return ToolResult(error=f"Element with index {index} not found")
-                    page = await context.get_current_page()
-                    options = await page.evaluate(
-                        """
-                        (xpath) => {
-                            const select = document.evaluate(xpath, document, null,
-                                XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
-                            if (!select) return null;
-                            return Array.from(select.options).map(opt => ({
-                                text: opt.text,
-                                value: opt.value,
-                                index: opt.index
-                            }));
-                        }
-                    """,
-                        element.xpath,
-                    )
-                    return ToolResult(output=f"Dropdown options: {options}")
-
-                elif action == "select_dropdown_option":
-                    if index is None or not text:
-                        return ToolResult(
-                            error="Index and text are required for 'select_dropdown_option' action"
-                        )
-                    element = await context.get_dom_element_by_index(index)
-                    if not element:
-                        return ToolResult(error=f"Element with index {index} not found")
-                    page = await context.get_current_page()
-                    await page.select_option(element.xpath, label=text)
-                    return ToolResult(
-                        output=f"Selected option '{text}' from dropdown at index {index}"
-                    )
+        # Navigation actions
+        if action == "go_to_url":
+            if not url:
+                return ToolResult(
+                    error="URL is required for 'go_to_url' action"
+                )
+            page = await context.get_current_page()
+            await page.goto(url)
+            await page.wait_for_load_state()
+            return ToolResult(output=f"Navigated to {url}")
+
+        elif action == "go_back":
+            await context.go_back()
+            return ToolResult(output="Navigated back")
+
+        elif action == "refresh":
+            await context.refresh_page()
+            return ToolResult(output="Refreshed current page")
+
+        elif action == "web_search":
+            if not query:
+                return ToolResult(
+                    error="Query is required for 'web_search' action"
+                )
+            # Execute the web search and return results directly without browser navigation
+            search_response = self.web_searcher.forward(
+                query=query
+            )
+            # Navigate to the first search result
+            first_search_result = search_response.results[0]
+            url_to_navigate = first_search_result.url
+
+            page = await context.get_current_page()
+            await page.goto(url_to_navigate)
+            await page.wait_for_load_state()
+
+            return search_response
+
+        # Element interaction actions
+        elif action == "click_element":
+            if index is None:
+                return ToolResult(
+                    error="Index is required for 'click_element' action"
+                )
+            element = await context.get_dom_element_by_index(index)
+            if not element:
+                return ToolResult(error=f"Element with index {index} not found")
+            download_path = await context._click_element_node(element)
+            output = f"Clicked element at index {index}"
+            if download_path:
+                output += f" - Downloaded file to {download_path}"
+            return ToolResult(output=output)
+
+        elif action == "input_text":
+            if index is None or not text:
+                return ToolResult(
+                    error="Index and text are required for 'input_text' action"
+                )
+            element = await context.get_dom_element_by_index(index)
+            if not element:
+                return ToolResult(error=f"Element with index {index} not found")
+            await context._input_text_element_node(element, text)
+            return ToolResult(
+                output=f"Input '{text}' into element at index {index}"
+            )
+
+        elif action == "scroll_down" or action == "scroll_up":
+            direction = 1 if action == "scroll_down" else -1
+            amount = (
+                scroll_amount
+                if scroll_amount is not None
+                else context.config.browser_window_size["height"]
+            )
+            await context.execute_javascript(
+                f"window.scrollBy(0, {direction * amount});"
+            )
+            return ToolResult(
+                output=f"Scrolled {'down' if direction > 0 else 'up'} by {amount} pixels"
+            )
+
+        elif action == "scroll_to_text":
+            if not text:
+                return ToolResult(
+                    error="Text is required for 'scroll_to_text' action"
+                )
+            page = await context.get_current_page()
+            try:
+                locator = page.get_by_text(text, exact=False)
+                await locator.scroll_into_view_if_needed()
+                return ToolResult(output=f"Scrolled to text: '{text}'")
+            except Exception as e:
+                return ToolResult(error=f"Failed to scroll to text: {str(e)}")
+
+        elif action == "send_keys":
+            if not keys:
+                return ToolResult(
+                    error="Keys are required for 'send_keys' action"
+                )
+            page = await context.get_current_page()
+            await page.keyboard.press(keys)
+            return ToolResult(output=f"Sent keys: {keys}")
+
+        elif action == "get_dropdown_options":
+            if index is None:
+                return ToolResult(
+                    error="Index is required for 'get_dropdown_options' action"
+                )
+            element = await context.get_dom_element_by_index(index)
+            if not element:
+                return ToolResult(error=f"Element with index {index} not found")
+            page = await context.get_current_page()
+            options = await page.evaluate(
+                """
+                (xpath) => {
+                    const select = document.evaluate(xpath, document, null,
+                        XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+                    if (!select) return null;
+                    return Array.from(select.options).map(opt => ({
+                        text: opt.text,
+                        value: opt.value,
+                        index: opt.index
+                    }));
+                }
+            """,
+                element.xpath,
+            )
+            return ToolResult(output=f"Dropdown options: {options}")
+
+        elif action == "select_dropdown_option":
+            if index is None or not text:
+                return ToolResult(
+                    error="Index and text are required for 'select_dropdown_option' action"
+                )
+            element = await context.get_dom_element_by_index(index)
+            if not element:
+                return ToolResult(error=f"Element with index {index} not found")
+            page = await context.get_current_page()
+            await page.select_option(element.xpath, label=text)
+            return ToolResult(
+                output=f"Selected option '{text}' from dropdown at index {index}"
+            )
 
-                # Content extraction actions
-                elif action == "extract_content":
-                    if not goal:
-                        return ToolResult(
-                            error="Goal is required for 'extract_content' action"
-                        )
+        # Content extraction actions
+        elif action == "extract_content":
+            if not goal:
+                return ToolResult(
+                    error="Goal is required for 'extract_content' action"
+                )
 
-                    page = await context.get_current_page()
-                    url = page.url
+            page = await context.get_current_page()
+            url = page.url
 
-                    fetch_ = await fetch_url(url, self.converter)
-                    content = fetch_.text_content
+            fetch_ = await fetch_url(url, self.converter)
+            content = fetch_.text_content
 
-                    logger.info(f"Extracting content from page {url}: {content}")
+            logger.info(f"Extracting content from page {url}: {content}")
 
-                    prompt = f"""\
+            prompt = f"""\
 Your task is to extract the content of the page. You will be given a page and a goal, and you should extract all relevant information around this goal from the page. If the goal is vague, summarize the page. Respond in json format.
 Extraction goal: {goal}
 
 Page content:
 {content[:min(len(content), max_content_length)]}
 """
-                    messages = [
-                        {"role": "user", "content": prompt}
-                    ]
-
-                    tools = [
-                        ExtractContentTool()
-                    ]
-
-                    # Use LLM to extract content with required function calling
-                    response = self.model(
-                        messages=messages,
-                        tools_to_call_from=tools,
-                    )
+            messages = [
+                {"role": "user", "content": prompt}
+            ]
+
+            tools = [
+                ExtractContentTool()
+            ]
+
+            # Use LLM to extract content with required function calling
+            response = self.model(
+                messages=messages,
+                tools_to_call_from=tools,
+            )
+
+            if response and response.tool_calls:
+                args = response.tool_calls[0].function.arguments
+                extracted_content = args.get("extracted_content", {})
+                return ToolResult(
+                    output=f"Extracted from page:\n{extracted_content}\n"
+                )
 
-                    if response and response.tool_calls:
-                        args = response.tool_calls[0].function.arguments
-                        extracted_content = args.get("extracted_content", {})
-                        return ToolResult(
-                            output=f"Extracted from page:\n{extracted_content}\n"
-                        )
-
-                    return ToolResult(output="No content was extracted from the page.")
-
-                # Tab management actions
-                elif action == "switch_tab":
-                    if tab_id is None:
-                        return ToolResult(
-                            error="Tab ID is required for 'switch_tab' action"
-                        )
-                    await context.switch_to_tab(tab_id)
-                    page = await context.get_current_page()
-                    await page.wait_for_load_state()
-                    return ToolResult(output=f"Switched to tab {tab_id}")
-
-                elif action == "open_tab":
-                    if not url:
-                        return ToolResult(error="URL is required for 'open_tab' action")
-                    await context.create_new_tab(url)
-                    return ToolResult(output=f"Opened new tab with {url}")
-
-                elif action == "close_tab":
-                    await context.close_current_tab()
-                    return ToolResult(output="Closed current tab")
-
-                # Utility actions
-                elif action == "wait":
-                    seconds_to_wait = seconds if seconds is not None else 3
-                    await asyncio.sleep(seconds_to_wait)
-                    return ToolResult(output=f"Waited for {seconds_to_wait} seconds")
-
-                else:
-                    return ToolResult(error=f"Unknown action: {action}")
+            return ToolResult(output="No content was extracted from the page.")
 
-            except Exception as e:
-                return ToolResult(error=f"Browser action '{action}' failed: {str(e)}")
+        # Tab management actions
+        elif action == "switch_tab":
+            if tab_id is None:
+                return ToolResult(
+                    error="Tab ID is required for 'switch_tab' action"
+                )
+            await context.switch_to_tab(tab_id)
+            page = await context.get_current_page()
+            await page.wait_for_load_state()
+            return ToolResult(output=f"Switched to tab {tab_id}")
+
+        elif action == "open_tab":
+            if not url:
+                return ToolResult(error="URL is required for 'open_tab' action")
+            await context.create_new_tab(url)
+            return ToolResult(output=f"Opened new tab with {url}")
+
+        elif action == "close_tab":
+            await context.close_current_tab()
+            return ToolResult(output="Closed current tab")
+
+        # Utility actions
+        elif action == "wait":
+            seconds_to_wait = seconds if seconds is not None else 3
+            await asyncio.sleep(seconds_to_wait)
+            return ToolResult(output=f"Waited for {seconds_to_wait} seconds")
+
+        else:
+            return ToolResult(error=f"Unknown action: {action}")
+
+    async def _execute_batch(self, context: BrowserContext, actions: list[dict]) -> ToolResult:
+        """
+        Execute a list of actions decided in one model call.
+
+        Element indices refer to the state the model saw before the batch. Before each
+        index-based action after the first, a cheap page fingerprint is compared with the
+        one taken before the batch, and the batch stops early if the page navigated or its
+        interactive elements changed. The batch also stops at the first error.
+        """
+        if len(actions) == 0:
+            return ToolResult(error="Actions are required for 'batch' action")
+
+        outputs = []
+        baseline = await PageFingerprint.capture(await context.get_current_page())
+
+        for i, step in enumerate(actions):
+            step = dict(step)
+            name = step.pop("action", None)
+            if name is None or name == "batch":
+                outputs.append(f"{i + 1}. Invalid action: {name}")
+                break
+
+            if i > 0 and step.get("index") is not None:
+                current = await PageFingerprint.capture(await context.get_current_page())
+                change = baseline.describe_change(current)
+                if change is not None:
+                    outputs.append(f"Stopped before action {i + 1} / {len(actions)} ({name}): the page changed ({change}). "
+                                   f"Get the current state before using element indices again.")
+                    break
+
+            result = await self._execute_action(context, name, **step)
+            if getattr(result, "error", None):
+                outputs.append(f"{i + 1}. {name}: Error: {result.error}")
+                break
+            outputs.append(f"{i + 1}. {name}: {getattr(result, 'output', result)}")
+
+        return ToolResult(output="\n".join(outputs))
 
     async def get_current_state(
-        self, context: Optional[BrowserContext] = None
+        self, context: Optional[BrowserContext] = None, diff: bool = True
     ) -> ToolResult:
         """
         Get the current browser state as a ToolResult.
         If context is not provided, uses self.context.
+        If diff is True, the interactive elements are reported as a diff against the
+        previous state of the same page instead of a full dump.
         """
         try:
             # Use provided context or fall back to self.context
@@ -551,17 +643,25 @@ Page content:
 
             screenshot = base64.b64encode(screenshot).decode("utf-8")
 
+            interactive_elements = (
+                state.element_tree.clickable_elements_to_string()
+                if state.element_tree
+                else ""
+            )
+            if diff:
+                is_full, interactive_elements = self.dom_differ.diff(state.url, interactive_elements)
+            else:
+                self.dom_differ.reset()
+                is_full = True
+
             # Build the state info with all required fields
             state_info = {
                 "url": state.url,
                 "title": state.title,
                 "tabs": [tab.model_dump() for tab in state.tabs],
                 "help": "[0], [1], [2], etc., represent clickable indices corresponding to the elements listed. Clicking on these indices will navigate to or interact with the respective content behind them.",
-                "interactive_elements": (
-                    state.element_tree.clickable_elements_to_string()
-                    if state.element_tree
-                    else ""
-                ),
+                "interactive_elements": interactive_elements,
+                "interactive_elements_is_diff": not is_full,
                 "scroll_info": {
                     "pixels_above": getattr(state, "pixels_above", 0),
                     "pixels_below": getattr(state, "pixels_below", 0),
@@ -585,12 +685,12 @@ Page content:
         async with self.lock:
 
             if self.context is not None:
-                await self.context.close()
+                await self.context_pool.release(self.context)
                 self.context = None
                 self.dom_service = None
-            if self.browser is not None:
-                await self.browser.close()
-                self.browser = None
+                self.dom_differ.reset()
+            # The browser is shared through the pool, which closes it at exit
+            self.browser = None
 
         self._loop.stop()
         self._loop.close()
@@ -624,6 +724,7 @@ Page content:
             goal: Optional[str] = None,
             keys: Optional[str] = None,
             seconds: Optional[int] = None,
+            actions: Optional[list[dict]] = None,
         ) -> ToolResult:
 
         res = await self.execute(
@@ -636,7 +737,8 @@ Page content:
             query=query,
             goal=goal,
             keys=keys,
-            seconds=seconds
+            seconds=seconds,
+            actions=actions,
         )
 
         return res
\ No newline at end of file
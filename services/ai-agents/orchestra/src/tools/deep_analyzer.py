@@ -59,6 +59,7 @@ class DeepAnalyzerTool(AsyncTool):
                  *args,
                  analyzer_model_ids: Optional[List[str]] = None,
                  summarizer_model_id: Optional[str] = None,
+                 pdf_page_workers: Optional[int] = None,
                  **kwargs
                  ):
 
@@ -73,7 +74,7 @@ class DeepAnalyzerTool(AsyncTool):
         self.summarizer_model_id = summarizer_model_id
         self.summary_model = model_manager.registed_models[self.summarizer_model_id]
 
-        self.converter: MarkitdownConverter = MarkitdownConverter()
+        self.converter: MarkitdownConverter = MarkitdownConverter(pdf_page_workers=pdf_page_workers)
 
     async def _analyze(self,
                  model,
@@ -102,7 +103,7 @@ class DeepAnalyzerTool(AsyncTool):
                 )
             else:
                 try:
-                    extracted_content = self.converter.convert(source).text_content
+                    extracted_content = (await self.converter.aconvert(source)).text_content
                 except Exception as e:
                     extracted_content = f"Failed to extract content from {source}. Error: {e}"
 
@@ -43,7 +43,7 @@ class FileReaderTool(AsyncTool):
         """Read a file and return its content as text."""
 
         try:
-            result = self.converter.convert(file_path)
+            result = await self.converter.aconvert(file_path)
         except Exception as e:
             return ToolResult(
                 output=None,
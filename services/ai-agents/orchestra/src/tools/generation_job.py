@@ -0,0 +1,48 @@
+import json
+from typing import Optional
+
+from src.tools import AsyncTool, ToolResult
+from src.models.generation_jobs import job_manager
+from src.registry import TOOL
+
+@TOOL.register_module(name="generation_job_tool", force=True)
+class GenerationJobTool(AsyncTool):
+    name = "generation_job_tool"
+    description = "Checks the status of a generation job started in the background, such as a video generation, and optionally waits for it to finish."
+    parameters = {
+        "type": "object",
+        "properties": {
+            "job_id": {
+                "type": "string",
+                "description": "The id of the job, as returned when the job was started.",
+            },
+            "wait": {
+                "type": "boolean",
+                "description": "(Optional) Whether to wait for the job to finish instead of returning its current status.",
+                "nullable": True,
+            },
+            "timeout": {
+                "type": "number",
+                "description": "(Optional) Maximum number of seconds to wait for the job.",
+                "nullable": True,
+            },
+        },
+        "required": ["job_id"],
+    }
+    output_type = "any"
+
+    async def forward(self, job_id: str, wait: Optional[bool] = False, timeout: Optional[float] = None) -> ToolResult:
+        if job_manager.status(job_id) is None:
+            return ToolResult(output=None, error=f"Unknown generation job: {job_id}")
+
+        if wait:
+            try:
+                await job_manager.wait(job_id, timeout=timeout)
+            except Exception:
+                # Timeouts and failures are reported by the status below
+                pass
+
+        status = job_manager.status(job_id)
+        if status["status"] == "failed":
+            return ToolResult(output=None, error=f"Generation job {job_id} failed: {status['error']}")
+        return ToolResult(output=json.dumps(status), error=None)
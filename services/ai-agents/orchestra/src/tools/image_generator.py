@@ -5,6 +5,7 @@ import os
 
 from src.tools import AsyncTool, ToolResult
 from src.models import ChatMessage, model_manager
+from src.models.generation_jobs import job_manager
 from src.logger import logger
 from src.registry import TOOL
 from src.config import config
@@ -145,7 +146,9 @@ class ImageGeneratorTool(AsyncTool):
 
         # Use the generator model to create the image
         try:
-            response = self.generator_model(prompt)
+            # The Imagen call blocks, it runs in a worker thread of the job manager
+            future = await job_manager.submit(submit_fn=lambda: self.generator_model(prompt))
+            response = await future
             if response:
                 image_data = base64.b64decode(response)
                 save_path = os.path.join(config.exp_path, save_name)
@@ -5,7 +5,11 @@ load_dotenv(verbose=True)
 from markitdown import MarkItDown
 import requests
 import io
-from typing import BinaryIO, Any
+import time
+import asyncio
+import weakref
+from concurrent.futures import ProcessPoolExecutor
+from typing import BinaryIO, Any, Dict, List, Optional
 import camelot
 import tempfile
 from markitdown.converters import PdfConverter
@@ -17,6 +21,7 @@ from markitdown._base_converter import DocumentConverterResult
 from markitdown._exceptions import MissingDependencyException, MISSING_DEPENDENCY_MESSAGE
 import pdfminer
 import pdfminer.high_level
+from pdfminer.pdfpage import PDFPage
 from litellm import transcription
 
 from src.models import model_manager
@@ -27,9 +32,34 @@ def read_tables_from_stream(file_stream):
     with tempfile.NamedTemporaryFile(suffix=".pdf", delete=True) as temp_pdf:
         temp_pdf.write(file_stream.read())
         temp_pdf.flush()
-        tables = camelot.read_pdf(temp_pdf.name, flavor="lattice")
+        tables = camelot.read_pdf(temp_pdf.name, flavor="lattice", pages="all")
         return tables
 
+def count_pdf_pages(pdf_path: str) -> int:
+    with open(pdf_path, "rb") as f:
+        return sum(1 for _ in PDFPage.get_pages(f))
+
+def convert_pdf_page(pdf_path: str, page_number: int) -> Dict[str, Any]:
+    """
+    Extract the text and the lattice tables of a single (0-based) page of a PDF file.
+    Runs inside a worker process, so it only takes picklable arguments and returns plain data.
+    """
+    start = time.perf_counter()
+    text = pdfminer.high_level.extract_text(pdf_path, page_numbers=[page_number])
+    text_time = time.perf_counter() - start
+
+    tables = camelot.read_pdf(pdf_path, flavor="lattice", pages=str(page_number + 1))
+    tables = [tables[i].df.to_markdown(index=False) for i in range(tables.n)]
+    table_time = time.perf_counter() - start - text_time
+
+    return dict(
+        page_number=page_number,
+        text=text,
+        tables=tables,
+        text_time=text_time,
+        table_time=table_time,
+    )
+
 def transcribe_audio(file_stream, audio_format):
 
     if "whisper" in model_manager.registed_models:
@@ -104,6 +134,70 @@ class AudioWhisperConverter(AudioConverter):
         return DocumentConverterResult(markdown=md_content.strip())
 
 class PdfWithTableConverter(PdfConverter):
+    """
+    PDF converter that appends the lattice tables found by camelot to the pdfminer text.
+
+    With `max_workers > 1`, documents of at least `min_parallel_pages` pages are converted
+    page by page in a process pool. Pages are reassembled in order, so the output is the
+    same as the serial conversion, and the timing of each page is kept in the `page_timings`
+    of the result. The pool is shut down by `shutdown`, or when the converter is collected.
+    """
+    def __init__(self,
+                 max_workers: Optional[int] = None,
+                 min_parallel_pages: int = 4):
+        super().__init__()
+        self.max_workers = max_workers if max_workers is not None else (os.cpu_count() or 1)
+        self.min_parallel_pages = min_parallel_pages
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._finalizer: Optional[weakref.finalize] = None
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        # The pool is started lazily and reused, so the worker start-up cost is paid once.
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            self._finalizer = weakref.finalize(
+                self, self._executor.shutdown, wait=False, cancel_futures=True
+            )
+        return self._executor
+
+    def shutdown(self):
+        if self._finalizer is not None:
+            self._finalizer()
+            self._finalizer = None
+            self._executor = None
+
+    def _convert_pages(self, pdf_path: str, num_pages: int) -> DocumentConverterResult:
+        start = time.perf_counter()
+
+        executor = self._get_executor()
+        futures = [
+            executor.submit(convert_pdf_page, pdf_path, page_number)
+            for page_number in range(num_pages)
+        ]
+        pages = [future.result() for future in futures]
+
+        page_timings = [
+            dict(page_number=page["page_number"],
+                 text_time=page["text_time"],
+                 table_time=page["table_time"])
+            for page in pages
+        ]
+        page_time = sum(page["text_time"] + page["table_time"] for page in pages)
+        logger.info(f"| Converted {num_pages} PDF pages with {self.max_workers} workers "
+                    f"in {time.perf_counter() - start:.2f}s (page time: {page_time:.2f}s)")
+
+        markdown_content = "".join(page["text"] for page in pages)
+        tables = [table for page in pages for table in page["tables"]]
+        if len(tables) > 0:
+            table_content = ""
+            for i, table in enumerate(tables):
+                table_content += f"Table {i + 1}:\n" + table + "\n\n"
+            markdown_content += "\n\n" + table_content
+
+        result = DocumentConverterResult(markdown=markdown_content)
+        result.page_timings = page_timings
+        return result
+
     def convert(
         self,
         file_stream: BinaryIO,
@@ -126,6 +220,16 @@ class PdfWithTableConverter(PdfConverter):
 
         assert isinstance(file_stream, io.IOBase)  # for mypy
 
+        if self.max_workers > 1:
+            position = file_stream.tell()
+            with tempfile.NamedTemporaryFile(suffix=".pdf", delete=True) as temp_pdf:
+                temp_pdf.write(file_stream.read())
+                temp_pdf.flush()
+                num_pages = count_pdf_pages(temp_pdf.name)
+                if num_pages >= self.min_parallel_pages:
+                    return self._convert_pages(temp_pdf.name, num_pages)
+            file_stream.seek(position)
+
         tables = read_tables_from_stream(file_stream)
         num_tables = tables.n
         if num_tables == 0:
@@ -147,11 +251,13 @@ class MarkitdownConverter():
     def __init__(self,
                  use_llm: bool = False,
                  model_id: str = None,
-                 timeout: int = 30):
+                 timeout: int = 30,
+                 pdf_page_workers: Optional[int] = 1):
 
         self.timeout = timeout
         self.use_llm = use_llm
         self.model_id = model_id
+        self.pdf_page_workers = pdf_page_workers
 
         if use_llm:
             client = model_manager.registed_models(model_id).http_client
@@ -173,7 +279,8 @@ class MarkitdownConverter():
             converter for converter in self.client._converters
             if not isinstance(converter.converter, tuple(removed_converters))
         ]
-        self.client.register_converter(PdfWithTableConverter())
+        self.pdf_converter = PdfWithTableConverter(max_workers=pdf_page_workers)
+        self.client.register_converter(self.pdf_converter)
         self.client.register_converter(AudioWhisperConverter())
 
     def convert(self, source: str, **kwargs: Any):
@@ -184,4 +291,11 @@ class MarkitdownConverter():
             return result
         except Exception as e:
             logger.error(f"Error during conversion: {e}")
-            return None
\ No newline at end of file
+            return None
+
+    async def aconvert(self, source: str, **kwargs: Any):
+        """Convert in a worker thread, so that slow conversions never block the event loop."""
+        return await asyncio.to_thread(self.convert, source, **kwargs)
+
+    def shutdown(self):
+        self.pdf_converter.shutdown()
\ No newline at end of file
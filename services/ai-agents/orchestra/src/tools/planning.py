@@ -1,9 +1,20 @@
+import json
+import os
+import threading
+from collections import Counter
+from contextlib import contextmanager
 from typing import Dict, List, Optional
 from typing_extensions import Literal
 
 from src.registry import TOOL
 from src.tools import AsyncTool, ToolResult
 from src.logger import logger
+from src.config import config
+
+try:
+    import fcntl
+except ImportError:  # Windows, plans files are then only locked within a process
+    fcntl = None
 
 _PLANNING_TOOL_DESCRIPTION = """A planning tool that allows the agent to create and manage plans for solving complex tasks. The tool provides functionality for creating plans, updating plan steps, and tracking progress.
 NOTE:
@@ -12,6 +23,212 @@ NOTE:
 - `create`: Create a new plan must include a unique plan_id.
 """
 
+_STEP_STATUSES = ["not_started", "in_progress", "completed", "blocked"]
+_STATUS_SYMBOLS = {
+    "not_started": "[ ]",
+    "in_progress": "[→]",
+    "completed": "[✓]",
+    "blocked": "[!]",
+}
+
+class Plan():
+    """A plan with incrementally maintained status counts and rendering.
+
+    Status counts are updated when a step changes, and the rendered line of each step is
+    cached until that step changes, so rendering a plan after `mark_step` only formats
+    the changed step and the header.
+    """
+    def __init__(self,
+                 plan_id: str,
+                 title: str,
+                 steps: List[str],
+                 step_statuses: Optional[List[str]] = None,
+                 step_notes: Optional[List[str]] = None):
+        self.plan_id = plan_id
+        self.title = title
+        self.steps: List[str] = []
+        self.step_statuses: List[str] = []
+        self.step_notes: List[str] = []
+        self.status_counts: Counter = Counter()
+        self._step_lines: List[Optional[str]] = []
+        self.set_steps(steps, step_statuses, step_notes)
+
+    def set_steps(self,
+                  steps: List[str],
+                  step_statuses: Optional[List[str]] = None,
+                  step_notes: Optional[List[str]] = None):
+        self.steps = list(steps)
+        self.step_statuses = list(step_statuses) if step_statuses else ["not_started"] * len(steps)
+        self.step_notes = list(step_notes) if step_notes else [""] * len(steps)
+        self.status_counts = Counter(self.step_statuses)
+        self._step_lines = [None] * len(steps)
+
+    def mark_step(self, step_index: int, status: Optional[str] = None, notes: Optional[str] = None):
+        if status:
+            self.status_counts[self.step_statuses[step_index]] -= 1
+            self.status_counts[status] += 1
+            self.step_statuses[step_index] = status
+        if notes:
+            self.step_notes[step_index] = notes
+        self._step_lines[step_index] = None
+
+    @property
+    def num_completed(self) -> int:
+        return self.status_counts["completed"]
+
+    def _render_step(self, index: int) -> str:
+        line = self._step_lines[index]
+        if line is None:
+            symbol = _STATUS_SYMBOLS.get(self.step_statuses[index], "[ ]")
+            line = f"{index}. {symbol} {self.steps[index]}\n"
+            if self.step_notes[index]:
+                line += f"   Notes: {self.step_notes[index]}\n"
+            self._step_lines[index] = line
+        return line
+
+    def render(self) -> str:
+        """Format the plan for display."""
+        output = f"Plan: {self.title} (ID: {self.plan_id})\n"
+        output += "=" * len(output) + "\n\n"
+
+        total_steps = len(self.steps)
+        completed = self.status_counts["completed"]
+        output += f"Progress: {completed}/{total_steps} steps completed "
+        if total_steps > 0:
+            percentage = (completed / total_steps) * 100
+            output += f"({percentage:.1f}%)\n"
+        else:
+            output += "(0%)\n"
+
+        output += (f"Status: {completed} completed, {self.status_counts['in_progress']} in progress, "
+                   f"{self.status_counts['blocked']} blocked, {self.status_counts['not_started']} not started\n\n")
+        output += "Steps:\n"
+        output += "".join(self._render_step(i) for i in range(total_steps))
+        return output
+
+    def to_dict(self) -> Dict:
+        return {
+            "plan_id": self.plan_id,
+            "title": self.title,
+            "steps": self.steps,
+            "step_statuses": self.step_statuses,
+            "step_notes": self.step_notes,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "Plan":
+        return cls(plan_id=data["plan_id"],
+                   title=data["title"],
+                   steps=data["steps"],
+                   step_statuses=data.get("step_statuses"),
+                   step_notes=data.get("step_notes"))
+
+
+class PlanStore():
+    """Plans by id, optionally persisted to a JSON file.
+
+    Stores on a file are shared within a process (see `shared`), so every tool built on
+    that file sees the same plans, in-memory stores are private to their tool. The file
+    is rewritten atomically after every change and reloaded when another process has
+    modified it, so plans also survive restarts and can be shared across processes.
+    Changes go through `locked`, which holds a lock file around the reload, the change
+    and the save, so that concurrent writers do not overwrite each other's plans.
+
+    Args:
+        path (str, optional): JSON file of the plans, None to keep them in memory.
+    """
+    _shared: Dict[str, "PlanStore"] = {}
+    _shared_lock = threading.Lock()
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self.plans: Dict[str, Plan] = {}
+        self.current_plan_id: Optional[str] = None
+        self._mtime: Optional[float] = None
+        self._lock = threading.RLock()
+        self.reload_if_changed()
+
+    @classmethod
+    def shared(cls, path: Optional[str] = None) -> "PlanStore":
+        if path is None:
+            return cls()
+        path = os.path.abspath(path)
+        with cls._shared_lock:
+            if path not in cls._shared:
+                cls._shared[path] = cls(path)
+            return cls._shared[path]
+
+    def __contains__(self, plan_id: str) -> bool:
+        return plan_id in self.plans
+
+    def __len__(self) -> int:
+        return len(self.plans)
+
+    def get(self, plan_id: str) -> Optional[Plan]:
+        return self.plans.get(plan_id)
+
+    def add(self, plan: Plan):
+        self.plans[plan.plan_id] = plan
+
+    def remove(self, plan_id: str):
+        del self.plans[plan_id]
+        if self.current_plan_id == plan_id:
+            self.current_plan_id = None
+
+    @contextmanager
+    def locked(self):
+        """Hold the plans for a read-modify-write, across processes when they are on a file.
+
+        The plans are reloaded first if another process changed the file, and a `save`
+        within the block writes on top of those changes.
+        """
+        with self._lock:
+            if self.path is None or fcntl is None:
+                self.reload_if_changed()
+                yield self
+                return
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            with open(f"{self.path}.lock", "a") as lock_file:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+                try:
+                    self.reload_if_changed()
+                    yield self
+                finally:
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+    def reload_if_changed(self):
+        if self.path is None or not os.path.exists(self.path):
+            return
+        with self._lock:
+            mtime = os.stat(self.path).st_mtime_ns
+            if mtime == self._mtime:
+                return
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+            except (OSError, json.JSONDecodeError) as e:
+                logger.warning(f"| Failed to load plans from {self.path}: {e}")
+                return
+            self.plans = {plan["plan_id"]: Plan.from_dict(plan) for plan in data.get("plans", [])}
+            self.current_plan_id = data.get("current_plan_id")
+            self._mtime = mtime
+
+    def save(self):
+        if self.path is None:
+            return
+        with self._lock:
+            data = {
+                "current_plan_id": self.current_plan_id,
+                "plans": [plan.to_dict() for plan in self.plans.values()],
+            }
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self.path)
+            self._mtime = os.stat(self.path).st_mtime_ns
+
+
 @TOOL.register_module(name="planning_tool", force=True)
 class PlanningTool(AsyncTool):
     """
@@ -75,15 +292,26 @@ class PlanningTool(AsyncTool):
 
     output_type = "any"
 
-    plans: dict = {}  # Dictionary to store plans by plan_id
-    _current_plan_id: Optional[str] = None  # Track the current active plan
-
-    def __init__(self):
+    def __init__(self, plans_path: Optional[str] = None):
         super(PlanningTool, self).__init__()
 
-        # Initialize plans dictionary
-        self.plans = {}
-        self._current_plan_id = None
+        # Plans are kept in memory unless a file is configured, a relative path is
+        # resolved in the experiment directory
+        if plans_path is not None and not os.path.isabs(plans_path):
+            plans_path = os.path.join(config.exp_path, plans_path)
+        self.store = PlanStore.shared(plans_path)
+
+    @property
+    def plans(self) -> Dict[str, Plan]:
+        return self.store.plans
+
+    @property
+    def _current_plan_id(self) -> Optional[str]:
+        return self.store.current_plan_id
+
+    @_current_plan_id.setter
+    def _current_plan_id(self, plan_id: Optional[str]):
+        self.store.current_plan_id = plan_id
 
     async def _create_plan(
         self,
@@ -129,16 +357,11 @@ class PlanningTool(AsyncTool):
             )
 
         # Create a new plan with initialized step statuses
-        plan = {
-            "plan_id": plan_id,
-            "title": title,
-            "steps": steps,
-            "step_statuses": ["not_started"] * len(steps),
-            "step_notes": [""] * len(steps),
-        }
+        plan = Plan(plan_id=plan_id, title=title, steps=steps)
 
-        self.plans[plan_id] = plan
+        self.store.add(plan)
         self._current_plan_id = plan_id  # Set as active plan
+        self.store.save()
 
         res = f"Plan created successfully with ID: {plan_id}\n\n{self._format_plan(plan)}"
         logger.info(res)
@@ -174,7 +397,7 @@ class PlanningTool(AsyncTool):
         plan = self.plans[plan_id]
 
         if title:
-            plan["title"] = title
+            plan.title = title
 
         if steps:
             if not isinstance(steps, list) or not all(
@@ -188,9 +411,9 @@ class PlanningTool(AsyncTool):
                 )
 
             # Preserve existing step statuses for unchanged steps
-            old_steps = plan["steps"]
-            old_statuses = plan["step_statuses"]
-            old_notes = plan["step_notes"]
+            old_steps = plan.steps
+            old_statuses = plan.step_statuses
+            old_notes = plan.step_notes
 
             # Create new step statuses and notes
             new_statuses = []
@@ -205,10 +428,9 @@ class PlanningTool(AsyncTool):
                     new_statuses.append("not_started")
                     new_notes.append("")
 
-            plan["steps"] = steps
-            plan["step_statuses"] = new_statuses
-            plan["step_notes"] = new_notes
+            plan.set_steps(steps, new_statuses, new_notes)
 
+        self.store.save()
         res = f"Plan updated successfully: {plan_id}\n\n{self._format_plan(plan)}"
         logger.info(res)
         return ToolResult(
@@ -229,12 +451,8 @@ class PlanningTool(AsyncTool):
         output = "Available plans:\n"
         for plan_id, plan in self.plans.items():
             current_marker = " (active)" if plan_id == self._current_plan_id else ""
-            completed = sum(
-                1 for status in plan["step_statuses"] if status == "completed"
-            )
-            total = len(plan["steps"])
-            progress = f"{completed}/{total} steps completed"
-            output += f"• {plan_id}{current_marker}: {plan['title']} - {progress}\n"
+            progress = f"{plan.num_completed}/{len(plan.steps)} steps completed"
+            output += f"• {plan_id}{current_marker}: {plan.title} - {progress}\n"
 
         res = output
         logger.info(res)
@@ -292,6 +510,7 @@ class PlanningTool(AsyncTool):
             )
 
         self._current_plan_id = plan_id
+        self.store.save()
 
         res = f"Plan '{plan_id}' is now the active plan.\n\n{self._format_plan(self.plans[plan_id])}"
         logger.info(res)
@@ -337,20 +556,15 @@ class PlanningTool(AsyncTool):
 
         plan = self.plans[plan_id]
 
-        if step_index < 0 or step_index >= len(plan["steps"]):
-            res = f"Invalid step_index: {step_index}. Valid indices range from 0 to {len(plan['steps'])-1}."
+        if step_index < 0 or step_index >= len(plan.steps):
+            res = f"Invalid step_index: {step_index}. Valid indices range from 0 to {len(plan.steps)-1}."
             logger.error(res)
             return ToolResult(
                 output=None,
                 error=res,
             )
 
-        if step_status and step_status not in [
-            "not_started",
-            "in_progress",
-            "completed",
-            "blocked",
-        ]:
+        if step_status and step_status not in _STEP_STATUSES:
             res = f"Invalid step_status: {step_status}. Valid statuses are: not_started, in_progress, completed, blocked"
             logger.error(res)
             return ToolResult(
@@ -358,11 +572,8 @@ class PlanningTool(AsyncTool):
                 error=res,
             )
 
-        if step_status:
-            plan["step_statuses"][step_index] = step_status
-
-        if step_notes:
-            plan["step_notes"][step_index] = step_notes
+        plan.mark_step(step_index, step_status, step_notes)
+        self.store.save()
 
         res = f"Step {step_index} updated successfully in plan '{plan_id}'.\n\n{self._format_plan(plan)}"
         logger.info(res)
@@ -389,11 +600,9 @@ class PlanningTool(AsyncTool):
                 error=res,
             )
 
-        del self.plans[plan_id]
-
-        # If the deleted plan was the active plan, clear the active plan
-        if self._current_plan_id == plan_id:
-            self._current_plan_id = None
+        # Deleting the active plan also clears the active plan
+        self.store.remove(plan_id)
+        self.store.save()
 
         res = f"Plan '{plan_id}' has been deleted."
         logger.info(res)
@@ -402,48 +611,9 @@ class PlanningTool(AsyncTool):
             error=None,
         )
 
-    def _format_plan(self, plan: Dict) -> str:
+    def _format_plan(self, plan: Plan) -> str:
         """Format a plan for display."""
-        output = f"Plan: {plan['title']} (ID: {plan['plan_id']})\n"
-        output += "=" * len(output) + "\n\n"
-
-        # Calculate progress statistics
-        total_steps = len(plan["steps"])
-        completed = sum(1 for status in plan["step_statuses"] if status == "completed")
-        in_progress = sum(
-            1 for status in plan["step_statuses"] if status == "in_progress"
-        )
-        blocked = sum(1 for status in plan["step_statuses"] if status == "blocked")
-        not_started = sum(
-            1 for status in plan["step_statuses"] if status == "not_started"
-        )
-
-        output += f"Progress: {completed}/{total_steps} steps completed "
-        if total_steps > 0:
-            percentage = (completed / total_steps) * 100
-            output += f"({percentage:.1f}%)\n"
-        else:
-            output += "(0%)\n"
-
-        output += f"Status: {completed} completed, {in_progress} in progress, {blocked} blocked, {not_started} not started\n\n"
-        output += "Steps:\n"
-
-        # Add each step with its status and notes
-        for i, (step, status, notes) in enumerate(
-            zip(plan["steps"], plan["step_statuses"], plan["step_notes"])
-        ):
-            status_symbol = {
-                "not_started": "[ ]",
-                "in_progress": "[→]",
-                "completed": "[✓]",
-                "blocked": "[!]",
-            }.get(status, "[ ]")
-
-            output += f"{i}. {status_symbol} {step}\n"
-            if notes:
-                output += f"   Notes: {notes}\n"
-
-        return output
+        return plan.render()
 
     async def forward(
         self,
@@ -470,6 +640,13 @@ class PlanningTool(AsyncTool):
         - step_notes: Additional notes for a step (used with mark_step action)
         """
 
+        # Pick up the changes made by other processes sharing the plans file, and keep
+        # them from writing it until this action saved. Actions never suspend, so the
+        # lock is not held across a switch to another task.
+        with self.store.locked():
+            return await self._dispatch(action, plan_id, title, steps, step_index, step_status, step_notes)
+
+    async def _dispatch(self, action, plan_id, title, steps, step_index, step_status, step_notes):
         if action == "create":
             return await self._create_plan(plan_id, title, steps)
         elif action == "update":
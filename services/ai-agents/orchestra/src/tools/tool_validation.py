@@ -1,8 +1,13 @@
 import ast
 import builtins
+import os
+import sys
+import weakref
+from collections import defaultdict
 from itertools import zip_longest
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
-from src.utils import BASE_BUILTIN_MODULES, get_source, is_valid_name
+from src.utils import BASE_BUILTIN_MODULES, get_module_mtime, get_source, is_valid_name
 
 
 _BUILTIN_NAMES = set(vars(builtins))
@@ -154,9 +159,9 @@ class MethodChecker(ast.NodeVisitor):
         self.generic_visit(node)
 
 
-def validate_tool_attributes(cls, check_imports: bool = True) -> None:
+def _get_class_node_errors(class_node: ast.ClassDef, check_imports: bool = True) -> List[str]:
     """
-    Validates that a Tool class follows the proper patterns:
+    Checks the class definition of a Tool, see `validate_tool_attributes`:
     0. Any argument of __init__ should have a default.
     Args chosen at init are not traceable, so we cannot rebuild the source code for them, thus any important arg should be defined as a class attribute.
     1. About the class:
@@ -166,7 +171,7 @@ def validate_tool_attributes(cls, check_imports: bool = True) -> None:
         - Imports must be from packages, not local files
         - All methods must be self-contained
 
-    Raises all errors encountered, if no error returns None.
+    Returns all errors encountered.
     """
 
     class ClassLevelChecker(ast.NodeVisitor):
@@ -227,11 +232,6 @@ def validate_tool_attributes(cls, check_imports: bool = True) -> None:
                     self.non_literal_defaults.add(arg.arg)
 
     class_level_checker = ClassLevelChecker()
-    source = get_source(cls)
-    tree = ast.parse(source)
-    class_node = tree.body[0]
-    if not isinstance(class_node, ast.ClassDef):
-        raise ValueError("Source code must define a class")
     class_level_checker.visit(class_node)
 
     errors = []
@@ -261,6 +261,123 @@ def validate_tool_attributes(cls, check_imports: bool = True) -> None:
             method_checker.visit(node)
             errors += [f"- {node.name}: {error}" for error in method_checker.errors]
 
+    return errors
+
+
+# Validation errors of Tool classes, by check_imports and the mtime of their module file
+_validation_cache: "weakref.WeakKeyDictionary[type, Dict[Tuple[bool, int], List[str]]]" = weakref.WeakKeyDictionary()
+
+
+def _get_cached_errors(cls, check_imports: bool, mtime: Optional[int]) -> Optional[List[str]]:
+    if mtime is None:
+        return None
+    return _validation_cache.get(cls, {}).get((check_imports, mtime))
+
+
+def _cache_errors(cls, check_imports: bool, mtime: Optional[int], errors: List[str]):
+    if mtime is None:
+        return
+    # Entries of an older version of the module are dropped
+    cached = {key: value for key, value in _validation_cache.get(cls, {}).items() if key[1] == mtime}
+    cached[(check_imports, mtime)] = errors
+    _validation_cache[cls] = cached
+
+
+def _format_errors(cls, errors: List[str]) -> str:
+    return f"Tool validation failed for {cls.__name__}:\n" + "\n".join(errors)
+
+
+def validate_tool_attributes(cls, check_imports: bool = True) -> None:
+    """
+    Validates that a Tool class follows the proper patterns:
+    0. Any argument of __init__ should have a default.
+    Args chosen at init are not traceable, so we cannot rebuild the source code for them, thus any important arg should be defined as a class attribute.
+    1. About the class:
+        - Class attributes should only be strings or dicts
+        - Class attributes cannot be complex attributes
+    2. About all class methods:
+        - Imports must be from packages, not local files
+        - All methods must be self-contained
+
+    Results are cached per class until its module file changes.
+
+    Raises all errors encountered, if no error returns None.
+    """
+    mtime = get_module_mtime(cls)
+    errors = _get_cached_errors(cls, check_imports, mtime)
+    if errors is None:
+        source = get_source(cls)
+        tree = ast.parse(source)
+        class_node = tree.body[0]
+        if not isinstance(class_node, ast.ClassDef):
+            raise ValueError("Source code must define a class")
+        errors = _get_class_node_errors(class_node, check_imports=check_imports)
+        _cache_errors(cls, check_imports, mtime, errors)
+
     if errors:
-        raise ValueError(f"Tool validation failed for {cls.__name__}:\n" + "\n".join(errors))
+        raise ValueError(_format_errors(cls, errors))
+    return
+
+
+def _find_module_class_node(module_tree: ast.Module, cls) -> Optional[ast.ClassDef]:
+    # The last top-level definition is the one bound to the name
+    class_node = None
+    for node in module_tree.body:
+        if isinstance(node, ast.ClassDef) and node.name == cls.__name__:
+            class_node = node
+    return class_node
+
+
+def validate_tools(tools: Iterable[Any], check_imports: bool = True) -> None:
+    """
+    Validates Tool classes or instances in bulk, see `validate_tool_attributes`.
+
+    Each module is read and parsed once for all the tools it defines, instead of
+    once per tool. Classes that are not defined at the top level of a module file
+    are validated one by one.
+
+    Raises the errors of all the invalid tools, if no error returns None.
+    """
+    classes = list(dict.fromkeys(tool if isinstance(tool, type) else tool.__class__ for tool in tools))
+
+    failures = []
+    by_module: Dict[str, List[type]] = defaultdict(list)
+    for cls in classes:
+        mtime = get_module_mtime(cls)
+        errors = _get_cached_errors(cls, check_imports, mtime)
+        if errors is not None:
+            if errors:
+                failures.append(_format_errors(cls, errors))
+        elif mtime is not None and cls.__qualname__ == cls.__name__ and not getattr(cls, "__source__", None):
+            by_module[cls.__module__].append(cls)
+        else:
+            try:
+                validate_tool_attributes(cls, check_imports=check_imports)
+            except ValueError as e:
+                failures.append(str(e))
+
+    for module_name, module_classes in by_module.items():
+        path = sys.modules[module_name].__file__
+        try:
+            mtime = os.stat(path).st_mtime_ns
+            with open(path, "r", encoding="utf-8") as f:
+                module_tree = ast.parse(f.read())
+        except (OSError, SyntaxError, UnicodeDecodeError):
+            module_tree = None
+
+        for cls in module_classes:
+            class_node = _find_module_class_node(module_tree, cls) if module_tree is not None else None
+            if class_node is None:
+                try:
+                    validate_tool_attributes(cls, check_imports=check_imports)
+                except ValueError as e:
+                    failures.append(str(e))
+                continue
+            errors = _get_class_node_errors(class_node, check_imports=check_imports)
+            _cache_errors(cls, check_imports, mtime, errors)
+            if errors:
+                failures.append(_format_errors(cls, errors))
+
+    if failures:
+        raise ValueError("\n\n".join(failures))
     return
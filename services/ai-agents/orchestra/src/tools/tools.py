@@ -49,7 +49,7 @@ from src.utils import (
     is_valid_name,
 )
 
-from src.tools.tool_validation import MethodChecker, validate_tool_attributes
+from src.tools.tool_validation import MethodChecker, validate_tool_attributes, validate_tools
 
 
 if TYPE_CHECKING:
@@ -1217,8 +1217,8 @@ class PipelineTool(Tool):
 
 def get_tools_definition_code(tools: Dict[str, Tool]) -> str:
     tool_codes = []
+    validate_tools(tools.values(), check_imports=False)
     for tool in tools.values():
-        validate_tool_attributes(tool.__class__, check_imports=False)
         tool_code = instance_to_source(tool, base_cls=Tool)
         tool_code = tool_code.replace("from smolagents.tools import Tool", "")
         tool_code += f"\n\n{tool.name} = {tool.__class__.__name__}()\n"
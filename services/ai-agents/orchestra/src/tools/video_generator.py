@@ -3,10 +3,10 @@ from typing import Tuple, Optional
 import base64
 import os
 from PIL import Image
-import asyncio
 
 from src.tools import AsyncTool, ToolResult
 from src.models import ChatMessage, model_manager
+from src.models.generation_jobs import job_manager, JobPending
 from src.logger import logger
 from src.registry import TOOL
 from src.config import config
@@ -89,6 +89,7 @@ class VideoGeneratorTool(AsyncTool):
                  analyzer_model_id: Optional[str] = None,
                  predict_model_id: Optional[str] = None,
                  fetch_model_id: Optional[str] = None,
+                 background: bool = False,
                  **kwargs):
 
         super(VideoGeneratorTool, self).__init__()
@@ -99,6 +100,9 @@ class VideoGeneratorTool(AsyncTool):
         self.analyzer_model = model_manager.registed_models[self.analyzer_model_id]
         self.predict_model = model_manager.registed_models[self.predict_model_id]
         self.fetch_model = model_manager.registed_models[self.fecth_model_id]
+        # Return as soon as the job is submitted instead of waiting for the video, the
+        # agent then checks or waits for it with the generation_job_tool
+        self.background = background
 
     async def forward(self,
                       prompt: str,
@@ -180,39 +184,39 @@ class VideoGeneratorTool(AsyncTool):
 
         prompt = _GENEATOR_DESCRIPTION + "\n" + prompt
 
-        # Use the generator model to create the image
+        save_path = os.path.join(config.exp_path, save_name)
+
         try:
-            # Veo3 Predict
-            response = self.predict_model(
-                prompt=prompt,
-                image=image_path,  # Optional image reference
+            # Veo3 Predict, then Veo3 Fetch polled in the background by the job manager. The
+            # video is written by the job itself, so it only completes once the file exists
+            # and a failed write fails the job.
+            future = await job_manager.submit(
+                submit_fn=lambda: self.predict_model(prompt=prompt, image=image_path),
+                fetch_fn=lambda name: self._fetch_video(name, save_path),
+                job_id=save_path,
             )
-            name = response
-            logger.info(f"Veo3 Predict operation name: {name}.")
-
-            video_data = None
-            while video_data is None:
-                try:
-                    # Veo3 Fetch
-                    response = model_manager.registed_models["veo3-fetch"](
-                        name=name,
-                    )
-                    video_data = base64.b64decode(response)
-                except Exception as e:
-                    logger.warning(f"Failed to fetch video data: {e}, retrying in 60 seconds...")
-                    await asyncio.sleep(60)  # Wait for 60 seconds before retrying
-
-            if video_data:
-                save_path = os.path.join(config.exp_path, save_name)
-                with open(save_path, "wb") as f:
-                    f.write(video_data)
-                output = f"Video generated successfully and saved as {save_path}."
+
+            if self.background:
+                output = (f"Video generation started as job {save_path}, the video will be saved as {save_path} "
+                          f"when it is ready. Check or wait for it with the generation_job_tool.")
                 return ToolResult(output=output, error=None)
-            else:
-                error_message = "Video generation returned no response."
-                logger.error(error_message)
-                return ToolResult(output=None, error=error_message)
+
+            await future
+            output = f"Video generated successfully and saved as {save_path}."
+            return ToolResult(output=output, error=None)
 
         except Exception as e:
             logger.error(f"Video generation failed: {e}")
-            return ToolResult(output=None, error=str(e))
\ No newline at end of file
+            return ToolResult(output=None, error=str(e))
+
+    def _fetch_video(self, name: str, save_path: str) -> Optional[str]:
+        try:
+            response = self.fetch_model(name=name)
+        except (KeyError, IndexError, TypeError):
+            # The operation holds no video until the generation is done
+            raise JobPending(name)
+        if not response:
+            return None
+        with open(save_path, "wb") as f:
+            f.write(base64.b64decode(response))
+        return save_path
@@ -1,3 +1,5 @@
+import importlib
+
 from .path_utils import assemble_project_path
 from .token_utils import get_token_count
 from .image_utils import download_image
@@ -5,6 +7,7 @@ from .utils import (escape_code_brackets,
                              _is_package_available,
                              BASE_BUILTIN_MODULES,
                              get_source,
+                             get_module_mtime,
                              is_valid_name,
                              instance_to_source,
                              truncate_content,
@@ -20,13 +23,21 @@ from .singleton import Singleton
 from .function_utils import (_convert_type_hints_to_json_schema,
                             get_imports,
                             get_json_schema)
+from .blob_store import BlobHandle, BlobStore, blob_store
 from .agent_types import (AgentType,
                            AgentText,
                            AgentAudio,
                            AgentImage,
                            handle_agent_output_types,
                            handle_agent_input_types)
-from .url_utils import fetch_url
+
+def __getattr__(name):
+    # url_utils imports markitdown, crawl4ai and firecrawl, only load them when used
+    if name == "fetch_url":
+        value = getattr(importlib.import_module(".url_utils", __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 __all__ = [
     "assemble_project_path",
@@ -36,6 +47,7 @@ __all__ = [
     "_is_package_available",
     "BASE_BUILTIN_MODULES",
     "get_source",
+    "get_module_mtime",
     "is_valid_name",
     "instance_to_source",
     "truncate_content",
@@ -50,6 +62,9 @@ __all__ = [
     "_convert_type_hints_to_json_schema",
     "get_imports",
     "get_json_schema",
+    "BlobHandle",
+    "BlobStore",
+    "blob_store",
     "AgentType",
     "AgentText",
     "AgentImage",
@@ -15,14 +15,14 @@
 import logging
 import os
 import pathlib
-import tempfile
-import uuid
+import weakref
 from io import BytesIO
 import PIL
 import PIL.Image
 import requests
 
 from src.utils import _is_package_available
+from src.utils.blob_store import BlobHandle, blob_store
 
 class AgentType:
     """
@@ -47,6 +47,11 @@ class AgentType:
     def to_string(self) -> str:
         return str(self._value)
 
+    def _hold(self, handle: BlobHandle, incref: bool = True):
+        """Reference a blob of the blob store, released when this object is garbage collected."""
+        self._handle = blob_store.incref(handle) if incref else handle
+        weakref.finalize(self, blob_store.release, self._handle)
+
 
 class AgentText(AgentType, str):
     """
@@ -72,9 +77,14 @@ class AgentImage(AgentType, PIL.Image.Image):
         self._path = None
         self._raw = None
         self._tensor = None
+        self._handle = None
 
         if isinstance(value, AgentImage):
             self._raw, self._path, self._tensor = value._raw, value._path, value._tensor
+            if value._handle is not None:
+                self._hold(value._handle)
+        elif BlobHandle.is_handle(value):
+            self._hold(value)
         elif isinstance(value, PIL.Image.Image):
             self._raw = value
         elif isinstance(value, bytes):
@@ -94,7 +104,7 @@ class AgentImage(AgentType, PIL.Image.Image):
             except ModuleNotFoundError:
                 pass
 
-        if self._path is None and self._raw is None and self._tensor is None:
+        if self._path is None and self._raw is None and self._tensor is None and self._handle is None:
             raise TypeError(f"Unsupported type for {self.__class__.__name__}: {type(value)}")
 
     def _ipython_display_(self, include=None, exclude=None):
@@ -116,12 +126,33 @@ class AgentImage(AgentType, PIL.Image.Image):
             self._raw = PIL.Image.open(self._path)
             return self._raw
 
+        if self._handle is not None:
+            self._raw = PIL.Image.open(BytesIO(blob_store.get(self._handle)))
+            return self._raw
+
         if self._tensor is not None:
             import numpy as np
 
             array = self._tensor.cpu().detach().numpy()
             return PIL.Image.fromarray((255 - array * 255).astype(np.uint8))
 
+    def to_handle(self) -> BlobHandle:
+        """
+        Returns a handle to the encoded image in the blob store. Passing the handle to another agent or executor
+        shares the image without copying or re-encoding it.
+        """
+        if self._handle is None:
+            if self._path is not None and os.path.isfile(self._path):
+                with open(self._path, "rb") as f:
+                    data = f.read()
+                suffix = os.path.splitext(str(self._path))[1]
+            else:
+                buffer = BytesIO()
+                self.to_raw().save(buffer, format="png")
+                data, suffix = buffer.getbuffer(), ".png"
+            self._hold(blob_store.put(data, suffix=suffix), incref=False)
+        return self._handle
+
     def to_string(self):
         """
         Returns the stringified version of that object. In the case of an AgentImage, it is a path to the serialized
@@ -130,24 +161,9 @@ class AgentImage(AgentType, PIL.Image.Image):
         if self._path is not None:
             return self._path
 
-        if self._raw is not None:
-            directory = tempfile.mkdtemp()
-            self._path = os.path.join(directory, str(uuid.uuid4()) + ".png")
-            self._raw.save(self._path, format="png")
-            return self._path
-
-        if self._tensor is not None:
-            import numpy as np
-
-            array = self._tensor.cpu().detach().numpy()
-
-            # There is likely simpler than load into image into save
-            img = PIL.Image.fromarray((255 - array * 255).astype(np.uint8))
-
-            directory = tempfile.mkdtemp()
-            self._path = os.path.join(directory, str(uuid.uuid4()) + ".png")
-            img.save(self._path, format="png")
-
+        # The file is shared by all the images with the same content and outlives them
+        if self._handle is not None or self._raw is not None or self._tensor is not None:
+            self._path = blob_store.path(self.to_handle())
             return self._path
 
     def save(self, output_bytes, format: str = None, **params):
@@ -179,9 +195,12 @@ class AgentAudio(AgentType, str):
 
         self._path = None
         self._tensor = None
+        self._handle = None
 
         self.samplerate = samplerate
-        if isinstance(value, (str, pathlib.Path)):
+        if BlobHandle.is_handle(value):
+            self._hold(value)
+        elif isinstance(value, (str, pathlib.Path)):
             self._path = value
         elif isinstance(value, torch.Tensor):
             self._tensor = value
@@ -213,6 +232,11 @@ class AgentAudio(AgentType, str):
 
         import torch
 
+        if self._handle is not None:
+            tensor, self.samplerate = sf.read(BytesIO(blob_store.get(self._handle)))
+            self._tensor = torch.tensor(tensor)
+            return self._tensor
+
         if self._path is not None:
             if "://" in str(self._path):
                 response = requests.get(self._path)
@@ -233,12 +257,29 @@ class AgentAudio(AgentType, str):
         if self._path is not None:
             return self._path
 
-        if self._tensor is not None:
-            directory = tempfile.mkdtemp()
-            self._path = os.path.join(directory, str(uuid.uuid4()) + ".wav")
-            sf.write(self._path, self._tensor, samplerate=self.samplerate)
+        if self._handle is not None or self._tensor is not None:
+            self._path = blob_store.path(self.to_handle())
             return self._path
 
+    def to_handle(self) -> BlobHandle:
+        """
+        Returns a handle to the encoded audio in the blob store, to share it with another agent or executor without
+        copying or re-encoding it.
+        """
+        import soundfile as sf
+
+        if self._handle is None:
+            if self._path is not None and os.path.isfile(self._path):
+                with open(self._path, "rb") as f:
+                    data = f.read()
+                suffix = os.path.splitext(str(self._path))[1]
+            else:
+                buffer = BytesIO()
+                sf.write(buffer, self.to_raw(), samplerate=self.samplerate, format="WAV")
+                data, suffix = buffer.getbuffer(), ".wav"
+            self._hold(blob_store.put(data, suffix=suffix), incref=False)
+        return self._handle
+
 
 _AGENT_TYPE_MAPPING = {"string": AgentText, "image": AgentImage, "audio": AgentAudio}
 
@@ -0,0 +1,274 @@
+"""Content-addressed store of binary blobs shared between agents.
+
+Images and audio handed from one agent to another (e.g. a screenshot from the browser
+agent to the analyzer agent) used to be re-encoded and written to a new temp file at
+every hop. The store keeps one copy per content, in shared memory while it fits the
+memory budget and in a spill file otherwise, and agent types reference it by a
+`BlobHandle`, a short string that can be passed around without copying the data.
+
+Blobs are refcounted: every `put` or `incref` of a handle must be balanced by a
+`release`, and the last release frees the shared memory and deletes the spill file.
+Files handed out by `path` are the exception, callers keep their path (e.g. in a
+tool result) beyond the life of the blob, so they are never deleted by the store.
+Other processes can read a blob by its handle and count their references to it
+the same way, but their last `release` only detaches the blob, the process that
+created it frees it. A blob of another process that was only read by `get` holds
+no reference, the next `release` of it detaches it.
+"""
+import hashlib
+import mmap
+import os
+import re
+import sys
+import tempfile
+import threading
+from multiprocessing import resource_tracker, shared_memory
+from typing import Dict, Optional, Tuple
+
+_HANDLE_PREFIX = "blob://"
+_HANDLE_PATTERN = re.compile(r"^blob://(?P<digest>[0-9a-f]{64})-(?P<size>\d+)(?P<suffix>\.\w+)?$")
+
+
+class BlobHandle(str):
+    """Reference to a blob, of the form `blob://<sha256>-<size><suffix>`."""
+
+    def __new__(cls, value: str):
+        match = _HANDLE_PATTERN.match(value)
+        if match is None:
+            raise ValueError(f"Invalid blob handle: {value}")
+        handle = super().__new__(cls, value)
+        handle.digest = match.group("digest")
+        handle.size = int(match.group("size"))
+        handle.suffix = match.group("suffix") or ""
+        return handle
+
+    @classmethod
+    def make(cls, digest: str, size: int, suffix: str = "") -> "BlobHandle":
+        return cls(f"{_HANDLE_PREFIX}{digest}-{size}{suffix}")
+
+    @staticmethod
+    def is_handle(value) -> bool:
+        return isinstance(value, str) and value.startswith(_HANDLE_PREFIX) and _HANDLE_PATTERN.match(value) is not None
+
+
+_attach_lock = threading.Lock()
+
+
+def _attach_shared_memory(name: str) -> shared_memory.SharedMemory:
+    # Attaching must not register the segment with this process's resource tracker,
+    # which would unlink it when this process exits
+    if sys.version_info >= (3, 13):
+        return shared_memory.SharedMemory(name=name, track=False)
+    # Before 3.13 attaching always registers it. Unregistering afterwards would also drop
+    # the creator's registration when both processes share a tracker (spawned children),
+    # so registration is skipped for the duration of the attach instead.
+    with _attach_lock:
+        register = resource_tracker.register
+        resource_tracker.register = lambda name, rtype: None
+        try:
+            return shared_memory.SharedMemory(name=name)
+        finally:
+            resource_tracker.register = register
+
+
+class _Blob():
+    __slots__ = ("handle", "refcount", "shm", "path", "owns_shm", "owns_path", "_mmap")
+
+    def __init__(self, handle: BlobHandle):
+        self.handle = handle
+        # Number of references held in this process
+        self.refcount = 0
+        self.shm: Optional[shared_memory.SharedMemory] = None
+        self.path: Optional[str] = None
+        self.owns_shm = False
+        self.owns_path = False
+        self._mmap: Optional[mmap.mmap] = None
+
+    def view(self) -> memoryview:
+        if self.shm is not None:
+            return self.shm.buf[:self.handle.size]
+        if self._mmap is None:
+            if self.handle.size == 0:
+                return memoryview(b"")
+            with open(self.path, "rb") as f:
+                self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return memoryview(self._mmap)[:self.handle.size]
+
+
+class BlobStore():
+    """Refcounted, content-addressed blobs in shared memory with a disk spill.
+
+    Args:
+        spill_dir (str, optional): Directory of the spill files, and of the files
+            materialized by `path`. Defaults to a directory in the system temp dir.
+        max_memory_bytes (int): Budget of the blobs held in shared memory, blobs that
+            do not fit are written to a spill file instead.
+        use_shared_memory (bool): Keep blobs in shared memory, False to always spill.
+    """
+    def __init__(self,
+                 spill_dir: Optional[str] = None,
+                 max_memory_bytes: int = 512 * 1024 * 1024,
+                 use_shared_memory: bool = True):
+        self.spill_dir = spill_dir or os.path.join(tempfile.gettempdir(), "orchestra-blobs")
+        self.max_memory_bytes = max_memory_bytes
+        self.use_shared_memory = use_shared_memory
+
+        self.memory_bytes = 0
+        self._blobs: Dict[str, _Blob] = {}
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def _shm_name(handle: BlobHandle) -> str:
+        # POSIX shared memory names are limited to 31 characters on macOS
+        return f"orc_{handle.digest[:24]}"
+
+    def _spill_path(self, handle: BlobHandle) -> str:
+        return os.path.join(self.spill_dir, f"{handle.digest}{handle.suffix}")
+
+    def put(self, data, suffix: str = "") -> BlobHandle:
+        """Store bytes-like data and return its handle, holding one reference to it.
+
+        Storing a content that is already in the store only adds a reference, also when
+        it was created by another process.
+        """
+        view = memoryview(data).cast("B")
+        handle = BlobHandle.make(hashlib.sha256(view).hexdigest(), view.nbytes, suffix)
+
+        with self._lock:
+            blob = self._blobs.get(handle)
+            if blob is None:
+                blob = _Blob(handle)
+                size = handle.size
+                if self.use_shared_memory and 0 < size and self.memory_bytes + size <= self.max_memory_bytes:
+                    try:
+                        blob.shm = shared_memory.SharedMemory(name=self._shm_name(handle), create=True, size=size)
+                        blob.shm.buf[:size] = view
+                        blob.owns_shm = True
+                        self.memory_bytes += size
+                    except FileExistsError:
+                        # Created by another process, its copy is the same content
+                        blob.shm = _attach_shared_memory(self._shm_name(handle))
+                    except OSError:
+                        blob.shm = None
+                if blob.shm is None:
+                    blob.path, blob.owns_path = self._write_file(handle, view)
+                self._blobs[handle] = blob
+            blob.refcount += 1
+        return handle
+
+    def _write_file(self, handle: BlobHandle, view: memoryview) -> Tuple[str, bool]:
+        """Write the blob to its spill file, returns the path and whether it was created."""
+        path = self._spill_path(handle)
+        if os.path.exists(path):
+            return path, False
+        os.makedirs(self.spill_dir, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(view)
+        os.replace(tmp_path, path)
+        return path, True
+
+    def _lookup(self, handle: str) -> _Blob:
+        handle = handle if isinstance(handle, BlobHandle) else BlobHandle(handle)
+        blob = self._blobs.get(handle)
+        if blob is not None:
+            return blob
+
+        # A blob of another process, attached without taking ownership nor a reference
+        blob = _Blob(handle)
+        try:
+            blob.shm = _attach_shared_memory(self._shm_name(handle))
+        except OSError:
+            path = self._spill_path(handle)
+            if not os.path.exists(path):
+                raise KeyError(f"Unknown blob: {handle}")
+            blob.path = path
+        self._blobs[handle] = blob
+        return blob
+
+    def get(self, handle: str) -> memoryview:
+        """Read-only view of a blob, without copying it. The view must not outlive the last `release`."""
+        with self._lock:
+            return self._lookup(handle).view().toreadonly()
+
+    def get_bytes(self, handle: str) -> bytes:
+        return bytes(self.get(handle))
+
+    def path(self, handle: str) -> str:
+        """Path of a file holding the blob, written once per content for callers that need a file.
+
+        The file persists after the blob is freed.
+        """
+        with self._lock:
+            blob = self._lookup(handle)
+            if blob.path is None:
+                blob.path, _ = self._write_file(blob.handle, blob.view())
+            # Spill files handed out here are no longer deleted with the blob
+            blob.owns_path = False
+            return blob.path
+
+    def incref(self, handle: str) -> BlobHandle:
+        with self._lock:
+            blob = self._lookup(handle)
+            blob.refcount += 1
+            return blob.handle
+
+    def release(self, handle: str):
+        """Drop a reference, the last one frees the blob, or detaches it if it belongs to another process."""
+        with self._lock:
+            blob = self._blobs.get(handle)
+            if blob is None:
+                return
+            # Blobs of other processes read without a reference are at 0
+            blob.refcount = max(blob.refcount - 1, 0)
+            if blob.refcount > 0:
+                return
+            del self._blobs[handle]
+            self._free(blob)
+
+    def refcount(self, handle: str) -> int:
+        blob = self._blobs.get(handle)
+        return blob.refcount if blob is not None else 0
+
+    def __contains__(self, handle: str) -> bool:
+        return handle in self._blobs
+
+    def __len__(self) -> int:
+        return len(self._blobs)
+
+    def _free(self, blob: _Blob):
+        # Only what this process created is unlinked, blobs of other processes are closed
+        # Views handed out by `get` keep the mapping alive until they are garbage collected
+        if blob._mmap is not None:
+            try:
+                blob._mmap.close()
+            except BufferError:
+                pass
+            blob._mmap = None
+        if blob.shm is not None:
+            try:
+                blob.shm.close()
+            except BufferError:
+                pass
+            if blob.owns_shm:
+                try:
+                    blob.shm.unlink()
+                except FileNotFoundError:
+                    pass
+                self.memory_bytes -= blob.handle.size
+            blob.shm = None
+        if blob.owns_path and blob.path is not None:
+            try:
+                os.remove(blob.path)
+            except FileNotFoundError:
+                pass
+
+    def close(self):
+        """Free every blob created by this process, and detach the others."""
+        with self._lock:
+            for blob in self._blobs.values():
+                self._free(blob)
+            self._blobs.clear()
+
+
+blob_store = BlobStore()
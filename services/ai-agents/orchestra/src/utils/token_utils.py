@@ -1,5 +1,3 @@
-import tiktoken
-
 def get_token_count(prompt: str, model: str = "gpt-4o") -> int:
     """
     Get the number of tokens in a prompt.
@@ -7,5 +5,7 @@ def get_token_count(prompt: str, model: str = "gpt-4o") -> int:
     :param model: The model to use for tokenization. Default is "gpt-4o".
     :return: The number of tokens in the prompt.
     """
+    import tiktoken
+
     encoding = tiktoken.encoding_for_model(model)
     return len(encoding.encode(prompt))
\ No newline at end of file
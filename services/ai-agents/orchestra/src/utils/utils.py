@@ -24,12 +24,14 @@ import json5
 import keyword
 import os
 import re
+import sys
 import types
+import weakref
 from functools import lru_cache
 from io import BytesIO
 from pathlib import Path
 from textwrap import dedent
-from typing import TYPE_CHECKING, Any, Dict, List, Tuple
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
 
 
 
@@ -315,9 +317,7 @@ def instance_to_source(instance, base_cls=None):
         class_lines.append("")
 
     # Find required imports using ImportFinder
-    import_finder = ImportFinder()
-    import_finder.visit(ast.parse("\n".join(class_lines)))
-    required_imports = import_finder.packages
+    required_imports = _find_required_imports("\n".join(class_lines))
 
     # Build final code with imports
     final_lines = []
@@ -339,6 +339,29 @@ def instance_to_source(instance, base_cls=None):
     return "\n".join(final_lines)
 
 
+@lru_cache(maxsize=256)
+def _find_required_imports(code: str) -> Tuple[str, ...]:
+    import_finder = ImportFinder()
+    import_finder.visit(ast.parse(code))
+    return tuple(import_finder.packages)
+
+
+def get_module_mtime(obj) -> Optional[int]:
+    """Modification time of the file of the module defining `obj`, None if it has no file."""
+    module = sys.modules.get(getattr(obj, "__module__", None) or "")
+    path = getattr(module, "__file__", None)
+    if not path:
+        return None
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+# Source of classes and functions, with the mtime of their module file when it was read
+_source_cache: "weakref.WeakKeyDictionary[Any, Tuple[int, str]]" = weakref.WeakKeyDictionary()
+
+
 def get_source(obj) -> str:
     """Get the source code of a class or callable object (e.g.: function, method).
     First attempts to get the source code using `inspect.getsource`.
@@ -362,11 +385,32 @@ def get_source(obj) -> str:
     if not (isinstance(obj, type) or callable(obj)):
         raise TypeError(f"Expected class or callable, got {type(obj)}")
 
+    # Handle dynamically created classes
+    source = getattr(obj, "__source__", None)
+    if source:
+        return dedent(source).strip()
+
+    # Sources are reused until the module file changes, saving agents with many tools
+    # would otherwise re-read every tool's source on each checkpoint
+    mtime = get_module_mtime(obj)
+    if mtime is not None:
+        try:
+            cached = _source_cache.get(obj)
+        except TypeError:
+            cached = None
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+
     inspect_error = None
     try:
-        # Handle dynamically created classes
-        source = getattr(obj, "__source__", None) or inspect.getsource(obj)
-        return dedent(source).strip()
+        source = dedent(inspect.getsource(obj)).strip()
+        if mtime is not None:
+            try:
+                _source_cache[obj] = (mtime, source)
+            except TypeError:
+                # Objects without weak references are not cached
+                pass
+        return source
     except OSError as e:
         # let's keep track of the exception to raise it if all further methods fail
         inspect_error = e
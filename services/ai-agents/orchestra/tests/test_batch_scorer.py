@@ -0,0 +1,80 @@
+import warnings
+warnings.simplefilter("ignore", DeprecationWarning)
+
+import sys
+import json
+import time
+import random
+import tempfile
+from pathlib import Path
+
+root = str(Path(__file__).resolve().parents[1])
+sys.path.append(root)
+
+from src.metric import question_scorer, score_batch, score_answer_files
+
+TRUTHS = ["42", "$1,000", "Sea gull", "a, b; c", "1, 2, 3", "Paris"]
+PREDICTIONS = ["42", "1000", "seagull", "a,b;c", "1,2,4", "London", None, "Unable to determine"]
+
+def write_answers(path: str, num_entries: int, seed: int = 0):
+    rng = random.Random(seed)
+    with open(path, "w") as f:
+        for i in range(num_entries):
+            truth = rng.choice(TRUTHS + ["?"])
+            f.write(json.dumps(dict(task_id=str(i),
+                                    task=rng.choice([1, 2, 3]),
+                                    prediction=rng.choice(PREDICTIONS),
+                                    true_answer=truth)) + "\n")
+
+def test_score_batch():
+    pairs = [(prediction, truth) for prediction in PREDICTIONS[:6] for truth in TRUTHS]
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", UserWarning)
+        expected = [question_scorer(prediction, truth) for prediction, truth in pairs]
+    predictions, truths = zip(*pairs)
+    assert score_batch(predictions, truths) == expected
+    assert score_batch(predictions, truths, num_workers=2, min_parallel_size=0, chunk_size=7) == expected
+    assert score_batch([None, "Unable to determine"], ["Paris", "Paris"]) == [False, False]
+
+def test_score_answer_files(tmp_path):
+    directory = str(tmp_path)
+    paths = [str(Path(directory, f"run_{i}.jsonl")) for i in range(4)]
+    for seed, path in enumerate(paths):
+        write_answers(path, 25000, seed=seed)
+
+    start = time.monotonic()
+    report = score_answer_files(paths, num_workers=4)
+    print(f"Scored 100000 answers in {time.monotonic() - start:.2f}s")
+    print(json.dumps(report.dict()["by_key"], indent=4))
+
+    assert report.overall.total == 100000
+    assert sum(group.total for group in report.by_file.values()) == 100000
+    assert sum(group.correct for group in report.by_key["task"].values()) == report.overall.correct
+    assert report.overall.unscored == sum(score is None for score in report.scores)
+
+def test_latest_entry_per_task(tmp_path):
+    # A retried task is appended again, only its last entry counts
+    entries = [
+        dict(task_id="1", task=1, prediction=None, true_answer="42", agent_error="timeout"),
+        dict(task_id="2", task=1, prediction="Paris", true_answer="Paris"),
+        dict(task_id="1", task=1, prediction="42", true_answer="42"),
+    ]
+    paths = [str(Path(tmp_path, "run_0.jsonl")), str(Path(tmp_path, "run_1.jsonl"))]
+    for path in paths:
+        with open(path, "w") as f:
+            f.writelines(json.dumps(entry) + "\n" for entry in entries)
+
+    report = score_answer_files(paths)
+    # Deduplicated per file, the same task in two runs counts twice
+    assert report.overall.total == 4 and report.overall.correct == 4
+    assert report.by_file[paths[0]].total == 2
+
+    report = score_answer_files(paths[:1], dedupe_key=None)
+    assert report.overall.total == 3 and report.overall.correct == 2
+
+if __name__ == "__main__":
+    test_score_batch()
+    with tempfile.TemporaryDirectory() as directory:
+        test_score_answer_files(directory)
+    with tempfile.TemporaryDirectory() as directory:
+        test_latest_entry_per_task(directory)
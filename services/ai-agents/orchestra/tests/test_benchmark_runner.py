@@ -0,0 +1,61 @@
+import warnings
+warnings.simplefilter("ignore", DeprecationWarning)
+
+import sys
+import time
+import asyncio
+import tempfile
+from pathlib import Path
+
+root = str(Path(__file__).resolve().parents[1])
+sys.path.append(root)
+
+from src.runner import AnswersLog, BenchmarkRunner
+
+async def answer(task: dict) -> dict:
+    await asyncio.sleep(task["delay"])
+    if task["task_id"] == "fail":
+        raise ValueError("broken task")
+    return dict(task_id=task["task_id"], prediction=f"answer {task['task_id']}")
+
+def error_entry(task: dict, error: BaseException) -> dict:
+    return dict(task_id=task["task_id"], prediction=None, agent_error=str(error))
+
+def is_done(entry: dict) -> bool:
+    return entry["prediction"] is not None
+
+def test_runner(tmp_path):
+    answers_file = str(Path(tmp_path, "answers.jsonl"))
+    tasks = [dict(task_id="timeout", delay=2), dict(task_id="slow", delay=0.5)]
+    tasks += [dict(task_id=str(i), delay=0.05) for i in range(10)] + [dict(task_id="fail", delay=0)]
+
+    runner = BenchmarkRunner(answer, AnswersLog(answers_file, is_done=is_done), error_entry,
+                             concurrency=2, task_timeout=1, report_interval=0)
+    start = time.monotonic()
+    stats = asyncio.run(runner.run(runner.tasks_to_run(tasks)))
+    elapsed = time.monotonic() - start
+
+    # The other slot runs the remaining tasks while one waits for the timeout,
+    # fixed batches of 2 would take 1.25s
+    assert elapsed < 1.2, elapsed
+    assert stats == dict(total=13, finished=13, failed=1, timed_out=1)
+
+    # An interrupted write leaves a partial line, which is ignored
+    with open(answers_file, "a") as f:
+        f.write('{"task_id": "partial"')
+
+    answers_log = AnswersLog(answers_file, is_done=is_done)
+    assert len(answers_log) == 13
+    assert answers_log.get("3")["prediction"] == "answer 3"
+    assert not answers_log.done("timeout")
+
+    # Resuming only runs the tasks without a done entry
+    runner = BenchmarkRunner(answer, answers_log, error_entry, concurrency=2, task_timeout=10)
+    remaining = runner.tasks_to_run(tasks)
+    assert sorted(task["task_id"] for task in remaining) == ["fail", "timeout"]
+    asyncio.run(runner.run(remaining))
+    assert AnswersLog(answers_file, is_done=is_done).done("timeout")
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as directory:
+        test_runner(directory)
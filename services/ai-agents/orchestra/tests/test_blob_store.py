@@ -0,0 +1,124 @@
+import warnings
+warnings.simplefilter("ignore", DeprecationWarning)
+
+import os
+import sys
+import tempfile
+import multiprocessing
+from pathlib import Path
+
+root = str(Path(__file__).resolve().parents[1])
+sys.path.append(root)
+
+import PIL.Image
+
+from src.utils.blob_store import BlobStore, BlobHandle
+from src.utils.agent_types import AgentImage
+from src.utils import blob_store
+
+def read_in_child(handle: str, queue):
+    queue.put(BlobStore().get_bytes(handle))
+
+def read_and_release_in_child(handle: str, queue):
+    store = BlobStore()
+    sizes = []
+    for _ in range(3):
+        sizes.append(len(store.get(handle)))
+        store.release(handle)
+        sizes.append(len(store))
+    # Counted references hold the blob until the last release
+    store.incref(handle)
+    store.incref(handle)
+    store.release(handle)
+    sizes.append(store.refcount(handle))
+    store.release(handle)
+    sizes.append(len(store))
+    queue.put(sizes)
+
+def test_blob_store(tmp_path):
+    spill_dir = str(tmp_path)
+    store = BlobStore(spill_dir=spill_dir, max_memory_bytes=1024)
+
+    # Identical contents share one blob
+    handle = store.put(b"x" * 512, suffix=".bin")
+    assert store.put(b"x" * 512, suffix=".bin") == handle
+    assert store.refcount(handle) == 2 and len(store) == 1
+    assert bytes(store.get(handle)) == b"x" * 512
+
+    # Blobs over the memory budget spill to disk
+    large = store.put(b"y" * 2048)
+    assert os.path.exists(os.path.join(spill_dir, BlobHandle(large).digest))
+    assert store.get_bytes(large) == b"y" * 2048
+
+    # Another process reads the blob by handle
+    queue = multiprocessing.get_context("spawn").Queue()
+    process = multiprocessing.get_context("spawn").Process(target=read_in_child, args=(str(handle), queue))
+    process.start()
+    assert queue.get(timeout=30) == b"x" * 512
+    process.join()
+
+    # Its references are counted there too, and the last release detaches the blob
+    process = multiprocessing.get_context("spawn").Process(target=read_and_release_in_child,
+                                                           args=(str(handle), queue))
+    process.start()
+    assert queue.get(timeout=30) == [512, 0, 512, 0, 512, 0, 1, 0]
+    process.join()
+    assert store.get_bytes(handle) == b"x" * 512 and store.refcount(handle) == 2
+
+    # The last release frees the blob, files handed out by `path` are kept
+    spill_path = os.path.join(spill_dir, BlobHandle(large).digest)
+    path = store.path(handle)
+    store.release(handle)
+    assert handle in store
+    store.release(handle)
+    store.release(large)
+    assert len(store) == 0 and store.memory_bytes == 0
+    assert os.path.exists(path) and not os.path.exists(spill_path)
+
+def test_foreign_blob(tmp_path):
+    owner = BlobStore(spill_dir=str(tmp_path), use_shared_memory=False)
+    other = BlobStore(spill_dir=str(tmp_path), use_shared_memory=False)
+    handle = owner.put(b"z" * 64)
+
+    # A blob read by handle and then stored again is counted like a local one
+    assert other.get_bytes(handle) == b"z" * 64
+    assert other.refcount(handle) == 0
+    assert other.put(b"z" * 64) == handle
+    assert other.refcount(handle) == 1
+    other.release(handle)
+    assert handle not in other
+
+    # Releasing a blob only read by `get` detaches it
+    other.get(handle)
+    assert handle in other
+    other.release(handle)
+    assert handle not in other and len(other) == 0
+
+    # Only the owner deletes the file
+    assert os.path.exists(other._spill_path(BlobHandle(handle)))
+    owner.release(handle)
+    assert not os.path.exists(owner._spill_path(BlobHandle(handle)))
+
+def test_agent_image():
+    image = AgentImage(PIL.Image.new("RGB", (64, 64), color="red"))
+    handle = image.to_handle()
+
+    # Agents pass the handle, the image is not copied nor re-encoded
+    received = AgentImage(handle)
+    assert received.to_raw().getpixel((0, 0)) == (255, 0, 0)
+    path = image.to_string()
+    assert received.to_string() == path
+    assert blob_store.refcount(handle) == 2
+
+    # The path stays valid once the images are gone
+    del image, received
+    assert handle not in blob_store
+    assert PIL.Image.open(path).getpixel((0, 0)) == (255, 0, 0)
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as spill_dir:
+        test_blob_store(Path(spill_dir))
+    with tempfile.TemporaryDirectory() as spill_dir:
+        test_foreign_blob(Path(spill_dir))
+    test_agent_image()
+    print("All tests passed.")
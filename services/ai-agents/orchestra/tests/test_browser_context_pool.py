@@ -0,0 +1,125 @@
+import warnings
+warnings.simplefilter("ignore", DeprecationWarning)
+
+import sys
+import time
+import tempfile
+import threading
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+import asyncio
+
+root = str(Path(__file__).resolve().parents[1])
+sys.path.append(root)
+
+from browser_use import BrowserConfig
+
+from src.tools.browser import context_pool
+from src.tools.browser.context_pool import BrowserContextPool, PooledContext
+from src.logger import logger
+
+def start_static_server(directory: str) -> ThreadingHTTPServer:
+    handler = partial(SimpleHTTPRequestHandler, directory=directory)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+async def visit(pool: BrowserContextPool, owner: str, url: str, cookie: str = None) -> str:
+    start = time.monotonic()
+    async with pool.context(owner) as context:
+        page = await context.get_current_page()
+        await page.goto(url)
+        if cookie is not None:
+            await page.evaluate(f"document.cookie = '{cookie}'")
+        cookies = await page.evaluate("document.cookie")
+    print(f"{owner}: {time.monotonic() - start:.3f}s, cookies: '{cookies}'")
+    return cookies
+
+class FakeContext():
+    """A stand-in for a browser context, or the shared browser, recording close()."""
+    def __init__(self):
+        self.closed = False
+
+    async def close(self):
+        self.closed = True
+
+class FakePool(BrowserContextPool):
+    async def _launch_context(self) -> PooledContext:
+        self.stats["context_launches"] += 1
+        return PooledContext(context=FakeContext())
+
+    async def _memory_mb(self, context) -> float:
+        return 0.0
+
+    async def _reset(self, context):
+        pass
+
+async def check_lru_eviction():
+    pool = FakePool(max_idle_contexts=2, num_warm_contexts=0)
+    contexts = {}
+    for owner in ["agent_a", "agent_b", "agent_c"]:
+        contexts[owner] = await pool.acquire(owner)
+        await pool.release(contexts[owner])
+
+    # The least recently released owner made room for the last one
+    assert contexts["agent_a"].closed and not contexts["agent_b"].closed
+    assert sorted(pool._idle) == ["agent_b", "agent_c"]
+    assert pool.metrics()["evictions"] == 1 and pool.metrics()["idle"] == 2
+
+    # A reused context is moved to the back of the line
+    assert await pool.acquire("agent_b") is contexts["agent_b"]
+    await pool.release(contexts["agent_b"])
+    context = await pool.acquire("agent_d")
+    await pool.release(context)
+    assert contexts["agent_c"].closed and not contexts["agent_b"].closed
+    assert sorted(pool._idle) == ["agent_b", "agent_d"]
+
+    # An evicted owner gets a fresh context
+    assert await pool.acquire("agent_a") is not contexts["agent_a"]
+
+def test_lru_eviction():
+    asyncio.run(check_lru_eviction())
+
+def test_close_at_exit():
+    pool = FakePool(num_warm_contexts=0)
+    pool.browser = FakeContext()
+    asyncio.run(pool.acquire("agent_a"))
+    context_pool._pools["fake"] = pool
+
+    browser, context = pool.browser, next(iter(pool._in_use.values())).context
+    context_pool._close_context_pools_at_exit()
+    assert browser.closed and context.closed
+    assert "fake" not in context_pool._pools
+
+async def main(url: str):
+    pool = BrowserContextPool(BrowserConfig(headless=True), max_uses=3)
+    await pool.start()
+
+    # Owners are isolated from each other
+    await visit(pool, "agent_a", url, cookie="owner=agent_a")
+    assert "owner=agent_a" not in await visit(pool, "agent_b", url)
+
+    # The context of an owner is reused across tasks, with its cookies
+    assert "owner=agent_a" in await visit(pool, "agent_a", url)
+
+    # and recycled after max_uses tasks
+    await visit(pool, "agent_a", url)
+    assert "owner=agent_a" not in await visit(pool, "agent_a", url)
+
+    print(pool.metrics())
+    await pool.close()
+
+if __name__ == "__main__":
+    logger.init_logger("tmp.log")
+
+    test_lru_eviction()
+    test_close_at_exit()
+
+    with tempfile.TemporaryDirectory() as directory:
+        Path(directory, "index.html").write_text("<html><body><button>Hello</button></body></html>")
+        server = start_static_server(directory)
+        try:
+            asyncio.run(main(f"http://127.0.0.1:{server.server_address[1]}/index.html"))
+        finally:
+            server.shutdown()
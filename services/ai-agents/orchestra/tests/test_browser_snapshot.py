@@ -0,0 +1,116 @@
+import warnings
+warnings.simplefilter("ignore", DeprecationWarning)
+
+import sys
+import asyncio
+from pathlib import Path
+
+root = str(Path(__file__).resolve().parents[1])
+sys.path.append(root)
+
+from src.tools.browser.snapshot import PageFingerprint, DOMSnapshotDiffer
+
+class FakePage():
+    """A local stand-in for a page, answering the fingerprint script."""
+    def __init__(self, url: str, count: int, hash: int):
+        self.url = url
+        self.result = {"count": count, "hash": hash}
+        self.scripts = []
+
+    async def evaluate(self, script: str):
+        self.scripts.append(script)
+        return self.result
+
+def test_capture():
+    page = FakePage("https://example.com", 12, -345)
+    fingerprint = asyncio.run(PageFingerprint.capture(page))
+    assert fingerprint == PageFingerprint(url="https://example.com", num_elements=12, elements_hash=-345)
+    # One round trip per capture
+    assert len(page.scripts) == 1
+
+def test_describe_change():
+    baseline = PageFingerprint(url="https://example.com", num_elements=12, elements_hash=7)
+
+    assert baseline.describe_change(PageFingerprint("https://example.com", 12, 7)) is None
+    assert baseline.describe_change(PageFingerprint("https://example.com/next", 12, 7)) == \
+        "navigated from https://example.com to https://example.com/next"
+    assert baseline.describe_change(PageFingerprint("https://example.com", 13, 7)) == \
+        "interactive elements changed from 12 to 13"
+    # Same number of elements, but different ones
+    assert baseline.describe_change(PageFingerprint("https://example.com", 12, 8)) == \
+        "interactive elements changed"
+
+FORM = "\n".join([
+    "[0]<input name=first_name>",
+    "[1]<input name=last_name>",
+    "[2]<select name=country>",
+    "[3]<input name=city>",
+    "[4]<input name=street>",
+    "[5]<input name=postcode>",
+    "[6]<input name=phone>",
+    "[7]<input name=email>",
+    "[8]<input type=checkbox name=newsletter>",
+    "[9]<textarea name=comments>",
+    "[10]<button>Next</button>",
+])
+
+def test_diff_full_then_changes():
+    differ = DOMSnapshotDiffer()
+    url = "https://example.com/form"
+
+    # First snapshot and unchanged pages
+    assert differ.diff(url, FORM) == (True, FORM)
+    is_full, observation = differ.diff(url, FORM)
+    assert not is_full and observation == "No changes to the 11 interactive elements since the last state."
+
+    # The last element changed, the others keep their index and are left out
+    changed = FORM.replace("[10]<button>Next</button>", "[10]<button>Submit</button>")
+    is_full, observation = differ.diff(url, changed)
+    assert not is_full
+    assert observation.splitlines()[1:] == ["- [10]<button>Next</button>", "+ [10]<button>Submit</button>"]
+
+    # A navigation starts over with a full snapshot
+    assert differ.diff("https://example.com/next", changed) == (True, changed)
+
+def test_diff_uses_current_indices():
+    differ = DOMSnapshotDiffer()
+    url = "https://example.com/form"
+    differ.diff(url, FORM)
+
+    # An error message inserted above the last two elements renumbers them
+    lines = FORM.splitlines()
+    inserted = lines[:9] + ["[9]<div role=alert>Too long</div>",
+                            "[10]<textarea name=comments>", "[11]<button>Next</button>"]
+    is_full, observation = differ.diff(url, "\n".join(inserted))
+    assert not is_full
+    assert observation.splitlines()[1:] == [
+        "+ [9]<div role=alert>Too long</div>",
+        "~ [10]<textarea name=comments>",
+        "~ [11]<button>Next</button>",
+    ]
+    # Every index the model can read is the one of the current state
+    current = set(inserted)
+    for line in observation.splitlines()[1:]:
+        if not line.startswith("- "):
+            assert line[2:] in current
+
+def test_diff_falls_back_to_full():
+    differ = DOMSnapshotDiffer()
+    url = "https://example.com/form"
+    differ.diff(url, FORM)
+
+    # A diff longer than the snapshot is not worth it
+    other = "\n".join(f"[{i}]<a>result {i}</a>" for i in range(3))
+    assert differ.diff(url, other) == (True, other)
+
+    # After a reset the next snapshot is full again
+    differ.reset()
+    assert differ.diff(url, other) == (True, other)
+
+if __name__ == "__main__":
+    test_capture()
+    test_describe_change()
+    test_diff_full_then_changes()
+    test_diff_uses_current_indices()
+    test_diff_falls_back_to_full()
+    print("ok")
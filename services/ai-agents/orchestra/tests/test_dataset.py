@@ -17,3 +17,10 @@ if __name__ == "__main__":
     
     dataset = HLEDataset(path=os.path.join(root, "data", "hle"), split="test", name="hle")
     print(len(dataset))
+
+    # Rows are materialized on access, and the shards cover the dataset
+    print(dataset[0]["task_id"], dataset[0]["file_name"])
+    shards = [HLEDataset(path=os.path.join(root, "data", "hle"), split="test", name="hle",
+                         num_shards=4, shard_index=index) for index in range(4)]
+    assert sum(len(shard) for shard in shards) == len(dataset)
+    assert [task_id for shard in shards for task_id in shard.task_ids] == dataset.task_ids
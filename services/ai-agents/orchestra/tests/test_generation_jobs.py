@@ -0,0 +1,121 @@
+import warnings
+warnings.simplefilter("ignore", DeprecationWarning)
+
+import sys
+import time
+import asyncio
+import threading
+from pathlib import Path
+
+root = str(Path(__file__).resolve().parents[1])
+sys.path.append(root)
+
+from src.models.generation_jobs import GenerationJobManager, JobPending
+
+class FakeJobAPI():
+    """A local stand-in for the Veo predict/fetch endpoints."""
+    def __init__(self, duration: float, fail_fetches: int = 0):
+        self.duration = duration
+        self.fail_fetches = fail_fetches
+        self.jobs = {}
+        self.num_fetches = 0
+        self.lock = threading.Lock()
+
+    def predict(self, prompt: str) -> str:
+        with self.lock:
+            name = f"operations/{len(self.jobs)}"
+            self.jobs[name] = (time.monotonic(), prompt)
+        return name
+
+    def fetch(self, name: str) -> str:
+        with self.lock:
+            self.num_fetches += 1
+            if self.fail_fetches > 0:
+                self.fail_fetches -= 1
+                raise ConnectionError("fake network error")
+        started, prompt = self.jobs[name]
+        if time.monotonic() - started < self.duration:
+            raise JobPending(name)
+        return f"video of {prompt}"
+
+async def test_jobs_run_in_background():
+    api = FakeJobAPI(duration=0.3, fail_fetches=2)
+    manager = GenerationJobManager(initial_interval=0.05, max_interval=0.1, backoff=2, timeout=5)
+
+    start = time.monotonic()
+    futures = [await manager.submit(lambda i=i: api.predict(f"cat {i}"), api.fetch, job_id=f"cat-{i}")
+               for i in range(20)]
+
+    # Submitting does not wait for the jobs, the agent keeps working meanwhile
+    assert time.monotonic() - start < 0.2
+    assert manager.num_pending == 20
+
+    results = await asyncio.gather(*futures)
+    elapsed = time.monotonic() - start
+    assert results == [f"video of cat {i}" for i in range(20)]
+    assert await manager.wait("cat-3") == "video of cat 3"
+
+    # One timer polls every job, with intervals growing up to max_interval
+    assert elapsed < 1.0, elapsed
+    assert api.num_fetches <= 20 * 8, api.num_fetches
+    print(f"20 jobs: {elapsed:.2f}s, {api.num_fetches} polls")
+
+    # One-shot generations run in a worker thread
+    image = await manager.submit(lambda: "image of a cat")
+    assert await image == "image of a cat"
+    await manager.close()
+
+async def test_job_timeout_and_errors():
+    manager = GenerationJobManager(initial_interval=0.01, max_interval=0.02, timeout=0.2, max_errors=3)
+
+    slow = FakeJobAPI(duration=10)
+    future = await manager.submit(lambda: slow.predict("slow"), slow.fetch)
+    try:
+        await future
+        raise AssertionError("the job should have timed out")
+    except TimeoutError:
+        pass
+
+    broken = FakeJobAPI(duration=0, fail_fetches=10)
+    future = await manager.submit(lambda: broken.predict("broken"), broken.fetch)
+    try:
+        await future
+        raise AssertionError("the job should have failed")
+    except ConnectionError:
+        pass
+    assert broken.num_fetches == 3
+
+    # Closing cancels the jobs still running
+    future = await manager.submit(lambda: slow.predict("cancelled"), slow.fetch, timeout=0)
+    await manager.close()
+    assert future.cancelled()
+
+async def test_job_status_and_pruning():
+    manager = GenerationJobManager(initial_interval=0.01, max_interval=0.02, timeout=5, keep_finished=0.1)
+
+    api = FakeJobAPI(duration=0.1)
+    await manager.submit(lambda: api.predict("cat"), api.fetch, job_id="cat")
+    assert manager.status("cat")["status"] == "pending"
+    assert await manager.wait("cat") == "video of cat"
+    await asyncio.sleep(0)
+    assert manager.status("cat")["status"] == "done"
+
+    broken = FakeJobAPI(duration=0, fail_fetches=10)
+    future = await manager.submit(lambda: broken.predict("broken"), broken.fetch, job_id="broken")
+    await asyncio.gather(future, return_exceptions=True)
+    await asyncio.sleep(0)
+    status = manager.status("broken")
+    assert status["status"] == "failed" and "ConnectionError" in status["error"]
+
+    # Finished jobs are dropped once kept for keep_finished seconds
+    await asyncio.sleep(0.15)
+    await manager.submit(lambda: "image of a cat", job_id="image")
+    assert set(manager.jobs) == {"image"}
+    assert manager.status("cat") is None
+    await manager.close()
+
+if __name__ == "__main__":
+    asyncio.run(test_jobs_run_in_background())
+    asyncio.run(test_job_timeout_and_errors())
+    asyncio.run(test_job_status_and_pruning())
+    print("All tests passed.")
@@ -0,0 +1,63 @@
+import os
+import sys
+import json
+import subprocess
+from pathlib import Path
+
+root = str(Path(__file__).resolve().parents[1])
+
+# Cold start budget in seconds for importing the core packages in a fresh interpreter
+IMPORT_TIME_BUDGET = float(os.getenv("IMPORT_TIME_BUDGET", "3.0"))
+
+# Modules that must only be imported by the tools or models that use them
+HEAVY_MODULES = [
+    "browser_use",
+    "playwright",
+    "patchright",
+    "markitdown",
+    "crawl4ai",
+    "camelot",
+    "langchain_openai",
+    "litellm",
+    "transformers",
+    "torch",
+    "mlx_lm",
+    "vllm",
+]
+
+_SCRIPT = """
+import sys, time, json
+sys.path.insert(0, {root!r})
+start = time.perf_counter()
+import src
+import src.tools
+import src.models
+from src.registry import TOOL, AGENT
+elapsed = time.perf_counter() - start
+print(json.dumps(dict(elapsed=elapsed, modules=sorted(sys.modules))))
+"""
+
+def measure_import():
+    output = subprocess.run(
+        [sys.executable, "-c", _SCRIPT.format(root=root)],
+        check=True,
+        capture_output=True,
+        text=True,
+        cwd=root,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+def test_import_time():
+    result = measure_import()
+
+    imported = [name for name in HEAVY_MODULES
+                if any(module == name or module.startswith(name + ".") for module in result["modules"])]
+    assert not imported, f"Heavy modules imported at startup: {imported}"
+    assert result["elapsed"] < IMPORT_TIME_BUDGET, (
+        f"Importing the core packages took {result['elapsed']:.2f}s, budget is {IMPORT_TIME_BUDGET:.2f}s"
+    )
+
+if __name__ == "__main__":
+    result = measure_import()
+    print(f"Import time: {result['elapsed']:.3f}s (budget: {IMPORT_TIME_BUDGET:.2f}s)")
+    test_import_time()
@@ -0,0 +1,83 @@
+import warnings
+warnings.simplefilter("ignore", DeprecationWarning)
+
+import sys
+import json
+import time
+import tempfile
+import threading
+from pathlib import Path
+
+root = str(Path(__file__).resolve().parents[1])
+sys.path.append(root)
+
+from src.logger import logger, LogLevel, LogPipeline, JsonlFileSink
+
+class SlowSink():
+    def __init__(self, delay: float):
+        self.delay = delay
+        self.records = []
+
+    def write(self, records):
+        time.sleep(self.delay)
+        self.records.extend(records)
+
+    def close(self):
+        pass
+
+def test_jsonl_file_sink(tmp_path):
+    log_path = str(Path(tmp_path, "log.jsonl"))
+    logger.init_logger(log_path)
+    logger.info("| plain message")
+    logger.log_markdown(title="Agent output:", content="**hello**")
+    logger.log_code(title="Executing parsed code:", content="print(1)")
+    logger.log_messages([{"role": "user", "content": "hi"}], level=LogLevel.DEBUG)
+    logger.flush()
+
+    with open(log_path) as f:
+        records = [json.loads(line) for line in f]
+    assert [record["kind"] for record in records] == ["message", "markdown", "code", "messages"]
+    assert records[0]["message"] == "| plain message"
+    assert records[1]["content"] == "**hello**"
+    logger.close()
+
+def test_overflow_policies():
+    for policy in ["drop", "sample"]:
+        sink = SlowSink(delay=0.05)
+        pipeline = LogPipeline([sink], max_queue_size=10, batch_size=1, overflow_policy=policy, sample_every=2)
+        for i in range(100):
+            pipeline.submit(dict(kind="message", levelno=20, message=str(i)))
+        # Errors are never dropped
+        assert pipeline.submit(dict(kind="message", levelno=40, message="error"))
+        pipeline.close()
+
+        metrics = pipeline.metrics()
+        print(policy, metrics)
+        assert metrics["dropped"] + metrics["sampled_out"] > 0
+        assert sink.records[-1]["message"] == "error"
+
+def test_enqueue_latency():
+    sink = SlowSink(delay=0.01)
+    pipeline = LogPipeline([sink], max_queue_size=10000)
+
+    def produce():
+        for i in range(1000):
+            pipeline.submit(dict(kind="message", levelno=20, message=str(i)))
+
+    start = time.monotonic()
+    threads = [threading.Thread(target=produce) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    print(f"Enqueued 8000 records in {time.monotonic() - start:.3f}s")
+
+    pipeline.close()
+    assert len(sink.records) == 8000
+    assert pipeline.metrics()["submitted"] == pipeline.metrics()["written"] == 8000
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as directory:
+        test_jsonl_file_sink(directory)
+    test_overflow_policies()
+    test_enqueue_latency()
@@ -0,0 +1,48 @@
+import warnings
+warnings.simplefilter("ignore", DeprecationWarning)
+
+import sys
+import time
+from pathlib import Path
+import asyncio
+
+root = str(Path(__file__).resolve().parents[1])
+sys.path.append(root)
+
+from src.mcp import MCPAdapt, AsyncToolAdapter, MCPSessionPool
+from src.logger import logger
+
+config = {
+    "mcpServers": {
+        "LocalMCP": {
+            "command": "python",
+            "args": [str(Path(root) / "src" / "mcp" / "server.py")],
+            "env": {"DEBUG": "true"}
+        },
+    }
+}
+
+async def main():
+    session_pool = MCPSessionPool()
+    mcpadapt = MCPAdapt(config, AsyncToolAdapter(session_pool=session_pool))
+    tools = await mcpadapt.tools()
+
+    tool = tools["count_letter_frequency"]
+
+    start = time.monotonic()
+    results = await asyncio.gather(*[
+        tool(input_string="strawberry") for _ in range(20)
+    ])
+    print(results[0])
+    print(f"20 concurrent calls: {time.monotonic() - start:.3f}s")
+
+    # A dead session is reconnected on the next call
+    session = await session_pool.acquire(config)
+    await session.close()
+    print(await tool(input_string="strawberry"))
+
+    await session_pool.close()
+
+if __name__ == "__main__":
+    logger.init_logger("tmp.log")
+    asyncio.run(main())
@@ -0,0 +1,137 @@
+import warnings
+warnings.simplefilter("ignore", DeprecationWarning)
+
+import sys
+import json
+import asyncio
+import tempfile
+from pathlib import Path
+
+root = str(Path(__file__).resolve().parents[1])
+sys.path.append(root)
+
+from mcp.types import Tool as MCPTool
+
+from src.mcp import MCPAdapt, AsyncToolAdapter, MCPToolCache, LazyMCPTools
+from src.mcp.tool_cache import fingerprint_tools
+
+config = {
+    "mcpServers": {
+        "LocalMCP": {
+            "command": "python",
+            "args": ["server.py"],
+        },
+    }
+}
+
+def make_spec(name: str, description: str = "A tool.") -> dict:
+    return dict(
+        name=name,
+        description=description,
+        inputSchema={"type": "object", "properties": {"text": {"type": "string"}}, "required": ["text"]},
+    )
+
+class FakeSessionPool():
+    """A local stand-in for the MCP session pool, listing a fixed set of tools."""
+    def __init__(self, specs):
+        self.specs = specs
+        self.num_listings = 0
+        self.client = self
+
+    async def acquire(self, config):
+        return self
+
+    async def list_tools(self):
+        self.num_listings += 1
+        return [MCPTool(**spec) for spec in self.specs]
+
+class CountingAdapter():
+    def __init__(self):
+        self.adapted = []
+
+    def adapt_tool(self, client, tool, server_config=None):
+        self.adapted.append(tool.name)
+        return f"adapted {tool.name}: {tool.description}"
+
+def test_fingerprint():
+    specs = [make_spec("count_letters"), make_spec("reverse_text")]
+    assert fingerprint_tools(specs) == fingerprint_tools(list(reversed(specs)))
+    assert fingerprint_tools(specs) != fingerprint_tools([make_spec("count_letters", "Changed."), specs[1]])
+
+def test_tool_cache_hit_and_miss(tmp_path):
+    cache = MCPToolCache(str(tmp_path))
+    specs = [make_spec("count_letters")]
+
+    assert cache.load(config) is None
+    fingerprint = cache.save(config, specs)
+
+    cached = cache.load(config)
+    assert cached["fingerprint"] == fingerprint
+    assert cached["tools"] == specs
+    # Another server config has its own entry
+    assert cache.load({"mcpServers": {}}) is None
+
+    # A tampered listing no longer matches its fingerprint and is ignored
+    path = cache._get_path(config)
+    with open(path) as f:
+        data = json.load(f)
+    data["tools"][0]["description"] = "Tampered."
+    with open(path, "w") as f:
+        json.dump(data, f)
+    assert cache.load(config) is None
+
+    with open(path, "w") as f:
+        f.write("{not json")
+    assert cache.load(config) is None
+
+def test_lazy_tools():
+    adapter = CountingAdapter()
+    tools = LazyMCPTools(adapter, None, config, [make_spec("count_letters"), make_spec("reverse_text")])
+
+    assert len(tools) == 2 and "count_letters" in tools
+    assert adapter.adapted == []
+
+    assert tools["count_letters"] == "adapted count_letters: A tool."
+    assert tools["count_letters"] == "adapted count_letters: A tool."
+    assert adapter.adapted == ["count_letters"]
+
+    # Only the tools whose schema changed are adapted again
+    tools["reverse_text"]
+    tools.update_specs([make_spec("count_letters", "Changed."), make_spec("reverse_text")])
+    assert tools["count_letters"] == "adapted count_letters: Changed."
+    tools["reverse_text"]
+    assert adapter.adapted == ["count_letters", "reverse_text", "count_letters"]
+
+    tools.update_specs([make_spec("reverse_text")])
+    assert list(tools) == ["reverse_text"]
+
+async def check_revalidation(cache_dir: str):
+    session_pool = FakeSessionPool([make_spec("count_letters")])
+
+    # Miss: listed from the server and saved
+    tools = await MCPAdapt(config, AsyncToolAdapter(session_pool=session_pool), cache_dir=cache_dir).tools()
+    assert list(tools) == ["count_letters"]
+    assert session_pool.num_listings == 1
+
+    # Hit: built from the cache, then revalidated in the background
+    session_pool.specs = [make_spec("count_letters"), make_spec("reverse_text")]
+    mcpadapt = MCPAdapt(config, AsyncToolAdapter(session_pool=session_pool), cache_dir=cache_dir)
+    tools = await mcpadapt.tools()
+    assert list(tools) == ["count_letters"]
+
+    await mcpadapt.revalidate_task
+    assert session_pool.num_listings == 2
+    assert sorted(tools) == ["count_letters", "reverse_text"]
+    assert [spec["name"] for spec in MCPToolCache(cache_dir).load(config)["tools"]] == ["count_letters", "reverse_text"]
+
+def test_revalidation(tmp_path):
+    asyncio.run(check_revalidation(str(tmp_path)))
+
+if __name__ == "__main__":
+    test_fingerprint()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        test_tool_cache_hit_and_miss(Path(tmp_dir))
+    test_lazy_tools()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        test_revalidation(Path(tmp_dir))
+    print("ok")
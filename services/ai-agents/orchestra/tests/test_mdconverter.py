@@ -10,7 +10,9 @@ from mmengine import DictAction
 root = str(Path(__file__).resolve().parents[1])
 sys.path.append(root)
 
-from src.tools.markdown.mdconvert import MarkitdownConverter
+from markitdown._stream_info import StreamInfo
+
+from src.tools.markdown.mdconvert import MarkitdownConverter, PdfWithTableConverter, count_pdf_pages
 from src.models import model_manager
 from src.logger import logger
 from src.config import config
@@ -32,8 +34,26 @@ def parse_args():
     args = parser.parse_args()
     return args
 
+def test_pdf_page_parallel_matches_serial():
+    pdf_path = os.path.join(root, "src", "tools", "browser", "http_server", "pdf_viewer",
+                            "compressed.tracemonkey-pldi-09.pdf")
+    serial = PdfWithTableConverter(max_workers=1)
+    parallel = PdfWithTableConverter(max_workers=2, min_parallel_pages=1)
+    try:
+        with open(pdf_path, "rb") as f:
+            serial_result = serial.convert(f, StreamInfo(extension=".pdf"))
+        with open(pdf_path, "rb") as f:
+            parallel_result = parallel.convert(f, StreamInfo(extension=".pdf"))
+    finally:
+        parallel.shutdown()
+
+    assert parallel_result.markdown == serial_result.markdown
+    assert [timing["page_number"] for timing in parallel_result.page_timings] == list(range(count_pdf_pages(pdf_path)))
+
 if __name__ == "__main__":
 
+    test_pdf_page_parallel_matches_serial()
+
     # Parse command line arguments
     args = parse_args()
 
@@ -0,0 +1,93 @@
+import warnings
+warnings.simplefilter("ignore", DeprecationWarning)
+
+import sys
+import time
+import asyncio
+import tempfile
+import multiprocessing
+from pathlib import Path
+
+root = str(Path(__file__).resolve().parents[1])
+sys.path.append(root)
+
+from src.tools.planning import PlanningTool, Plan, PlanStore
+
+async def check_planning_tool(plans_path: str):
+    tool = PlanningTool(plans_path=plans_path)
+    res = await tool.forward(action="create", plan_id="gaia", title="Answer the question",
+                             steps=["Search the web", "Read the paper", "Answer"])
+    assert res.error is None
+
+    res = await tool.forward(action="mark_step", step_index=1, step_status="completed", step_notes="Found it")
+    assert "1. [✓] Read the paper\n   Notes: Found it\n" in res.output
+    assert "Progress: 1/3 steps completed (33.3%)" in res.output
+
+    # Unchanged steps keep their status when the plan is updated
+    res = await tool.forward(action="update", plan_id="gaia",
+                             steps=["Search the web", "Read the paper", "Check", "Answer"])
+    assert "1. [✓] Read the paper" in res.output and "2. [ ] Check" in res.output
+
+    # A managed agent building its own tool on the same file shares the plans
+    managed_tool = PlanningTool(plans_path=plans_path)
+    assert managed_tool.store is tool.store
+    res = await managed_tool.forward(action="get")
+    assert "Plan: Answer the question (ID: gaia)" in res.output
+
+    # Plans survive a restart
+    store = PlanStore(plans_path)
+    assert store.current_plan_id == "gaia"
+    assert store.get("gaia").render() == tool.store.get("gaia").render()
+
+    res = await tool.forward(action="delete", plan_id="gaia")
+    assert res.error is None and len(PlanStore(plans_path)) == 0
+
+    # Without a file, the plans of concurrent tasks stay separate
+    tools = [PlanningTool(), PlanningTool()]
+    await tools[0].forward(action="create", plan_id="gaia", title="Task 1", steps=["Answer"])
+    res = await tools[1].forward(action="create", plan_id="gaia", title="Task 2", steps=["Answer"])
+    assert res.error is None
+    assert tools[0].store.get("gaia").title == "Task 1"
+
+def test_planning_tool(tmp_path):
+    asyncio.run(check_planning_tool(str(tmp_path / "plans.json")))
+
+def add_plans(plans_path: str, worker: int, num_plans: int):
+    store = PlanStore(plans_path)
+    for i in range(num_plans):
+        with store.locked():
+            store.add(Plan(plan_id=f"plan-{worker}-{i}", title=f"Plan {i}", steps=["Answer"]))
+            store.save()
+
+def test_concurrent_writers(tmp_path):
+    plans_path = str(tmp_path / "plans.json")
+    context = multiprocessing.get_context("spawn")
+    processes = [context.Process(target=add_plans, args=(plans_path, worker, 20)) for worker in range(4)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join(timeout=60)
+        assert process.exitcode == 0
+
+    # Every writer reloaded the others' plans before saving its own
+    assert len(PlanStore(plans_path)) == 80
+
+def test_render_speed():
+    plan = Plan(plan_id="large", title="Large plan", steps=[f"Step {i}" for i in range(2000)])
+    plan.render()
+
+    start = time.monotonic()
+    for i in range(2000):
+        plan.mark_step(i, "completed")
+        plan.render()
+    elapsed = time.monotonic() - start
+    assert plan.status_counts["completed"] == 2000
+    print(f"2000 mark_step + render on a 2000-step plan: {elapsed:.3f}s")
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        test_planning_tool(Path(tmp_dir))
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        test_concurrent_writers(Path(tmp_dir))
+    test_render_speed()
+    print("All tests passed.")
@@ -0,0 +1,66 @@
+import warnings
+warnings.simplefilter("ignore", DeprecationWarning)
+
+import os
+import sys
+import time
+import tempfile
+import importlib
+from pathlib import Path
+
+root = str(Path(__file__).resolve().parents[1])
+sys.path.append(root)
+
+from src.tools.tool_validation import validate_tool_attributes, validate_tools
+from src.utils import get_source
+
+TOOLS_MODULE = '''
+class Tool:
+    pass
+
+class SearchTool(Tool):
+    name = "search_tool"
+    description = "Search the web."
+
+    def forward(self, query: str) -> str:
+        return query.upper()
+
+class BrokenTool(Tool):
+    name = "broken_tool"
+    description = "Uses an undefined name."
+
+    def forward(self, query: str) -> str:
+        return undefined_helper(query)
+'''
+
+def test_validate_tools(tmp_path):
+    tmp_dir = str(tmp_path)
+    module_path = os.path.join(tmp_dir, "fake_tools.py")
+    with open(module_path, "w") as f:
+        f.write(TOOLS_MODULE)
+    sys.path.insert(0, tmp_dir)
+    module = importlib.import_module("fake_tools")
+
+    validate_tool_attributes(module.SearchTool)
+    try:
+        validate_tools([module.SearchTool(), module.BrokenTool])
+        raise AssertionError("BrokenTool should not validate")
+    except ValueError as e:
+        assert "BrokenTool" in str(e) and "SearchTool" not in str(e)
+
+    # Cached sources and validation results are reused until the module file changes
+    start = time.monotonic()
+    for _ in range(1000):
+        get_source(module.SearchTool)
+        validate_tool_attributes(module.SearchTool)
+    print(f"1000 cached source lookups and validations: {time.monotonic() - start:.3f}s")
+
+    with open(module_path, "a") as f:
+        f.write("\n# edited\n")
+    os.utime(module_path, ns=(time.time_ns(), time.time_ns() + 10**9))
+    validate_tools([module.SearchTool])
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        test_validate_tools(Path(tmp_dir))
+    print("All tests passed.")
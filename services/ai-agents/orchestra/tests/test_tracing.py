@@ -0,0 +1,92 @@
+import warnings
+warnings.simplefilter("ignore", DeprecationWarning)
+
+import sys
+import json
+import time
+import asyncio
+import tempfile
+from pathlib import Path
+
+root = str(Path(__file__).resolve().parents[1])
+sys.path.append(root)
+
+from src.logger import Tracer
+
+async def call_tool(tracer: Tracer, name: str, delay: float):
+    with tracer.span(name, category="tool"):
+        await asyncio.sleep(delay)
+
+async def run_agent(tracer: Tracer):
+    with tracer.span("agent.run", category="agent"):
+        with tracer.span("step 1", category="step") as step:
+            with tracer.span("write_memory_to_messages", category="prompt"):
+                pass
+            with tracer.span("model.generate", category="model", model_id="fake"):
+                await asyncio.sleep(0.02)
+            await asyncio.gather(call_tool(tracer, "tool_a", 0.01), call_tool(tracer, "tool_b", 0.01))
+    return step
+
+def test_breakdown_and_export():
+    tracer = Tracer()
+    tracer.enable()
+    step = asyncio.run(run_agent(tracer))
+
+    assert set(step.breakdown) == {"prompt", "model", "tool"}
+    assert step.breakdown["model"] >= 0.02
+    spans = {span.name: span for span in tracer.spans}
+    assert spans["tool_a"].parent is spans["step 1"]
+
+    with tempfile.TemporaryDirectory() as directory:
+        chrome_path = tracer.export(str(Path(directory, "trace.json")), format="chrome")
+        with open(chrome_path) as f:
+            events = json.load(f)["traceEvents"]
+        assert len(events) == 6 and all(event["ph"] == "X" for event in events)
+
+        otlp_path = tracer.export(str(Path(directory, "trace.otlp.json")), format="otlp")
+        with open(otlp_path) as f:
+            otlp_spans = json.load(f)["resourceSpans"][0]["scopeSpans"][0]["spans"]
+        assert sum("parentSpanId" not in span for span in otlp_spans) == 1
+
+def stream_events(tracer: Tracer):
+    with tracer.span("model.generate_stream", category="stream") as span:
+        for i in range(3):
+            time.sleep(0.01)
+            with span.suspended():
+                yield i
+
+def test_suspended_generator_span():
+    tracer = Tracer()
+    tracer.enable()
+    with tracer.span("step 1", category="step") as step:
+        for _ in stream_events(tracer):
+            # The consumer runs under the step, not under the generator's span
+            with tracer.span("log.markdown", category="log"):
+                time.sleep(0.05)
+            assert tracer.current_span() is step
+
+    spans = {span.name: span for span in tracer.spans}
+    assert all(span.parent is step for span in spans.values() if span is not step)
+    # The consumer's time is not counted in the stream span
+    assert 0.03 <= spans["model.generate_stream"].duration < 0.1
+    assert step.breakdown["log"] >= 0.15
+
+def test_disabled_overhead():
+    tracer = Tracer()
+    num_spans = 100000
+
+    start = time.perf_counter()
+    for _ in range(num_spans):
+        with tracer.span("model.generate", category="model", model_id="fake"):
+            pass
+    per_span = (time.perf_counter() - start) / num_spans
+    print(f"Disabled span: {per_span * 1e6:.2f}us")
+
+    # A step makes a handful of spans around model calls that take seconds
+    assert per_span < 20e-6
+    assert not tracer.spans
+
+if __name__ == "__main__":
+    test_breakdown_and_export()
+    test_suspended_generator_span()
+    test_disabled_overhead()